@@ -535,7 +535,7 @@ def _download_html(url: str, timeout: int = 20) -> Optional[str]:
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.9",
         }
-        r = utils.safe_requests_get(url, timeout=timeout, headers=headers, allow_redirects=True)
+        r = utils.pooled_requests_get(url, timeout=timeout, headers=headers, allow_redirects=True)
         if 200 <= r.status_code < 400:
             r.encoding = r.encoding or "utf-8"
             return r.text
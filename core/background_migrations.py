@@ -0,0 +1,120 @@
+"""
+Resumable batch jobs queued by schema migrations (core.db.MIGRATIONS).
+
+A migration step that has to touch every article (indexing for search, compressing
+bodies, filling published_ts) only records a row in
+background_migrations. This worker runs those jobs one short write transaction at a
+time and saves the position after each batch, so the first window is not held up and
+a job interrupted by exit continues where it stopped on the next start. Batches are
+idempotent, so repeating one after a crash is harmless.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core import content_store, db, search_index
+
+LOG = logging.getLogger(__name__)
+
+# name -> batch(position, batch_size) -> (items, next_position or None when finished)
+JOBS: Dict[str, Tuple[Callable, int]] = {
+    # No longer queued (counters are filled by the migration step); kept for jobs queued by older versions
+    "feed_counters": (db.rebuild_feed_counters_batch, 200),
+    "search_index": (search_index.backfill_batch, search_index.BACKFILL_BATCH),
+    "content_compress": (content_store.migrate_batch, content_store.MIGRATION_BATCH),
+    "published_ts": (db.backfill_published_ts_batch, db.PUBLISHED_TS_BATCH),
+}
+# Pause between batches so refresh writes are not starved
+_PAUSE_S = 0.05
+
+
+def pending() -> List[Tuple[str, object]]:
+    """Unfinished jobs as (name, position), in the order they were queued."""
+    conn = db.get_connection()
+    try:
+        c = conn.cursor()
+        c.execute("SELECT name, position FROM background_migrations WHERE done = 0 ORDER BY rowid")
+        return [(row[0], row[1]) for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def _save(name: str, position, done: bool) -> None:
+    with db.write_connection() as conn:
+        conn.execute(
+            "UPDATE background_migrations SET position = ?, done = ?, updated_at = ? WHERE name = ?",
+            (position, 1 if done else 0, time.time(), name),
+        )
+        conn.commit()
+
+
+def run_pending(stop_event: Optional[threading.Event] = None, pause_s: float = 0.0) -> Dict[str, int]:
+    """Run queued jobs until they finish (or stop_event is set). Returns items processed per job."""
+    processed: Dict[str, int] = {}
+    for name, position in pending():
+        job = JOBS.get(name)
+        if job is None:
+            LOG.warning(f"Unknown background migration {name!r}; skipping")
+            continue
+        batch, batch_size = job
+        processed[name] = 0
+        started = time.perf_counter()
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                return processed
+            items, next_position = batch(position, batch_size)
+            processed[name] += items
+            if next_position is None:
+                _save(name, position, done=True)
+                LOG.info(
+                    f"Background migration {name} finished: {processed[name]} items "
+                    f"in {time.perf_counter() - started:.1f}s"
+                )
+                break
+            position = next_position
+            _save(name, position, done=False)
+            if pause_s:
+                if stop_event is not None:
+                    stop_event.wait(pause_s)
+                else:
+                    time.sleep(pause_s)
+    return processed
+
+
+_LOCK = threading.Lock()
+_THREAD: Optional[threading.Thread] = None
+_STOP = threading.Event()
+
+
+def _worker() -> None:
+    try:
+        run_pending(stop_event=_STOP, pause_s=_PAUSE_S)
+    except Exception:
+        LOG.exception("Background migration failed")
+
+
+def start() -> None:
+    """Work through queued jobs in a background thread (returns at once when none are queued)."""
+    global _THREAD
+    if not pending():
+        return
+    with _LOCK:
+        if _THREAD is not None and _THREAD.is_alive():
+            return
+        _STOP.clear()
+        _THREAD = threading.Thread(target=_worker, name="background-migrations", daemon=True)
+        _THREAD.start()
+
+
+def shutdown(timeout: float = 5.0) -> None:
+    global _THREAD
+    with _LOCK:
+        t = _THREAD
+        _THREAD = None
+    _STOP.set()
+    if t is not None:
+        t.join(timeout=timeout)
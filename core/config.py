@@ -27,6 +27,27 @@ DEFAULT_CONFIG = {
     "per_host_max_connections": 4,
     "feed_timeout_seconds": 15,
     "feed_retry_attempts": 5,
+    # "staged" (default: fetch threads -> parse processes -> single persistence thread, so feedparser
+    # and BeautifulSoup run outside the GUI process), "threads" (fetch and parse on worker threads)
+    # or "async" (one event loop for all downloads, bounded worker pool for parsing).
+    "refresh_engine": "staged",
+    "async_refresh_max_in_flight": 64,
+    "refresh_cpu_workers": 2,
+    "refresh_parse_workers": 0,  # 0 = auto (based on CPU count)
+    "refresh_queue_size": 32,
+    # Only fetch feeds whose next check is due (based on publish history and server cache hints).
+    # Manual refresh always fetches everything.
+    "adaptive_refresh": True,
+    "refresh_max_interval": 21600,  # seconds; upper bound for how long a quiet feed can go unchecked
+    # Feed bodies at least this large are parsed only up to a run of already-stored items (0 = off).
+    "incremental_ingest_min_bytes": 1048576,
+    # Per-host circuit breaker: skip a host after this many consecutive failures (or a 429/503
+    # with Retry-After) and report its feeds as "deferred" until the cooldown ends.
+    "host_failure_threshold": 5,
+    "host_cooldown_seconds": 60,
+    "host_cooldown_max_seconds": 3600,
+    # Per-feed refresh timings are kept for this many refresh runs (0 = don't record).
+    "refresh_stats_runs": 20,
     "active_provider": "local",
     "debug_mode": False,
     "refresh_on_startup": True,
@@ -48,6 +69,9 @@ DEFAULT_CONFIG = {
     "minimize_to_tray": True,
     "start_maximized": False,
     "max_cached_views": 15,
+    "view_cache_max_mb": 256,  # estimated memory budget for cached article views; 0 = unlimited
+    "view_cache_keep_stubs": True,  # keep evicted views as stubs (article count) that reload in one page
+    "prefetch_views": True,  # load neighbouring tree views into the view cache while idle
     "playback_speed": 1.0,
     "volume": 100,
     "volume_step": 5,
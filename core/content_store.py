@@ -0,0 +1,137 @@
+"""
+Compressed storage for articles.content.
+
+Feed HTML is most of the database. Bodies are stored as a BLOB with a one-byte format
+tag, a 4-byte little-endian original length (for the stats report) and the payload:
+
+- TAG_ZLIB: zlib-compressed UTF-8
+
+Short bodies, and bodies that do not shrink, stay plain TEXT, which is also what
+older databases hold; decode() accepts both, so readers never care which one a row
+has. Bodies are decoded only where they are actually needed (the content pane,
+get_articles(), the search index), never for list pages.
+
+Rows written before compression existed are converted in small batches by the
+"content_compress" background migration (core.background_migrations); stats()
+reports how much space compression saved.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+import zlib
+from typing import Any, Dict, Optional, Union
+
+from core.db import get_connection, write_connection
+
+LOG = logging.getLogger(__name__)
+
+TAG_ZLIB = 1
+# Below this many UTF-8 bytes compression is not worth the CPU
+MIN_COMPRESS_BYTES = 256
+_ZLIB_LEVEL = 6
+_HEADER = struct.Struct("<BI")
+
+MIGRATION_BATCH = 500
+
+
+def encode(text: Optional[str]) -> Union[str, bytes, None]:
+    """Value to store in articles.content for an article body."""
+    if not text:
+        return text
+    raw = text.encode("utf-8")
+    if len(raw) < MIN_COMPRESS_BYTES:
+        return text
+    packed = zlib.compress(raw, _ZLIB_LEVEL)
+    if len(packed) + _HEADER.size >= len(raw):
+        return text
+    return _HEADER.pack(TAG_ZLIB, len(raw)) + packed
+
+
+def decode(value: Any) -> Optional[str]:
+    """Article body from an articles.content value (plain TEXT or tagged BLOB)."""
+    if value is None or isinstance(value, str):
+        return value
+    data = bytes(value)
+    if len(data) < _HEADER.size:
+        return data.decode("utf-8", "replace")
+    tag, _size = _HEADER.unpack_from(data)
+    if tag == TAG_ZLIB:
+        return zlib.decompress(data[_HEADER.size:]).decode("utf-8", "replace")
+    LOG.warning(f"Unknown article content format tag {tag}")
+    return ""
+
+
+def stats() -> Dict[str, int]:
+    """Storage report: row counts by format, stored bytes and bytes saved by compression."""
+    conn = get_connection()
+    try:
+        c = conn.cursor()
+        c.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length(CAST(content AS BLOB))), 0) FROM articles "
+            "WHERE typeof(content) = 'text'"
+        )
+        plain, plain_bytes = c.fetchone()
+        c.execute(
+            "SELECT COUNT(*) FROM articles WHERE typeof(content) = 'text' AND length(CAST(content AS BLOB)) >= ?",
+            (MIN_COMPRESS_BYTES,),
+        )
+        pending = c.fetchone()[0]
+        compressed = compressed_bytes = original_bytes = 0
+        c.execute("SELECT length(content), substr(content, 1, ?) FROM articles WHERE typeof(content) = 'blob'", (_HEADER.size,))
+        for stored_len, head in c:
+            compressed += 1
+            compressed_bytes += int(stored_len or 0)
+            if head is not None and len(head) == _HEADER.size:
+                original_bytes += _HEADER.unpack(bytes(head))[1]
+    finally:
+        conn.close()
+    return {
+        "plain_rows": int(plain),
+        "compressed_rows": compressed,
+        "pending_rows": int(pending),
+        "stored_bytes": int(plain_bytes) + compressed_bytes,
+        "original_bytes": int(plain_bytes) + original_bytes,
+        "saved_bytes": max(0, original_bytes - compressed_bytes),
+    }
+
+
+def migrate_batch(after_rowid: Optional[int] = 0, batch_size: int = MIGRATION_BATCH):
+    """Compress the next batch of plain-text bodies with rowid > after_rowid.
+
+    Returns (compressed, last_rowid); last_rowid is None when nothing is left.
+    """
+    with write_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        c = conn.cursor()
+        c.execute(
+            "SELECT rowid, content FROM articles WHERE rowid > ? AND typeof(content) = 'text' "
+            "AND length(CAST(content AS BLOB)) >= ? ORDER BY rowid LIMIT ?",
+            (int(after_rowid or 0), MIN_COMPRESS_BYTES, max(1, int(batch_size))),
+        )
+        rows = c.fetchall()
+        if not rows:
+            conn.commit()
+            return 0, None
+        updates = []
+        for rowid, content in rows:
+            encoded = encode(content)
+            if isinstance(encoded, bytes):
+                updates.append((encoded, rowid))
+        if updates:
+            c.executemany("UPDATE articles SET content = ? WHERE rowid = ?", updates)
+        conn.commit()
+        return len(updates), rows[-1][0]
+
+
+def migrate(batch_size: int = MIGRATION_BATCH) -> int:
+    """Compress every plain-text body worth compressing now. Returns the number of rows changed."""
+    total = 0
+    last_rowid = 0
+    while True:
+        changed, last = migrate_batch(last_rowid, batch_size)
+        if last is None:
+            return total
+        total += changed
+        last_rowid = last
@@ -1,188 +1,840 @@
+import contextlib
 import sqlite3
 import os
 import logging
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
 from core.config import APP_DIR
 
 log = logging.getLogger(__name__)
 
 DB_FILE = os.path.join(APP_DIR, "rss.db")
 
+# feed_counters holds per-feed article totals so the tree and view totals never scan
+# articles. The triggers below keep it exact for every insert/update/delete.
+_UNREAD = "(COALESCE({row}.is_read, 0) = 0)"
+_FAVORITE = "(COALESCE({row}.is_favorite, 0) != 0)"
 
-def init_db():
-    conn = sqlite3.connect(DB_FILE, timeout=30, check_same_thread=False)
+
+def _counter_deltas(row: str, sign: str) -> str:
+    unread = _UNREAD.format(row=row)
+    fav = _FAVORITE.format(row=row)
+    return (
+        f"total = total {sign} 1, "
+        f"unread = unread {sign} {unread}, "
+        f"favorites = favorites {sign} {fav}, "
+        f"unread_favorites = unread_favorites {sign} ({unread} AND {fav})"
+    )
+
+
+_FEED_COUNTER_TRIGGERS = (
+    f"""CREATE TRIGGER IF NOT EXISTS trg_articles_counters_insert AFTER INSERT ON articles
+    BEGIN
+        INSERT OR IGNORE INTO feed_counters (feed_id) VALUES (NEW.feed_id);
+        UPDATE feed_counters SET {_counter_deltas("NEW", "+")} WHERE feed_id = NEW.feed_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_articles_counters_delete AFTER DELETE ON articles
+    BEGIN
+        UPDATE feed_counters SET {_counter_deltas("OLD", "-")} WHERE feed_id = OLD.feed_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_articles_counters_update
+    AFTER UPDATE OF feed_id, is_read, is_favorite ON articles
+    WHEN OLD.feed_id IS NOT NEW.feed_id
+        OR {_UNREAD.format(row="OLD")} != {_UNREAD.format(row="NEW")}
+        OR {_FAVORITE.format(row="OLD")} != {_FAVORITE.format(row="NEW")}
+    BEGIN
+        UPDATE feed_counters SET {_counter_deltas("OLD", "-")} WHERE feed_id = OLD.feed_id;
+        INSERT OR IGNORE INTO feed_counters (feed_id) VALUES (NEW.feed_id);
+        UPDATE feed_counters SET {_counter_deltas("NEW", "+")} WHERE feed_id = NEW.feed_id;
+    END""",
+)
+
+# Full-text search (see core.search_index). An articles_fts row shares the article's rowid
+# so the delete trigger stays a key lookup; article_id is kept for joins. Inserts are indexed
+# by the refresh writer because the body has to be HTML-stripped first.
+_ARTICLES_FTS_SQL = """CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    article_id UNINDEXED, title, author, body,
+    tokenize = 'unicode61 remove_diacritics 2'
+)"""
+# BM25 with title hits weighted above author and body hits
+_ARTICLES_FTS_RANK = "bm25(0.0, 10.0, 4.0, 1.0)"
+_ARTICLES_FTS_DELETE_TRIGGER = """CREATE TRIGGER IF NOT EXISTS trg_articles_fts_delete AFTER DELETE ON articles
+    BEGIN
+        DELETE FROM articles_fts WHERE rowid = OLD.rowid;
+    END"""
+
+# articles.published_ts: the date as seconds since the epoch, for ordering and retention.
+# Computed by SQLite from the normalized 'YYYY-MM-DD HH:MM:SS' (UTC) date string. A date
+# SQLite cannot read ('' or a raw RFC 822 string) gets 0, the epoch, rather than NULL:
+# NULL would sort after everything and never match a (published_ts, id) < (?, ?) cursor.
+PUBLISHED_TS_BATCH = 1000
+
+
+def published_ts_sql(date_expr: str) -> str:
+    """SQL expression for the published_ts of date_expr (a column or a ? placeholder)."""
+    return f"COALESCE(CAST(strftime('%s', {date_expr}) AS INTEGER), 0)"
+
+
+_PUBLISHED_TS_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_articles_feed_id_published_ts_id ON articles (feed_id, published_ts, id)",
+    # Checked by published_ts_ready(), so created last
+    "CREATE INDEX IF NOT EXISTS idx_articles_published_ts_id ON articles (published_ts, id)",
+)
+
+
+def _feed_counters_aggregate(where: str = "") -> str:
+    return f"""
+    SELECT feed_id,
+           COUNT(*),
+           SUM({_UNREAD.format(row="articles")}),
+           SUM({_FAVORITE.format(row="articles")}),
+           SUM({_UNREAD.format(row="articles")} AND {_FAVORITE.format(row="articles")})
+    FROM articles {where} GROUP BY feed_id
+"""
+
+
+# Schema migrations
+#
+# PRAGMA user_version records the last step applied, so a startup on an up-to-date
+# database is a single version check. Each step runs once, in its own transaction.
+# Steps stay cheap; anything that has to touch every article is queued in
+# background_migrations and worked through in batches by core.background_migrations.
+
+
+def _queue_background_migration(c, name: str) -> None:
+    """Queue a batch job (see core.background_migrations) if there are articles to process."""
+    c.execute("SELECT 1 FROM articles LIMIT 1")
+    if c.fetchone() is None:
+        return
+    c.execute(
+        "INSERT OR IGNORE INTO background_migrations (name, position, done, updated_at) VALUES (?, NULL, 0, ?)",
+        (name, time.time()),
+    )
+
+
+def _migrate_base_schema(c) -> None:
+    c.execute('''CREATE TABLE IF NOT EXISTS feeds (
+        id TEXT PRIMARY KEY,
+        url TEXT,
+        title TEXT,
+        category TEXT,
+        icon_url TEXT
+    )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS articles (
+        id TEXT PRIMARY KEY,
+        feed_id TEXT,
+        title TEXT,
+        url TEXT,
+        content TEXT,
+        date TEXT,
+        author TEXT,
+        is_read INTEGER DEFAULT 0,
+        is_favorite INTEGER DEFAULT 0,
+        media_url TEXT,
+        media_type TEXT,
+        FOREIGN KEY(feed_id) REFERENCES feeds(id)
+    )''')
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_feed_id ON articles (feed_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_is_read ON articles (is_read)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (date)")
+    # Composite indexes to speed up common paging/count queries on larger databases.
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_is_read_feed_id ON articles (is_read, feed_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_date_id ON articles (date, id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_feed_id_date_id ON articles (feed_id, date, id)")
+
+    c.execute('''CREATE TABLE IF NOT EXISTS chapters (
+        id TEXT PRIMARY KEY,
+        article_id TEXT,
+        start REAL,
+        title TEXT,
+        href TEXT,
+        FOREIGN KEY(article_id) REFERENCES articles(id)
+    )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_chapters_article_id_start ON chapters (article_id, start)")
+
+    c.execute('''CREATE TABLE IF NOT EXISTS categories (
+        id TEXT PRIMARY KEY,
+        title TEXT UNIQUE
+    )''')
+
+    c.execute(
+        '''CREATE TABLE IF NOT EXISTS playback_state (
+        id TEXT PRIMARY KEY,
+        position_ms INTEGER NOT NULL DEFAULT 0,
+        duration_ms INTEGER,
+        updated_at INTEGER NOT NULL,
+        completed INTEGER NOT NULL DEFAULT 0,
+        seek_supported INTEGER,
+        title TEXT
+    )'''
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_playback_state_updated_at ON playback_state (updated_at)")
+
+    # Deferred NPR audio / chapter lookups for new articles (see core.enrichment)
+    c.execute(
+        '''CREATE TABLE IF NOT EXISTS enrichment_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        article_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        url TEXT,
+        priority INTEGER NOT NULL DEFAULT 0,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL,
+        last_error TEXT,
+        UNIQUE(article_id, kind)
+    )'''
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_enrichment_jobs_due ON enrichment_jobs (next_attempt_at, priority)")
+
+    # Circuit-breaker state for feed hosts (see core.host_health)
+    c.execute(
+        '''CREATE TABLE IF NOT EXISTS host_health (
+        host TEXT PRIMARY KEY,
+        state TEXT NOT NULL,
+        consecutive_failures INTEGER NOT NULL DEFAULT 0,
+        open_count INTEGER NOT NULL DEFAULT 0,
+        retry_at REAL,
+        last_error TEXT,
+        updated_at REAL
+    )'''
+    )
+
+    # Per-feed, per-phase refresh timings for the last few runs (see core.refresh_stats)
+    c.execute(
+        '''CREATE TABLE IF NOT EXISTS refresh_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,
+        run_started_at REAL NOT NULL,
+        engine TEXT,
+        feed_id TEXT NOT NULL,
+        host TEXT,
+        status TEXT,
+        queue_wait_s REAL,
+        host_wait_s REAL,
+        connect_s REAL,
+        download_s REAL,
+        bytes INTEGER,
+        parse_s REAL,
+        chapter_s REAL,
+        db_s REAL,
+        entries INTEGER,
+        total_s REAL
+    )'''
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_refresh_stats_run ON refresh_stats (run_started_at, run_id)")
+
+    # Migration: Add columns if they don't exist
     try:
-        c = conn.cursor()
-        # Improve concurrent writer/readers when refresh runs in multiple threads
-        try:
-            c.execute("PRAGMA journal_mode=WAL")
-            c.execute("PRAGMA synchronous=NORMAL")
-            c.execute("PRAGMA busy_timeout=60000")
-        except Exception as e:
-            log.warning(f"Failed to set PRAGMAs: {e}")
-        
-        c.execute('''CREATE TABLE IF NOT EXISTS feeds (
-            id TEXT PRIMARY KEY,
-            url TEXT,
-            title TEXT,
-            category TEXT,
-            icon_url TEXT
-        )''')
-        
-        c.execute('''CREATE TABLE IF NOT EXISTS articles (
-            id TEXT PRIMARY KEY,
-            feed_id TEXT,
-            title TEXT,
-            url TEXT,
-            content TEXT,
-            date TEXT,
-            author TEXT,
-            is_read INTEGER DEFAULT 0,
-            is_favorite INTEGER DEFAULT 0,
-            media_url TEXT,
-            media_type TEXT,
-            FOREIGN KEY(feed_id) REFERENCES feeds(id)
-        )''')
-        
-        c.execute("CREATE INDEX IF NOT EXISTS idx_articles_feed_id ON articles (feed_id)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_articles_is_read ON articles (is_read)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (date)")
-        # Composite indexes to speed up common paging/count queries on larger databases.
-        c.execute("CREATE INDEX IF NOT EXISTS idx_articles_is_read_feed_id ON articles (is_read, feed_id)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_articles_date_id ON articles (date, id)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_articles_feed_id_date_id ON articles (feed_id, date, id)")
-
-        c.execute('''CREATE TABLE IF NOT EXISTS chapters (
-            id TEXT PRIMARY KEY,
-            article_id TEXT,
-            start REAL,
-            title TEXT,
-            href TEXT,
-            FOREIGN KEY(article_id) REFERENCES articles(id)
-        )''')
-        c.execute("CREATE INDEX IF NOT EXISTS idx_chapters_article_id_start ON chapters (article_id, start)")
-
-        c.execute('''CREATE TABLE IF NOT EXISTS categories (
-            id TEXT PRIMARY KEY,
-            title TEXT UNIQUE
-        )''')
+        c.execute("ALTER TABLE articles ADD COLUMN media_url TEXT")
+    except sqlite3.OperationalError:
+        pass
 
-        c.execute(
-            '''CREATE TABLE IF NOT EXISTS playback_state (
-            id TEXT PRIMARY KEY,
-            position_ms INTEGER NOT NULL DEFAULT 0,
-            duration_ms INTEGER,
-            updated_at INTEGER NOT NULL,
-            completed INTEGER NOT NULL DEFAULT 0,
-            seek_supported INTEGER,
-            title TEXT
-        )'''
-        )
-        c.execute("CREATE INDEX IF NOT EXISTS idx_playback_state_updated_at ON playback_state (updated_at)")
-        
-        # Migration: Add columns if they don't exist
-        try:
-            c.execute("ALTER TABLE articles ADD COLUMN media_url TEXT")
-        except sqlite3.OperationalError:
-            pass
-            
-        try:
-            c.execute("ALTER TABLE articles ADD COLUMN media_type TEXT")
-        except sqlite3.OperationalError:
-            pass
+    try:
+        c.execute("ALTER TABLE articles ADD COLUMN media_type TEXT")
+    except sqlite3.OperationalError:
+        pass
 
-        try:
-            c.execute("ALTER TABLE articles ADD COLUMN is_favorite INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
+    try:
+        c.execute("ALTER TABLE articles ADD COLUMN is_favorite INTEGER DEFAULT 0")
+    except sqlite3.OperationalError:
+        pass
 
+    try:
+        c.execute("CREATE INDEX IF NOT EXISTS idx_articles_is_favorite ON articles (is_favorite)")
+    except sqlite3.OperationalError:
+        pass
+
+    try:
+        c.execute("ALTER TABLE feeds ADD COLUMN etag TEXT")
+    except sqlite3.OperationalError:
+        pass
+    try:
+        c.execute("ALTER TABLE feeds ADD COLUMN last_modified TEXT")
+    except sqlite3.OperationalError:
+        pass
+
+    # Adaptive refresh scheduling (see core.feed_schedule)
+    for col, col_type in (
+        ("last_checked_at", "REAL"),
+        ("next_check_at", "REAL"),
+        ("last_new_item_at", "REAL"),
+        ("publish_interval_s", "REAL"),
+        ("ttl_s", "INTEGER"),
+        ("skip_hours", "TEXT"),
+        # Digest of the last response body (or scraped listing) for servers without validators
+        ("body_hash", "TEXT"),
+        ("body_size", "INTEGER"),
+    ):
         try:
-            c.execute("CREATE INDEX IF NOT EXISTS idx_articles_is_favorite ON articles (is_favorite)")
-        except sqlite3.OperationalError:
-            pass
-            
-        try:
-            c.execute("ALTER TABLE feeds ADD COLUMN etag TEXT")
-        except sqlite3.OperationalError:
-            pass
-        try:
-            c.execute("ALTER TABLE feeds ADD COLUMN last_modified TEXT")
+            c.execute(f"ALTER TABLE feeds ADD COLUMN {col} {col_type}")
         except sqlite3.OperationalError:
             pass
-            
-        # Seed categories from existing feeds if empty
-        c.execute("SELECT count(*) FROM categories")
-        if c.fetchone()[0] == 0:
-            c.execute(
-                "INSERT OR IGNORE INTO categories (id, title) "
-                "SELECT lower(hex(randomblob(16))), category FROM feeds WHERE category IS NOT NULL AND category != ''"
-            )
-            # Ensure Uncategorized exists
-            c.execute("INSERT OR IGNORE INTO categories (id, title) VALUES (?, ?)", ("uncategorized", "Uncategorized"))
-        
+
+    # Batch jobs queued by later steps (see core.background_migrations)
+    c.execute(
+        '''CREATE TABLE IF NOT EXISTS background_migrations (
+        name TEXT PRIMARY KEY,
+        position,
+        done INTEGER NOT NULL DEFAULT 0,
+        updated_at REAL
+    )'''
+    )
+
+    # Seed categories from existing feeds if empty
+    c.execute("SELECT count(*) FROM categories")
+    if c.fetchone()[0] == 0:
+        c.execute(
+            "INSERT OR IGNORE INTO categories (id, title) "
+            "SELECT lower(hex(randomblob(16))), category FROM feeds WHERE category IS NOT NULL AND category != ''"
+        )
+        # Ensure Uncategorized exists
+        c.execute("INSERT OR IGNORE INTO categories (id, title) VALUES (?, ?)", ("uncategorized", "Uncategorized"))
+
+
+def _migrate_feed_counters(c) -> None:
+    # Materialised per-feed counters (after the is_favorite migration the triggers use)
+    c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'feed_counters'")
+    counters_existed = c.fetchone() is not None
+    c.execute(
+        '''CREATE TABLE IF NOT EXISTS feed_counters (
+        feed_id TEXT PRIMARY KEY,
+        total INTEGER NOT NULL DEFAULT 0,
+        unread INTEGER NOT NULL DEFAULT 0,
+        favorites INTEGER NOT NULL DEFAULT 0,
+        unread_favorites INTEGER NOT NULL DEFAULT 0
+    )'''
+    )
+    for trigger_sql in _FEED_COUNTER_TRIGGERS:
+        c.execute(trigger_sql)
+    if not counters_existed:
+        # Filled here rather than by a background job: unread counts and view totals
+        # read this table, and one GROUP BY over articles is quick even on large databases.
+        _rebuild_feed_counters(c)
+
+
+def _migrate_search_index(c) -> None:
+    # Existing articles are indexed by the "search_index" batch job.
+    try:
+        c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'")
+        fts_existed = c.fetchone() is not None
+        c.execute(_ARTICLES_FTS_SQL)
+        if not fts_existed:
+            c.execute("INSERT INTO articles_fts (articles_fts, rank) VALUES ('rank', ?)", (_ARTICLES_FTS_RANK,))
+        c.execute(_ARTICLES_FTS_DELETE_TRIGGER)
+    except sqlite3.OperationalError as e:
+        log.warning(f"Full-text search unavailable (SQLite built without FTS5?): {e}")
+        return
+    _queue_background_migration(c, "search_index")
+
+
+def _migrate_compress_content(c) -> None:
+    # Bodies written before compression existed (see core.content_store)
+    _queue_background_migration(c, "content_compress")
+
+
+def _migrate_published_ts(c) -> None:
+    c.execute("PRAGMA table_info(articles)")
+    if "published_ts" not in {row[1] for row in c.fetchall()}:
+        c.execute("ALTER TABLE articles ADD COLUMN published_ts INTEGER")
+    c.execute("SELECT 1 FROM articles LIMIT 1")
+    if c.fetchone() is None:
+        for index_sql in _PUBLISHED_TS_INDEXES:
+            c.execute(index_sql)
+        return
+    # Existing rows are filled in by the "published_ts" batch job, which builds the
+    # indexes when it is done; until then views keep ordering by date.
+    _queue_background_migration(c, "published_ts")
+
+
+# (user_version, step); append new steps, never renumber.
+MIGRATIONS = (
+    (1, _migrate_base_schema),
+    (2, _migrate_feed_counters),
+    (3, _migrate_search_index),
+    (4, _migrate_compress_content),
+    (5, _migrate_published_ts),
+)
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version() -> int:
+    conn = get_connection()
+    try:
+        return int(conn.execute("PRAGMA user_version").fetchone()[0] or 0)
+    finally:
+        conn.close()
+
+
+def init_db():
+    """Bring the schema up to SCHEMA_VERSION, applying each pending step once."""
+    if get_schema_version() >= SCHEMA_VERSION:
+        return
+    with write_connection() as conn:
+        c = conn.cursor()
+        _enable_incremental_vacuum_if_empty(conn)
+        for version, step in MIGRATIONS:
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-read under the write lock: another thread may have migrated meanwhile.
+                c.execute("PRAGMA user_version")
+                if int(c.fetchone()[0] or 0) >= version:
+                    conn.rollback()
+                    continue
+                step(c)
+                c.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+                log.info(f"Database schema migrated to version {version} ({step.__name__})")
+            except Exception:
+                conn.rollback()
+                raise
+
+
+def _enable_incremental_vacuum_if_empty(conn) -> None:
+    # auto_vacuum can only be switched before the first table exists (or by a VACUUM);
+    # on a brand new file that VACUUM is instant. Older databases are converted by
+    # core.maintenance when they are small enough.
+    try:
+        if conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0]:
+            return
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    except Exception as e:
+        log.warning(f"Could not enable incremental auto-vacuum: {e}")
+
+
+def _rebuild_feed_counters(c) -> None:
+    c.execute("DELETE FROM feed_counters")
+    c.execute(
+        "INSERT INTO feed_counters (feed_id, total, unread, favorites, unread_favorites) "
+        + _feed_counters_aggregate()
+    )
+
+
+def rebuild_feed_counters_batch(after_feed_id: Optional[str] = None, batch_size: int = 200):
+    """Recompute feed_counters for the next batch_size feeds (by feed_id) after after_feed_id.
+
+    Returns (feeds, last_feed_id); last_feed_id is None when nothing is left.
+    """
+    with write_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        c = conn.cursor()
+        if after_feed_id is None:
+            c.execute("SELECT DISTINCT feed_id FROM articles WHERE feed_id IS NOT NULL ORDER BY feed_id LIMIT ?",
+                      (max(1, int(batch_size)),))
+        else:
+            c.execute("SELECT DISTINCT feed_id FROM articles WHERE feed_id > ? ORDER BY feed_id LIMIT ?",
+                      (str(after_feed_id), max(1, int(batch_size))))
+        feed_ids = [row[0] for row in c.fetchall()]
+        if not feed_ids:
+            conn.commit()
+            return 0, None
+        placeholders = ",".join("?" * len(feed_ids))
+        c.execute(f"DELETE FROM feed_counters WHERE feed_id IN ({placeholders})", feed_ids)
+        c.execute(
+            "INSERT INTO feed_counters (feed_id, total, unread, favorites, unread_favorites) "
+            + _feed_counters_aggregate(f"WHERE feed_id IN ({placeholders})"),
+            feed_ids,
+        )
         conn.commit()
+        return len(feed_ids), feed_ids[-1]
+
+
+def _renormalize_dates(c, first_rowid: int, last_rowid: int) -> None:
+    """Rewrite dates SQLite cannot read (empty, or stored raw by older versions) in normalized form."""
+    from core import utils  # core.utils imports this module
+
+    c.execute(
+        "SELECT rowid, date, title, url FROM articles WHERE rowid BETWEEN ? AND ? "
+        "AND published_ts IS NULL AND strftime('%s', date) IS NULL",
+        (first_rowid, last_rowid),
+    )
+    updates = []
+    for rowid, date, title, url in c.fetchall():
+        normalized = utils.normalize_date(date or "", title or "", url=url or "")
+        if normalized != date:
+            updates.append((normalized, rowid))
+    if updates:
+        c.executemany("UPDATE articles SET date = ? WHERE rowid = ?", updates)
+
+
+def backfill_published_ts_batch(after_rowid: Optional[int] = 0, batch_size: int = PUBLISHED_TS_BATCH):
+    """Fill published_ts for the next batch of articles with rowid > after_rowid.
+
+    The call that finds nothing left builds the published_ts indexes. Returns
+    (updated, last_rowid); last_rowid is None when finished.
+    """
+    with write_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        c = conn.cursor()
+        c.execute(
+            "SELECT rowid FROM articles WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (int(after_rowid or 0), max(1, int(batch_size))),
+        )
+        rowids = [row[0] for row in c.fetchall()]
+        if not rowids:
+            for index_sql in _PUBLISHED_TS_INDEXES:
+                c.execute(index_sql)
+            conn.commit()
+            return 0, None
+        _renormalize_dates(c, rowids[0], rowids[-1])
+        c.execute(
+            f"UPDATE articles SET published_ts = {published_ts_sql('date')} "
+            "WHERE rowid BETWEEN ? AND ? AND published_ts IS NULL",
+            (rowids[0], rowids[-1]),
+        )
+        updated = max(0, c.rowcount)
+        conn.commit()
+        return updated, rowids[-1]
+
+
+_PUBLISHED_TS_READY = set()
+
+
+def published_ts_ready() -> bool:
+    """True once every article has published_ts and its indexes exist (order by it then)."""
+    db_file = DB_FILE
+    if db_file in _PUBLISHED_TS_READY:
+        return True
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_articles_published_ts_id'"
+        ).fetchone()
     finally:
         conn.close()
+    if row is None:
+        return False
+    _PUBLISHED_TS_READY.add(db_file)
+    return True
+
+
+def check_feed_counters(repair: bool = True) -> int:
+    """
+    Compare feed_counters with a full count of articles.
+
+    Returns the number of feeds whose counters disagree; with repair=True they are
+    rebuilt from articles (in one transaction). This scans the whole articles table, so
+    it is a maintenance routine, not something to run on every refresh.
+    """
+    with write_connection() as conn:
+        c = conn.cursor()
+        conn.execute("BEGIN IMMEDIATE")
+        c.execute(_feed_counters_aggregate())
+        actual = {row[0]: tuple(int(v or 0) for v in row[1:]) for row in c.fetchall()}
+        c.execute("SELECT feed_id, total, unread, favorites, unread_favorites FROM feed_counters")
+        stored = {row[0]: tuple(int(v or 0) for v in row[1:]) for row in c.fetchall()}
+        zero = (0, 0, 0, 0)
+        mismatched = [
+            fid for fid in set(actual) | set(stored)
+            if actual.get(fid, zero) != stored.get(fid, zero)
+        ]
+        if mismatched:
+            log.warning(f"feed_counters out of sync for {len(mismatched)} feed(s)")
+            if repair:
+                _rebuild_feed_counters(c)
+        conn.commit()
+        return len(mismatched)
 
 
-def cleanup_old_articles(days: int, keep_favorites: bool = True):
+RETENTION_BATCH = 500
+
+
+def cleanup_old_articles(days: int, keep_favorites: bool = True, batch_size: int = RETENTION_BATCH,
+                         stop_event: Optional[threading.Event] = None, pause_s: float = 0.0) -> Dict[str, int]:
     """
     Delete articles older than 'days' days.
-    
+
+    The candidates are read first, then deleted batch_size rowids at a time, each batch
+    in its own short write transaction (the condition is checked again inside it), so
+    refresh writes get the writer between batches. Chapters, enrichment jobs and resume
+    positions of the deleted articles go with them; the search index rows and feed
+    counters are removed by triggers.
+
     Args:
         days: Number of days to retain.
         keep_favorites: If True, do not delete favorited articles.
+
+    Returns a dict with the rows deleted per table and the number of batches.
     """
+    report = {"articles": 0, "chapters": 0, "enrichment_jobs": 0, "playback_state": 0, "batches": 0}
     if days is None or days < 0:
-        return
-        
-    conn = get_connection()
+        return report
+
+    by_ts = published_ts_ready()
+    where = "published_ts < ?" if by_ts else "date < ?"
+    if keep_favorites:
+        where += " AND is_favorite = 0"
+    # Resume positions touched within the retention window are kept even if the article goes
+    playback_cutoff = int(time.time()) - int(days) * 86400
     try:
-        # Calculate cutoff date
-        # SQLite's 'now' is UTC. verify if we need 'localtime' or if normalization uses UTC.
-        # core.utils.normalize_date produces 'YYYY-MM-DD HH:MM:SS' (usually UTC or naive).
-        # We'll use SQLite's date modifier.
-        cutoff_date_query = f"date('now', '-{days} days')"
-        
-        query = "DELETE FROM articles WHERE date < date('now', '-? days')"
-        # Parameter substitution for days in modifiers is tricky in sqlite, constructing string is safer for modifier
-        # provided 'days' is int.
-        
-        params = []
-        where_clauses = [f"date < date('now', '-{int(days)} days')"]
-        
-        if keep_favorites:
-            where_clauses.append("is_favorite = 0")
-            
-        where_str = " AND ".join(where_clauses)
-        
-        # 1. Delete chapters for these articles first (no CASCADE support guaranteed)
-        # We can use subquery: DELETE FROM chapters WHERE article_id IN (SELECT id FROM articles WHERE ...)
-        
-        subquery = f"SELECT id FROM articles WHERE {where_str}"
-        
-        c = conn.cursor()
-        c.execute(f"DELETE FROM chapters WHERE article_id IN ({subquery})")
-        c.execute(f"DELETE FROM articles WHERE {where_str}")
-        
-        deleted = c.rowcount
-        conn.commit()
-        if deleted > 0:
-            log.info(f"Cleaned up {deleted} old articles (retention: {days} days)")
-            # VACUUM is heavy, maybe just auto_vacuum handles it or do it rarely.
-            # c.execute("VACUUM") 
-            
+        conn = get_connection()
+        try:
+            c = conn.cursor()
+            if by_ts:
+                cutoff = int(time.time()) - int(days) * 86400
+            else:
+                # normalize_date stores 'YYYY-MM-DD HH:MM:SS' (UTC), which compares as text
+                c.execute("SELECT date('now', ?)", (f"-{int(days)} days",))
+                cutoff = c.fetchone()[0]
+            c.execute(f"SELECT rowid FROM articles WHERE {where} ORDER BY rowid", (cutoff,))
+            rowids = [row[0] for row in c.fetchall()]
+        finally:
+            conn.close()
+
+        batch_size = max(1, int(batch_size))
+        for i in range(0, len(rowids), batch_size):
+            if stop_event is not None and stop_event.is_set():
+                break
+            if i and pause_s:
+                time.sleep(pause_s)
+            chunk = rowids[i:i + batch_size]
+            marks = ",".join("?" * len(chunk))
+            with write_connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                c = conn.cursor()
+                c.execute(
+                    f"SELECT rowid, id, media_url, url FROM articles WHERE rowid IN ({marks}) AND {where}",
+                    chunk + [cutoff],
+                )
+                rows = c.fetchall()
+                if not rows:
+                    conn.commit()
+                    continue
+                ids = [r[1] for r in rows]
+                id_marks = ",".join("?" * len(ids))
+                c.execute(f"DELETE FROM chapters WHERE article_id IN ({id_marks})", ids)
+                report["chapters"] += max(0, c.rowcount)
+                c.execute(f"DELETE FROM enrichment_jobs WHERE article_id IN ({id_marks})", ids)
+                report["enrichment_jobs"] += max(0, c.rowcount)
+                urls = sorted({u for r in rows for u in (r[2], r[3]) if u})
+                if urls:
+                    c.execute(
+                        f"DELETE FROM playback_state WHERE id IN ({','.join('?' * len(urls))}) AND updated_at < ?",
+                        urls + [playback_cutoff],
+                    )
+                    report["playback_state"] += max(0, c.rowcount)
+                c.execute(f"DELETE FROM articles WHERE rowid IN ({','.join('?' * len(rows))})", [r[0] for r in rows])
+                report["articles"] += max(0, c.rowcount)
+                conn.commit()
+            report["batches"] += 1
+
+        if report["articles"] > 0:
+            log.info(
+                f"Cleaned up {report['articles']} old articles in {report['batches']} batches "
+                f"(retention: {days} days; {report['chapters']} chapters, "
+                f"{report['playback_state']} resume positions)"
+            )
     except Exception as e:
         log.error(f"Error cleaning up old articles: {e}")
-    finally:
-        conn.close()
+    return report
+
+
+# Connection management
+#
+# get_connection() hands out connections cached per thread: close() rolls back anything
+# left uncommitted and returns the connection to the calling thread's pool, so the
+# PRAGMAs are paid once per connection and sqlite3's statement cache is reused.
+# write_connection() serializes short writes on one shared connection.
+
+DEFAULT_BUSY_TIMEOUT_MS = 60000
+# Idle connections kept per thread (nested get_connection() calls need more than one)
+MAX_IDLE_PER_THREAD = 4
+_STATEMENT_CACHE_SIZE = 256
+
+_POOL_LOCK = threading.Lock()
+_LOCAL = threading.local()
+_GENERATION = 0
+_OPEN = weakref.WeakSet()
+_STATS = {"opened": 0, "reused": 0, "closed": 0, "writer_uses": 0, "writer_wait_s": 0.0}
 
+_WRITE_LOCK = threading.RLock()
+_WRITER: Optional["PooledConnection"] = None
+
+
+class PooledConnection:
+    """sqlite3.Connection stand-in returned by get_connection() and write_connection()."""
+
+    def __init__(self, db_file: str, generation: int):
+        raw = sqlite3.connect(
+            db_file, timeout=30, check_same_thread=False, cached_statements=_STATEMENT_CACHE_SIZE
+        )
+        try:
+            raw.execute(f"PRAGMA busy_timeout={DEFAULT_BUSY_TIMEOUT_MS}")
+            raw.execute("PRAGMA journal_mode=WAL")
+            raw.execute("PRAGMA synchronous=NORMAL")
+        except Exception as e:
+            log.warning(f"Failed to set PRAGMAs on connection: {e}")
+        self._raw = raw
+        self.db_file = db_file
+        self.generation = generation
+        self.busy_timeout_ms = DEFAULT_BUSY_TIMEOUT_MS
+        self.in_use = False
+        self.closed = False
+        # False for the writer connection, which close() must not return to a pool
+        self.pooled = True
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw.__exit__(exc_type, exc, tb)
+
+    def set_busy_timeout(self, ms: int) -> None:
+        ms = int(ms)
+        if ms != self.busy_timeout_ms:
+            self._raw.execute(f"PRAGMA busy_timeout={ms}")
+            self.busy_timeout_ms = ms
+
+    def close(self) -> None:
+        if self.pooled:
+            _release(self)
+
+    def close_raw(self) -> None:
+        self.in_use = False
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._raw.close()
+        except Exception:
+            pass
+        with _POOL_LOCK:
+            _STATS["closed"] += 1
+            _OPEN.discard(self)
+
+
+def _open(db_file: str) -> PooledConnection:
+    with _POOL_LOCK:
+        generation = _GENERATION
+    conn = PooledConnection(db_file, generation)
+    with _POOL_LOCK:
+        _STATS["opened"] += 1
+        _OPEN.add(conn)
+    return conn
 
-def get_connection():
-    conn = sqlite3.connect(DB_FILE, timeout=30, check_same_thread=False)
+
+def _idle_list(db_file: str) -> list:
+    """The calling thread's idle connections for db_file (a thread pools one database)."""
+    idle = getattr(_LOCAL, "idle", None)
+    if idle is None or getattr(_LOCAL, "db_file", None) != db_file:
+        for conn in idle or []:
+            conn.close_raw()
+        idle = []
+        _LOCAL.idle = idle
+        _LOCAL.db_file = db_file
+    return idle
+
+
+def get_connection(busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS) -> PooledConnection:
+    """A connection to DB_FILE from the calling thread's pool; close() gives it back."""
+    db_file = DB_FILE
+    idle = _idle_list(db_file)
+    conn = None
+    while idle:
+        candidate = idle.pop()
+        if candidate.generation == _GENERATION:
+            conn = candidate
+            break
+        candidate.close_raw()
+    if conn is None:
+        conn = _open(db_file)
+    else:
+        with _POOL_LOCK:
+            _STATS["reused"] += 1
+    conn.in_use = True
     try:
-        conn.execute("PRAGMA busy_timeout=60000")
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.set_busy_timeout(busy_timeout_ms)
     except Exception as e:
-        log.warning(f"Failed to set PRAGMAs on connection: {e}")
+        log.warning(f"Failed to set busy_timeout on connection: {e}")
     return conn
+
+
+def _release(conn: PooledConnection) -> None:
+    if not conn.in_use:
+        return
+    conn.in_use = False
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except Exception:
+        conn.close_raw()
+        return
+    if conn.generation != _GENERATION or conn.db_file != DB_FILE:
+        conn.close_raw()
+        return
+    idle = _idle_list(conn.db_file)
+    if len(idle) >= MAX_IDLE_PER_THREAD:
+        conn.close_raw()
+        return
+    idle.append(conn)
+
+
+@contextlib.contextmanager
+def write_connection(timeout: Optional[float] = None, busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS):
+    """The shared writer connection, held exclusively for the with-block.
+
+    The caller commits; anything left uncommitted is rolled back on exit. Raises
+    sqlite3.OperationalError("database is locked") if the writer is not free within
+    timeout seconds, the same error a busy SQLite lock gives.
+    """
+    global _WRITER
+    started = time.perf_counter()
+    if not _WRITE_LOCK.acquire(timeout=-1 if timeout is None else max(0.0, float(timeout))):
+        raise sqlite3.OperationalError("database is locked")
+    depth = getattr(_LOCAL, "write_depth", 0)
+    _LOCAL.write_depth = depth + 1
+    try:
+        with _POOL_LOCK:
+            _STATS["writer_uses"] += 1
+            _STATS["writer_wait_s"] += time.perf_counter() - started
+        conn = _WRITER
+        if conn is None or conn.db_file != DB_FILE or conn.generation != _GENERATION:
+            if conn is not None:
+                conn.close_raw()
+            conn = _open(DB_FILE)
+            conn.pooled = False
+            _WRITER = conn
+        conn.set_busy_timeout(busy_timeout_ms)
+        yield conn
+    finally:
+        try:
+            if depth == 0 and _WRITER is not None and _WRITER.in_transaction:
+                _WRITER.rollback()
+        except Exception as e:
+            log.warning(f"Writer connection rollback failed: {e}")
+        _LOCAL.write_depth = depth
+        _WRITE_LOCK.release()
+
+
+def connection_stats() -> Dict[str, Any]:
+    """Connection usage counters: opened/reused/closed, writer uses and time spent waiting for it."""
+    with _POOL_LOCK:
+        stats = dict(_STATS)
+        stats["open"] = len(_OPEN)
+    handed_out = stats["opened"] + stats["reused"]
+    stats["reuse_rate"] = round(stats["reused"] / handed_out, 3) if handed_out else 0.0
+    stats["writer_wait_s"] = round(stats["writer_wait_s"], 3)
+    return stats
+
+
+def close_all_connections() -> None:
+    """Close every cached connection (at exit). Connections in use close when released."""
+    global _GENERATION, _WRITER
+    with _POOL_LOCK:
+        _GENERATION += 1
+        conns = [c for c in _OPEN if not c.in_use]
+    for conn in conns:
+        conn.close_raw()
+    with _WRITE_LOCK:
+        if _WRITER is not None:
+            _WRITER.close_raw()
+            _WRITER = None
@@ -0,0 +1,308 @@
+"""
+Deferred article enrichment: NPR audio lookup and podcast chapter downloads.
+
+Both used to run inline while a feed was being stored, holding the per-host limiter
+slot and the write transaction for a page download each. Now the refresh writer only
+records a row in enrichment_jobs (in the same transaction as the article insert) and
+a background worker works through them:
+
+- jobs are ordered by priority (playable audio first), newest article first,
+- the table is capped at MAX_PENDING rows; the lowest-priority, oldest jobs are dropped,
+- transient network failures (timeouts, connection errors, 429/5xx) are retried with
+  exponential backoff up to MAX_ATTEMPTS; a page without audio or chapters finishes
+  the job,
+- jobs live in SQLite, so whatever is left at exit is picked up on the next start.
+
+Listeners registered with add_listener() receive a dict per finished job:
+{"article_id", "kind", "media_url", "media_type", "chapters"}; they are called from
+the worker thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.db import get_connection, write_connection
+
+LOG = logging.getLogger(__name__)
+
+KIND_NPR_AUDIO = "npr_audio"
+KIND_CHAPTERS = "chapters"
+
+PRIORITIES = {
+    KIND_NPR_AUDIO: 20,
+    KIND_CHAPTERS: 10,
+}
+
+MAX_PENDING = 5000
+MAX_ATTEMPTS = 4
+_RETRY_BASE_S = 60.0
+_LEASE_FACTOR = 4  # a claimed job is retried after timeout_s * factor if the worker died
+
+
+def plan_jobs(entries: Iterable[Dict[str, Any]]) -> List[Tuple[str, str, str, int]]:
+    """Enrichment jobs for freshly inserted entries: (article_id, kind, url, priority)."""
+    from core import npr as npr_mod
+
+    jobs = []
+    for e in entries or []:
+        aid = e.get("id")
+        if not aid:
+            continue
+        url = e.get("url") or ""
+        if not e.get("media_url") and npr_mod.is_npr_url(url):
+            jobs.append((aid, KIND_NPR_AUDIO, url, PRIORITIES[KIND_NPR_AUDIO]))
+        chapter_url = e.get("chapter_url")
+        if chapter_url:
+            jobs.append((aid, KIND_CHAPTERS, chapter_url, PRIORITIES[KIND_CHAPTERS]))
+    return jobs
+
+
+def insert_jobs(c, jobs: List[Tuple[str, str, str, int]], now: Optional[float] = None,
+                max_pending: int = MAX_PENDING) -> int:
+    """Insert jobs with an open cursor (caller commits). Returns rows dropped by the cap."""
+    if not jobs:
+        return 0
+    now = time.time() if now is None else float(now)
+    c.executemany(
+        "INSERT OR IGNORE INTO enrichment_jobs (article_id, kind, url, priority, attempts, next_attempt_at, created_at) "
+        "VALUES (?, ?, ?, ?, 0, ?, ?)",
+        [(aid, kind, url, int(prio), now, now) for aid, kind, url, prio in jobs],
+    )
+    c.execute("SELECT COUNT(*) FROM enrichment_jobs")
+    excess = int(c.fetchone()[0] or 0) - int(max_pending)
+    if excess <= 0:
+        return 0
+    c.execute(
+        "DELETE FROM enrichment_jobs WHERE id IN "
+        "(SELECT id FROM enrichment_jobs ORDER BY priority ASC, id ASC LIMIT ?)",
+        (excess,),
+    )
+    LOG.info(f"Enrichment queue full; dropped {excess} low-priority job(s)")
+    return excess
+
+
+class EnrichmentQueue:
+    def __init__(self, timeout_s: float = 15.0):
+        self.timeout_s = max(1.0, float(timeout_s))
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- lifecycle -------------------------------------------------------
+
+    def start(self, timeout_s: Optional[float] = None) -> None:
+        if timeout_s is not None:
+            self.timeout_s = max(1.0, float(timeout_s))
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._wake.set()
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="enrichment", daemon=True)
+            self._thread.start()
+        # Resume jobs left over from a previous session.
+        self._wake.set()
+
+    def notify(self) -> None:
+        if self._thread is not None:
+            self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            t = self._thread
+            self._thread = None
+        self._stop.set()
+        self._wake.set()
+        if t is not None:
+            t.join(timeout=timeout)
+
+    def add_listener(self, cb: Callable[[Dict[str, Any]], None]) -> None:
+        with self._lock:
+            if cb not in self._listeners:
+                self._listeners.append(cb)
+
+    def remove_listener(self, cb: Callable[[Dict[str, Any]], None]) -> None:
+        with self._lock:
+            try:
+                self._listeners.remove(cb)
+            except ValueError:
+                pass
+
+    # --- processing ------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                if self.run_pending(limit=1):
+                    continue
+                wait = self._seconds_until_next()
+            except Exception:
+                LOG.exception("Enrichment worker error")
+                wait = _RETRY_BASE_S
+            # Sleep until new work is queued or the next retry is due; no polling when idle.
+            self._wake.wait(timeout=wait)
+
+    def _seconds_until_next(self) -> Optional[float]:
+        conn = get_connection()
+        try:
+            c = conn.cursor()
+            c.execute("SELECT MIN(next_attempt_at) FROM enrichment_jobs")
+            row = c.fetchone()
+        finally:
+            conn.close()
+        if not row or row[0] is None:
+            return None
+        return max(0.5, float(row[0]) - time.time())
+
+    def _claim(self, now: float) -> Optional[Tuple[int, str, str, str, int]]:
+        with write_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                "SELECT id, article_id, kind, url, attempts FROM enrichment_jobs "
+                "WHERE next_attempt_at <= ? ORDER BY priority DESC, id DESC LIMIT 1",
+                (now,),
+            )
+            row = c.fetchone()
+            if not row:
+                return None
+            # Lease the job so another worker (or a restart) does not run it concurrently.
+            c.execute(
+                "UPDATE enrichment_jobs SET next_attempt_at = ? WHERE id = ? AND next_attempt_at <= ?",
+                (now + self.timeout_s * _LEASE_FACTOR, row[0], now),
+            )
+            conn.commit()
+            return row if c.rowcount == 1 else None
+
+    def run_pending(self, limit: Optional[int] = None) -> int:
+        """Run due jobs on the calling thread. Returns how many were processed."""
+        done = 0
+        while limit is None or done < limit:
+            if self._stop.is_set() and threading.current_thread() is self._thread:
+                break
+            job = self._claim(time.time())
+            if job is None:
+                break
+            self._process(job)
+            done += 1
+        return done
+
+    def _process(self, job) -> None:
+        job_id, article_id, kind, url, attempts = job
+        try:
+            event = self._execute(article_id, kind, url)
+        except Exception as e:
+            self._reschedule(job_id, attempts, str(e))
+            return
+        self._finish(job_id)
+        if event is not None:
+            self._emit(event)
+
+    def _execute(self, article_id: str, kind: str, url: str) -> Optional[Dict[str, Any]]:
+        conn = get_connection()
+        try:
+            c = conn.cursor()
+            c.execute("SELECT media_url, media_type FROM articles WHERE id = ?", (article_id,))
+            row = c.fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None  # article was deleted meanwhile
+
+        if kind == KIND_NPR_AUDIO:
+            from core import npr as npr_mod
+
+            if row[0]:
+                return None
+            media_url, media_type = npr_mod.extract_npr_audio(url, timeout_s=self.timeout_s, raise_transient=True)
+            if not media_url:
+                return None
+            with write_connection() as conn:
+                conn.execute(
+                    "UPDATE articles SET media_url = ?, media_type = ? WHERE id = ? AND (media_url IS NULL OR media_url = '')",
+                    (media_url, media_type, article_id),
+                )
+                conn.commit()
+            return {"article_id": article_id, "kind": kind, "media_url": media_url, "media_type": media_type, "chapters": 0}
+
+        if kind == KIND_CHAPTERS:
+            from core import utils
+
+            chapters = utils.fetch_and_store_chapters(
+                article_id, row[0], row[1], url, allow_id3=False, raise_transient=True
+            ) or []
+            return {"article_id": article_id, "kind": kind, "media_url": row[0], "media_type": row[1], "chapters": len(chapters)}
+
+        LOG.debug(f"Unknown enrichment job kind {kind!r}; dropping")
+        return None
+
+    def _finish(self, job_id: int) -> None:
+        with write_connection() as conn:
+            conn.execute("DELETE FROM enrichment_jobs WHERE id = ?", (job_id,))
+            conn.commit()
+
+    def _reschedule(self, job_id: int, attempts: int, error: str) -> None:
+        attempts = int(attempts or 0) + 1
+        with write_connection() as conn:
+            if attempts >= MAX_ATTEMPTS:
+                LOG.debug(f"Enrichment job {job_id} failed {attempts} times; dropping ({error})")
+                conn.execute("DELETE FROM enrichment_jobs WHERE id = ?", (job_id,))
+            else:
+                conn.execute(
+                    "UPDATE enrichment_jobs SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                    (attempts, time.time() + _RETRY_BASE_S * (2 ** (attempts - 1)), error[:500], job_id),
+                )
+            conn.commit()
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for cb in listeners:
+            try:
+                cb(event)
+            except Exception as e:
+                LOG.debug(f"Enrichment listener failed: {e}")
+
+
+_QUEUE: Optional[EnrichmentQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_queue() -> EnrichmentQueue:
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = EnrichmentQueue()
+        return _QUEUE
+
+
+def start(timeout_s: Optional[float] = None) -> None:
+    get_queue().start(timeout_s)
+
+
+def notify() -> None:
+    with _QUEUE_LOCK:
+        q = _QUEUE
+    if q is not None:
+        q.notify()
+
+
+def add_listener(cb) -> None:
+    get_queue().add_listener(cb)
+
+
+def remove_listener(cb) -> None:
+    get_queue().remove_listener(cb)
+
+
+def shutdown(timeout: float = 5.0) -> None:
+    with _QUEUE_LOCK:
+        q = _QUEUE
+    if q is not None:
+        q.stop(timeout=timeout)
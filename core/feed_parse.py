@@ -0,0 +1,359 @@
+"""
+CPU-side of a feed refresh: turn a downloaded feed document into plain data.
+
+parse_feed_document() runs feedparser, builds the podcast chapter map and does the
+per-entry normalization (titles, dates, media enclosure selection). It returns only
+builtin types (dicts, lists, strings) so it can run in a worker process: the staged
+refresh engine hands payloads to a ProcessPoolExecutor, while the threaded engines
+call it inline.
+
+Anything that needs the network or the database (NPR page scraping, chapter JSON
+downloads, existence checks) stays with the caller.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import time
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+import feedparser
+from bs4 import BeautifulSoup as BS, XMLParsedAsHTMLWarning
+import warnings
+
+from core import feed_schedule, utils
+
+try:
+    from lxml import etree as lxml_etree
+except Exception:  # pragma: no cover - optional at runtime, listed in requirements
+    lxml_etree = None
+
+warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+
+log = logging.getLogger(__name__)
+
+# Shared extension filters for enclosure/media tags
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp")
+AUDIO_EXTS = (".mp3", ".m4a", ".m4b", ".aac", ".ogg", ".opus", ".wav", ".flac")
+
+# Incremental ingest stops after this many consecutive already-stored items.
+DEFAULT_KNOWN_RUN = 5
+_RDF_ABOUT = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about"
+
+
+def build_chapter_map(xml_text: str, feed_url: str = "") -> Dict[str, str]:
+    """Map item guid/link -> chapters URL for podcast:chapters style tags."""
+    chapter_map: Dict[str, str] = {}
+    if not xml_text:
+        return chapter_map
+    try:
+        # Prefer XML parser if available (lxml), otherwise fall back to built-in HTML parser
+        try:
+            soup = BS(xml_text, "xml")
+        except Exception as parser_exc:
+            log.debug(f"XML parser unavailable for chapter map on {feed_url}; falling back to html.parser ({parser_exc})")
+            soup = BS(xml_text, "html.parser")
+
+        for item in soup.find_all("item"):
+            chap = item.find(["podcast:chapters", "psc:chapters", "chapters"])
+            if chap:
+                chap_url = chap.get("url") or chap.get("href") or chap.get("src") or chap.get("link")
+                if chap_url:
+                    guid = item.find("guid")
+                    link = item.find("link")
+                    key = None
+                    if guid and guid.text:
+                        key = guid.text.strip()
+                    elif link and link.text:
+                        key = link.text.strip()
+                    if key:
+                        chapter_map[key] = chap_url
+    except Exception as e:
+        log.warning(f"Chapter map build failed for {feed_url}: {e}")
+    return chapter_map
+
+
+def _entry_content(entry) -> str:
+    if 'content' in entry:
+        return entry.content[0].value
+    if 'summary_detail' in entry:
+        return entry.summary_detail.value
+    if 'summary' in entry:
+        return entry.summary
+    if 'description' in entry:
+        return entry.description
+    return ""
+
+
+def _entry_title(entry, content: str) -> str:
+    title = entry.get('title', '')
+    if not title or title.strip() == "No Title":
+        # Fallback: create title from content snippet (e.g. Bluesky/Mastodon)
+        snippet = content or ""
+        if snippet:
+            try:
+                snippet = BS(snippet, "html.parser").get_text(" ", strip=True)
+            except Exception:
+                pass
+        if len(snippet) > 80:
+            snippet = snippet[:80] + "..."
+        title = snippet or "No Title"
+    return title
+
+
+def _entry_media(entry, url: str):
+    media_url = None
+    media_type = None
+
+    # 1. Prioritize YouTube video ID if present (ensures we get the video, not thumbnail)
+    if 'yt_videoid' in entry:
+        media_url = url
+        media_type = "video/youtube"
+    # 2. Check enclosures, but filter out common image types (thumbnails)
+    elif 'enclosures' in entry and len(entry.enclosures) > 0:
+        valid_enclosure = None
+        for enc in entry.enclosures:
+            enc_href = getattr(enc, "href", None)
+            enc_type = getattr(enc, "type", "") or ""
+            if enc_href:
+                # Skip if it looks like an image and isn't explicitly audio/video type
+                if any(enc_href.lower().endswith(ext) for ext in IMAGE_EXTS):
+                    if not (enc_type.startswith("audio/") or enc_type.startswith("video/")):
+                        continue
+                valid_enclosure = enc
+                break
+
+        if valid_enclosure:
+            enc_type = getattr(valid_enclosure, "type", "") or ""
+            enc_href = getattr(valid_enclosure, "href", None)
+            if enc_type.startswith("audio/") or enc_type.startswith("video/"):
+                media_url = enc_href
+                media_type = enc_type
+            elif enc_href and enc_href.lower().endswith(AUDIO_EXTS):
+                media_url = enc_href
+                media_type = enc_type or "audio/mpeg"
+
+    # 3. Check media:content (common in RSS 2.0 / MRSS)
+    if not media_url and 'media_content' in entry:
+        for mc in entry.media_content:
+            mc_url = mc.get('url')
+            mc_type = mc.get('type')
+            if mc_url:
+                # Skip thumbnails or images
+                if mc_type and mc_type.startswith('image/'):
+                    continue
+                if any(mc_url.lower().endswith(ext) for ext in IMAGE_EXTS):
+                    continue
+
+                # Accept if audio/video or looks like audio
+                if (mc_type and (mc_type.startswith('audio/') or mc_type.startswith('video/'))) or \
+                   mc_url.lower().endswith(AUDIO_EXTS):
+                    media_url = mc_url
+                    media_type = mc_type or "audio/mpeg"
+                    break
+
+    return media_url, media_type
+
+
+def _entry_chapter_url(entry, chapter_map: Dict[str, str]) -> Optional[str]:
+    chapter_url = None
+    if 'podcast_chapters' in entry:
+        chapters_tag = entry.podcast_chapters
+        chapter_url = getattr(chapters_tag, 'href', None) or getattr(chapters_tag, 'url', None) or getattr(chapters_tag, 'value', None)
+    if not chapter_url and 'psc_chapters' in entry:
+        chapters_tag = entry.psc_chapters
+        chapter_url = getattr(chapters_tag, 'href', None) or getattr(chapters_tag, 'url', None) or getattr(chapters_tag, 'value', None)
+
+    if not chapter_url:
+        key = entry.get('guid') or entry.get('id') or entry.get('link')
+        if key and key in chapter_map:
+            chapter_url = chapter_map[key]
+    return chapter_url
+
+
+def _item_guid(el) -> Optional[str]:
+    """The id feedparser would assign to an <item>/<entry> element (guid/id, else link)."""
+    link_text = None
+    link_href = None
+    for child in el:
+        if not isinstance(child.tag, str):
+            continue
+        name = lxml_etree.QName(child).localname
+        if name in ("guid", "id") and child.text and child.text.strip():
+            return child.text.strip()
+        if name == "link" and link_text is None and link_href is None:
+            if child.text and child.text.strip():
+                link_text = child.text.strip()
+            elif child.get("href") and child.get("rel", "alternate") == "alternate":
+                link_href = child.get("href").strip()
+    return link_text or link_href or el.get(_RDF_ABOUT)
+
+
+def truncate_at_known_items(
+    data: bytes,
+    known_ids: Collection[str],
+    known_run: int = DEFAULT_KNOWN_RUN,
+) -> Optional[Tuple[bytes, int]]:
+    """Stream items with lxml iterparse and cut the document after a run of known GUIDs.
+
+    Feeds list newest items first, so once known_run consecutive items are already
+    stored the rest of the document holds nothing new. Returns (document, items_kept)
+    where document is the feed re-serialized up to and including that run (channel
+    metadata intact), or None if lxml is missing, the XML is malformed or no such run
+    exists. Callers then parse the full document.
+    """
+    if lxml_etree is None or not data or not known_ids:
+        return None
+    known_run = max(1, int(known_run))
+    root = None
+    items = 0
+    run = 0
+    try:
+        context = lxml_etree.iterparse(
+            io.BytesIO(data),
+            events=("start", "end"),
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+        )
+        for event, el in context:
+            if root is None and event == "start":
+                root = el
+                continue
+            if event != "end" or not isinstance(el.tag, str):
+                continue
+            if lxml_etree.QName(el).localname not in ("item", "entry"):
+                continue
+            items += 1
+            guid = _item_guid(el)
+            if guid and guid in known_ids:
+                run += 1
+                if run >= known_run:
+                    break
+            else:
+                run = 0
+        else:
+            return None
+    except Exception as e:
+        log.debug(f"Incremental parse unavailable ({e}); using full parse")
+        return None
+    if root is None:
+        return None
+    # iterparse builds the tree ahead of the events it has delivered; drop everything
+    # after the stopping item so only the head of the feed is serialized.
+    node = el
+    while node is not None and node is not root:
+        parent = node.getparent()
+        for sibling in list(node.itersiblings()):
+            parent.remove(sibling)
+        node = parent
+    return lxml_etree.tostring(root, xml_declaration=True, encoding="utf-8"), items
+
+
+def parse_feed_document(
+    data: Optional[bytes],
+    text: Optional[str],
+    feed_url: str = "",
+    known_ids: Optional[Collection[str]] = None,
+    known_run: int = DEFAULT_KNOWN_RUN,
+) -> Dict[str, Any]:
+    """Parse a feed payload into plain data.
+
+    Returns a dict with:
+        title: feed title or None when the document has none
+        bozo: feedparser's malformed-document flag
+        entries: list of dicts (id, title, url, author, content, date, media_url,
+                 media_type, chapter_url), in document order
+        ttl_s, skip_hours: RSS <ttl>/<skipHours> scheduling hints (see feed_schedule)
+        incremental: True when only the head of the feed (up to a run of known_ids) was parsed
+        timings: {"parse_s", "chapter_s"} seconds spent parsing and building the chapter map
+
+    When known_ids (ids already stored for this feed) is given, the document is first cut
+    after known_run consecutive known items; see truncate_at_known_items().
+    """
+    started = time.perf_counter()
+    if known_ids and data:
+        truncated = truncate_at_known_items(data, known_ids, known_run)
+        if truncated is not None:
+            head_data, kept = truncated
+            head_text = head_data.decode("utf-8", errors="replace")
+            result = parse_feed_document(head_data, head_text, feed_url)
+            if not result["bozo"]:
+                log.debug(f"Incremental parse of {feed_url}: {kept} item(s) of {len(data)} bytes")
+                result["incremental"] = True
+                # Count the streaming pass as parse time too.
+                chapter_s = result["timings"]["chapter_s"]
+                result["timings"]["parse_s"] = time.perf_counter() - started - chapter_s
+                return result
+
+    d = feedparser.parse(data if data is not None else (text or ""))
+
+    # Resilience: if 0 entries, try parsing decoded text as fallback
+    # (Sometimes feedparser fails on bytes with certain encoding declarations vs actual content)
+    if len(d.entries) == 0 and d.bozo and text:
+        try:
+            d_text = feedparser.parse(text)
+            if len(d_text.entries) > 0:
+                d = d_text
+                log.info(f"Fallback to text parsing successful for {feed_url}")
+        except Exception:
+            pass
+
+    chapter_started = time.perf_counter()
+    chapter_map = build_chapter_map(text or "", feed_url)
+    chapter_s = time.perf_counter() - chapter_started
+
+    entries: List[Dict[str, Any]] = []
+    for entry in d.entries:
+        content = _entry_content(entry)
+
+        article_id = entry.get('id', entry.get('link', ''))
+        if not article_id:
+            continue
+
+        title = _entry_title(entry, content)
+        url = entry.get('link', '')
+        author = entry.get('author', 'Unknown')
+
+        raw_date = entry.get('published') or entry.get('updated') or entry.get('pubDate') or entry.get('date')
+        if not raw_date:
+            parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+            if parsed:
+                raw_date = time.strftime("%Y-%m-%d %H:%M:%S", parsed)
+
+        date = utils.normalize_date(
+            str(raw_date) if raw_date else "",
+            title,
+            content or (entry.get('summary') or ''),
+            url
+        )
+
+        media_url, media_type = _entry_media(entry, url)
+
+        entries.append({
+            "id": str(article_id),
+            "title": title,
+            "url": url,
+            "author": author,
+            "content": content,
+            "date": date,
+            "media_url": media_url,
+            "media_type": media_type,
+            "chapter_url": _entry_chapter_url(entry, chapter_map),
+        })
+
+    feed_title = d.feed.get('title') if 'title' in d.feed else None
+    hints = feed_schedule.parse_feed_hints(text)
+    return {
+        "title": feed_title,
+        "bozo": bool(d.bozo),
+        "entries": entries,
+        "ttl_s": hints["ttl_s"],
+        "skip_hours": hints["skip_hours"],
+        "incremental": False,
+        "timings": {
+            "parse_s": time.perf_counter() - started - chapter_s,
+            "chapter_s": chapter_s,
+        },
+    }
@@ -0,0 +1,182 @@
+"""
+Adaptive per-feed refresh scheduling.
+
+Each feed row keeps a little fetch history (feeds.last_checked_at, last_new_item_at,
+publish_interval_s, ttl_s, skip_hours, next_check_at). After every check the next
+due time is derived from:
+
+- how often the feed publishes (median gap between its newest entry dates),
+- how long it has been quiet (idle feeds are checked less often),
+- server hints: Cache-Control max-age / Expires, RSS <ttl> and <skipHours>.
+
+The delay is always clamped between the user's refresh_interval and a maximum
+interval, so a busy feed is still checked every cycle and a dormant one a few
+times a day. Everything here is pure (no DB, no network) so it can run inside a
+parse worker process.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+_MIN_PUBLISH_INTERVAL_S = 60.0
+_MAX_PUBLISH_INTERVAL_S = 365 * 86400.0
+_RECENT_ENTRIES = 20
+
+_MAX_AGE_RE = re.compile(r"(?:^|,)\s*(?:s-)?max-age\s*=\s*\"?(\d+)", re.I)
+_TTL_RE = re.compile(r"<ttl>\s*(\d+)\s*</ttl>", re.I)
+_SKIP_HOURS_RE = re.compile(r"<skipHours>(.*?)</skipHours>", re.I | re.S)
+_HOUR_RE = re.compile(r"<hour>\s*(\d{1,2})\s*</hour>", re.I)
+_FIRST_ITEM_RE = re.compile(r"<(?:item|entry)[\s>]", re.I)
+
+
+def http_fresh_until(headers, now: Optional[float] = None) -> Optional[float]:
+    """Epoch seconds until which the response may be reused per Cache-Control/Expires."""
+    if not headers:
+        return None
+    now = time.time() if now is None else float(now)
+    try:
+        cache_control = headers.get("Cache-Control") or ""
+    except Exception:
+        cache_control = ""
+    lowered = cache_control.lower()
+    if "no-store" in lowered or "no-cache" in lowered:
+        return None
+    m = _MAX_AGE_RE.search(cache_control)
+    if m:
+        return now + int(m.group(1))
+    try:
+        expires = headers.get("Expires")
+    except Exception:
+        expires = None
+    if expires:
+        try:
+            dt = parsedate_to_datetime(str(expires))
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.timestamp()
+        except Exception:
+            return None
+    return None
+
+
+def parse_feed_hints(text: Optional[str]) -> Dict[str, Any]:
+    """Extract RSS <ttl> (as seconds) and <skipHours> from the channel header."""
+    hints: Dict[str, Any] = {"ttl_s": None, "skip_hours": []}
+    if not text:
+        return hints
+    # Channel-level elements precede the first item; avoid scanning the whole body.
+    m = _FIRST_ITEM_RE.search(text)
+    head = text[:m.start()] if m else text[:65536]
+    ttl = _TTL_RE.search(head)
+    if ttl:
+        try:
+            minutes = int(ttl.group(1))
+            if minutes > 0:
+                hints["ttl_s"] = minutes * 60
+        except ValueError:
+            pass
+    skip = _SKIP_HOURS_RE.search(head)
+    if skip:
+        hours = set()
+        for h in _HOUR_RE.findall(skip.group(1)):
+            try:
+                hv = int(h) % 24
+            except ValueError:
+                continue
+            hours.add(hv)
+        if len(hours) < 24:
+            hints["skip_hours"] = sorted(hours)
+    return hints
+
+
+def format_skip_hours(hours: Optional[Iterable[int]]) -> Optional[str]:
+    hours = sorted(set(int(h) for h in (hours or [])))
+    return ",".join(str(h) for h in hours) if hours else None
+
+
+def parse_skip_hours(value: Optional[str]) -> Set[int]:
+    out: Set[int] = set()
+    for part in str(value or "").split(","):
+        part = part.strip()
+        if part.isdigit():
+            out.add(int(part) % 24)
+    return out
+
+
+def _entry_timestamp(date_str: Optional[str]) -> Optional[float]:
+    if not date_str or str(date_str).startswith("0001-01-01"):
+        return None
+    try:
+        dt = datetime.strptime(str(date_str)[:19], "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+    return dt.replace(tzinfo=timezone.utc).timestamp()
+
+
+def entry_timestamps(entries: List[Dict[str, Any]], now: Optional[float] = None) -> List[float]:
+    """Distinct entry publish times (epoch), newest first, ignoring sentinel/future dates."""
+    now = time.time() if now is None else float(now)
+    stamps = set()
+    for e in entries or []:
+        ts = _entry_timestamp(e.get("date"))
+        if ts is not None and ts <= now + 86400:
+            stamps.add(ts)
+    return sorted(stamps, reverse=True)
+
+
+def estimate_publish_interval(stamps: List[float]) -> Optional[float]:
+    """Median gap between the newest entries, or None with fewer than two dates."""
+    recent = stamps[:_RECENT_ENTRIES]
+    if len(recent) < 2:
+        return None
+    gaps = sorted(recent[i] - recent[i + 1] for i in range(len(recent) - 1))
+    mid = len(gaps) // 2
+    median = gaps[mid] if len(gaps) % 2 else (gaps[mid - 1] + gaps[mid]) / 2.0
+    return max(_MIN_PUBLISH_INTERVAL_S, min(_MAX_PUBLISH_INTERVAL_S, float(median)))
+
+
+def _skip_forward(ts: float, skip_hours: Set[int]) -> float:
+    if not skip_hours or len(skip_hours) >= 24:
+        return ts
+    for _ in range(24):
+        hour = datetime.fromtimestamp(ts, timezone.utc).hour
+        if hour not in skip_hours:
+            return ts
+        ts = (int(ts) // 3600 + 1) * 3600.0
+    return ts
+
+
+def compute_next_check(
+    now: float,
+    *,
+    base_interval: float,
+    max_interval: float,
+    publish_interval: Optional[float] = None,
+    last_new_item_at: Optional[float] = None,
+    fresh_until: Optional[float] = None,
+    ttl_s: Optional[float] = None,
+    skip_hours: Optional[Set[int]] = None,
+    failed: bool = False,
+) -> float:
+    """Return the epoch time at which a feed should next be fetched."""
+    base_interval = max(1.0, float(base_interval))
+    max_interval = max(base_interval, float(max_interval))
+    delay = base_interval
+    if not failed:
+        if publish_interval:
+            # Check about twice per expected publish gap.
+            delay = max(delay, float(publish_interval) / 2.0)
+        if last_new_item_at:
+            delay = max(delay, (now - float(last_new_item_at)) / 4.0)
+        if ttl_s:
+            delay = max(delay, float(ttl_s))
+        delay = min(delay, max_interval)
+    next_at = now + delay
+    if fresh_until and not failed:
+        next_at = max(next_at, min(float(fresh_until), now + max_interval))
+    return _skip_forward(next_at, skip_hours or set())
@@ -0,0 +1,290 @@
+"""
+Per-host circuit breaker for feed refreshes, persisted in the host_health table.
+
+States:
+- closed: requests flow normally; host-level failures (connection errors, timeouts,
+  5xx, 429) are counted.
+- open: after failure_threshold consecutive failures, or a 429/503 carrying
+  Retry-After, the host is skipped until retry_at. Feeds on it are reported as
+  status "deferred" without touching the network.
+- half_open: once retry_at passes, a single probe request is let through. Success
+  closes the circuit; failure re-opens it with a doubled cooldown.
+
+State survives restarts, so a host that was down when the app closed is not hammered
+again on startup. The breaker itself is in memory; state changes are written behind by
+a flusher thread through core.db.write_connection(), so callers (including the asyncio
+refresh loop) never wait on SQLite. flush() writes pending changes synchronously; a
+refresh ends with one.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+
+import core.db
+
+LOG = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN_S = 60.0
+DEFAULT_MAX_COOLDOWN_S = 3600.0
+
+# Status codes that say "this server is unhealthy" rather than "this feed is wrong".
+HOST_FAILURE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for errors worth retrying later: connection failures, timeouts and
+    HTTPError responses with one of HOST_FAILURE_STATUSES."""
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError):
+        resp = getattr(exc, "response", None)
+        return resp is not None and resp.status_code in HOST_FAILURE_STATUSES
+    return False
+
+
+# Scrapers (curl, yt-dlp) wrap network errors in their own exception types; these
+# messages are what they report for a timeout, DNS/connect failure or a 429/5xx.
+_HOST_FAILURE_TEXT = re.compile(
+    r"timed? ?out|could not resolve|name resolution|getaddrinfo|failed to connect|"
+    r"connection (?:refused|reset|aborted)|network is unreachable|\bhttp(?: error)? (?:429|50[0234])\b",
+    re.IGNORECASE,
+)
+
+
+def is_host_failure(exc: BaseException) -> bool:
+    """True when exc says the host (not the page) is failing; parse errors and the like are not."""
+    if is_transient_error(exc) or isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    return bool(_HOST_FAILURE_TEXT.search(str(exc) or ""))
+
+
+class HostDeferred(Exception):
+    """Raised when a host's circuit is open; the feed should be retried after retry_at."""
+
+    def __init__(self, host: str, retry_at: Optional[float]):
+        self.host = host
+        self.retry_at = retry_at
+        when = time.strftime("%H:%M:%S", time.localtime(retry_at)) if retry_at else "later"
+        super().__init__(f"{host} is unavailable; retrying after {when}")
+
+
+def parse_retry_after(value, now: Optional[float] = None) -> Optional[float]:
+    """Retry-After header (delta-seconds or HTTP-date) -> seconds to wait, or None."""
+    if value is None:
+        return None
+    now = time.time() if now is None else float(now)
+    value = str(value).strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(int(value))
+    try:
+        dt = parsedate_to_datetime(value)
+    except Exception:
+        return None
+    if dt is None:
+        return None
+    return max(0.0, dt.timestamp() - now)
+
+
+class HostHealthRegistry:
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown_s: float = DEFAULT_COOLDOWN_S,
+        max_cooldown_s: float = DEFAULT_MAX_COOLDOWN_S,
+    ):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._loaded_for: Optional[str] = None
+        self._probing = set()
+        # host -> (database file, record) waiting for the flusher
+        self._dirty: Dict[str, Any] = {}
+        self._dirty_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self.configure(failure_threshold, cooldown_s, max_cooldown_s)
+
+    def configure(self, failure_threshold: int, cooldown_s: float, max_cooldown_s: float) -> None:
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_s = max(1.0, float(cooldown_s))
+        self.max_cooldown_s = max(self.cooldown_s, float(max_cooldown_s))
+
+    # --- persistence -----------------------------------------------------
+
+    def _ensure_loaded(self) -> None:
+        # Reload when the database file changes (tests swap core.db.DB_FILE).
+        if self._loaded_for == core.db.DB_FILE:
+            return
+        self._hosts = {}
+        self._probing = set()
+        self._loaded_for = core.db.DB_FILE
+        try:
+            conn = core.db.get_connection()
+            try:
+                c = conn.cursor()
+                c.execute(
+                    "SELECT host, state, consecutive_failures, open_count, retry_at, last_error FROM host_health"
+                )
+                for host, state, failures, open_count, retry_at, last_error in c.fetchall():
+                    self._hosts[host] = {
+                        "state": state or CLOSED,
+                        "failures": int(failures or 0),
+                        "open_count": int(open_count or 0),
+                        "retry_at": retry_at,
+                        "last_error": last_error,
+                    }
+            finally:
+                conn.close()
+        except Exception as e:
+            LOG.debug(f"Host health load failed: {e}")
+
+    def _persist(self, host: str, rec: Dict[str, Any]) -> None:
+        """Queue rec for the flusher thread; the latest state per host wins."""
+        with self._dirty_lock:
+            self._dirty[host] = (core.db.DB_FILE, rec)
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._flush_loop, name="host-health", daemon=True)
+                self._flusher.start()
+        self._flush_wake.set()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._flush_wake.wait()
+            self._flush_wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write queued state changes now (one transaction)."""
+        with self._flush_lock:
+            with self._dirty_lock:
+                pending, self._dirty = self._dirty, {}
+            # Changes queued against another database file (tests swap DB_FILE) are dropped.
+            rows = [(host, rec) for host, (db_file, rec) in pending.items() if db_file == core.db.DB_FILE]
+            if not rows:
+                return
+            try:
+                with core.db.write_connection() as conn:
+                    for host, rec in rows:
+                        if rec["state"] == CLOSED and rec["failures"] == 0:
+                            conn.execute("DELETE FROM host_health WHERE host = ?", (host,))
+                        else:
+                            conn.execute(
+                                "INSERT OR REPLACE INTO host_health "
+                                "(host, state, consecutive_failures, open_count, retry_at, last_error, updated_at) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (host, rec["state"], rec["failures"], rec["open_count"], rec["retry_at"],
+                                 (rec.get("last_error") or "")[:500], time.time()),
+                            )
+                    conn.commit()
+            except Exception as e:
+                LOG.debug(f"Host health persist failed for {len(rows)} host(s): {e}")
+
+    # --- breaker ---------------------------------------------------------
+
+    def check(self, host: str, now: Optional[float] = None) -> None:
+        """Raise HostDeferred if requests to host should not be made right now."""
+        if not host:
+            return
+        now = time.time() if now is None else float(now)
+        changed = None
+        with self._lock:
+            self._ensure_loaded()
+            rec = self._hosts.get(host)
+            if rec is None or rec["state"] == CLOSED:
+                return
+            if rec["state"] == OPEN:
+                if rec["retry_at"] and now < float(rec["retry_at"]):
+                    raise HostDeferred(host, rec["retry_at"])
+                rec["state"] = HALF_OPEN
+                changed = dict(rec)
+            if rec["state"] == HALF_OPEN:
+                if host in self._probing:
+                    raise HostDeferred(host, now + self.cooldown_s)
+                self._probing.add(host)
+        if changed is not None:
+            self._persist(host, changed)
+
+    def release_probe(self, host: str) -> None:
+        """Let another half-open probe through after an attempt that proved nothing either way."""
+        with self._lock:
+            self._probing.discard(host)
+
+    def record_success(self, host: str) -> None:
+        if not host:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            self._probing.discard(host)
+            rec = self._hosts.pop(host, None)
+        if rec is not None:
+            self._persist(host, {"state": CLOSED, "failures": 0, "open_count": 0, "retry_at": None})
+
+    def record_failure(self, host: str, error: str = "", retry_after: Optional[float] = None,
+                       now: Optional[float] = None) -> None:
+        """Count a host-level failure; retry_after (seconds) opens the circuit immediately."""
+        if not host:
+            return
+        now = time.time() if now is None else float(now)
+        with self._lock:
+            self._ensure_loaded()
+            was_probe = host in self._probing
+            self._probing.discard(host)
+            rec = self._hosts.setdefault(
+                host, {"state": CLOSED, "failures": 0, "open_count": 0, "retry_at": None, "last_error": None}
+            )
+            rec["failures"] += 1
+            rec["last_error"] = error
+            if retry_after is not None or was_probe or rec["failures"] >= self.failure_threshold:
+                cooldown = min(self.max_cooldown_s, self.cooldown_s * (2 ** rec["open_count"]))
+                if retry_after is not None:
+                    cooldown = min(self.max_cooldown_s, max(float(retry_after), 1.0))
+                rec["state"] = OPEN
+                rec["open_count"] += 1
+                rec["retry_at"] = now + cooldown
+                LOG.info(f"Circuit open for {host} for {int(cooldown)}s ({error})")
+            snapshot = dict(rec)
+        self._persist(host, snapshot)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            self._ensure_loaded()
+            return {h: dict(r) for h, r in self._hosts.items()}
+
+
+_REGISTRY: Optional[HostHealthRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> HostHealthRegistry:
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = HostHealthRegistry()
+        return _REGISTRY
+
+
+def configure(failure_threshold: int, cooldown_s: float, max_cooldown_s: float) -> None:
+    get_registry().configure(failure_threshold, cooldown_s, max_cooldown_s)
+
+
+def flush() -> None:
+    """Write pending breaker state changes now."""
+    with _REGISTRY_LOCK:
+        reg = _REGISTRY
+    if reg is not None:
+        reg.flush()
@@ -0,0 +1,207 @@
+"""
+Shared per-host HTTP session registry.
+
+Feed refresh (and the side-fetches it triggers: chapters JSON, NPR story pages,
+full-text downloads) talks to the same few dozen hosts over and over. A bare
+requests.get() pays a fresh TCP+TLS handshake every time; this registry keeps one
+keep-alive requests.Session per origin instead.
+
+Design notes:
+- One Session per scheme://host:port, created lazily and shared across threads.
+  urllib3 connection pools are thread-safe; the pool size follows
+  per_host_max_connections so concurrent refresh workers for a host can each hold
+  a warm connection.
+- Counters (requests sent vs. connections opened) are kept per host so connection
+  reuse can be inspected from diagnostics/benchmarks.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+LOG = logging.getLogger(__name__)
+
+_DEFAULT_POOL_SIZE = 4
+_MIN_POOL_SIZE = 1
+_MAX_POOL_SIZE = 32
+
+
+def _origin_key(url: str) -> str:
+    try:
+        parts = urlsplit(str(url or ""))
+        scheme = (parts.scheme or "http").lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except Exception:
+        return ""
+    if not host:
+        return ""
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        return f"{scheme}://{host}:{port}"
+    return f"{scheme}://{host}"
+
+
+class HostSessionRegistry:
+    """Thread-safe registry of keep-alive sessions, one per origin."""
+
+    def __init__(self, pool_size: int = _DEFAULT_POOL_SIZE):
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._request_counts: Dict[str, int] = {}
+        self._pool_size = self._clamp_pool_size(pool_size)
+
+    @staticmethod
+    def _clamp_pool_size(value) -> int:
+        try:
+            size = int(value)
+        except (TypeError, ValueError):
+            size = _DEFAULT_POOL_SIZE
+        return max(_MIN_POOL_SIZE, min(_MAX_POOL_SIZE, size))
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size
+
+    def configure(self, pool_size: int) -> None:
+        """Set the per-host keep-alive pool size.
+
+        Existing sessions keep serving in-flight requests; they are dropped from the
+        registry so the next request for a host builds a session with the new size.
+        """
+        size = self._clamp_pool_size(pool_size)
+        with self._lock:
+            if size == self._pool_size:
+                return
+            self._pool_size = size
+            stale = list(self._sessions.values())
+            self._sessions.clear()
+        for s in stale:
+            try:
+                s.close()
+            except Exception:
+                pass
+
+    def _make_session(self) -> requests.Session:
+        s = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self._pool_size,
+            pool_block=False,
+        )
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+        return s
+
+    def session_for(self, url: str) -> requests.Session:
+        key = _origin_key(url)
+        with self._lock:
+            s = self._sessions.get(key)
+            if s is None:
+                s = self._make_session()
+                self._sessions[key] = s
+            return s
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        key = _origin_key(url)
+        s = self.session_for(url)
+        with self._lock:
+            self._request_counts[key] = self._request_counts.get(key, 0) + 1
+        return s.get(url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        key = _origin_key(url)
+        s = self.session_for(url)
+        with self._lock:
+            self._request_counts[key] = self._request_counts.get(key, 0) + 1
+        return s.head(url, **kwargs)
+
+    @staticmethod
+    def _connections_opened(session: requests.Session) -> int:
+        opened = 0
+        seen = set()
+        for adapter in session.adapters.values():
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            try:
+                pools = adapter.poolmanager.pools
+                for pool_key in list(pools.keys()):
+                    pool = pools.get(pool_key)
+                    if pool is not None:
+                        opened += int(getattr(pool, "num_connections", 0) or 0)
+            except Exception:
+                continue
+        return opened
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return per-origin counters: requests, connections opened and connections reused."""
+        with self._lock:
+            sessions = dict(self._sessions)
+            counts = dict(self._request_counts)
+
+        out: Dict[str, Dict[str, int]] = {}
+        for key, n_requests in counts.items():
+            s = sessions.get(key)
+            opened = self._connections_opened(s) if s is not None else 0
+            out[key or "(unknown)"] = {
+                "requests": int(n_requests),
+                "connections_opened": int(opened),
+                "connections_reused": max(0, int(n_requests) - int(opened)),
+            }
+        return out
+
+    def totals(self) -> Dict[str, int]:
+        totals = {"hosts": 0, "requests": 0, "connections_opened": 0, "connections_reused": 0}
+        for st in self.stats().values():
+            totals["hosts"] += 1
+            for k in ("requests", "connections_opened", "connections_reused"):
+                totals[k] += int(st.get(k, 0))
+        return totals
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._request_counts.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._request_counts.clear()
+        for s in sessions:
+            try:
+                s.close()
+            except Exception:
+                pass
+
+
+_REGISTRY: Optional[HostSessionRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> HostSessionRegistry:
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = HostSessionRegistry()
+        return _REGISTRY
+
+
+def configure(pool_size: int) -> None:
+    get_registry().configure(pool_size)
+
+
+def get_stats() -> Dict[str, Dict[str, int]]:
+    return get_registry().stats()
+
+
+def close_all() -> None:
+    with _REGISTRY_LOCK:
+        reg = _REGISTRY
+    if reg is not None:
+        reg.close()
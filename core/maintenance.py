@@ -0,0 +1,210 @@
+"""
+Scheduled database maintenance: article retention and incremental vacuum.
+
+Retention used to run on every feed tree refresh as one DELETE over the whole table,
+holding the write lock for as long as it took. It now runs here on a timer:
+
+- core.db.cleanup_old_articles() deletes in short batches by rowid (with the chapters,
+  enrichment jobs and resume positions of those articles; search rows go by trigger),
+- freed pages are returned to the file system with PRAGMA incremental_vacuum, a few
+  hundred pages per tick, so no single write transaction is long.
+
+Databases created before this have auto_vacuum=NONE, which only a full VACUUM can
+change; that is done once for files up to CONVERT_MAX_BYTES. Larger ones keep reusing
+their free pages for new articles instead of shrinking.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from core import db
+
+LOG = logging.getLogger(__name__)
+
+RETENTION_CHOICES = {
+    "1 day": 1,
+    "2 days": 2,
+    "3 days": 3,
+    "1 week": 7,
+    "2 weeks": 14,
+    "3 weeks": 21,
+    "1 month": 30,
+    "2 months": 60,
+    "3 months": 90,
+    "6 months": 180,
+    "1 year": 365,
+    "2 years": 730,
+    "5 years": 1825,
+}
+
+INTERVAL_S = 3600.0
+# First run shortly after start, once the startup refresh has had the writer
+INITIAL_DELAY_S = 120.0
+VACUUM_PAGES_PER_TICK = 256
+# Pause between retention batches and vacuum ticks so other writers get a turn
+_PAUSE_S = 0.05
+CONVERT_MAX_BYTES = 64 * 1024 * 1024
+
+AUTO_VACUUM_NONE = 0
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def retention_days(setting: Optional[str]) -> Optional[int]:
+    """Days to keep for an "article_retention" setting; None means keep everything."""
+    return RETENTION_CHOICES.get(str(setting or "").strip())
+
+
+def _page_info() -> Dict[str, int]:
+    conn = db.get_connection()
+    try:
+        # Touch the schema first: a pooled connection reports a stale auto_vacuum
+        # after another connection ran VACUUM until it reads the database again.
+        conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        return {
+            "auto_vacuum": int(conn.execute("PRAGMA auto_vacuum").fetchone()[0]),
+            "page_size": int(conn.execute("PRAGMA page_size").fetchone()[0]),
+            "page_count": int(conn.execute("PRAGMA page_count").fetchone()[0]),
+            "freelist_count": int(conn.execute("PRAGMA freelist_count").fetchone()[0]),
+        }
+    finally:
+        conn.close()
+
+
+def enable_incremental_vacuum(max_bytes: int = CONVERT_MAX_BYTES) -> bool:
+    """Switch an existing database to auto_vacuum=INCREMENTAL (one full VACUUM).
+
+    Skipped, returning False, when the file is larger than max_bytes: the VACUUM holds
+    the writer for the whole rewrite.
+    """
+    info = _page_info()
+    if info["auto_vacuum"] == AUTO_VACUUM_INCREMENTAL:
+        return True
+    size = info["page_size"] * info["page_count"]
+    if max_bytes is not None and size > max_bytes:
+        LOG.info(
+            f"Database is {size // (1024 * 1024)} MB; leaving auto_vacuum off "
+            f"(free pages are reused, the file does not shrink)"
+        )
+        return False
+    started = time.perf_counter()
+    with db.write_connection() as conn:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    LOG.info(f"Enabled incremental auto-vacuum in {time.perf_counter() - started:.1f}s")
+    return True
+
+
+def incremental_vacuum(pages_per_tick: int = VACUUM_PAGES_PER_TICK, max_ticks: Optional[int] = None,
+                       pause_s: float = 0.0, stop_event: Optional[threading.Event] = None) -> Dict[str, int]:
+    """Release free pages pages_per_tick at a time. Returns pages and bytes freed."""
+    before = _page_info()
+    report = {"ticks": 0, "pages_freed": 0, "bytes_freed": 0, "freelist_before": before["freelist_count"]}
+    if before["auto_vacuum"] != AUTO_VACUUM_INCREMENTAL:
+        report["freelist_after"] = before["freelist_count"]
+        return report
+    pages_per_tick = max(1, int(pages_per_tick))
+    freelist = before["freelist_count"]
+    while freelist > 0 and (max_ticks is None or report["ticks"] < max_ticks):
+        if stop_event is not None and stop_event.is_set():
+            break
+        with db.write_connection() as conn:
+            # executescript steps the pragma to completion; execute() would free one page
+            conn.executescript(f"PRAGMA incremental_vacuum({pages_per_tick})")
+            remaining = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+        report["ticks"] += 1
+        if remaining >= freelist:
+            break
+        freelist = remaining
+        if pause_s:
+            if stop_event is not None:
+                stop_event.wait(pause_s)
+            else:
+                time.sleep(pause_s)
+    report["freelist_after"] = freelist
+    report["pages_freed"] = before["freelist_count"] - freelist
+    report["bytes_freed"] = report["pages_freed"] * before["page_size"]
+    return report
+
+
+def run_once(days: Optional[int], stop_event: Optional[threading.Event] = None,
+             pause_s: float = 0.0) -> Dict[str, Any]:
+    """One maintenance pass: retention for days (None = keep all), then vacuum ticks."""
+    started = time.perf_counter()
+    report: Dict[str, Any] = {"retention": None, "vacuum": None}
+    if days is not None:
+        report["retention"] = db.cleanup_old_articles(days, stop_event=stop_event, pause_s=pause_s)
+    if stop_event is None or not stop_event.is_set():
+        report["vacuum"] = incremental_vacuum(pause_s=pause_s, stop_event=stop_event)
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    try:
+        report["file_bytes"] = os.path.getsize(db.DB_FILE)
+    except OSError:
+        report["file_bytes"] = None
+    freed = (report["vacuum"] or {}).get("bytes_freed", 0)
+    deleted = (report["retention"] or {}).get("articles", 0)
+    if deleted or freed:
+        LOG.info(
+            f"Maintenance: deleted {deleted} articles, released {freed // 1024} KB "
+            f"in {report['seconds']:.1f}s"
+        )
+    return report
+
+
+_LOCK = threading.Lock()
+_THREAD: Optional[threading.Thread] = None
+_STOP = threading.Event()
+_LAST_REPORT: Optional[Dict[str, Any]] = None
+
+
+def last_report() -> Optional[Dict[str, Any]]:
+    """The report of the most recent scheduled pass (None before the first one)."""
+    return _LAST_REPORT
+
+
+def _worker(get_days: Callable[[], Optional[int]], interval_s: float, initial_delay_s: float) -> None:
+    global _LAST_REPORT
+    if _STOP.wait(initial_delay_s):
+        return
+    try:
+        enable_incremental_vacuum()
+    except Exception:
+        LOG.exception("Enabling incremental auto-vacuum failed")
+    while not _STOP.is_set():
+        try:
+            _LAST_REPORT = run_once(get_days(), stop_event=_STOP, pause_s=_PAUSE_S)
+        except Exception:
+            LOG.exception("Database maintenance failed")
+        if _STOP.wait(interval_s):
+            return
+
+
+def start(get_days: Callable[[], Optional[int]], interval_s: float = INTERVAL_S,
+          initial_delay_s: float = INITIAL_DELAY_S) -> None:
+    """Run maintenance every interval_s seconds in a background thread.
+
+    get_days is called before each pass, so retention setting changes apply without a restart.
+    """
+    global _THREAD
+    with _LOCK:
+        if _THREAD is not None and _THREAD.is_alive():
+            return
+        _STOP.clear()
+        _THREAD = threading.Thread(
+            target=_worker, args=(get_days, interval_s, initial_delay_s), name="db-maintenance", daemon=True
+        )
+        _THREAD.start()
+
+
+def shutdown(timeout: float = 5.0) -> None:
+    global _THREAD
+    with _LOCK:
+        t = _THREAD
+        _THREAD = None
+    _STOP.set()
+    if t is not None:
+        t.join(timeout=timeout)
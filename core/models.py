@@ -2,8 +2,15 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 from core.utils import parse_datetime_utc
 
+
 class Article:
-    def __init__(self, title: str, url: str, content: str, date: str, author: str, feed_id: str, is_read: bool = False, id: str = None, media_url: str = None, media_type: str = None, chapters: list = None, is_favorite: bool = False):
+    # __slots__: list pages build tens of thousands of these, a per-instance __dict__ doubles their size.
+    __slots__ = (
+        "id", "title", "url", "content", "date", "author", "feed_id", "is_read", "is_favorite",
+        "media_url", "media_type", "chapters", "snippet", "_timestamp",
+    )
+
+    def __init__(self, title: str, url: str, content: str, date: str, author: str, feed_id: str, is_read: bool = False, id: str = None, media_url: str = None, media_type: str = None, chapters: list = None, is_favorite: bool = False, timestamp: float = None):
         self.id = id or url  # Use URL as ID if generic ID not provided
         self.title = title
         self.url = url
@@ -16,14 +23,32 @@ class Article:
         self.media_url = media_url
         self.media_type = media_type
         self.chapters = chapters or []
-        
-        self.timestamp = 0.0
-        if self.date:
-            dt = parse_datetime_utc(self.date)
-            if dt:
-                self.timestamp = dt.timestamp()
+        # Matching text excerpt when the article came from search_articles()
+        self.snippet = None
+        # Seconds since the epoch (UTC). The local provider passes articles.published_ts;
+        # providers that only have the date string leave it to be parsed on first use.
+        self._timestamp = timestamp
+
+    @property
+    def timestamp(self) -> float:
+        ts = self._timestamp
+        if ts is None:
+            ts = 0.0
+            if self.date:
+                dt = parse_datetime_utc(self.date)
+                if dt:
+                    ts = dt.timestamp()
+            self._timestamp = ts
+        return ts
+
+    @timestamp.setter
+    def timestamp(self, value: float) -> None:
+        self._timestamp = value
+
 
 class Feed:
+    __slots__ = ("id", "title", "url", "category", "icon_url", "unread_count")
+
     def __init__(self, id: str, title: str, url: str, category: str = "Uncategorized", icon_url: str = None):
         self.id = id
         self.title = title
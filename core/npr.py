@@ -2,6 +2,7 @@ import re
 import json
 import logging
 from bs4 import BeautifulSoup
+from core import host_health
 from core import utils
 
 log = logging.getLogger(__name__)
@@ -11,16 +12,18 @@ def is_npr_url(url: str) -> bool:
         return False
     return "npr.org" in url.lower()
 
-def extract_npr_audio(url: str, timeout_s: float = 10.0) -> tuple[str | None, str | None]:
+def extract_npr_audio(url: str, timeout_s: float = 10.0, raise_transient: bool = False) -> tuple[str | None, str | None]:
     """
     Extracts the audio URL and type from an NPR story page.
     Returns (audio_url, audio_type).
+    With raise_transient, network errors worth retrying (host_health.is_transient_error)
+    are raised instead of being reported as "no audio".
     """
     if not is_npr_url(url):
         return None, None
         
     try:
-        resp = utils.safe_requests_get(url, timeout=timeout_s)
+        resp = utils.pooled_requests_get(url, timeout=timeout_s)
         resp.raise_for_status()
         html = resp.text
         soup = BeautifulSoup(html, "html.parser")
@@ -59,6 +62,8 @@ def extract_npr_audio(url: str, timeout_s: float = 10.0) -> tuple[str | None, st
                 return href, "audio/mpeg"
 
     except Exception as e:
+        if raise_transient and host_health.is_transient_error(e):
+            raise
         log.warning(f"NPR audio extraction failed for {url}: {e}")
         
     return None, None
@@ -6,20 +6,13 @@ import time
 from dataclasses import dataclass
 from typing import Callable, Optional
 
-from core.db import get_connection
+from core.db import get_connection, write_connection
 
 LOG = logging.getLogger(__name__)
 
 _PLAYBACK_STATE_BUSY_TIMEOUT_MS = 500
 
 
-def _configure_conn(conn: sqlite3.Connection) -> None:
-    try:
-        conn.execute(f"PRAGMA busy_timeout={int(_PLAYBACK_STATE_BUSY_TIMEOUT_MS)}")
-    except sqlite3.Error as e:
-        LOG.warning("Failed to set playback_state busy_timeout pragma: %s", e)
-
-
 def _is_locked_error(error: Exception) -> bool:
     if not isinstance(error, sqlite3.OperationalError):
         return False
@@ -37,22 +30,18 @@ def _is_locked_error(error: Exception) -> bool:
 
 
 def _execute_write_op(op_name: str, op: Callable[[sqlite3.Cursor], None]) -> None:
-    conn = get_connection()
+    # Don't block the GUI thread for long if a refresh is writing.
+    # We'll retry on the next timer tick.
+    timeout_s = _PLAYBACK_STATE_BUSY_TIMEOUT_MS / 1000.0
     try:
-        _configure_conn(conn)
-        c = conn.cursor()
-        try:
-            op(c)
+        with write_connection(timeout=timeout_s, busy_timeout_ms=_PLAYBACK_STATE_BUSY_TIMEOUT_MS) as conn:
+            op(conn.cursor())
             conn.commit()
-        except sqlite3.OperationalError as e:
-            # Don't block the GUI thread for long if a refresh is writing.
-            # We'll retry on the next timer tick.
-            if _is_locked_error(e):
-                LOG.debug("playback_state is locked; skipping %s", op_name)
-                return
-            raise
-    finally:
-        conn.close()
+    except sqlite3.OperationalError as e:
+        if _is_locked_error(e):
+            LOG.debug("playback_state is locked; skipping %s", op_name)
+            return
+        raise
 
 
 @dataclass(frozen=True)
@@ -70,9 +59,8 @@ def get_playback_state(playback_id: str) -> Optional[PlaybackState]:
     if not playback_id:
         return None
 
-    conn = get_connection()
+    conn = get_connection(busy_timeout_ms=_PLAYBACK_STATE_BUSY_TIMEOUT_MS)
     try:
-        _configure_conn(conn)
         c = conn.cursor()
         c.execute(
             "SELECT id, position_ms, duration_ms, updated_at, completed, seek_supported, title "
@@ -0,0 +1,250 @@
+"""
+Per-feed refresh timings.
+
+Every feed refresh carries a FeedTimings that the refresh code fills in phase by phase:
+
+    queue_wait_s  waiting for a refresh worker (or in-flight slot)
+    host_wait_s   waiting for the per-host connection slot
+    connect_s     DNS + connect + time to first byte (until response headers arrived)
+    download_s    reading the response body
+    bytes         size of the downloaded body
+    parse_s       feedparser and entry normalisation
+    chapter_s     building the podcast:chapters map
+    db_s          SQLite lookups and the refresh writer
+    entries       entries parsed
+    total_s       from the feed's start until its progress state is emitted
+
+The numbers are attached to the progress_cb state dict under "timings". A RefreshRun
+collects them for one refresh and stores them in the refresh_stats table, which keeps
+the last few runs; get_refresh_stats() summarises them (slowest feeds and hosts, and
+a per-run trend).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from core.db import get_connection, write_connection
+
+LOG = logging.getLogger(__name__)
+
+PHASES = (
+    "queue_wait_s",
+    "host_wait_s",
+    "connect_s",
+    "download_s",
+    "parse_s",
+    "chapter_s",
+    "db_s",
+    "total_s",
+)
+COUNTERS = ("bytes", "entries")
+
+DEFAULT_KEEP_RUNS = 20
+
+
+class FeedTimings:
+    """Accumulates phase durations (seconds) and counters for one feed refresh."""
+
+    def __init__(self, queued_at: Optional[float] = None):
+        self._started = time.perf_counter()
+        self.values: Dict[str, float] = {}
+        if queued_at is not None:
+            self.values["queue_wait_s"] = max(0.0, self._started - float(queued_at))
+
+    def add(self, name: str, value) -> None:
+        try:
+            self.values[name] = self.values.get(name, 0) + max(0, value)
+        except TypeError:
+            pass
+
+    def merge(self, values: Optional[Dict[str, Any]]) -> None:
+        for name, value in (values or {}).items():
+            self.add(name, value)
+
+    @contextlib.contextmanager
+    def measure(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Snapshot with every phase present; total_s is measured up to now."""
+        out: Dict[str, Any] = {}
+        for name in PHASES:
+            out[name] = round(float(self.values.get(name, 0.0)), 4)
+        out["total_s"] = round(time.perf_counter() - self._started, 4)
+        for name in COUNTERS:
+            out[name] = int(self.values.get(name, 0) or 0)
+        return out
+
+
+class RefreshRun:
+    """Collects the timings of one refresh run and saves them to refresh_stats."""
+
+    def __init__(self, feeds: Iterable, engine: str = "threads"):
+        self.run_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self.engine = engine
+        self._hosts: Dict[str, str] = {}
+        for row in feeds or []:
+            try:
+                self._hosts[row[0]] = urlparse(row[1]).hostname or ""
+            except Exception:
+                continue
+        self._rows: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def wrap(self, progress_cb: Optional[Callable[[Dict[str, Any]], None]]):
+        """A progress callback that records each feed's timings, then calls progress_cb."""
+
+        def _cb(state):
+            try:
+                self.record(state)
+            except Exception as e:
+                LOG.debug(f"Refresh stats record failed: {e}")
+            if progress_cb is not None:
+                progress_cb(state)
+
+        return _cb
+
+    def record(self, state: Dict[str, Any]) -> None:
+        timings = state.get("timings")
+        feed_id = state.get("id")
+        if not timings or not feed_id:
+            return
+        row = (
+            self.run_id, self.started_at, self.engine, feed_id, self._hosts.get(feed_id, ""), state.get("status"),
+            *(timings.get(name, 0.0) for name in PHASES[:4]),
+            timings.get("bytes", 0),
+            *(timings.get(name, 0.0) for name in PHASES[4:7]),
+            timings.get("entries", 0),
+            timings.get("total_s", 0.0),
+        )
+        with self._lock:
+            self._rows.append(row)
+
+    def save(self, keep_runs: int = DEFAULT_KEEP_RUNS) -> None:
+        """Insert the collected rows and drop runs older than the newest keep_runs."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows or keep_runs <= 0:
+            return
+        with write_connection() as conn:
+            c = conn.cursor()
+            c.executemany(
+                "INSERT INTO refresh_stats (run_id, run_started_at, engine, feed_id, host, status, "
+                "queue_wait_s, host_wait_s, connect_s, download_s, bytes, parse_s, chapter_s, db_s, entries, total_s) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            c.execute(
+                "DELETE FROM refresh_stats WHERE run_started_at < ("
+                "SELECT MIN(run_started_at) FROM ("
+                "SELECT DISTINCT run_started_at FROM refresh_stats ORDER BY run_started_at DESC LIMIT ?))",
+                (int(keep_runs),),
+            )
+            conn.commit()
+
+
+def _p95(values: List[float]) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+def get_refresh_stats(runs: int = 10, limit: int = 10) -> Dict[str, Any]:
+    """Summarise the newest runs stored in refresh_stats.
+
+    Returns a dict with:
+        runs: per-run trend, newest first (feeds, errors, mean/p95/max total_s,
+              bytes, entries and the summed time per phase)
+        slowest_feeds: the latest run's slowest feeds with all their phases
+        slowest_hosts: hosts by mean total_s across the returned runs
+    """
+    runs = max(1, int(runs))
+    limit = max(1, int(limit))
+    columns = ("feed_id", "host", "status") + PHASES[:4] + ("bytes",) + PHASES[4:7] + ("entries", "total_s")
+    conn = get_connection()
+    try:
+        c = conn.cursor()
+        c.execute(
+            "SELECT DISTINCT run_id, run_started_at, engine FROM refresh_stats "
+            "ORDER BY run_started_at DESC LIMIT ?",
+            (runs,),
+        )
+        run_rows = c.fetchall()
+        if not run_rows:
+            return {"runs": [], "slowest_feeds": [], "slowest_hosts": []}
+        run_ids = [r[0] for r in run_rows]
+        placeholders = ",".join("?" for _ in run_ids)
+        c.execute(
+            f"SELECT run_id, {', '.join(columns)} FROM refresh_stats WHERE run_id IN ({placeholders})",
+            run_ids,
+        )
+        rows = c.fetchall()
+    finally:
+        conn.close()
+
+    by_run: Dict[str, List[Dict[str, Any]]] = {rid: [] for rid in run_ids}
+    for row in rows:
+        by_run[row[0]].append(dict(zip(columns, row[1:])))
+
+    trend = []
+    for run_id, started_at, engine in run_rows:
+        feeds = by_run[run_id]
+        totals = [float(f["total_s"] or 0) for f in feeds]
+        trend.append({
+            "run_id": run_id,
+            "started_at": started_at,
+            "engine": engine,
+            "feeds": len(feeds),
+            "errors": sum(1 for f in feeds if f["status"] in ("error", "deferred")),
+            "mean_total_s": round(sum(totals) / len(totals), 4) if totals else 0.0,
+            "p95_total_s": round(_p95(totals), 4),
+            "max_total_s": round(max(totals), 4) if totals else 0.0,
+            "bytes": sum(int(f["bytes"] or 0) for f in feeds),
+            "entries": sum(int(f["entries"] or 0) for f in feeds),
+            "phases": {p: round(sum(float(f[p] or 0) for f in feeds), 4) for p in PHASES if p != "total_s"},
+        })
+
+    latest = sorted(by_run[run_ids[0]], key=lambda f: float(f["total_s"] or 0), reverse=True)
+
+    hosts: Dict[str, Dict[str, Any]] = {}
+    for feeds in by_run.values():
+        for f in feeds:
+            h = hosts.setdefault(f["host"] or "", {"host": f["host"] or "", "feeds": 0, "errors": 0,
+                                                   "_total": 0.0, "_connect": 0.0, "max_total_s": 0.0})
+            total = float(f["total_s"] or 0)
+            h["feeds"] += 1
+            h["errors"] += 1 if f["status"] in ("error", "deferred") else 0
+            h["_total"] += total
+            h["_connect"] += float(f["connect_s"] or 0)
+            h["max_total_s"] = max(h["max_total_s"], total)
+    slowest_hosts = []
+    for h in hosts.values():
+        n = max(1, h["feeds"])
+        slowest_hosts.append({
+            "host": h["host"],
+            "feeds": h["feeds"],
+            "errors": h["errors"],
+            "mean_total_s": round(h.pop("_total") / n, 4),
+            "mean_connect_s": round(h.pop("_connect") / n, 4),
+            "max_total_s": round(h["max_total_s"], 4),
+        })
+    slowest_hosts.sort(key=lambda h: h["mean_total_s"], reverse=True)
+
+    return {
+        "runs": trend,
+        "slowest_feeds": latest[:limit],
+        "slowest_hosts": slowest_hosts[:limit],
+    }
@@ -0,0 +1,266 @@
+"""
+Single-writer persistence for refreshed feeds.
+
+Refresh workers used to each hold a SQLite connection, look entries up one by one and
+commit every few rows, so ten workers fought over the WAL write lock. Instead, workers
+hand parsed feed results to one writer thread:
+
+- existing article ids for a feed are fetched with a single IN (...) query,
+- new rows and changed dates are applied with executemany(),
+- results from several feeds that arrive together share one transaction (group commit).
+
+submit() returns a Future resolving to the list of entries that were actually inserted.
+Enrichment jobs for those entries (core.enrichment) are queued, and the entries are added
+to the search index (core.search_index), in the same transaction.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from core import content_store, enrichment, search_index
+from core.db import published_ts_sql, write_connection
+
+LOG = logging.getLogger(__name__)
+
+_SQLITE_MAX_VARS = 900
+_DEFAULT_MAX_BATCH_FEEDS = 16
+_DEFAULT_LINGER_S = 0.02
+
+
+# feeds columns a job may set
+FEED_COLUMNS = frozenset({
+    "title",
+    "etag",
+    "last_modified",
+    "last_checked_at",
+    "next_check_at",
+    "publish_interval_s",
+    "ttl_s",
+    "skip_hours",
+    "body_hash",
+    "body_size",
+})
+
+
+@dataclass
+class FeedWriteJob:
+    feed_id: str
+    feed_fields: Dict[str, Any]
+    entries: List[Dict[str, Any]]
+    # When any entry is inserted, feeds.last_new_item_at is set to this value.
+    new_item_time: Optional[float] = None
+    future: concurrent.futures.Future = field(default_factory=concurrent.futures.Future)
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _update_feed(c, feed_id: str, fields: Dict[str, Any]) -> None:
+    cols = [k for k in fields if k in FEED_COLUMNS]
+    if not cols:
+        return
+    assignments = ", ".join(f"{k} = ?" for k in cols)
+    c.execute(f"UPDATE feeds SET {assignments} WHERE id = ?", [fields[k] for k in cols] + [feed_id])
+
+
+def _apply_job(c, job: FeedWriteJob) -> Dict[str, Any]:
+    _update_feed(c, job.feed_id, job.feed_fields)
+
+    # Feeds occasionally repeat an id; the first occurrence wins (matches document order).
+    entries = []
+    seen = set()
+    for e in job.entries or []:
+        aid = e.get("id")
+        if not aid or aid in seen:
+            continue
+        seen.add(aid)
+        entries.append(e)
+
+    existing: Dict[str, str] = {}
+    ids = [e["id"] for e in entries]
+    for chunk in _chunks(ids, _SQLITE_MAX_VARS):
+        placeholders = ",".join("?" * len(chunk))
+        c.execute(f"SELECT id, date FROM articles WHERE id IN ({placeholders})", chunk)
+        for row in c.fetchall():
+            existing[row[0]] = row[1] or ""
+
+    date_updates = []
+    new_entries = []
+    for e in entries:
+        aid = e["id"]
+        if aid in existing:
+            if existing[aid] != (e.get("date") or ""):
+                date_updates.append((e.get("date"), aid))
+            continue
+        new_entries.append(e)
+
+    if date_updates:
+        c.executemany(
+            f"UPDATE articles SET date = ?1, published_ts = {published_ts_sql('?1')} WHERE id = ?2",
+            date_updates,
+        )
+    if new_entries:
+        c.executemany(
+            "INSERT INTO articles (id, feed_id, title, url, content, date, published_ts, author, is_read, media_url, media_type) "
+            f"VALUES (?, ?, ?, ?, ?, ?6, {published_ts_sql('?6')}, ?, 0, ?, ?)",
+            [
+                (
+                    e["id"], job.feed_id, e.get("title"), e.get("url"), content_store.encode(e.get("content")),
+                    e.get("date"), e.get("author"), e.get("media_url"), e.get("media_type"),
+                )
+                for e in new_entries
+            ],
+        )
+        if job.new_item_time is not None:
+            c.execute("UPDATE feeds SET last_new_item_at = ? WHERE id = ?", (job.new_item_time, job.feed_id))
+        # Slow lookups (NPR audio, chapters) are queued with the insert and run later.
+        enrichment.insert_jobs(c, enrichment.plan_jobs(new_entries))
+        search_index.index_entries(c, new_entries)
+    return {"new_entries": new_entries, "updated": len(date_updates)}
+
+
+class RefreshWriter:
+    """Owns the only refresh-time write connection and applies queued feed results."""
+
+    def __init__(self, max_batch_feeds: int = _DEFAULT_MAX_BATCH_FEEDS, linger_s: float = _DEFAULT_LINGER_S):
+        self.max_batch_feeds = max(1, int(max_batch_feeds))
+        self.linger_s = max(0.0, float(linger_s))
+        self._queue: "queue.Queue[Optional[FeedWriteJob]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {"transactions": 0, "feeds": 0, "inserted": 0, "updated": 0, "failed_feeds": 0}
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="refresh-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, feed_id: str, feed_fields: Dict[str, Any], entries: Optional[List[Dict[str, Any]]] = None,
+               new_item_time: Optional[float] = None) -> concurrent.futures.Future:
+        """Queue feed column updates (see FEED_COLUMNS) plus entries to upsert."""
+        job = FeedWriteJob(
+            feed_id=feed_id,
+            feed_fields=dict(feed_fields or {}),
+            entries=list(entries or []),
+            new_item_time=new_item_time,
+        )
+        self._ensure_started()
+        self._queue.put(job)
+        return job.future
+
+    def write(self, feed_id: str, feed_fields: Dict[str, Any], entries: Optional[List[Dict[str, Any]]] = None,
+              new_item_time: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Submit and wait. Returns the entries that were inserted."""
+        return self.submit(feed_id, feed_fields, entries, new_item_time).result()["new_entries"]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            t = self._thread
+            self._thread = None
+        if t is None:
+            return
+        self._queue.put(None)
+        t.join(timeout=timeout)
+
+    def _next_batch(self, first: FeedWriteJob) -> List[FeedWriteJob]:
+        batch = [first]
+        stop = False
+        while len(batch) < self.max_batch_feeds:
+            try:
+                job = self._queue.get(timeout=self.linger_s) if self.linger_s else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                stop = True
+                break
+            batch.append(job)
+        if stop:
+            # Re-queue the stop marker so the loop exits after this batch.
+            self._queue.put(None)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = self._next_batch(job)
+            try:
+                self._apply_batch(batch)
+            except Exception:
+                LOG.exception("Refresh writer batch failed")
+                for j in batch:
+                    if not j.future.done():
+                        j.future.set_exception(RuntimeError("refresh writer failed"))
+
+    def _apply_batch(self, batch: List[FeedWriteJob]) -> None:
+        with write_connection() as conn:
+            results = None
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                c = conn.cursor()
+                results = [_apply_job(c, j) for j in batch]
+                conn.commit()
+                self._record(len(batch), results, transactions=1)
+            except Exception as e:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                if len(batch) == 1:
+                    self._record_failure(1)
+                    batch[0].future.set_exception(e)
+                    return
+                LOG.debug(f"Group commit failed ({e}); retrying feeds individually")
+                for j in batch:
+                    self._apply_batch([j])
+                return
+        for j, res in zip(batch, results):
+            j.future.set_result(res)
+        if any(res["new_entries"] for res in results):
+            enrichment.notify()
+
+    def _record(self, feeds: int, results, transactions: int) -> None:
+        with self._lock:
+            self._stats["transactions"] += transactions
+            self._stats["feeds"] += feeds
+            for res in results:
+                self._stats["inserted"] += len(res["new_entries"])
+                self._stats["updated"] += int(res["updated"])
+
+    def _record_failure(self, feeds: int) -> None:
+        with self._lock:
+            self._stats["failed_feeds"] += feeds
+
+
+_WRITER: Optional[RefreshWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_writer() -> RefreshWriter:
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = RefreshWriter()
+        return _WRITER
+
+
+def shutdown_writer(timeout: float = 5.0) -> None:
+    with _WRITER_LOCK:
+        w = _WRITER
+    if w is not None:
+        w.shutdown(timeout=timeout)
@@ -0,0 +1,137 @@
+"""
+Full-text search index over articles (SQLite FTS5).
+
+articles_fts (created by core.db.init_db) holds each article's title, author and
+HTML-stripped body under the article's own rowid:
+
+- the refresh writer indexes new articles in the same transaction as the insert,
+- a trigger removes the index row when an article is deleted,
+- articles stored before the index existed are indexed in small batches by the
+  "search_index" background migration (core.background_migrations).
+
+Queries go through LocalProvider.search_articles(); fts_query() turns what the user
+typed into a safe MATCH expression.
+"""
+
+from __future__ import annotations
+
+import html
+import logging
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, Optional
+
+from core import content_store
+from core.db import get_connection, write_connection
+
+LOG = logging.getLogger(__name__)
+
+BACKFILL_BATCH = 500
+
+_SCRIPT_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]*>")
+_WS_RE = re.compile(r"\s+")
+_QUERY_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_MIN_PREFIX = 3
+
+_INSERT_SQL = (
+    "INSERT INTO articles_fts (rowid, article_id, title, author, body) "
+    "VALUES ((SELECT rowid FROM articles WHERE id = ?), ?, ?, ?, ?)"
+)
+
+
+def html_to_text(value: Optional[str]) -> str:
+    """Plain text of an HTML fragment (tags, scripts and entities removed)."""
+    if not value:
+        return ""
+    text = _SCRIPT_RE.sub(" ", value)
+    text = _TAG_RE.sub(" ", text)
+    text = html.unescape(text)
+    return _WS_RE.sub(" ", text).strip()
+
+
+def fts_query(text: Optional[str]) -> str:
+    """FTS5 MATCH expression for user input.
+
+    Every word must match; "quoted phrases" stay phrases and a trailing * makes a
+    prefix search (for stems of at least _MIN_PREFIX characters; shorter ones match
+    most of the archive and would have to rank all of it). Everything else is quoted,
+    so operators and punctuation typed by the user cannot produce a syntax error.
+    """
+    terms = []
+    for m in _QUERY_TOKEN_RE.finditer(text or ""):
+        phrase, word = m.group(1), m.group(2)
+        prefix = False
+        if phrase is None:
+            phrase = word.rstrip("*")
+            prefix = word.endswith("*") and len(phrase) >= _MIN_PREFIX
+        if not any(ch.isalnum() for ch in phrase):
+            continue
+        terms.append('"' + phrase.strip().replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def index_entries(c, entries: Iterable[Dict[str, Any]]) -> None:
+    """Index freshly inserted articles (entry dicts with id/title/author/content)."""
+    rows = [
+        (e["id"], e["id"], e.get("title") or "", e.get("author") or "", html_to_text(e.get("content")))
+        for e in entries
+    ]
+    if not rows:
+        return
+    try:
+        c.executemany(_INSERT_SQL, rows)
+    except sqlite3.OperationalError as e:
+        # FTS5 missing: search is unavailable but the articles themselves are stored.
+        LOG.debug(f"Search indexing skipped: {e}")
+
+
+def pending_count() -> int:
+    """Articles not in the index yet (0 once the backfill has finished)."""
+    conn = get_connection()
+    try:
+        c = conn.cursor()
+        c.execute("SELECT (SELECT COUNT(*) FROM articles) - (SELECT COUNT(*) FROM articles_fts)")
+        return max(0, int(c.fetchone()[0] or 0))
+    finally:
+        conn.close()
+
+
+def backfill_batch(after_rowid: Optional[int] = 0, batch_size: int = BACKFILL_BATCH):
+    """Index the next batch of unindexed articles with rowid > after_rowid.
+
+    Returns (indexed, last_rowid); last_rowid is None when nothing is left.
+    """
+    with write_connection() as conn:
+        # Select and insert in one write transaction so the refresh writer cannot index
+        # the same rows in between.
+        conn.execute("BEGIN IMMEDIATE")
+        c = conn.cursor()
+        c.execute(
+            "SELECT a.rowid, a.id, a.title, a.author, a.content FROM articles a "
+            "WHERE a.rowid > ? AND NOT EXISTS (SELECT 1 FROM articles_fts f WHERE f.rowid = a.rowid) "
+            "ORDER BY a.rowid LIMIT ?",
+            (int(after_rowid or 0), max(1, int(batch_size))),
+        )
+        rows = c.fetchall()
+        if not rows:
+            conn.commit()
+            return 0, None
+        c.executemany(
+            "INSERT INTO articles_fts (rowid, article_id, title, author, body) VALUES (?, ?, ?, ?, ?)",
+            [(r[0], r[1], r[2] or "", r[3] or "", html_to_text(content_store.decode(r[4]))) for r in rows],
+        )
+        conn.commit()
+        return len(rows), rows[-1][0]
+
+
+def backfill(batch_size: int = BACKFILL_BATCH) -> int:
+    """Index every article missing from the index now. Returns the number indexed."""
+    total = 0
+    last_rowid = 0
+    while True:
+        indexed, last = backfill_batch(last_rowid, batch_size)
+        if last is None:
+            return total
+        total += indexed
+        last_rowid = last
@@ -1,14 +1,18 @@
 import requests
 import re
+import time
 import uuid
 import logging
 import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup as BS
 from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from dateutil import parser as dateparser
 from dateutil.parser import UnknownTimezoneWarning
 from io import BytesIO
-from core.db import get_connection
+from core.db import get_connection, write_connection
+from core import http_pool
 import warnings
 import urllib.parse
 
@@ -70,6 +74,18 @@ def safe_requests_get(url, **kwargs):
     return requests.get(url, headers=final_headers, **kwargs)
 
 
+def pooled_requests_get(url, **kwargs):
+    """Like safe_requests_get, but reuses a keep-alive session for the URL's host.
+
+    Use this for repeated fetches against the same hosts (feed refresh, chapters,
+    story pages) so connections are not re-established for every request.
+    """
+    headers = kwargs.pop("headers", {})
+    final_headers = HEADERS.copy()
+    final_headers.update(headers)
+    return http_pool.get_registry().get(url, headers=final_headers, **kwargs)
+
+
 def safe_requests_head(url, **kwargs):
     """Wrapper for requests.head with default browser headers."""
     headers = kwargs.pop("headers", {})
@@ -91,6 +107,19 @@ def format_datetime(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%d %H:%M:%S")
 
 
+_TEXT_ISO_DATE_RE = re.compile(r"\b(\d{4})[/-](\d{1,2})[/-](\d{1,2})\b")
+_TEXT_NUMERIC_DATE_RE = re.compile(r"\b(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})\b")
+_TEXT_MONTH_DAY_YEAR_RE = re.compile(
+    r"(?i)\b(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})\b"
+)
+_TEXT_DAY_MONTH_YEAR_RE = re.compile(
+    r"(?i)\b(\d{1,2})(?:st|nd|rd|th)?\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?,?\s+(\d{4})\b"
+)
+_TEXT_MONTH_DAY_HINT_RE = re.compile(r"(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+\d{1,2}")
+_TEXT_DAY_MONTH_HINT_RE = re.compile(r"\d{1,2}[/-]\d{1,2}")
+_TEXT_ISO_HINT_RE = re.compile(r"\d{4}-\d{1,2}-\d{1,2}")
+
+
 def extract_date_from_text(text: str, fuzzy: bool = True):
     """
     Try multiple date patterns inside arbitrary text.
@@ -100,7 +129,7 @@ def extract_date_from_text(text: str, fuzzy: bool = True):
         return None
     
     # 1) ISO-like yyyy-mm-dd (Check FIRST to avoid greedy matching by other patterns)
-    m_iso = re.search(r"\b(\d{4})[/-](\d{1,2})[/-](\d{1,2})\b", text)
+    m_iso = _TEXT_ISO_DATE_RE.search(text)
     if m_iso:
         try:
             y, mth, d = map(int, m_iso.groups())
@@ -111,7 +140,7 @@ def extract_date_from_text(text: str, fuzzy: bool = True):
 
     # 2) numeric with / or - (e.g. 12/25/2023 or 25-12-23)
     # Require word boundaries to avoid matching inside other numbers
-    m = re.search(r"\b(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})\b", text)
+    m = _TEXT_NUMERIC_DATE_RE.search(text)
     if m:
         a, b, year = m.groups()
         try:
@@ -133,9 +162,9 @@ def extract_date_from_text(text: str, fuzzy: bool = True):
             
     # 3) Explicit Month Name (Strict) - e.g. "Jan 1, 2020", "15 May 1999"
     # Matches: Month DD, YYYY or DD Month YYYY
-    m_text = re.search(r"(?i)\b(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})\b", text)
+    m_text = _TEXT_MONTH_DAY_YEAR_RE.search(text)
     if not m_text:
-        m_text = re.search(r"(?i)\b(\d{1,2})(?:st|nd|rd|th)?\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?,?\s+(\d{4})\b", text)
+        m_text = _TEXT_DAY_MONTH_YEAR_RE.search(text)
         
     if m_text:
         try:
@@ -158,9 +187,9 @@ def extract_date_from_text(text: str, fuzzy: bool = True):
             # we don't want to override feed dates with year-only hints like "2025".
             lower = text.lower()
             has_month_day_hint = (
-                re.search(r"(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+\d{1,2}", lower) or
-                re.search(r"\d{1,2}[/-]\d{1,2}", text) or
-                re.search(r"\d{4}-\d{1,2}-\d{1,2}", text)
+                _TEXT_MONTH_DAY_HINT_RE.search(lower) or
+                _TEXT_DAY_MONTH_HINT_RE.search(text) or
+                _TEXT_ISO_HINT_RE.search(text)
             )
             only_year = (dt.month == 1 and dt.day == 1 and not has_month_day_hint)
             if not only_year:
@@ -172,11 +201,92 @@ def extract_date_from_text(text: str, fuzzy: bool = True):
     return None
 
 
+# Strict shapes that the standard library parses exactly like dateutil does.
+_RFC822_DATE_RE = re.compile(
+    r"^(?:[A-Za-z]{3},\s*)?\d{1,2}\s+[A-Za-z]{3}\s+\d{4}\s+\d{1,2}:\d{2}(?::\d{2})?"
+    r"(?:\s*(?P<tz>[+-]\d{4}|[A-Za-z]{1,5}))?$"
+)
+_ISO8601_DATE_RE = re.compile(
+    r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?"
+    r"(?P<tz>Z|[+-]\d{2}:?\d{2})?$"
+)
+_RFC822_ZONES = frozenset({"UT", "Z"}) | frozenset(TZINFOS)
+_RAW_DATE_CACHE_SIZE = 4096
+
+
+def _parse_raw_date_fast(raw: str):
+    """RFC 822 / ISO 8601 via the standard library; None when the string is not strictly one of them."""
+    m = _RFC822_DATE_RE.match(raw)
+    if m:
+        tz = m.group("tz")
+        if tz and tz[0] not in "+-" and tz.upper() not in _RFC822_ZONES:
+            return None  # unknown zone name: let dateutil decide
+        try:
+            return parsedate_to_datetime(raw)
+        except (TypeError, ValueError, IndexError):
+            return None
+    m = _ISO8601_DATE_RE.match(raw)
+    if m:
+        value = raw
+        tz = m.group("tz")
+        if tz == "Z":
+            value = value[:-1] + "+00:00"
+        elif tz and ":" not in tz:
+            value = value[:-2] + ":" + value[-2:]
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+@lru_cache(maxsize=_RAW_DATE_CACHE_SIZE)
+def _parse_raw_date(raw_date_str: str):
+    """Parse a feed-supplied date string. Returns (aware UTC datetime, formatted) or None.
+
+    Feeds repeat the same few formats and often the same values on every refresh, so
+    results are memoised; the 2-day future check stays in normalize_date() because it
+    depends on the current time.
+    """
+    dt = None
+    # Check for Unix Timestamp (numeric string)
+    if raw_date_str.replace('.', '', 1).isdigit():
+        try:
+            ts = float(raw_date_str)
+            # Reasonable bounds for timestamp (e.g. > 1980 and < 2100)
+            if 315532800 < ts < 4102444800:
+                dt = datetime.fromtimestamp(ts, timezone.utc)
+        except Exception:
+            dt = None
+
+    if dt is None:
+        dt = _parse_raw_date_fast(raw_date_str.strip())
+
+    if dt is None:
+        try:
+            dt = dateparser.parse(raw_date_str, tzinfos=TZINFOS)
+        except Exception:
+            dt = None
+
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    else:
+        try:
+            dt = dt.astimezone(timezone.utc)
+        except (OverflowError, ValueError):
+            return None
+    return dt, format_datetime(dt)
+
+
 def normalize_date(raw_date_str: str, title: str = "", content: str = "", url: str = "") -> str:
     """
     Robust date normalizer.
     Prioritizes the Raw Feed Date to ensure correct sorting of new articles.
     Fallbacks to Title/URL/Content only if the feed date is missing or invalid.
+    Strict RFC 822 / ISO 8601 dates take a standard-library fast path, and parsed raw
+    dates are cached (see _parse_raw_date).
     """
     now = datetime.now(timezone.utc)
     
@@ -197,24 +307,9 @@ def normalize_date(raw_date_str: str, title: str = "", content: str = "", url: s
 
     # 1) Check raw feed date (Priority)
     if raw_date_str:
-        # Check for Unix Timestamp (numeric string)
-        if raw_date_str.replace('.', '', 1).isdigit():
-            try:
-                ts = float(raw_date_str)
-                # Reasonable bounds for timestamp (e.g. > 1980 and < 2100)
-                if 315532800 < ts < 4102444800:
-                    dt = datetime.fromtimestamp(ts, timezone.utc)
-                    if valid(dt):
-                        return format_datetime(dt)
-            except Exception:
-                pass
-
-        try:
-            dt = dateparser.parse(raw_date_str, tzinfos=TZINFOS)
-            if valid(dt):
-                return format_datetime(dt)
-        except Exception:
-            pass
+        parsed = _parse_raw_date(raw_date_str)
+        if parsed is not None and valid(parsed[0]):
+            return parsed[1]
 
     # 2) Check Title (Fallback)
     if title:
@@ -290,14 +385,18 @@ def humanize_article_date(date_str: str, now_utc: datetime = None) -> str:
     dt_utc = parse_datetime_utc(date_str)
     if not dt_utc:
         return ""
+    return humanize_timestamp(dt_utc.timestamp(), now_utc=now_utc)
+
+
+def humanize_timestamp(ts: float, now_utc: datetime = None) -> str:
+    """humanize_article_date() for seconds since the epoch (Article.timestamp); no date parsing."""
+    if not ts or ts <= 0:
+        return ""
 
-    now = now_utc or datetime.now(timezone.utc)
-    delta = now - dt_utc
-    if delta.total_seconds() < 0:
-        delta = timedelta(seconds=0)
+    now = (now_utc or datetime.now(timezone.utc)).timestamp()
+    secs = max(0, int(now - ts))
 
-    if delta <= timedelta(hours=24):
-        secs = int(delta.total_seconds())
+    if secs <= 24 * 3600:
         if secs < 60:
             return "Just now"
         mins = secs // 60
@@ -307,9 +406,7 @@ def humanize_article_date(date_str: str, now_utc: datetime = None) -> str:
         return f"{hours} hour{'s' if hours != 1 else ''} ago"
 
     # Absolute local time
-    local_tz = datetime.now().astimezone().tzinfo or timezone.utc
-    dt_local = dt_utc.astimezone(local_tz)
-    return dt_local.strftime("%Y-%m-%d %H:%M")
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(ts))
 
 
 # --- Chapters ---
@@ -356,11 +453,14 @@ def get_chapters_batch(article_ids: list) -> dict:
         conn.close()
 
 
-def fetch_and_store_chapters(article_id, media_url, media_type, chapter_url=None, allow_id3: bool = True):
+def fetch_and_store_chapters(article_id, media_url, media_type, chapter_url=None, allow_id3: bool = True,
+                             raise_transient: bool = False):
     """
     Fetches chapters from chapter_url (JSON) or media_url (ID3 tags).
     Stores them in DB linked to article_id.
     Returns list of chapter dicts.
+    With raise_transient, a chapter_url download failing with an error worth retrying
+    (host_health.is_transient_error) is raised instead of returning no chapters.
     """
     # Check DB first
     existing = get_chapters_from_db(article_id)
@@ -372,12 +472,11 @@ def fetch_and_store_chapters(article_id, media_url, media_type, chapter_url=None
     # 1) Explicit chapter URL (Podcasting 2.0)
     if chapter_url:
         try:
-            resp = safe_requests_get(chapter_url, timeout=10)
+            resp = pooled_requests_get(chapter_url, timeout=10)
             resp.raise_for_status()
             data = resp.json()
             chapters = data.get("chapters", [])
-            conn = get_connection()
-            try:
+            with write_connection() as conn:
                 c = conn.cursor()
                 for ch in chapters:
                     ch_id = str(uuid.uuid4())
@@ -388,11 +487,13 @@ def fetch_and_store_chapters(article_id, media_url, media_type, chapter_url=None
                               (ch_id, article_id, float(start), title_ch, href))
                     chapters_out.append({"start": float(start), "title": title_ch, "href": href})
                 conn.commit()
-            finally:
-                conn.close()
             if chapters_out:
                 return chapters_out
         except Exception as e:
+            if raise_transient:
+                from core import host_health
+                if host_health.is_transient_error(e):
+                    raise
             log.warning(f"Chapter fetch failed for {chapter_url}: {e}")
 
     if not allow_id3:
@@ -411,7 +512,7 @@ def fetch_and_store_chapters(article_id, media_url, media_type, chapter_url=None
             def _read_prefix_bytes(url: str, *, headers: dict, max_bytes: int, timeout_s: int) -> bytes:
                 if max_bytes <= 0:
                     return b""
-                resp = safe_requests_get(url, headers=headers, timeout=int(timeout_s), stream=True)
+                resp = pooled_requests_get(url, headers=headers, timeout=int(timeout_s), stream=True)
                 try:
                     if not getattr(resp, "ok", False):
                         return b""
@@ -466,8 +567,7 @@ def fetch_and_store_chapters(article_id, media_url, media_type, chapter_url=None
                 return chapters_out
 
             id3 = ID3(BytesIO(tag_bytes))
-            conn = get_connection()
-            try:
+            with write_connection() as conn:
                 c = conn.cursor()
                 for frame in id3.getall("CHAP"):
                     ch_id = str(uuid.uuid4())
@@ -486,8 +586,6 @@ def fetch_and_store_chapters(article_id, media_url, media_type, chapter_url=None
                     chapters_out.append({"start": float(start), "title": title_ch, "href": href})
 
                 conn.commit()
-            finally:
-                conn.close()
         except ImportError:
             log.info("mutagen not installed, skipping ID3 chapter parse.")
         except ID3Error as e:
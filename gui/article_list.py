@@ -0,0 +1,40 @@
+import wx
+
+from gui.article_rows import COLUMNS, ArticleRows
+
+
+class ArticleListCtrl(wx.ListCtrl):
+    """Virtual report list drawing its rows from an ArticleRows model.
+
+    After changing the model call reset() (rows replaced: selection and focus are
+    cleared, like DeleteAllItems) or sync() (rows appended or removed at the end, or
+    changed in place: selection is kept).
+    """
+
+    def __init__(self, parent, rows: ArticleRows):
+        super().__init__(parent, style=wx.LC_REPORT | wx.LC_SINGLE_SEL | wx.LC_VIRTUAL)
+        self.rows = rows
+        for i, (label, width) in enumerate(COLUMNS):
+            self.InsertColumn(i, label, width=width)
+
+    def OnGetItemText(self, item, column):
+        try:
+            return self.rows.text(item, column)
+        except Exception:
+            return ""
+
+    def reset(self) -> None:
+        self.DeleteAllItems()
+        self.SetItemCount(self.rows.count())
+        self.Refresh()
+
+    def sync(self) -> None:
+        count = self.rows.count()
+        if count != self.GetItemCount():
+            self.SetItemCount(count)
+        self.Refresh()
+
+    def refresh_row(self, row: int) -> None:
+        self.rows.invalidate(row)
+        if 0 <= row < self.GetItemCount():
+            self.RefreshItem(row)
@@ -0,0 +1,118 @@
+"""
+Row model behind the virtual article list (gui.article_list.ArticleListCtrl).
+
+A virtual wx.ListCtrl only asks for the text of rows it is about to draw, so showing a
+view means setting the item count, whatever its size. Rows are the loaded articles,
+then an optional trailing row ("Load more items", "Loading more..."); a view with no
+articles shows a single message row ("Loading...", "No articles found.").
+
+Row text (feed title, humanized date, read state) is formatted WINDOW rows at a time
+the first time any row in the window is drawn and kept in an LRU of MAX_WINDOWS
+windows. Anything that changes what an article's row shows calls invalidate().
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from core import utils
+
+# (label, width) per column
+COLUMNS = (
+    ("Title", 350),
+    ("Feed", 150),
+    ("Date", 120),
+    ("Author", 120),
+    ("Status", 80),
+)
+
+Row = Tuple[str, str, str, str, str]
+
+
+class ArticleRows:
+    WINDOW = 64
+    MAX_WINDOWS = 16
+
+    def __init__(self, title_fn: Callable[[object], str], feed_title_fn: Callable[[Optional[str]], str]):
+        self._title_fn = title_fn
+        self._feed_title_fn = feed_title_fn
+        self.articles: Sequence = []
+        self.trailer: Optional[str] = None
+        self.message: Optional[str] = None
+        self._windows: "OrderedDict[int, List[Row]]" = OrderedDict()
+        self.formatted = 0
+
+    def set_articles(self, articles: Sequence) -> None:
+        """Show articles (the list is kept by reference; call invalidate() after changing it)."""
+        self.articles = articles if articles is not None else []
+        self.message = None
+        self.invalidate()
+
+    def set_message(self, text: Optional[str]) -> None:
+        """Show text as the only row (no articles, no trailing row)."""
+        self.articles = []
+        self.trailer = None
+        self.message = text
+        self.invalidate()
+
+    def set_trailer(self, label: Optional[str]) -> None:
+        self.trailer = label
+
+    def count(self) -> int:
+        n = len(self.articles)
+        if n == 0:
+            if self.trailer is None and self.message is not None:
+                return 1
+        return n + (1 if self.trailer is not None else 0)
+
+    def trailer_index(self) -> int:
+        """Index of the trailing row, or -1 when there is none."""
+        return len(self.articles) if self.trailer is not None else -1
+
+    def article_at(self, row: int):
+        if 0 <= row < len(self.articles):
+            return self.articles[row]
+        return None
+
+    def invalidate(self, row: Optional[int] = None) -> None:
+        """Forget formatted text for row's window (or for every row)."""
+        if row is None:
+            self._windows.clear()
+        else:
+            self._windows.pop(row // self.WINDOW, None)
+
+    def text(self, row: int, column: int) -> str:
+        n = len(self.articles)
+        if 0 <= row < n:
+            return self._row(row)[column]
+        if column != 0:
+            return ""
+        if row == n and self.trailer is not None:
+            return self.trailer
+        if row == 0 and n == 0 and self.message is not None:
+            return self.message
+        return ""
+
+    def _row(self, row: int) -> Row:
+        key = row // self.WINDOW
+        window = self._windows.get(key)
+        if window is None:
+            start = key * self.WINDOW
+            window = [self._format(a) for a in self.articles[start:start + self.WINDOW]]
+            self.formatted += len(window)
+            self._windows[key] = window
+            while len(self._windows) > self.MAX_WINDOWS:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(key)
+        return window[row - key * self.WINDOW]
+
+    def _format(self, article) -> Row:
+        return (
+            self._title_fn(article),
+            self._feed_title_fn(article.feed_id) if article.feed_id else "",
+            utils.humanize_timestamp(article.timestamp),
+            article.author or "",
+            "Read" if article.is_read else "Unread",
+        )
@@ -210,6 +210,12 @@ class SettingsDialog(wx.Dialog):
         self.cache_ctrl = wx.SpinCtrl(general_panel, min=5, max=100, initial=int(config.get("max_cached_views", 15)))
         cache_sizer.Add(self.cache_ctrl, 0, wx.ALL, 5)
         general_sizer.Add(cache_sizer, 0, wx.EXPAND | wx.ALL, 5)
+
+        cache_mb_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        cache_mb_sizer.Add(wx.StaticText(general_panel, label="View Cache Memory Limit (MB, 0 = unlimited):"), 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+        self.cache_mb_ctrl = wx.SpinCtrl(general_panel, min=0, max=8192, initial=int(config.get("view_cache_max_mb", 256)))
+        cache_mb_sizer.Add(self.cache_mb_ctrl, 0, wx.ALL, 5)
+        general_sizer.Add(cache_mb_sizer, 0, wx.EXPAND | wx.ALL, 5)
         
         # Downloads
         self.downloads_chk = wx.CheckBox(general_panel, label="Enable Downloads")
@@ -448,6 +454,7 @@ class SettingsDialog(wx.Dialog):
             "show_player_on_play": self.show_player_on_play_chk.GetValue(),
             "vlc_network_caching_ms": self.vlc_cache_ctrl.GetValue(),
             "max_cached_views": self.cache_ctrl.GetValue(),
+            "view_cache_max_mb": self.cache_mb_ctrl.GetValue(),
             "downloads_enabled": self.downloads_chk.GetValue(),
             "download_path": self.dl_path_ctrl.GetValue(),
             "download_retention": self.retention_ctrl.GetValue(),
@@ -1004,6 +1011,28 @@ class AboutDialog(wx.Dialog):
         repo_btn.Bind(wx.EVT_BUTTON, lambda e: webbrowser.open("https://github.com/serrebi/BlindRSS"))
         close_btn.Bind(wx.EVT_BUTTON, lambda e: self.EndModal(wx.ID_CLOSE))
 
+class DiagnosticsDialog(wx.Dialog):
+    """Read-only report (view cache size, hit ratio, ...) in a text box screen readers can walk."""
+
+    def __init__(self, parent, text):
+        super().__init__(parent, title="Diagnostics", size=(560, 420), style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        self.text_ctrl = wx.TextCtrl(self, value=text, style=wx.TE_MULTILINE | wx.TE_READONLY)
+        self.text_ctrl.SetName("Diagnostics")
+        sizer.Add(self.text_ctrl, 1, wx.EXPAND | wx.ALL, 10)
+
+        close_btn = wx.Button(self, wx.ID_CLOSE, "Close")
+        sizer.Add(close_btn, 0, wx.ALIGN_CENTER | wx.BOTTOM, 10)
+
+        self.SetSizer(sizer)
+        self.SetEscapeId(wx.ID_CLOSE)
+        self.Centre()
+        self.text_ctrl.SetFocus()
+
+        close_btn.Bind(wx.EVT_BUTTON, lambda e: self.EndModal(wx.ID_CLOSE))
+
+
 # Backwards-compatible name (menu item was historically called "Search Podcast").
 PodcastSearchDialog = FeedSearchDialog
 
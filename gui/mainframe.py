@@ -11,7 +11,7 @@ import logging
 from urllib.parse import urlsplit
 from bs4 import BeautifulSoup
 # from dateutil import parser as date_parser  # Removed unused import
-from .dialogs import AddFeedDialog, SettingsDialog, FeedPropertiesDialog, AboutDialog
+from .dialogs import AddFeedDialog, SettingsDialog, FeedPropertiesDialog, AboutDialog, DiagnosticsDialog
 from .player import PlayerFrame
 from .tray import BlindRSSTrayIcon
 from .hotkeys import HoldRepeatHotkeys
@@ -22,7 +22,14 @@ from core import article_extractor
 from core import updater
 from core.version import APP_VERSION
 from core import dependency_check
+from core import enrichment
+from core import maintenance
 import core.discovery
+from gui.article_list import ArticleListCtrl
+from gui.article_rows import ArticleRows
+from gui import view_cache
+from gui.prefetch import ViewPrefetcher, top_unread_categories
+from gui import tree_model
 
 log = logging.getLogger(__name__)
 
@@ -44,6 +51,14 @@ class MainFrame(wx.Frame):
         self.view_cache = {}
         self._view_cache_lock = threading.Lock()
         self.max_cached_views = int(self.config_manager.get("max_cached_views", 15))
+        self.view_cache_max_bytes = view_cache.max_bytes_from_setting(
+            self.config_manager.get("view_cache_max_mb", view_cache.DEFAULT_MAX_MB)
+        )
+        self.view_cache_keep_stubs = bool(self.config_manager.get("view_cache_keep_stubs", True))
+        self.view_cache_stats = view_cache.ViewCacheStats()
+        # Warms view_cache for the tree items around the selection while the user is idle.
+        self.prefetch_enabled = bool(self.config_manager.get("prefetch_views", True))
+        self.prefetcher = ViewPrefetcher(self._prefetch_fetch, self._store_prefetched_view, self._prefetch_wanted)
 
         self.current_feed_id = None
         self._loading_more_placeholder = False
@@ -52,6 +67,10 @@ class MainFrame(wx.Frame):
         self._load_more_inflight = False
         self._load_more_label = "Load more items (Enter)"
         self._loading_label = "Loading more..."
+        # Article search: the list shows view "search:<query>", ranked within this view id.
+        self._search_scope = "all"
+        # search_articles() cursor for the next page of the current search (None: no more)
+        self._search_cursor = None
         
         # Create player window lazily to keep startup fast.
         self.player_window = None
@@ -74,6 +93,9 @@ class MainFrame(wx.Frame):
         self.init_menus()
         self.init_shortcuts()
         self.Bind(wx.EVT_CHAR_HOOK, self.on_char_hook)
+
+        # Audio/chapters found after refresh by the background enrichment worker.
+        enrichment.add_listener(self._on_article_enriched)
         
         self.tray_icon = BlindRSSTrayIcon(self)
         
@@ -84,6 +106,9 @@ class MainFrame(wx.Frame):
         self.stop_event = threading.Event()
         self.refresh_thread = threading.Thread(target=self.refresh_loop, daemon=True)
         self.refresh_thread.start()
+
+        # Article retention and vacuum run on their own schedule (see core.maintenance)
+        maintenance.start(lambda: maintenance.retention_days(self.config_manager.get("article_retention", "Unlimited")))
         
         # Initial load
         self.refresh_feeds()
@@ -128,18 +153,16 @@ class MainFrame(wx.Frame):
         self.tree.SetName("Feeds Tree")
         self.root = self.tree.AddRoot("Root")
         self.all_feeds_node = self.tree.AppendItem(self.root, "All Feeds")
+        # Mirrors the tree's categories and feeds so refreshes only touch changed items.
+        self.tree_sync = tree_model.TreeSync(tree_model.WxTreeBackend(self.tree, self.root))
         
         # Right: Splitter (List + Content)
         right_splitter = wx.SplitterWindow(splitter)
         
-        # Top Right: List (Articles)
-        self.list_ctrl = wx.ListCtrl(right_splitter, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        # Top Right: List (Articles). Virtual: rows are drawn from self.article_rows on demand.
+        self.article_rows = ArticleRows(self._get_display_title, self._get_list_feed_title)
+        self.list_ctrl = ArticleListCtrl(right_splitter, self.article_rows)
         self.list_ctrl.SetName("Articles List")
-        self.list_ctrl.InsertColumn(0, "Title", width=350)
-        self.list_ctrl.InsertColumn(1, "Feed", width=150)
-        self.list_ctrl.InsertColumn(2, "Date", width=120)
-        self.list_ctrl.InsertColumn(3, "Author", width=120)
-        self.list_ctrl.InsertColumn(4, "Status", width=80)
         
         # Bottom Right: Content (No embedded player anymore)
         self.content_ctrl = wx.TextCtrl(right_splitter, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_RICH2)
@@ -265,6 +288,7 @@ class MainFrame(wx.Frame):
                     "total": None,
                     "page_size": self.article_page_size,
                     "paged_offset": 0,
+                    "cursor": None,
                     "fully_loaded": False,
                     "last_access": time.time(),
                 }
@@ -272,32 +296,31 @@ class MainFrame(wx.Frame):
             else:
                 st["last_access"] = time.time()
 
-            # LRU prune
-            try:
-                max_views = int(getattr(self, "max_cached_views", 15))
-            except Exception:
-                max_views = 15
-
-            if max_views > 0 and len(self.view_cache) > max_views:
-                # Evict least recently used views, but never evict the current view.
-                current = getattr(self, "current_feed_id", None)
-                items = []
-                for k, v in list(self.view_cache.items()):
-                    if k == current:
-                        continue
-                    ts = 0.0
-                    try:
-                        ts = float(v.get("last_access", 0.0))
-                    except Exception:
-                        ts = 0.0
-                    items.append((ts, k))
-                items.sort()
-                while len(self.view_cache) > max_views and items:
-                    _, victim = items.pop(0)
-                    self.view_cache.pop(victim, None)
-
+            self._prune_view_cache_locked()
             return st
 
+    def _prune_view_cache_locked(self):
+        """LRU-evict views over max_cached_views or the byte budget, never the current view."""
+        try:
+            max_views = int(getattr(self, "max_cached_views", 15))
+        except Exception:
+            max_views = 15
+        try:
+            view_cache.prune(
+                self.view_cache,
+                keep=getattr(self, "current_feed_id", None),
+                max_views=max_views,
+                max_bytes=int(getattr(self, "view_cache_max_bytes", 0)),
+                keep_stubs=bool(getattr(self, "view_cache_keep_stubs", True)),
+                stats=getattr(self, "view_cache_stats", None),
+            )
+        except Exception:
+            log.exception("Error pruning view cache")
+
+    def _prune_view_cache(self):
+        with getattr(self, "_view_cache_lock", threading.Lock()):
+            self._prune_view_cache_locked()
+
     def _select_view(self, feed_id: str):
         """Switch the UI to a view, using cached articles when available."""
         if not feed_id:
@@ -308,27 +331,25 @@ class MainFrame(wx.Frame):
         self.selected_article_id = None
 
         # If we have cached articles for this view, render them immediately.
+        stub = None
         with getattr(self, "_view_cache_lock", threading.Lock()):
             st = self.view_cache.get(feed_id)
+            if view_cache.is_stub(st):
+                # Evicted to stay within the memory budget: reload as many articles as it showed.
+                stub = st.pop("stub")
+                st["last_access"] = time.time()
+        stats = getattr(self, "view_cache_stats", None)
+        if stub is not None:
+            if stats:
+                stats.record("stub")
+            self._begin_articles_load(feed_id, full_load=True, clear_list=True, limit=stub)
+            return
         if st and isinstance(st.get("articles"), list) and st.get("articles"):
+            if stats:
+                stats.record("hit")
             self.current_articles = list(st.get("articles") or [])
-            self.list_ctrl.DeleteAllItems()
             self._remove_loading_more_placeholder()
-
-            self.list_ctrl.Freeze()
-            for i, article in enumerate(self.current_articles):
-                idx = self.list_ctrl.InsertItem(i, self._get_display_title(article))
-                feed_title = ""
-                try:
-                    feed = self.feed_map.get(article.feed_id)
-                    feed_title = (feed.title or "") if feed else ""
-                except Exception:
-                    feed_title = ""
-                self.list_ctrl.SetItem(idx, 1, feed_title)
-                self.list_ctrl.SetItem(idx, 2, utils.humanize_article_date(article.date))
-                self.list_ctrl.SetItem(idx, 3, article.author or "")
-                self.list_ctrl.SetItem(idx, 4, "Read" if article.is_read else "Unread")
-            self.list_ctrl.Thaw()
+            self._render_article_rows()
 
             if not bool(st.get("fully_loaded", False)):
                 self._add_loading_more_placeholder()
@@ -338,27 +359,29 @@ class MainFrame(wx.Frame):
             # Start a cheap top-up (latest page) in the background.
             self.current_request_id = time.time()
             threading.Thread(
-                target=self._load_articles_thread,
-                args=(feed_id, self.current_request_id, False),
+                target=self._in_foreground,
+                args=(self._load_articles_thread, feed_id, self.current_request_id, False),
                 daemon=True,
             ).start()
             return
 
         # If we have cached empty state, show it immediately and still top-up.
         if st and isinstance(st.get("articles"), list) and not st.get("articles") and st.get("fully_loaded"):
+            if stats:
+                stats.record("hit")
             self.current_articles = []
-            self.list_ctrl.DeleteAllItems()
-            self._remove_loading_more_placeholder()
-            self.list_ctrl.InsertItem(0, "No articles found.")
+            self._show_list_message("No articles found.")
             self.current_request_id = time.time()
             threading.Thread(
-                target=self._load_articles_thread,
-                args=(feed_id, self.current_request_id, False),
+                target=self._in_foreground,
+                args=(self._load_articles_thread, feed_id, self.current_request_id, False),
                 daemon=True,
             ).start()
             return
 
         # No cache yet: do fast-first + background history.
+        if stats:
+            stats.record("miss")
         self._begin_articles_load(feed_id, full_load=True, clear_list=True)
 
     def _resume_history_thread(self, feed_id: str, request_id):
@@ -378,6 +401,8 @@ class MainFrame(wx.Frame):
                 except Exception:
                     offset = 0
 
+            cached = st.get("articles") or []
+            cursor = st.get("cursor") or self._keyset_cursor(cached)
             total = st.get("total")
 
             while True:
@@ -394,7 +419,7 @@ class MainFrame(wx.Frame):
                     except Exception:
                         pass
 
-                page, page_total = self.provider.get_articles_page(feed_id, offset=offset, limit=page_size)
+                page, page_total = self._fetch_older_page(feed_id, offset, page_size, cursor)
                 if total is None and page_total is not None:
                     total = page_total
                 if page is None:
@@ -402,10 +427,11 @@ class MainFrame(wx.Frame):
                 if not page:
                     break
 
+                cursor = self._keyset_cursor(page)
                 # Sort newest-first defensively.
                 page.sort(key=lambda a: (a.timestamp, a.id), reverse=True)
 
-                wx.CallAfter(self._append_articles, page, request_id, total, page_size)
+                wx.CallAfter(self._append_articles, page, request_id, total, page_size, cursor=cursor)
 
                 offset += len(page)
                 try:
@@ -449,6 +475,8 @@ class MainFrame(wx.Frame):
         view_menu = wx.Menu()
         # Ctrl+P is handled globally (see main.py GlobalMediaKeyFilter). Do not make it a menu accelerator.
         player_item = view_menu.Append(wx.ID_ANY, "Show/Hide &Player (Ctrl+P)", "Show or hide the media player window")
+        view_menu.AppendSeparator()
+        search_articles_item = view_menu.Append(wx.ID_ANY, "&Search Articles...\tCtrl+F", "Search article titles, authors and text")
 
         # Player menu (media controls)
         player_menu = wx.Menu()
@@ -468,6 +496,7 @@ class MainFrame(wx.Frame):
         
         tools_menu = wx.Menu()
         find_feed_item = tools_menu.Append(wx.ID_ANY, "Find a &Podcast or RSS Feed...", "Find and add a podcast or RSS feed")
+        diagnostics_item = tools_menu.Append(wx.ID_ANY, "&Diagnostics...", "Show view cache size and hit ratio")
         tools_menu.AppendSeparator()
         settings_item = tools_menu.Append(wx.ID_PREFERENCES, "&Settings...", "Configure application")
         
@@ -490,6 +519,7 @@ class MainFrame(wx.Frame):
         self.Bind(wx.EVT_MENU, self.on_import_opml, import_opml_item)
         self.Bind(wx.EVT_MENU, self.on_export_opml, export_opml_item)
         self.Bind(wx.EVT_MENU, self.on_show_player, player_item)
+        self.Bind(wx.EVT_MENU, self.on_search_articles, search_articles_item)
         self.Bind(wx.EVT_MENU, self.on_show_player, player_toggle_item)
         self.Bind(wx.EVT_MENU, self.on_player_play_pause, player_play_pause_item)
         self.Bind(wx.EVT_MENU, self.on_player_stop, player_stop_item)
@@ -498,6 +528,7 @@ class MainFrame(wx.Frame):
         self.Bind(wx.EVT_MENU, self.on_player_volume_up, player_vol_up_item)
         self.Bind(wx.EVT_MENU, self.on_player_volume_down, player_vol_down_item)
         self.Bind(wx.EVT_MENU, self.on_settings, settings_item)
+        self.Bind(wx.EVT_MENU, self.on_diagnostics, diagnostics_item)
         self.Bind(wx.EVT_MENU, self.on_check_updates, check_updates_item)
         self.Bind(wx.EVT_MENU, self.on_exit, exit_item)
         self.Bind(wx.EVT_MENU, self.on_find_feed, find_feed_item)
@@ -751,6 +782,11 @@ class MainFrame(wx.Frame):
             self._fulltext_worker_event.set()
         except Exception:
             pass
+        enrichment.remove_listener(self._on_article_enriched)
+        try:
+            self.prefetcher.stop()
+        except Exception:
+            log.exception("Error stopping view prefetch")
 
         self.stop_event.set()
         if self.refresh_thread.is_alive():
@@ -958,6 +994,34 @@ class MainFrame(wx.Frame):
                  # maybe refresh content?
                  pass
 
+    def _on_article_enriched(self, event):
+        # Called from the enrichment worker thread.
+        if not event or not event.get("media_url"):
+            return
+        try:
+            wx.CallAfter(self._apply_article_enrichment, event)
+        except Exception:
+            log.debug("Failed to schedule article enrichment update", exc_info=True)
+
+    def _apply_article_enrichment(self, event):
+        article_id = event.get("article_id")
+        for a in self.current_articles:
+            if a.id == article_id:
+                a.media_url = event.get("media_url")
+                a.media_type = event.get("media_type")
+                self._refresh_article_in_list(article_id)
+                return
+        # Not in the visible list; keep cached views consistent for when the user navigates back.
+        try:
+            with getattr(self, "_view_cache_lock", threading.Lock()):
+                for st in (self.view_cache or {}).values():
+                    for a in (st.get("articles") or []):
+                        if getattr(a, "id", None) == article_id:
+                            a.media_url = event.get("media_url")
+                            a.media_type = event.get("media_type")
+        except Exception:
+            pass
+
     def _update_cached_views_for_article(self, article):
         try:
             with getattr(self, "_view_cache_lock", threading.Lock()):
@@ -993,10 +1057,17 @@ class MainFrame(wx.Frame):
         view_id = view_id or ""
         return view_id.startswith("favorites:") or view_id.startswith("fav:")
 
+    def _is_search_view(self, view_id: str) -> bool:
+        return (view_id or "").startswith("search:")
+
     def _get_display_title(self, article) -> str:
         """Return title to display in list. Now that we have a Feed column, just return the title."""
         title = article.title or ""
         # Removed appending feed title since it now has a column
+        snippet = getattr(article, "snippet", None)
+        if snippet:
+            # Search results: read the matching text along with the title.
+            title = f"{title} - {snippet}"
         return title
 
     def _sync_favorite_flag_in_cached_views(self, article_id: str, is_favorite: bool) -> None:
@@ -1047,28 +1118,16 @@ class MainFrame(wx.Frame):
             log.exception("Error decrementing view total for view_id '%s'", view_id)
 
     def _remove_article_from_current_list(self, idx: int) -> None:
-        froze = False
         try:
-            self.list_ctrl.Freeze()
-            froze = True
+            self.current_articles.pop(idx)
         except Exception:
-            log.exception("Error freezing list_ctrl")
-
+            log.exception("Error popping article from current_articles at index %s", idx)
         try:
-            try:
-                self.current_articles.pop(idx)
-            except Exception:
-                log.exception("Error popping article from current_articles at index %s", idx)
-            try:
-                self.list_ctrl.DeleteItem(idx)
-            except Exception:
-                log.exception("Error deleting item from list_ctrl at index %s", idx)
-        finally:
-            if froze:
-                try:
-                    self.list_ctrl.Thaw()
-                except Exception:
-                    log.exception("Error thawing list_ctrl")
+            # Rows below idx move up one; the selection stays at idx (the next article).
+            self.article_rows.set_articles(self.current_articles)
+            self.list_ctrl.sync()
+        except Exception:
+            log.exception("Error removing item from list_ctrl at index %s", idx)
 
     def _remove_article_from_cached_views(self, article_id: str) -> None:
         try:
@@ -1175,9 +1234,7 @@ class MainFrame(wx.Frame):
 
     def _show_empty_articles_state(self) -> None:
         try:
-            self._remove_loading_more_placeholder()
-            self.list_ctrl.DeleteAllItems()
-            self.list_ctrl.InsertItem(0, "No articles found.")
+            self._show_list_message("No articles found.")
             self.content_ctrl.Clear()
             self.selected_article_id = None
         except Exception:
@@ -1357,30 +1414,6 @@ class MainFrame(wx.Frame):
 
     def _refresh_feeds_worker(self):
         try:
-            # Perform retention cleanup first
-            try:
-                from core.db import cleanup_old_articles
-                retention_str = self.config_manager.get("article_retention", "Unlimited")
-                days = None
-                if retention_str == "1 day": days = 1
-                elif retention_str == "2 days": days = 2
-                elif retention_str == "3 days": days = 3
-                elif retention_str == "1 week": days = 7
-                elif retention_str == "2 weeks": days = 14
-                elif retention_str == "3 weeks": days = 21
-                elif retention_str == "1 month": days = 30
-                elif retention_str == "2 months": days = 60
-                elif retention_str == "3 months": days = 90
-                elif retention_str == "6 months": days = 180
-                elif retention_str == "1 year": days = 365
-                elif retention_str == "2 years": days = 730
-                elif retention_str == "5 years": days = 1825
-                
-                if days is not None:
-                    cleanup_old_articles(days)
-            except Exception as e:
-                log.error(f"Retention cleanup failed: {e}")
-
             feeds = self.provider.get_feeds()
             all_cats = self.provider.get_categories()
             wx.CallAfter(self._update_tree, feeds, all_cats)
@@ -1441,10 +1474,7 @@ class MainFrame(wx.Frame):
             feed_obj.category = category
 
         # Update tree label if present
-        node = self.feed_nodes.get(feed_id)
-        if node and node.IsOk():
-            label = f"{title} ({unread})" if unread > 0 else title
-            self.tree.SetItemText(node, label)
+        self.tree_sync.relabel(("feed", feed_id), tree_model.feed_label(title, unread))
 
         # If the selected view is impacted, schedule article reload
         sel = self.tree.GetSelection()
@@ -1482,105 +1512,45 @@ class MainFrame(wx.Frame):
             selected_data = hint
             self._selection_hint = None
 
-        frozen = False
-        self._updating_tree = True
+        favorites = False
         try:
-            self.tree.Freeze() # Stop updates while rebuilding
-            frozen = True
-            self.tree.DeleteChildren(self.all_feeds_node)
-            self.tree.DeleteChildren(self.root)
+            favorites = bool(getattr(self.provider, "supports_favorites", lambda: False)())
+        except Exception:
+            favorites = False
 
-            # Map feed id -> Feed and Tree items for quick lookup (downloads, labeling)
+        self._updating_tree = True
+        try:
+            # Map feed id -> Feed for quick lookup (downloads, labeling)
             self.feed_map = {f.id: f for f in feeds}
-            self.feed_nodes = {}
-            
-            # Special Views
-            self.all_feeds_node = self.tree.AppendItem(self.root, "All Articles")
-            self.tree.SetItemData(self.all_feeds_node, {"type": "all", "id": "all"})
-
-            self.unread_node = self.tree.AppendItem(self.root, "Unread Articles")
-            self.tree.SetItemData(self.unread_node, {"type": "all", "id": "unread:all"})
-            
-            self.read_node = self.tree.AppendItem(self.root, "Read Articles")
-            self.tree.SetItemData(self.read_node, {"type": "all", "id": "read:all"})
-
-            self.favorites_node = None
-            try:
-                if getattr(self.provider, "supports_favorites", lambda: False)():
-                    self.favorites_node = self.tree.AppendItem(self.root, "Favorites")
-                    self.tree.SetItemData(self.favorites_node, {"type": "all", "id": "favorites:all"})
-            except Exception:
-                self.favorites_node = None
-            
-            # Group by category
-            categories = {c: [] for c in all_cats} # Initialize with all known categories
-            
-            for feed in feeds:
-                cat = feed.category or "Uncategorized"
-                if cat not in categories:
-                    categories[cat] = []
-                categories[cat].append(feed)
-                
-            # Sort categories alphabetically
-            sorted_cats = sorted(categories.keys())
-            
-            item_to_select = None
 
-            for cat in sorted_cats:
-                cat_feeds = categories[cat]
-                # Sort feeds alphabetically by title
-                cat_feeds.sort(key=lambda f: (f.title or "").lower())
-                
-                cat_node = self.tree.AppendItem(self.root, cat)
-                cat_data = {"type": "category", "id": cat}
-                self.tree.SetItemData(cat_node, cat_data)
-                
-                # Check if this category was selected
-                if selected_data and selected_data["type"] == "category" and selected_data["id"] == cat:
-                    item_to_select = cat_node
-
-                for feed in cat_feeds:
-                    title = f"{feed.title} ({feed.unread_count})" if feed.unread_count > 0 else feed.title
-                    node = self.tree.AppendItem(cat_node, title)
-                    feed_data = {"type": "feed", "id": feed.id}
-                    self.tree.SetItemData(node, feed_data)
-                    self.feed_nodes[feed.id] = node
-                    
-                    # Check if this feed was selected
-                    if selected_data and selected_data["type"] == "feed" and selected_data["id"] == feed.id:
-                        item_to_select = node
+            # Only changed items are touched; unchanged ones keep their handles and selection.
+            stats = self.tree_sync.sync(tree_model.build_spec(feeds, all_cats, favorites=favorites))
+            if any(stats.values()):
+                log.debug("Feed tree update: %s", stats)
 
-            self.tree.ExpandAll()
+            self.feed_nodes = self.tree_sync.handles("feed")
+            self.all_feeds_node = self.tree_sync.handle(("all", "all"))
+            self.unread_node = self.tree_sync.handle(("all", "unread:all"))
+            self.read_node = self.tree_sync.handle(("all", "read:all"))
+            self.favorites_node = self.tree_sync.handle(("all", "favorites:all"))
 
-            # Restore selection (default to All Feeds on first load so the list populates)
+            # Restore selection (default to All Articles on first load so the list populates)
             selection_target = None
-            if selected_data and selected_data["type"] == "all":
-                if selected_data.get("id") == "unread:all":
-                    selection_target = self.unread_node
-                elif selected_data.get("id") == "read:all":
-                    selection_target = self.read_node
-                elif selected_data.get("id") == "favorites:all" and self.favorites_node and self.favorites_node.IsOk():
-                    selection_target = self.favorites_node
-                else:
-                    selection_target = self.all_feeds_node
-            elif item_to_select and item_to_select.IsOk():
-                selection_target = item_to_select
-            else:
+            if selected_data:
+                selection_target = self.tree_sync.handle((selected_data.get("type"), selected_data.get("id")))
+            if selection_target is None:
                 selection_target = self.all_feeds_node
 
             if selection_target and selection_target.IsOk():
-                # Ignore transient EVT_TREE_SEL_CHANGED during rebuild; we refresh explicitly below.
-                self.tree.SelectItem(selection_target)
+                current = self.tree.GetSelection()
+                if not (current.IsOk() and current == selection_target):
+                    # Ignore transient EVT_TREE_SEL_CHANGED during the update; we refresh explicitly below.
+                    self.tree.SelectItem(selection_target)
         finally:
-            if frozen:
-                try:
-                    self.tree.Thaw() # Resume updates
-                except Exception:
-                    pass
             self._updating_tree = False
 
         # Ensure article list refreshes after auto/remote refresh.
-        # Re-selecting items on a rebuilt tree does not always emit EVT_TREE_SEL_CHANGED,
+        # Re-selecting items on an updated tree does not always emit EVT_TREE_SEL_CHANGED,
         # so explicitly trigger a load for the currently selected node.
         self._reload_selected_articles()
 
@@ -1599,21 +1569,19 @@ class MainFrame(wx.Frame):
             return f"category:{data.get('id')}"
         return None
 
-    def _begin_articles_load(self, feed_id: str, full_load: bool = True, clear_list: bool = True):
+    def _begin_articles_load(self, feed_id: str, full_load: bool = True, clear_list: bool = True, limit: int | None = None):
         # Track current view so auto-refresh can do a cheap "top-up" without reloading history.
         self.current_feed_id = feed_id
 
         if clear_list:
-            self._remove_loading_more_placeholder()
-            self.list_ctrl.DeleteAllItems()
-            self.list_ctrl.InsertItem(0, "Loading...")
+            self._show_list_message("Loading...")
             self.content_ctrl.Clear()
 
         # Use a request ID to handle race conditions (if user clicks fast / auto-refresh overlaps).
         self.current_request_id = time.time()
         threading.Thread(
-            target=self._load_articles_thread,
-            args=(feed_id, self.current_request_id, full_load),
+            target=self._in_foreground,
+            args=(self._load_articles_thread, feed_id, self.current_request_id, full_load, limit),
             daemon=True
         ).start()
 
@@ -1623,6 +1591,9 @@ class MainFrame(wx.Frame):
         If the view is already loaded, only fetch the newest page and merge it in.
         If the view isn't loaded yet (or selection changed), do a full load.
         """
+        if self._is_search_view(getattr(self, "current_feed_id", None)):
+            # Keep search results on screen; selecting a tree node leaves the search.
+            return
         item = self.tree.GetSelection()
         feed_id = self._get_feed_id_from_tree_item(item)
         if not feed_id:
@@ -1656,21 +1627,100 @@ class MainFrame(wx.Frame):
             return
 
         self._select_view(feed_id)
+        self._schedule_prefetch(item)
 
-    def _load_articles_thread(self, feed_id, request_id, full_load: bool = True):
+    def _in_foreground(self, fn, *args):
+        """Run a user-initiated load; idle prefetch waits until it finishes."""
+        with self.prefetcher.foreground():
+            fn(*args)
+
+    def _schedule_prefetch(self, item):
+        """Queue the tree items around item and the categories with the most unread articles."""
+        if not getattr(self, "prefetch_enabled", True):
+            self.prefetcher.cancel()
+            return
+        view_ids = []
+        for step in (self.tree.GetNextVisible, self.tree.GetPrevVisible):
+            try:
+                view_ids.append(self._get_feed_id_from_tree_item(step(item)))
+            except Exception:
+                pass
+        try:
+            view_ids.extend(f"category:{c}" for c in top_unread_categories(list(self.feed_map.values())))
+        except Exception:
+            log.exception("Error ranking categories for prefetch")
+        self.prefetcher.schedule(view_ids)
+
+    def _prefetch_wanted(self, view_id: str) -> bool:
+        if not view_id or self._is_search_view(view_id) or view_id == getattr(self, "current_feed_id", None):
+            return False
+        with self._view_cache_lock:
+            st = self.view_cache.get(view_id)
+            return st is None or view_cache.is_stub(st)
+
+    def _prefetch_fetch(self, view_id: str):
+        """First page of a view (prefetch worker thread); a stub reloads what it had."""
+        page_size = self.article_page_size
+        with self._view_cache_lock:
+            st = self.view_cache.get(view_id)
+            limit = st["stub"] if view_cache.is_stub(st) else 0
+        page, total = self.provider.get_articles_page(view_id, offset=0, limit=max(page_size, limit))
+        page = page or []
+        cursor = self._keyset_cursor(page)
+        page.sort(key=lambda a: (a.timestamp, a.id), reverse=True)
+        return page, total, page_size, cursor
+
+    def _store_prefetched_view(self, view_id: str, result) -> None:
+        page, total, page_size, cursor = result
+        with self._view_cache_lock:
+            if view_id == getattr(self, "current_feed_id", None):
+                return
+            st = self.view_cache.get(view_id)
+            if st is not None and not view_cache.is_stub(st):
+                return
+            if total is not None:
+                fully = len(page) >= int(total)
+            else:
+                fully = len(page) < int(page_size)
+            self.view_cache[view_id] = {
+                "articles": page,
+                "id_set": {a.id for a in page},
+                "total": total,
+                "page_size": int(page_size),
+                "paged_offset": len(page),
+                "cursor": cursor,
+                "fully_loaded": bool(fully),
+                "last_access": time.time(),
+            }
+            self._prune_view_cache_locked()
+
+    def _load_articles_thread(self, feed_id, request_id, full_load: bool = True, limit: int | None = None):
         page_size = self.article_page_size
+        if self._is_search_view(feed_id):
+            try:
+                # Results stay in rank order; "Load more" continues from next_cursor.
+                page, next_cursor = self.provider.search_articles(
+                    feed_id[len("search:"):], view_id=self._search_scope, limit=page_size
+                )
+                page = page or []
+            except Exception:
+                log.exception("Error searching articles")
+                page, next_cursor = [], None
+            wx.CallAfter(self._populate_search_results, page, next_cursor, request_id, page_size)
+            return
         try:
-            # Fast-first page
-            page, total = self.provider.get_articles_page(feed_id, offset=0, limit=page_size)
+            # Fast-first page (or, reloading an evicted view, everything it had loaded)
+            page, total = self.provider.get_articles_page(feed_id, offset=0, limit=max(page_size, int(limit or 0)))
             # Ensure stable order (newest first)
             page = page or []
+            cursor = self._keyset_cursor(page)
             page.sort(key=lambda a: (a.timestamp, a.id), reverse=True)
 
             if not full_load:
                 wx.CallAfter(self._quick_merge_articles, page, request_id, feed_id)
                 return
 
-            wx.CallAfter(self._populate_articles, page, request_id, total, page_size)
+            wx.CallAfter(self._populate_articles, page, request_id, total, page_size, cursor)
 
         except Exception as e:
             print(f"Error loading articles: {e}")
@@ -1678,7 +1728,15 @@ class MainFrame(wx.Frame):
                 wx.CallAfter(self._populate_articles, [], request_id, 0, page_size)
             # For quick mode, just do nothing on failure.
 
-    def _populate_articles(self, articles, request_id, total=None, page_size: int | None = None):
+    def _populate_search_results(self, articles, next_cursor, request_id, page_size):
+        if not hasattr(self, 'current_request_id') or request_id != self.current_request_id:
+            return
+        self._search_cursor = next_cursor
+        # Without a cursor this is every match; with one, the full page shows "Load more".
+        total = len(articles) if next_cursor is None else None
+        self._populate_articles(articles, request_id, total, page_size)
+
+    def _populate_articles(self, articles, request_id, total=None, page_size: int | None = None, cursor=None):
         # If a newer request was started, ignore this result
         if not hasattr(self, 'current_request_id') or request_id != self.current_request_id:
             return
@@ -1688,12 +1746,11 @@ class MainFrame(wx.Frame):
         self._remove_loading_more_placeholder()
 
         self.current_articles = list(articles or [])
-        self.list_ctrl.DeleteAllItems()
 
         fid = getattr(self, 'current_feed_id', None)
 
         if not self.current_articles:
-            self.list_ctrl.InsertItem(0, 'No articles found.')
+            self._show_list_message('No articles found.')
             # Cache empty state
             if fid:
                 st = self._ensure_view_state(fid)
@@ -1706,21 +1763,7 @@ class MainFrame(wx.Frame):
                 st['last_access'] = time.time()
             return
 
-        self.list_ctrl.Freeze()
-        for i, article in enumerate(self.current_articles):
-            idx = self.list_ctrl.InsertItem(i, self._get_display_title(article))
-            
-            feed_title = ""
-            if article.feed_id:
-                feed = self.feed_map.get(article.feed_id)
-                if feed:
-                    feed_title = feed.title or ""
-            
-            self.list_ctrl.SetItem(idx, 1, feed_title)
-            self.list_ctrl.SetItem(idx, 2, utils.humanize_article_date(article.date))
-            self.list_ctrl.SetItem(idx, 3, article.author or '')
-            self.list_ctrl.SetItem(idx, 4, "Read" if article.is_read else "Unread")
-        self.list_ctrl.Thaw()
+        self._render_article_rows()
 
         # Add a placeholder row if we know/strongly suspect there is more history coming.
         more = False
@@ -1740,11 +1783,13 @@ class MainFrame(wx.Frame):
         # Update cache for this view (fresh first page).
         if fid:
             st = self._ensure_view_state(fid)
+            st.pop('stub', None)
             st['articles'] = self.current_articles
             st['id_set'] = {a.id for a in self.current_articles}
             st['total'] = total
             st['page_size'] = int(page_size)
             st['paged_offset'] = len(articles or [])
+            st['cursor'] = cursor
             # Determine completion based on paging + total/short page.
             fully = False
             if total is not None:
@@ -1759,8 +1804,13 @@ class MainFrame(wx.Frame):
                     fully = False
             st['fully_loaded'] = bool(fully)
             st['last_access'] = time.time()
+            self._prune_view_cache()
 
-    def _append_articles(self, articles, request_id, total=None, page_size: int | None = None):
+    def _append_articles(self, articles, request_id, total=None, page_size: int | None = None,
+                         ranked: bool = False, more: bool | None = None, cursor=None):
+        """Add an older page to the list. ranked keeps the given order (search results) instead
+        of re-sorting by date; more, when given, decides whether "Load more" stays; cursor is
+        the keyset cursor after the page (see _keyset_cursor)."""
         if not hasattr(self, 'current_request_id') or request_id != self.current_request_id:
             return
         if not articles:
@@ -1781,6 +1831,8 @@ class MainFrame(wx.Frame):
                 st['paged_offset'] = int(st.get('paged_offset', 0)) + len(articles)
             except Exception:
                 st['paged_offset'] = len(articles)
+            if cursor is not None:
+                st['cursor'] = cursor
             if total is not None:
                 st['total'] = total
             st['page_size'] = int(page_size)
@@ -1823,26 +1875,11 @@ class MainFrame(wx.Frame):
 
         # Combine and sort to ensure chronological order even if paging overlapped/shifted
         combined = getattr(self, 'current_articles', []) + new_articles
-        combined.sort(key=lambda a: (a.timestamp, a.id), reverse=True)
+        if not ranked:
+            combined.sort(key=lambda a: (a.timestamp, a.id), reverse=True)
         self.current_articles = combined
 
-        self.list_ctrl.Freeze()
-        self.list_ctrl.DeleteAllItems()
-        for i, article in enumerate(self.current_articles):
-            idx = self.list_ctrl.InsertItem(i, self._get_display_title(article))
-            
-            feed_title = ""
-            if article.feed_id:
-                feed = self.feed_map.get(article.feed_id)
-                if feed:
-                    feed_title = feed.title or ""
-            
-            self.list_ctrl.SetItem(idx, 1, feed_title)
-            self.list_ctrl.SetItem(idx, 2, utils.humanize_article_date(article.date))
-            self.list_ctrl.SetItem(idx, 3, article.author or '')
-            self.list_ctrl.SetItem(idx, 4, "Read" if article.is_read else "Unread")
-        
-        self.list_ctrl.Thaw()
+        self._render_article_rows()
 
         # Update cache for this view
         if fid:
@@ -1861,11 +1898,11 @@ class MainFrame(wx.Frame):
             if st.get('total') is None and len(articles) < int(page_size):
                 st['fully_loaded'] = True
             st['last_access'] = time.time()
+            self._prune_view_cache()
 
-        more = False
-        if total is None:
+        if more is None and total is None:
             more = (len(articles) >= page_size)
-        else:
+        elif more is None:
             try:
                 # Prefer paging progress when available
                 if fid and st is not None and st.get('paged_offset') is not None:
@@ -1994,46 +2031,50 @@ class MainFrame(wx.Frame):
             self._update_loading_placeholder(self._loading_label if loading else self._load_more_label)
             return
         label = self._loading_label if loading else self._load_more_label
-        idx = self.list_ctrl.InsertItem(self.list_ctrl.GetItemCount(), label)
-        self.list_ctrl.SetItem(idx, 1, "")
-        self.list_ctrl.SetItem(idx, 2, "")
-        self.list_ctrl.SetItem(idx, 3, "")
-        self.list_ctrl.SetItem(idx, 4, "")
+        self.article_rows.set_trailer(label)
+        self.list_ctrl.sync()
         self._loading_more_placeholder = True
 
     def _remove_loading_more_placeholder(self):
         if not getattr(self, "_loading_more_placeholder", False):
             return
-        count = self.list_ctrl.GetItemCount()
-        if count > 0:
-            self.list_ctrl.DeleteItem(count - 1)
+        self.article_rows.set_trailer(None)
+        self.list_ctrl.sync()
         self._loading_more_placeholder = False
 
     def _update_loading_placeholder(self, text: str | None = None):
         if not getattr(self, "_loading_more_placeholder", False):
             return
-        count = self.list_ctrl.GetItemCount()
-        if count <= 0:
+        idx = self.article_rows.trailer_index()
+        if idx < 0:
             return
-        label = text or self._load_more_label
         try:
-            self.list_ctrl.SetItem(count - 1, 0, label)
-            self.list_ctrl.SetItem(count - 1, 1, "")
-            self.list_ctrl.SetItem(count - 1, 2, "")
-            self.list_ctrl.SetItem(count - 1, 3, "")
-            self.list_ctrl.SetItem(count - 1, 4, "")
+            self.article_rows.set_trailer(text or self._load_more_label)
+            self.list_ctrl.RefreshItem(idx)
         except Exception:
             pass
+
     def _is_load_more_row(self, idx: int) -> bool:
         if idx is None or idx < 0:
             return False
         if not getattr(self, "_loading_more_placeholder", False):
             return False
-        count = self.list_ctrl.GetItemCount()
-        if idx != count - 1:
-            return False
-        title = self.list_ctrl.GetItemText(idx)
-        return title in (self._load_more_label, self._loading_label)
+        return idx == self.article_rows.trailer_index()
+
+    def _render_article_rows(self):
+        """Show self.current_articles; the virtual list formats only the rows it draws."""
+        self.article_rows.set_articles(self.current_articles)
+        self.list_ctrl.reset()
+
+    def _show_list_message(self, text: str | None):
+        """Replace the list with a single message row (or nothing when text is None)."""
+        self._loading_more_placeholder = False
+        self.article_rows.set_message(text)
+        self.list_ctrl.reset()
+
+    def _get_list_feed_title(self, feed_id) -> str:
+        feed = self.feed_map.get(feed_id)
+        return (feed.title or "") if feed else ""
 
     def _load_more_articles(self):
         if self._load_more_inflight:
@@ -2043,43 +2084,102 @@ class MainFrame(wx.Frame):
         feed_id = getattr(self, "current_feed_id", None)
         if not feed_id:
             return
+        if self._is_search_view(feed_id):
+            self._load_more_search(feed_id)
+            return
         st = self._ensure_view_state(feed_id)
         
         # Robust offset calculation:
         # 1. Use current article count as authoritative source if available.
         # 2. Fall back to cached paged_offset.
         # This fixes bugs where cache eviction resets paged_offset to 0, causing Page 0 duplicates.
-        current_count = len(getattr(self, "current_articles", []) or [])
+        current = getattr(self, "current_articles", []) or []
+        current_count = len(current)
         cached_offset = int(st.get("paged_offset", 0))
         offset = current_count if current_count > 0 else cached_offset
+        # Keyset cursor: continue strictly after the last article the provider returned.
+        cursor = st.get("cursor") or self._keyset_cursor(current)
 
         self._load_more_inflight = True
         self._update_loading_placeholder(self._loading_label)
         request_id = getattr(self, "current_request_id", None)
         page_size = self.article_page_size
         threading.Thread(
-            target=self._load_more_thread,
-            args=(feed_id, request_id, offset, page_size),
+            target=self._in_foreground,
+            args=(self._load_more_thread, feed_id, request_id, offset, page_size, cursor),
             daemon=True,
         ).start()
 
-    def _load_more_thread(self, feed_id, request_id, offset, page_size):
+    def _load_more_search(self, feed_id):
+        cursor = self._search_cursor
+        request_id = getattr(self, "current_request_id", None)
+        if cursor is None:
+            self._finish_loading_more(request_id)
+            return
+        self._load_more_inflight = True
+        self._update_loading_placeholder(self._loading_label)
+        threading.Thread(
+            target=self._in_foreground,
+            args=(self._load_more_search_thread, feed_id, request_id, cursor, self.article_page_size),
+            daemon=True,
+        ).start()
+
+    def _load_more_search_thread(self, feed_id, request_id, cursor, page_size):
         try:
-            page, total = self.provider.get_articles_page(feed_id, offset=offset, limit=page_size)
+            page, next_cursor = self.provider.search_articles(
+                feed_id[len("search:"):], view_id=self._search_scope, limit=page_size, cursor=cursor
+            )
+            wx.CallAfter(self._after_load_more_search, page or [], next_cursor, request_id, page_size)
+        except Exception as e:
+            log.exception("Error searching articles")
+            wx.CallAfter(self._load_more_failed, request_id, str(e))
+
+    def _after_load_more_search(self, page, next_cursor, request_id, page_size):
+        self._load_more_inflight = False
+        if not hasattr(self, "current_request_id") or request_id != self.current_request_id:
+            return
+        self._search_cursor = next_cursor
+        if not page:
+            self._finish_loading_more(request_id)
+            return
+        self._append_articles(page, request_id, None, page_size, ranked=True, more=next_cursor is not None)
+        if next_cursor is None:
+            self._finish_loading_more(request_id)
+
+    @staticmethod
+    def _keyset_cursor(page):
+        """(timestamp, id) of a page's last article, taken before the page is re-sorted.
+
+        Until the published_ts backfill finishes, the provider orders by the stored date string,
+        which differs from timestamp order for dates SQLite cannot read (their timestamp is 0).
+        The cursor has to name the provider's last row, not the last row shown.
+        """
+        return (page[-1].timestamp, page[-1].id) if page else None
+
+    def _fetch_older_page(self, feed_id, offset, page_size, cursor=None):
+        """Next page of older articles: keyset paging when the provider has it, else OFFSET."""
+        if cursor is not None and self.provider.supports_keyset_paging():
+            return self.provider.get_articles_after(feed_id, cursor=cursor, limit=page_size)
+        return self.provider.get_articles_page(feed_id, offset=offset, limit=page_size)
+
+    def _load_more_thread(self, feed_id, request_id, offset, page_size, cursor=None):
+        try:
+            page, total = self._fetch_older_page(feed_id, offset, page_size, cursor)
             page = page or []
+            cursor = self._keyset_cursor(page)
             page.sort(key=lambda a: (a.timestamp, a.id), reverse=True)
-            wx.CallAfter(self._after_load_more, page, total, request_id, page_size)
+            wx.CallAfter(self._after_load_more, page, total, request_id, page_size, cursor)
         except Exception as e:
             wx.CallAfter(self._load_more_failed, request_id, str(e))
 
-    def _after_load_more(self, page, total, request_id, page_size):
+    def _after_load_more(self, page, total, request_id, page_size, cursor=None):
         self._load_more_inflight = False
         if not hasattr(self, "current_request_id") or request_id != self.current_request_id:
             return
         if not page:
             self._finish_loading_more(request_id)
             return
-        self._append_articles(page, request_id, total, page_size)
+        self._append_articles(page, request_id, total, page_size, cursor=cursor)
 
     def _load_more_failed(self, request_id, error_msg: str):
         self._load_more_inflight = False
@@ -2163,23 +2263,7 @@ class MainFrame(wx.Frame):
             # Reset placeholder state since we are doing a full rebuild
             self._remove_loading_more_placeholder()
 
-            self.list_ctrl.Freeze()
-            self.list_ctrl.DeleteAllItems()
-            for i, article in enumerate(self.current_articles):
-                idx = self.list_ctrl.InsertItem(i, self._get_display_title(article))
-                
-                feed_title = ""
-                if article.feed_id:
-                    feed = self.feed_map.get(article.feed_id)
-                    if feed:
-                        feed_title = feed.title or ""
-                        
-                self.list_ctrl.SetItem(idx, 1, feed_title)
-                self.list_ctrl.SetItem(idx, 2, utils.humanize_article_date(article.date))
-                self.list_ctrl.SetItem(idx, 3, article.author or "")
-                self.list_ctrl.SetItem(idx, 4, "Read" if article.is_read else "Unread")
-            
-            self.list_ctrl.Thaw()
+            self._render_article_rows()
 
             # Re-evaluate "Load More" placeholder
             more = False
@@ -2256,6 +2340,16 @@ class MainFrame(wx.Frame):
                 self._content_debounce.Stop()
             self._content_debounce = wx.CallLater(150, self._update_content_view, idx)
 
+    def _article_body(self, article) -> str:
+        """Article HTML; bodies missing from list pages are loaded on demand and not kept on the Article."""
+        content = getattr(article, "content", None)
+        if content is None:
+            try:
+                content = self.provider.get_article_content(article.id)
+            except Exception:
+                log.exception(f"Failed to load content for {article.id}")
+        return content or ""
+
     def _update_content_view(self, idx):
         if idx < 0 or idx >= len(self.current_articles):
             return
@@ -2267,13 +2361,13 @@ class MainFrame(wx.Frame):
 
         # Prepare content (Heavy: BeautifulSoup)
         header = f"Title: {article.title}\n"
-        header += f"Date: {utils.humanize_article_date(article.date)}\n"
+        header += f"Date: {utils.humanize_timestamp(article.timestamp)}\n"
         header += f"Author: {article.author}\n"
         header += f"Link: {article.url}\n"
         header += "-" * 40 + "\n\n"
         
         try:
-            content = self._strip_html(article.content)
+            content = self._strip_html(self._article_body(article))
             full_text = header + content
             self.content_ctrl.SetValue(full_text)
         except Exception:
@@ -2378,7 +2472,7 @@ class MainFrame(wx.Frame):
             return
         self._fulltext_loading_url = cache_key
 
-        fallback_html = getattr(article, "content", "") or ""
+        fallback_html = self._article_body(article)
         fallback_title = getattr(article, "title", "") or ""
         fallback_author = getattr(article, "author", "") or ""
 
@@ -2672,7 +2766,7 @@ class MainFrame(wx.Frame):
         if not article.is_read:
             threading.Thread(target=self.provider.mark_read, args=(article.id,), daemon=True).start()
             article.is_read = True
-            self.list_ctrl.SetItem(idx, 3, "Read")
+            self.list_ctrl.refresh_row(idx)
 
     def mark_article_unread(self, idx):
         if idx < 0 or idx >= len(self.current_articles):
@@ -2681,7 +2775,7 @@ class MainFrame(wx.Frame):
         if article.is_read:
             threading.Thread(target=self.provider.mark_unread, args=(article.id,), daemon=True).start()
             article.is_read = False
-            self.list_ctrl.SetItem(idx, 3, "Unread")
+            self.list_ctrl.refresh_row(idx)
 
     def on_article_activate(self, event):
         # Double click or Enter
@@ -3143,6 +3237,16 @@ class MainFrame(wx.Frame):
             except Exception:
                 pass
 
+            # View cache limits apply from the next prune.
+            try:
+                self.max_cached_views = int(self.config_manager.get("max_cached_views", 15))
+                self.view_cache_max_bytes = view_cache.max_bytes_from_setting(
+                    self.config_manager.get("view_cache_max_mb", view_cache.DEFAULT_MAX_MB)
+                )
+                self._prune_view_cache()
+            except Exception:
+                log.exception("Error applying view cache settings")
+
             # Apply playback speed immediately if the player exists
             if "playback_speed" in data:
                 try:
@@ -3170,7 +3274,7 @@ class MainFrame(wx.Frame):
                 try:
                     # Clear list/content immediately to avoid stale selection against new provider.
                     self.current_articles = []
-                    self.list_ctrl.DeleteAllItems()
+                    self._show_list_message(None)
                     self.content_ctrl.SetValue("")
                 except Exception:
                     pass
@@ -3180,6 +3284,14 @@ class MainFrame(wx.Frame):
                     pass
         dlg.Destroy()
 
+    def on_diagnostics(self, event):
+        with self._view_cache_lock:
+            info = view_cache.summary(self.view_cache, self.view_cache_stats)
+        text = view_cache.format_report(info, self.view_cache_max_bytes, self.max_cached_views)
+        dlg = DiagnosticsDialog(self, text)
+        dlg.ShowModal()
+        dlg.Destroy()
+
     def on_check_updates(self, event):
         self._start_update_check(manual=True)
 
@@ -3271,6 +3383,27 @@ class MainFrame(wx.Frame):
     def on_exit(self, event):
         self.real_close()
 
+    def on_search_articles(self, event):
+        scope = self._get_feed_id_from_tree_item(self.tree.GetSelection()) or "all"
+        where = "all articles" if scope == "all" else "the selected feed or category"
+        dlg = wx.TextEntryDialog(self, f"Search {where} for:", "Search Articles")
+        try:
+            if dlg.ShowModal() != wx.ID_OK:
+                return
+            query = dlg.GetValue().strip()
+        finally:
+            dlg.Destroy()
+        if not query:
+            return
+        self._search_scope = scope
+        view_id = f"search:{query}"
+        with self._view_cache_lock:
+            # Searches are not served from the view cache; always run the query again.
+            self.view_cache.pop(view_id, None)
+        self.selected_article_id = None
+        self._begin_articles_load(view_id, full_load=True, clear_list=True)
+        self.list_ctrl.SetFocus()
+
     def on_find_feed(self, event):
         from gui.dialogs import FeedSearchDialog
         dlg = FeedSearchDialog(self)
@@ -0,0 +1,162 @@
+"""
+Idle-time prefetch of article views (MainFrame.view_cache) the user is likely to open next.
+
+MainFrame calls schedule() after each tree selection with the views next to it and the
+categories with the most unread articles. One low-priority worker thread loads their
+first page and hands it to store(), so moving to them renders from the cache.
+
+The worker stays out of the way of foreground loads:
+- it starts only after idle_s without a new selection or foreground load,
+- it waits while any foreground() block is running and re-checks both between views,
+- it sleeps throttle_s after each view,
+- a new schedule() or cancel() drops whatever is pending, and a page that finishes
+  after that is not stored.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Sequence
+
+log = logging.getLogger(__name__)
+
+IDLE_S = 0.6
+THROTTLE_S = 0.25
+TOP_CATEGORIES = 3
+
+
+def top_unread_categories(feeds: Iterable, n: int = TOP_CATEGORIES) -> List[str]:
+    """Names of the n categories with the most unread articles (none without unread)."""
+    totals = {}
+    for feed in feeds:
+        unread = int(getattr(feed, "unread_count", 0) or 0)
+        if unread > 0:
+            cat = getattr(feed, "category", None) or "Uncategorized"
+            totals[cat] = totals.get(cat, 0) + unread
+    ranked = sorted(totals.items(), key=lambda kv: (-kv[1], kv[0]))
+    return [cat for cat, _ in ranked[:n]]
+
+
+class ViewPrefetcher:
+    def __init__(
+        self,
+        fetch: Callable[[str], object],
+        store: Callable[[str, object], None],
+        wanted: Callable[[str], bool],
+        idle_s: float = IDLE_S,
+        throttle_s: float = THROTTLE_S,
+    ):
+        """fetch(view_id) loads a view (worker thread); store(view_id, result) caches it;
+        wanted(view_id) says whether the view still needs loading."""
+        self._fetch = fetch
+        self._store = store
+        self._wanted = wanted
+        self.idle_s = float(idle_s)
+        self.throttle_s = float(throttle_s)
+        self._cond = threading.Condition()
+        self._pending: List[str] = []
+        self._generation = 0
+        self._busy = 0
+        self._last_activity = 0.0
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self.fetched = 0
+
+    def schedule(self, view_ids: Sequence[str]) -> None:
+        """Replace the pending views (duplicates and empty ids dropped, order kept)."""
+        seen = set()
+        ids = []
+        for v in view_ids:
+            if v and v not in seen:
+                seen.add(v)
+                ids.append(v)
+        with self._cond:
+            if self._stopped:
+                return
+            self._generation += 1
+            self._pending = ids
+            self._last_activity = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="view-prefetch", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def cancel(self) -> None:
+        with self._cond:
+            self._generation += 1
+            self._pending = []
+            self._last_activity = time.monotonic()
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def foreground(self):
+        """Wrap foreground loads; the worker waits until none is running."""
+        with self._cond:
+            self._busy += 1
+            self._last_activity = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._busy -= 1
+                self._last_activity = time.monotonic()
+                self._cond.notify_all()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        with self._cond:
+            self._stopped = True
+            self._pending = []
+            self._generation += 1
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def pending(self) -> List[str]:
+        with self._cond:
+            return list(self._pending)
+
+    def _next(self):
+        """Block until a view may be fetched; returns (view_id, generation) or None on stop."""
+        with self._cond:
+            while True:
+                if self._stopped:
+                    return None
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                if self._busy:
+                    self._cond.wait()
+                    continue
+                quiet = time.monotonic() - self._last_activity
+                if quiet < self.idle_s:
+                    self._cond.wait(self.idle_s - quiet)
+                    continue
+                return self._pending.pop(0), self._generation
+
+    def _current(self, generation: int) -> bool:
+        with self._cond:
+            return generation == self._generation and not self._stopped
+
+    def _run(self) -> None:
+        while True:
+            item = self._next()
+            if item is None:
+                return
+            view_id, generation = item
+            try:
+                if not self._wanted(view_id):
+                    continue
+                result = self._fetch(view_id)
+                if self._current(generation):
+                    self._store(view_id, result)
+                    self.fetched += 1
+            except Exception:
+                log.exception("Error prefetching view %s", view_id)
+            if self.throttle_s > 0:
+                with self._cond:
+                    if not self._stopped:
+                        self._cond.wait(self.throttle_s)
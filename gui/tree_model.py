@@ -0,0 +1,235 @@
+"""
+Incremental updates for the feed tree (MainFrame.tree).
+
+build_spec() describes the tree MainFrame wants: the special views, then one node per
+category (sorted) holding its feeds (sorted by title). TreeSync remembers what it last
+put in the tree and turns a new spec into as few widget calls as it can:
+- label changes (unread counts, feed renames) are SetItemText on the existing item,
+- nodes that are gone are deleted,
+- new nodes are inserted after their previous sibling,
+- nodes whose position changed (a rename that re-sorts, a feed moved to another
+  category) are deleted and inserted again. The siblings that stay put are a longest
+  increasing subsequence of their old positions, so one move costs one delete and one
+  insert.
+
+Items that did not change keep their handles, so the selection, expansion state and a
+screen reader's place in the tree survive a refresh. All calls of one sync() run under
+a single Freeze, and nothing is frozen when nothing changed.
+
+The tree is reached through a small backend (WxTreeBackend for a wx.TreeCtrl), so the
+diff runs without wx in tests.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+Key = Tuple[str, str]
+
+SPECIAL_VIEWS = (
+    ("All Articles", "all"),
+    ("Unread Articles", "unread:all"),
+    ("Read Articles", "read:all"),
+)
+FAVORITES_VIEW = ("Favorites", "favorites:all")
+
+
+class TreeNode:
+    __slots__ = ("key", "label", "children")
+
+    def __init__(self, key: Key, label: str, children: Optional[List["TreeNode"]] = None):
+        self.key = key
+        self.label = label
+        self.children = children or []
+
+    @property
+    def data(self) -> Dict[str, str]:
+        """Item data as MainFrame reads it back (GetItemData)."""
+        return {"type": self.key[0], "id": self.key[1]}
+
+
+def feed_label(title: str, unread: int) -> str:
+    return f"{title} ({unread})" if unread and unread > 0 else (title or "")
+
+
+def build_spec(feeds: Iterable, all_cats: Iterable[str], favorites: bool = False) -> List[TreeNode]:
+    """Top-level nodes for the feed tree: special views, then categories with their feeds."""
+    nodes = [TreeNode(("all", view_id), label) for label, view_id in SPECIAL_VIEWS]
+    if favorites:
+        nodes.append(TreeNode(("all", FAVORITES_VIEW[1]), FAVORITES_VIEW[0]))
+
+    categories: Dict[str, list] = {c: [] for c in all_cats}
+    for feed in feeds:
+        categories.setdefault(feed.category or "Uncategorized", []).append(feed)
+    for cat in sorted(categories):
+        cat_feeds = sorted(categories[cat], key=lambda f: (f.title or "").lower())
+        children = [TreeNode(("feed", f.id), feed_label(f.title, f.unread_count)) for f in cat_feeds]
+        nodes.append(TreeNode(("category", cat), cat, children))
+    return nodes
+
+
+def _stable_positions(old_positions: Sequence[int]) -> set:
+    """Indices into old_positions forming a longest increasing subsequence."""
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    prev = [-1] * len(old_positions)
+    for i, pos in enumerate(old_positions):
+        j = bisect_left(tails, pos)
+        if j == len(tails):
+            tails.append(pos)
+            tail_idx.append(i)
+        else:
+            tails[j] = pos
+            tail_idx[j] = i
+        prev[i] = tail_idx[j - 1] if j > 0 else -1
+    keep = set()
+    i = tail_idx[-1] if tail_idx else -1
+    while i >= 0:
+        keep.add(i)
+        i = prev[i]
+    return keep
+
+
+class TreeSync:
+    def __init__(self, backend):
+        self.backend = backend
+        self._children: Optional[Dict[Optional[Key], List[Key]]] = None  # None until the first sync
+        self._items: Dict[Key, list] = {}  # key -> [handle, label, parent key]
+        self._frozen = False
+
+    def handle(self, key: Hashable):
+        item = self._items.get(key)
+        return item[0] if item else None
+
+    def handles(self, kind: str) -> Dict[str, object]:
+        """Handles of every node of one kind ("feed", "category", "all") by id."""
+        return {k[1]: v[0] for k, v in self._items.items() if k[0] == kind}
+
+    def relabel(self, key: Key, label: str) -> bool:
+        """Change one label outside a sync (e.g. live unread counts during a refresh)."""
+        item = self._items.get(key)
+        if item is None:
+            return False
+        if item[1] != label:
+            self.backend.set_label(item[0], label)
+            item[1] = label
+        return True
+
+    def sync(self, spec: Sequence[TreeNode]) -> Dict[str, int]:
+        """Make the tree match spec; returns counts of inserted, removed and relabeled items."""
+        stats = {"inserted": 0, "removed": 0, "relabeled": 0}
+        self._frozen = False
+        try:
+            if self._children is None:
+                self._freeze()
+                self.backend.clear()
+                self._children = {}
+                self._items = {}
+
+            wanted: Dict[Key, Optional[Key]] = {}
+            for node in spec:
+                wanted[node.key] = None
+                for child in node.children:
+                    wanted[child.key] = node.key
+
+            # Nodes that are gone or changed parent (their parent's Delete takes the children along).
+            for key in [k for k, v in self._items.items() if wanted.get(k, ()) != v[2]]:
+                if key in self._items:
+                    self._delete(key, stats)
+
+            new_categories = []
+            self._sync_children(None, self.backend.root, spec, stats, new_categories)
+            for node in spec:
+                if node.children or self._children.get(node.key):
+                    self._sync_children(node.key, self._items[node.key][0], node.children, stats, new_categories)
+            for key in new_categories:
+                self.backend.expand(self._items[key][0])
+        finally:
+            if self._frozen:
+                self._frozen = False
+                self.backend.thaw()
+        return stats
+
+    def _freeze(self) -> None:
+        if not self._frozen:
+            self._frozen = True
+            self.backend.freeze()
+
+    def _delete(self, key: Key, stats: Dict[str, int], widget: bool = True) -> None:
+        handle, _label, parent = self._items.pop(key)
+        for child in self._children.pop(key, []):
+            self._delete(child, stats, widget=False)
+        siblings = self._children.get(parent)
+        if siblings is not None:
+            try:
+                siblings.remove(key)
+            except ValueError:
+                pass
+        if widget:
+            self._freeze()
+            self.backend.delete(handle)
+        stats["removed"] += 1
+
+    def _sync_children(self, parent: Optional[Key], parent_handle, nodes: Sequence[TreeNode], stats, new_categories) -> None:
+        old = self._children.get(parent, [])
+        old_pos = {k: i for i, k in enumerate(old)}
+        present = [i for i, n in enumerate(nodes) if n.key in old_pos]
+        stable = _stable_positions([old_pos[nodes[i].key] for i in present])
+        for j, i in enumerate(present):
+            if j not in stable:
+                self._delete(nodes[i].key, stats)
+
+        order: List[Key] = []
+        prev_handle = None
+        for node in nodes:
+            item = self._items.get(node.key)
+            if item is None:
+                self._freeze()
+                handle = self.backend.insert(parent_handle, prev_handle, node.label, node.data)
+                item = self._items[node.key] = [handle, node.label, parent]
+                stats["inserted"] += 1
+                if node.children:
+                    new_categories.append(node.key)
+            elif item[1] != node.label:
+                self._freeze()
+                self.backend.set_label(item[0], node.label)
+                item[1] = node.label
+                stats["relabeled"] += 1
+            order.append(node.key)
+            prev_handle = item[0]
+        self._children[parent] = order
+
+
+class WxTreeBackend:
+    """TreeSync backend for a wx.TreeCtrl (children of root)."""
+
+    def __init__(self, tree, root):
+        self.tree = tree
+        self.root = root
+
+    def clear(self) -> None:
+        self.tree.DeleteChildren(self.root)
+
+    def insert(self, parent, prev, label: str, data):
+        if prev is None:
+            item = self.tree.PrependItem(parent, label)
+        else:
+            item = self.tree.InsertItem(parent, prev, label)
+        self.tree.SetItemData(item, data)
+        return item
+
+    def delete(self, item) -> None:
+        self.tree.Delete(item)
+
+    def set_label(self, item, label: str) -> None:
+        self.tree.SetItemText(item, label)
+
+    def expand(self, item) -> None:
+        self.tree.Expand(item)
+
+    def freeze(self) -> None:
+        self.tree.Freeze()
+
+    def thaw(self) -> None:
+        self.tree.Thaw()
@@ -0,0 +1,240 @@
+"""
+Memory accounting and eviction for MainFrame.view_cache.
+
+Each cached view is a dict (see MainFrame._ensure_view_state) whose "articles" list holds
+Article objects with their chapters and, from remote providers, their bodies (local list
+pages leave content to get_article_content()), so the number of views says little about
+what the cache costs. prune() keeps at most max_views full views and, when
+max_bytes is set, evicts least recently used views until the estimated total fits. The
+current view is never evicted, even when it alone is over budget.
+
+With keep_stubs an evicted view keeps its dict as a stub holding the number of articles
+it showed. Selecting a stub reloads that many articles in one page request instead of
+starting over from the first page. At most MAX_STUBS stubs are kept.
+
+Sizes are estimates (sys.getsizeof of the article and its fields) taken from up to
+SAMPLE articles spread over the list and scaled to its length. They are cached on the
+view dict until its article list changes.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+DEFAULT_MAX_MB = 256
+SAMPLE = 200
+MAX_STUBS = 100
+
+_ARTICLE_FIELDS = ("id", "title", "url", "content", "date", "author", "feed_id", "media_url", "media_type", "snippet")
+# A list slot plus an id_set entry per article.
+_PER_ARTICLE_OVERHEAD = 8 + 64
+
+
+def max_bytes_from_setting(value) -> int:
+    """Byte budget for a "view_cache_max_mb" setting; 0 means unbounded."""
+    try:
+        mb = float(value)
+    except (TypeError, ValueError):
+        mb = DEFAULT_MAX_MB
+    return max(0, int(mb * 1024 * 1024))
+
+
+def estimate_article_bytes(article) -> int:
+    size = sys.getsizeof(article) + _PER_ARTICLE_OVERHEAD
+    for name in _ARTICLE_FIELDS:
+        value = getattr(article, name, None)
+        if value is not None:
+            size += sys.getsizeof(value)
+    chapters = getattr(article, "chapters", None)
+    if chapters:
+        size += sys.getsizeof(chapters)
+        for ch in chapters:
+            size += sys.getsizeof(ch)
+            try:
+                for v in ch.values():
+                    size += sys.getsizeof(v)
+            except Exception:
+                pass
+    return size
+
+
+def estimate_view_bytes(st: Dict[str, Any]) -> int:
+    """Estimated size of one cached view, cached on st until its article list changes."""
+    if st.get("stub") is not None:
+        return sys.getsizeof(st)
+    articles = st.get("articles") or []
+    key = (id(articles), len(articles))
+    if st.get("_bytes_key") == key:
+        return st.get("bytes", 0)
+    n = len(articles)
+    if n <= SAMPLE:
+        size = sum(estimate_article_bytes(a) for a in articles)
+    else:
+        step = n / SAMPLE
+        sampled = sum(estimate_article_bytes(articles[int(i * step)]) for i in range(SAMPLE))
+        size = int(sampled * n / SAMPLE)
+    size += sys.getsizeof(articles)
+    st["_bytes_key"] = key
+    st["bytes"] = size
+    return size
+
+
+def is_stub(st: Optional[Dict[str, Any]]) -> bool:
+    return bool(st) and st.get("stub") is not None
+
+
+def make_stub(st: Dict[str, Any]) -> None:
+    """Drop a view's articles, keeping how many there were."""
+    st["stub"] = len(st.get("articles") or [])
+    st["articles"] = []
+    st["id_set"] = set()
+    st["fully_loaded"] = False
+    st.pop("cursor", None)
+    st.pop("_bytes_key", None)
+    st.pop("bytes", None)
+
+
+class ViewCacheStats:
+    """Hit/miss counters for view selections (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rehydrations = 0
+        self.evictions = 0
+        self.stubbed = 0
+
+    def record(self, outcome: str) -> None:
+        """Count one selection: "hit", "miss" or "stub" (a miss served from a stub)."""
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+            else:
+                self.misses += 1
+                if outcome == "stub":
+                    self.rehydrations += 1
+
+    def record_evictions(self, dropped: int, stubbed: int) -> None:
+        with self._lock:
+            self.evictions += dropped + stubbed
+            self.stubbed += stubbed
+
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return (self.hits / total) if total else 0.0
+
+
+def prune(
+    cache: Dict[str, Dict[str, Any]],
+    keep: Optional[str] = None,
+    max_views: int = 15,
+    max_bytes: int = 0,
+    keep_stubs: bool = True,
+    stats: Optional[ViewCacheStats] = None,
+) -> List[str]:
+    """Evict least recently used views until both limits hold; returns the evicted ids.
+
+    The caller holds the lock guarding cache.
+    """
+    full = []
+    stubs = []
+    total = 0
+    for k, st in cache.items():
+        if is_stub(st):
+            if k != keep:
+                stubs.append((_last_access(st), k))
+            continue
+        size = estimate_view_bytes(st)
+        total += size
+        if k != keep:
+            full.append((_last_access(st), k, size))
+    count = len(cache) - len(stubs) - (1 if is_stub(cache.get(keep)) else 0)
+
+    full.sort()
+    evicted = []
+    dropped = stubbed = 0
+    while full and ((max_views > 0 and count > max_views) or (max_bytes > 0 and total > max_bytes)):
+        ts, victim, size = full.pop(0)
+        st = cache[victim]
+        if keep_stubs and st.get("articles"):
+            make_stub(st)
+            stubs.append((ts, victim))
+            stubbed += 1
+        else:
+            cache.pop(victim, None)
+            dropped += 1
+        evicted.append(victim)
+        total -= size
+        count -= 1
+
+    if len(stubs) > MAX_STUBS:
+        stubs.sort()
+        for _, victim in stubs[: len(stubs) - MAX_STUBS]:
+            cache.pop(victim, None)
+            dropped += 1
+
+    if stats is not None and (dropped or stubbed):
+        stats.record_evictions(dropped, stubbed)
+    return evicted
+
+
+def summary(cache: Dict[str, Dict[str, Any]], stats: Optional[ViewCacheStats] = None) -> Dict[str, Any]:
+    """Size and hit counters for the diagnostics view. The caller holds the cache lock."""
+    views = []
+    for k, st in cache.items():
+        stub = is_stub(st)
+        views.append({
+            "view_id": k,
+            "articles": st["stub"] if stub else len(st.get("articles") or []),
+            "bytes": estimate_view_bytes(st),
+            "stub": stub,
+            "last_access": _last_access(st),
+        })
+    views.sort(key=lambda v: v["bytes"], reverse=True)
+    out = {
+        "views": views,
+        "full_views": sum(1 for v in views if not v["stub"]),
+        "stubs": sum(1 for v in views if v["stub"]),
+        "bytes": sum(v["bytes"] for v in views),
+    }
+    if stats is not None:
+        out.update(
+            hits=stats.hits,
+            misses=stats.misses,
+            rehydrations=stats.rehydrations,
+            evictions=stats.evictions,
+            hit_ratio=stats.hit_ratio(),
+        )
+    return out
+
+
+def format_report(info: Dict[str, Any], max_bytes: int = 0, max_views: int = 0) -> str:
+    mb = 1024 * 1024
+    budget = f"{max_bytes / mb:.0f} MB" if max_bytes else "unlimited"
+    lines = [
+        "View cache",
+        f"Size: {info['bytes'] / mb:.1f} MB of {budget}",
+        f"Views: {info['full_views']} of {max_views or 'unlimited'}, plus {info['stubs']} stubs",
+    ]
+    if "hits" in info:
+        lines.append(
+            f"Hit ratio: {info['hit_ratio'] * 100:.0f}% ({info['hits']} hits, {info['misses']} misses, "
+            f"{info['rehydrations']} reloaded from stubs)"
+        )
+        lines.append(f"Evictions: {info['evictions']}")
+    if info["views"]:
+        lines.append("")
+        for v in info["views"]:
+            kind = "stub" if v["stub"] else "cached"
+            lines.append(f"{v['view_id']}: {v['articles']} articles, {v['bytes'] / 1024:.0f} KB ({kind})")
+    return "\n".join(lines)
+
+
+def _last_access(st: Dict[str, Any]) -> float:
+    try:
+        return float(st.get("last_access", 0.0))
+    except Exception:
+        return 0.0
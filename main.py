@@ -49,6 +49,14 @@ from core import updater as app_updater
 from gui.mainframe import MainFrame
 from core.stream_proxy import get_proxy
 from core.range_cache_proxy import get_range_cache_proxy
+from core import http_pool
+from core import refresh_writer
+from core import enrichment
+from core import background_migrations
+from core import maintenance
+from core import host_health
+from core import db
+from providers import local_staged
 
 class GlobalMediaKeyFilter(wx.EventFilter):
     """Capture media shortcuts globally so they work in dialogs too."""
@@ -152,6 +160,46 @@ class RSSApp(wx.App):
             get_range_cache_proxy().stop()
         except Exception as e:
             log.error(f"Error stopping RangeCacheProxy: {e}")
+
+        try:
+            http_pool.close_all()
+        except Exception as e:
+            log.error(f"Error closing HTTP sessions: {e}")
+
+        try:
+            local_staged.shutdown_parse_pool()
+        except Exception as e:
+            log.error(f"Error stopping feed parse workers: {e}")
+
+        try:
+            refresh_writer.shutdown_writer()
+        except Exception as e:
+            log.error(f"Error stopping refresh writer: {e}")
+
+        try:
+            enrichment.shutdown()
+        except Exception as e:
+            log.error(f"Error stopping enrichment worker: {e}")
+
+        try:
+            background_migrations.shutdown()
+        except Exception as e:
+            log.error(f"Error stopping background migrations: {e}")
+
+        try:
+            maintenance.shutdown()
+        except Exception as e:
+            log.error(f"Error stopping database maintenance: {e}")
+
+        try:
+            host_health.flush()
+        except Exception as e:
+            log.error(f"Error saving host health: {e}")
+
+        try:
+            db.close_all_connections()
+        except Exception as e:
+            log.error(f"Error closing database connections: {e}")
             
         # Release the lock implicitly by object destruction, but explicit delete is good practice
         try:
@@ -68,6 +68,50 @@ class RSSProvider(abc.ABC):
         limit = int(limit)
         return articles[offset:offset + limit], total
 
+    # List pages may leave Article.content as None; such providers load the body here.
+    def get_article_content(self, article_id: str) -> Optional[str]:
+        return None
+
+    def search_articles(self, query: str, view_id: str = "all", limit: int = 50, cursor: Optional[int] = None) -> Tuple[List[Article], Optional[int]]:
+        """Articles in view_id matching every word of query, best match first.
+
+        Returns (articles, next_cursor); pass next_cursor back for the following page
+        (None when there are no more results). Default implementation filters
+        get_articles() by substring, newest first.
+        """
+        words = [w.strip('"*').lower() for w in (query or "").split()]
+        words = [w for w in words if w]
+        if not words or limit is None or int(limit) <= 0:
+            return [], None
+        offset = max(0, int(cursor or 0))
+        matches = []
+        for a in self.get_articles(view_id or "all") or []:
+            text = " ".join((a.title or "", a.author or "", a.content or "")).lower()
+            if all(w in text for w in words):
+                matches.append(a)
+        matches.sort(key=lambda a: (a.date or "", a.id or ""), reverse=True)
+        end = offset + int(limit)
+        return matches[offset:end], (end if end < len(matches) else None)
+
+    # Keyset paging is optional; the UI falls back to get_articles_page() offsets without it.
+    def supports_keyset_paging(self) -> bool:
+        return False
+
+    def get_articles_after(self, feed_id: str, cursor: Optional[Tuple[float, str]] = None, limit: int = 200) -> Tuple[List[Article], int]:
+        """Page of articles following cursor=(timestamp, id) in (timestamp DESC, id DESC) order.
+
+        Default implementation calls get_articles() and filters the result.
+        """
+        articles = self.get_articles(feed_id) or []
+        total = len(articles)
+        if limit is None or int(limit) <= 0:
+            return [], total
+        articles = sorted(articles, key=lambda a: (a.timestamp, a.id or ""), reverse=True)
+        if cursor is not None:
+            key = (cursor[0] or 0, cursor[1] or "")
+            articles = [a for a in articles if (a.timestamp, a.id or "") < key]
+        return articles[:int(limit)], total
+
     @abc.abstractmethod
     def mark_read(self, article_id: str) -> bool:
         pass
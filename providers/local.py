@@ -1,21 +1,34 @@
 import feedparser
+import hashlib
+import requests
 import time
 import uuid
 import threading
 import sqlite3
 import concurrent.futures
 import os
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
 from urllib.parse import urlparse
 from .base import RSSProvider
 from core.models import Feed, Article
-from core.db import get_connection, init_db
+from core.db import get_connection, init_db, published_ts_ready, published_ts_sql, write_connection
 from core.discovery import discover_feed
 from core import utils
+from core import http_pool
+from core import feed_parse
+from core import feed_schedule
+from core import refresh_writer
+from core import enrichment
+from core import host_health
+from core import refresh_stats
+from core import search_index
+from core import content_store
+from core import background_migrations
 from core import rumble as rumble_mod
 from core import odysee as odysee_mod
-from core import npr as npr_mod
 from bs4 import BeautifulSoup as BS, XMLParsedAsHTMLWarning
 import xml.etree.ElementTree as ET
 import logging
@@ -31,15 +44,85 @@ _REFRESH_WORKERS_MAX_CAP = 16
 _REFRESH_WORKERS_PER_CPU_MULTIPLIER = 2
 _REFRESH_PER_HOST_MIN_CAP = 2
 _REFRESH_PER_HOST_MAX_CAP = 8
+# Article bodies kept by get_article_content()
+_CONTENT_CACHE_SIZE = 32
+# Keyset cursors are timestamps; gmtime() rejects negative ones on Windows
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class FeedFetchResult:
+    """Outcome of downloading a feed document (independent of how it was fetched)."""
+    status: str  # "ok", "not_modified", "deferred" or "error"
+    data: Optional[bytes] = None
+    text: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+    # Epoch seconds from Cache-Control max-age / Expires, if the server sent them
+    fresh_until: Optional[float] = None
+    # Digest/size of the response body; lets unchanged bodies skip parsing when the
+    # server sends no usable ETag/Last-Modified.
+    body_hash: Optional[str] = None
+    body_size: Optional[int] = None
+    # For status "deferred": when the host's circuit breaker lets requests through again
+    retry_at: Optional[float] = None
+
+
+def _body_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _record_listing_failure(health, host: str, error: Exception) -> None:
+    """Count a failed listing scrape against the host only when the host itself failed."""
+    if host_health.is_host_failure(error):
+        health.record_failure(host, str(error))
+    else:
+        # A page that did not parse says nothing about the host; let another probe through.
+        health.release_probe(host)
+
+
+def _listing_digest(items) -> Tuple[str, int]:
+    """Digest of scraped listing items, so unchanged Rumble/Odysee pages can be skipped."""
+    parts = []
+    for item in items or []:
+        parts.append("\x1f".join(
+            str(getattr(item, name, "") or "") for name in ("id", "title", "url", "author", "published")
+        ))
+    payload = "\x1e".join(parts).encode("utf-8", errors="replace")
+    return _body_digest(payload), len(payload)
+
 
 class LocalProvider(RSSProvider):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         init_db()
+        self._content_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._content_cache_lock = threading.Lock()
+        try:
+            http_pool.configure(int(self.config.get("per_host_max_connections", 4) or 4))
+        except Exception:
+            pass
+        try:
+            enrichment.start(timeout_s=float(self.config.get("feed_timeout_seconds", 15) or 15))
+        except Exception as e:
+            log.warning(f"Enrichment worker failed to start: {e}")
+        try:
+            background_migrations.start()
+        except Exception as e:
+            log.warning(f"Background migrations failed to start: {e}")
 
     def get_name(self) -> str:
         return "Local RSS"
 
+    @staticmethod
+    def _is_html_listing_url(feed_url: str) -> bool:
+        """True for Rumble/Odysee channel pages that are scraped instead of parsed as RSS."""
+        url = str(feed_url or "")
+        if url.lower().endswith((".xml", ".rss", ".atom")):
+            return False
+        return bool(odysee_mod.is_odysee_url(url) or rumble_mod.is_rumble_url(url))
+
     def refresh_feed(self, feed_id: str, progress_cb=None) -> bool:
         conn = get_connection()
         try:
@@ -69,12 +152,22 @@ class LocalProvider(RSSProvider):
         try:
             c = conn.cursor()
             # Fetch etag/last_modified for conditional get plus metadata for UI updates
-            c.execute("SELECT id, url, title, category, etag, last_modified FROM feeds")
+            if force or not self._adaptive_refresh_enabled():
+                c.execute("SELECT id, url, title, category, etag, last_modified FROM feeds")
+            else:
+                # Feeds due within a short slack window are fetched now rather than a full cycle later.
+                due_by = time.time() + min(60.0, self._base_refresh_interval() / 2.0)
+                c.execute(
+                    "SELECT id, url, title, category, etag, last_modified FROM feeds "
+                    "WHERE next_check_at IS NULL OR next_check_at <= ?",
+                    (due_by,),
+                )
             feeds = c.fetchall()
         finally:
             conn.close()
 
         if not feeds:
+            log.debug("Refresh: no feeds due")
             return True
 
         configured_workers = max(1, int(self.config.get("max_concurrent_refreshes", 5) or 1))
@@ -97,31 +190,129 @@ class LocalProvider(RSSProvider):
             log.info("Clamping max_concurrent_refreshes from %s to %s for responsiveness", configured_workers, max_workers)
         if configured_per_host != per_host_limit:
             log.info("Clamping per_host_max_connections from %s to %s", configured_per_host, per_host_limit)
+        # Keep-alive pool per host sized to match how many requests may be in flight for it.
+        http_pool.configure(per_host_limit)
+        try:
+            host_health.configure(
+                int(self.config.get("host_failure_threshold", host_health.DEFAULT_FAILURE_THRESHOLD)),
+                float(self.config.get("host_cooldown_seconds", host_health.DEFAULT_COOLDOWN_S)),
+                float(self.config.get("host_cooldown_max_seconds", host_health.DEFAULT_MAX_COOLDOWN_S)),
+            )
+        except (TypeError, ValueError):
+            pass
         feed_timeout = max(1, int(self.config.get("feed_timeout_seconds", 15) or 15))
         retries = max(0, int(self.config.get("feed_retry_attempts", 1) or 0))
 
+        engine = str(self.config.get("refresh_engine", "staged") or "staged").strip().lower()
+        run = refresh_stats.RefreshRun(feeds, engine)
+        try:
+            return self._run_refresh_engine(
+                engine, feeds, max_workers, per_host_limit, feed_timeout, retries, run.wrap(progress_cb), force
+            )
+        finally:
+            host_health.flush()
+            self._save_refresh_stats(run)
+
+    def _run_refresh_engine(self, engine, feeds, max_workers, per_host_limit, feed_timeout, retries, progress_cb, force) -> bool:
+        if engine == "async":
+            from providers import local_async
+            if local_async.is_available():
+                try:
+                    max_in_flight = max(1, int(self.config.get("async_refresh_max_in_flight", 64) or 64))
+                except (TypeError, ValueError):
+                    max_in_flight = 64
+                try:
+                    cpu_workers = max(1, int(self.config.get("refresh_cpu_workers", 2) or 2))
+                except (TypeError, ValueError):
+                    cpu_workers = 2
+                return local_async.run_refresh(
+                    self,
+                    feeds,
+                    per_host_limit=per_host_limit,
+                    max_in_flight=max_in_flight,
+                    cpu_workers=min(cpu_workers, max_workers),
+                    feed_timeout=feed_timeout,
+                    retries=retries,
+                    progress_cb=progress_cb,
+                    force=force,
+                )
+            log.warning("refresh_engine 'async' requested but aiohttp is not installed; using threads")
+        elif engine == "staged":
+            from providers import local_staged
+            try:
+                parse_workers = int(self.config.get("refresh_parse_workers", 0) or 0)
+            except (TypeError, ValueError):
+                parse_workers = 0
+            try:
+                queue_size = max(1, int(self.config.get("refresh_queue_size", 32) or 32))
+            except (TypeError, ValueError):
+                queue_size = 32
+            return local_staged.run_refresh(
+                self,
+                feeds,
+                fetch_workers=max_workers,
+                parse_workers=parse_workers,
+                per_host_limit=per_host_limit,
+                queue_size=queue_size,
+                feed_timeout=feed_timeout,
+                retries=retries,
+                progress_cb=progress_cb,
+                force=force,
+            )
+
         host_limits = defaultdict(lambda: threading.Semaphore(per_host_limit))
 
-        def task(feed_row):
-            return self._refresh_single_feed(feed_row, host_limits, feed_timeout, retries, progress_cb, force)
+        def task(feed_row, queued_at):
+            return self._refresh_single_feed(
+                feed_row, host_limits, feed_timeout, retries, progress_cb, force, queued_at=queued_at
+            )
 
         # Increase workers for network-bound tasks
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(task, f): f for f in feeds}
+            queued_at = time.perf_counter()
+            futures = {executor.submit(task, f, queued_at): f for f in feeds}
             for future in concurrent.futures.as_completed(futures):
                 try:
                     future.result()
                 except Exception as e:
                     log.error(f"Refresh worker error: {e}")
+        try:
+            totals = http_pool.get_registry().totals()
+            log.debug(
+                "Refresh HTTP pool: %s requests over %s hosts, %s connections opened, %s reused",
+                totals["requests"], totals["hosts"], totals["connections_opened"], totals["connections_reused"],
+            )
+        except Exception:
+            pass
         return True
 
-    def _refresh_single_feed(self, feed_row, host_limits, feed_timeout, retries, progress_cb, force=False):
+    def _save_refresh_stats(self, run: "refresh_stats.RefreshRun") -> None:
+        try:
+            keep_runs = int(self.config.get("refresh_stats_runs", refresh_stats.DEFAULT_KEEP_RUNS))
+        except (TypeError, ValueError):
+            keep_runs = refresh_stats.DEFAULT_KEEP_RUNS
+        try:
+            run.save(keep_runs=keep_runs)
+        except Exception as e:
+            log.debug(f"Saving refresh stats failed: {e}")
+
+    def get_refresh_stats(self, runs: int = 10, limit: int = 10) -> Dict[str, Any]:
+        """Slowest feeds/hosts and per-run trend from the recorded refresh timings."""
+        return refresh_stats.get_refresh_stats(runs=runs, limit=limit)
+
+    def get_content_stats(self) -> Dict[str, int]:
+        """Article body storage: rows per format, stored bytes and bytes saved by compression."""
+        return content_store.stats()
+
+    def _refresh_single_feed(self, feed_row, host_limits, feed_timeout, retries, progress_cb, force=False, queued_at=None):
         # Each thread gets its own connection
         feed_id, feed_url, feed_title, feed_category, etag, last_modified = feed_row
         status = "ok"
         new_items = 0
         error_msg = None
         final_title = feed_title or "Unknown Feed"
+        fetched = None
+        timings = refresh_stats.FeedTimings(queued_at)
 
         headers = {}
         if not force:
@@ -131,14 +322,7 @@ class LocalProvider(RSSProvider):
         host = urlparse(feed_url).hostname or feed_url
         limiter = host_limits[host]
 
-        xml_text = None
-        new_etag = None
-        new_last_modified = None
-
         try:
-            from core import rumble as rumble_mod
-            from core import odysee as odysee_mod
-
             is_odysee_listing = (
                 odysee_mod.is_odysee_url(feed_url)
                 and not str(feed_url).lower().endswith((".xml", ".rss", ".atom"))
@@ -147,14 +331,10 @@ class LocalProvider(RSSProvider):
                 normalized_feed_url = odysee_mod.normalize_odysee_feed_url(feed_url)
                 if normalized_feed_url and normalized_feed_url != feed_url:
                     try:
-                        connu = get_connection()
-                        try:
-                            cu = connu.cursor()
-                            cu.execute("UPDATE feeds SET url = ? WHERE id = ?", (normalized_feed_url, feed_id))
+                        with write_connection() as connu:
+                            connu.execute("UPDATE feeds SET url = ? WHERE id = ?", (normalized_feed_url, feed_id))
                             connu.commit()
-                            feed_url = normalized_feed_url
-                        finally:
-                            connu.close()
+                        feed_url = normalized_feed_url
                     except Exception:
                         feed_url = normalized_feed_url
 
@@ -163,8 +343,9 @@ class LocalProvider(RSSProvider):
                     conn0 = get_connection()
                     try:
                         c0 = conn0.cursor()
-                        c0.execute("SELECT COUNT(*) FROM articles WHERE feed_id = ?", (feed_id,))
-                        existing_count = int(c0.fetchone()[0] or 0)
+                        c0.execute("SELECT total FROM feed_counters WHERE feed_id = ?", (feed_id,))
+                        row0 = c0.fetchone()
+                        existing_count = int(row0[0] or 0) if row0 else 0
                     finally:
                         conn0.close()
                 except Exception:
@@ -183,77 +364,46 @@ class LocalProvider(RSSProvider):
                 page_title = None
                 all_items = []
 
-                with limiter:
-                    last_exc = None
-                    attempts = retries + 1
-                    for attempt in range(1, attempts + 1):
-                        try:
+                health = host_health.get_registry()
+                attempts = retries + 1
+                for attempt in range(1, attempts + 1):
+                    health.check(host)
+                    try:
+                        # The host slot is held per attempt, not across the backoff sleep.
+                        wait_started = time.perf_counter()
+                        with limiter, timings.measure("download_s"):
+                            timings.add("host_wait_s", time.perf_counter() - wait_started)
                             page_title, all_items = odysee_mod.fetch_listing_items(
                                 feed_url,
                                 max_items=int(max_items),
                                 timeout_s=float(feed_timeout),
                             )
-                            break
-                        except Exception as e:
-                            last_exc = e
-                            status = "error"
-                            error_msg = str(e)
-                            if attempt <= retries:
-                                backoff = min(4, attempt)
-                                time.sleep(backoff)
-                                continue
-                            raise last_exc
+                        health.record_success(host)
+                        break
+                    except Exception as e:
+                        _record_listing_failure(health, host, e)
+                        status = "error"
+                        error_msg = str(e)
+                        if attempt > retries:
+                            raise
+                    time.sleep(min(4, attempt))  # simple backoff
 
                 if page_title:
                     final_title = page_title
 
-                conn = get_connection()
-                try:
-                    c = conn.cursor()
-                    c.execute(
-                        "UPDATE feeds SET title = ?, etag = ?, last_modified = ? WHERE id = ?",
-                        (final_title, None, None, feed_id),
-                    )
-                    conn.commit()
-
-                    total_entries = len(all_items)
-                    for i, item in enumerate(all_items):
-                        try:
-                            article_id = item.id
-                            title = item.title or "No Title"
-                            url = item.url or ""
-                            author = item.author or final_title or "Odysee"
-                            raw_date = item.published or ""
-                            date = utils.normalize_date(raw_date, title, "", url)
-
-                            c.execute("SELECT date FROM articles WHERE id = ?", (article_id,))
-                            row = c.fetchone()
-                            if row:
-                                existing_date = row[0] or ""
-                                if existing_date != date:
-                                    c.execute("UPDATE articles SET date = ? WHERE id = ?", (date, article_id))
-                                    if i % 5 == 0 or i == total_entries - 1:
-                                        conn.commit()
-                                continue
-
-                            c.execute(
-                                "INSERT INTO articles (id, feed_id, title, url, content, date, author, is_read, media_url, media_type) "
-                                "VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?)",
-                                (article_id, feed_id, title, url, "", date, author, None, None),
-                            )
-                            new_items += 1
-
-                            if i % 5 == 0 or i == total_entries - 1:
-                                conn.commit()
-                        except Exception as e:
-                            log.debug(f"Odysee entry parse/insert failed for {feed_url}: {e}")
-                            continue
-                finally:
-                    try:
-                        conn.close()
-                    except Exception:
-                        pass
-
+                # A successful retry clears the error from earlier attempts.
+                status = "ok"
+                error_msg = None
+                listing_hash, listing_size = _listing_digest(all_items)
+                with timings.measure("db_s"):
+                    unchanged = not force and self._body_unchanged(feed_id, listing_hash, listing_size)
+                if unchanged:
+                    status = "not_modified"
+                    return
+                new_items = self._store_listing_items(
+                    feed_id, feed_url, final_title, all_items, "Odysee",
+                    body_hash=listing_hash, body_size=listing_size, timings=timings,
+                )
                 return
 
             is_rumble_listing = (
@@ -267,14 +417,10 @@ class LocalProvider(RSSProvider):
                 normalized_feed_url = rumble_mod.normalize_rumble_feed_url(feed_url)
                 if normalized_feed_url and normalized_feed_url != feed_url:
                     try:
-                        connu = get_connection()
-                        try:
-                            cu = connu.cursor()
-                            cu.execute("UPDATE feeds SET url = ? WHERE id = ?", (normalized_feed_url, feed_id))
+                        with write_connection() as connu:
+                            connu.execute("UPDATE feeds SET url = ? WHERE id = ?", (normalized_feed_url, feed_id))
                             connu.commit()
-                            feed_url = normalized_feed_url
-                        finally:
-                            connu.close()
+                        feed_url = normalized_feed_url
                     except Exception:
                         feed_url = normalized_feed_url
 
@@ -283,8 +429,9 @@ class LocalProvider(RSSProvider):
                     conn0 = get_connection()
                     try:
                         c0 = conn0.cursor()
-                        c0.execute("SELECT COUNT(*) FROM articles WHERE feed_id = ?", (feed_id,))
-                        existing_count = int(c0.fetchone()[0] or 0)
+                        c0.execute("SELECT total FROM feed_counters WHERE feed_id = ?", (feed_id,))
+                        row0 = c0.fetchone()
+                        existing_count = int(row0[0] or 0) if row0 else 0
                     finally:
                         conn0.close()
                 except Exception:
@@ -310,11 +457,15 @@ class LocalProvider(RSSProvider):
                 page_title = None
                 all_items = []
 
-                with limiter:
-                    last_exc = None
-                    attempts = retries + 1
-                    for attempt in range(1, attempts + 1):
-                        try:
+                health = host_health.get_registry()
+                attempts = retries + 1
+                for attempt in range(1, attempts + 1):
+                    health.check(host)
+                    try:
+                        # The host slot is held per attempt, not across the backoff sleep.
+                        wait_started = time.perf_counter()
+                        with limiter, timings.measure("download_s"):
+                            timings.add("host_wait_s", time.perf_counter() - wait_started)
                             all_items.clear()
                             page_title = None
                             for page in range(1, max_pages + 1):
@@ -325,312 +476,417 @@ class LocalProvider(RSSProvider):
                                 if not items:
                                     break
                                 all_items.extend(items)
-                            break
-                        except Exception as e:
-                            last_exc = e
-                            status = "error"
-                            error_msg = str(e)
-                            if attempt <= retries:
-                                backoff = min(4, attempt)
-                                time.sleep(backoff)
-                                continue
-                            raise last_exc
+                        health.record_success(host)
+                        break
+                    except Exception as e:
+                        _record_listing_failure(health, host, e)
+                        status = "error"
+                        error_msg = str(e)
+                        if attempt > retries:
+                            raise
+                    time.sleep(min(4, attempt))  # simple backoff
 
                 if page_title:
                     final_title = page_title
 
-                conn = get_connection()
-                try:
-                    c = conn.cursor()
-                    # Clear conditional-cache metadata (HTML listing refresh does not use ETag/Last-Modified)
-                    c.execute(
-                        "UPDATE feeds SET title = ?, etag = ?, last_modified = ? WHERE id = ?",
-                        (final_title, None, None, feed_id),
-                    )
-                    conn.commit()
-
-                    total_entries = len(all_items)
-                    for i, item in enumerate(all_items):
-                        try:
-                            article_id = item.id
-                            title = item.title or "No Title"
-                            url = item.url or ""
-                            author = item.author or final_title or "Rumble"
-                            raw_date = item.published or ""
-                            date = utils.normalize_date(raw_date, title, "", url)
-
-                            c.execute("SELECT date FROM articles WHERE id = ?", (article_id,))
-                            row = c.fetchone()
-                            if row:
-                                existing_date = row[0] or ""
-                                if existing_date != date:
-                                    c.execute("UPDATE articles SET date = ? WHERE id = ?", (date, article_id))
-                                    if i % 5 == 0 or i == total_entries - 1:
-                                        conn.commit()
-                                continue
-
-                            c.execute(
-                                "INSERT INTO articles (id, feed_id, title, url, content, date, author, is_read, media_url, media_type) "
-                                "VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?)",
-                                (article_id, feed_id, title, url, "", date, author, None, None),
-                            )
-                            new_items += 1
-
-                            if i % 5 == 0 or i == total_entries - 1:
-                                conn.commit()
-                        except Exception as e:
-                            log.debug(f"Rumble entry parse/insert failed for {feed_url}: {e}")
-                            continue
-                finally:
-                    try:
-                        conn.close()
-                    except Exception:
-                        pass
-
+                # A successful retry clears the error from earlier attempts.
+                status = "ok"
+                error_msg = None
+                listing_hash, listing_size = _listing_digest(all_items)
+                with timings.measure("db_s"):
+                    unchanged = not force and self._body_unchanged(feed_id, listing_hash, listing_size)
+                if unchanged:
+                    status = "not_modified"
+                    return
+                new_items = self._store_listing_items(
+                    feed_id, feed_url, final_title, all_items, "Rumble",
+                    body_hash=listing_hash, body_size=listing_size, timings=timings,
+                )
                 return
 
-            with limiter:
-                last_exc = None
-                attempts = retries + 1
-                for attempt in range(1, attempts + 1):
-                    try:
-                        resp = utils.safe_requests_get(feed_url, headers=headers, timeout=feed_timeout)
-                        if resp.status_code == 304:
-                            status = "not_modified"
-                            new_etag = etag
-                            new_last_modified = last_modified
-                            break
-                        resp.raise_for_status()
-                        # Use content instead of text to let feedparser handle encoding detection
-                        xml_data = resp.content
-                        xml_text = resp.text
-                        new_etag = resp.headers.get('ETag')
-                        new_last_modified = resp.headers.get('Last-Modified')
-                        break
-                    except Exception as e:
-                        last_exc = e
-                        status = "error"
-                        error_msg = f"HTTP {getattr(e.response, 'status_code', 'Error')}: {str(e)}"
-                        if attempt <= retries:
-                            backoff = min(4, attempt)  # simple backoff
-                            time.sleep(backoff)
-                            continue
-                        raise last_exc
-
+            fetched = self._fetch_feed_document(feed_url, headers, limiter, feed_timeout, retries, timings=timings)
+            with timings.measure("db_s"):
+                self._short_circuit_unchanged(feed_id, fetched, force)
+            status = fetched.status
             if status == "not_modified":
                 return
-            if xml_data is None:
-                return
 
-            d = feedparser.parse(xml_data)
-            
-            # Resilience: if 0 entries, try parsing decoded text as fallback
-            # (Sometimes feedparser fails on bytes with certain encoding declarations vs actual content)
-            if len(d.entries) == 0 and d.bozo:
+            final_title, new_items = self._ingest_feed_document(
+                feed_id, feed_url, final_title, fetched, feed_timeout, timings=timings
+            )
+        except host_health.HostDeferred as e:
+            status = "deferred"
+            error_msg = str(e)
+            fetched = FeedFetchResult(status="deferred", error=error_msg, retry_at=e.retry_at)
+            log.info(f"Skipping feed {feed_url}: {e}")
+        except Exception as e:
+            error_msg = str(e)
+            status = "error"
+            log.error(f"Error processing feed {feed_url}: {e}")
+        finally:
+            if status != "ok":
+                with timings.measure("db_s"):
+                    self._record_feed_check(feed_id, status, fetched)
+            state = self._collect_feed_state(feed_id, final_title, feed_category, status, new_items, error_msg, timings)
+            self._emit_progress(progress_cb, state)
+
+    def _fetch_feed_document(self, feed_url, headers, limiter, feed_timeout, retries, timings=None) -> "FeedFetchResult":
+        """Download a feed document, retrying with a short backoff.
+
+        The host slot is held only for the request itself, not while backing off. Hosts
+        whose circuit is open raise host_health.HostDeferred without being contacted.
+        Raises the last error once all attempts are exhausted. Slot wait, time to first
+        byte and body download are added to timings (a refresh_stats.FeedTimings).
+        """
+        timings = timings or refresh_stats.FeedTimings()
+        host = urlparse(feed_url).hostname or ""
+        health = host_health.get_registry()
+        attempts = retries + 1
+        for attempt in range(1, attempts + 1):
+            health.check(host)
+            try:
+                wait_started = time.perf_counter()
+                with limiter:
+                    request_started = time.perf_counter()
+                    timings.add("host_wait_s", request_started - wait_started)
+                    resp = utils.pooled_requests_get(feed_url, headers=headers, timeout=feed_timeout)
+                    request_s = time.perf_counter() - request_started
+                # requests' elapsed ends when the headers are parsed; the rest is the body.
                 try:
-                    d_text = feedparser.parse(xml_text)
-                    if len(d_text.entries) > 0:
-                        d = d_text
-                        log.info(f"Fallback to text parsing successful for {feed_url}")
+                    ttfb = min(request_s, resp.elapsed.total_seconds())
                 except Exception:
-                    pass
-            
-            # Build chapter map
-            chapter_map = {}
+                    ttfb = request_s
+                timings.add("connect_s", ttfb)
+                timings.add("download_s", request_s - ttfb)
+                if resp.status_code in host_health.HOST_FAILURE_STATUSES:
+                    retry_after = None
+                    if resp.status_code in (429, 503):
+                        retry_after = host_health.parse_retry_after(resp.headers.get("Retry-After"))
+                    if retry_after is not None or attempt > retries:
+                        # Count a 5xx once per feed so one broken feed cannot trip a shared host;
+                        # an explicit Retry-After opens the circuit straight away.
+                        health.record_failure(host, f"HTTP {resp.status_code}", retry_after=retry_after)
+                        # The server asked us to back off: defer instead of retrying now.
+                        health.check(host)
+                    else:
+                        health.release_probe(host)
+                else:
+                    # Any other answer (even a 404 for this feed) means the host is up.
+                    health.record_success(host)
+                if resp.status_code == 304:
+                    return FeedFetchResult(
+                        status="not_modified",
+                        fresh_until=feed_schedule.http_fresh_until(resp.headers),
+                    )
+                resp.raise_for_status()
+                timings.add("bytes", len(resp.content or b""))
+                # Keep the raw bytes so feedparser can handle encoding detection
+                return FeedFetchResult(
+                    status="ok",
+                    data=resp.content,
+                    text=resp.text,
+                    etag=resp.headers.get('ETag'),
+                    last_modified=resp.headers.get('Last-Modified'),
+                    fresh_until=feed_schedule.http_fresh_until(resp.headers),
+                )
+            except host_health.HostDeferred:
+                raise
+            except (requests.ConnectionError, requests.Timeout) as e:
+                health.record_failure(host, str(e))
+                if attempt > retries:
+                    raise
+            except Exception:
+                health.release_probe(host)
+                if attempt > retries:
+                    raise
+            time.sleep(min(4, attempt))  # simple backoff
+
+    def _ingest_feed_document(self, feed_id, feed_url, final_title, fetched: "FeedFetchResult", feed_timeout, timings=None):
+        """Parse a downloaded feed document and store new entries. Returns (title, new_items)."""
+        timings = timings or refresh_stats.FeedTimings()
+        with timings.measure("db_s"):
+            known_ids = self._incremental_known_ids(feed_id, fetched)
+        parsed = feed_parse.parse_feed_document(fetched.data, fetched.text, feed_url, known_ids=known_ids)
+        return self._store_parsed_feed(feed_id, feed_url, final_title, parsed, fetched, feed_timeout, timings=timings)
+
+    def _store_parsed_feed(self, feed_id, feed_url, final_title, parsed: Dict[str, Any], fetched: "FeedFetchResult", feed_timeout, timings=None):
+        """Persist the output of feed_parse.parse_feed_document(). Returns (title, new_items).
+
+        Rows go through the shared refresh writer (one transaction for several feeds);
+        NPR audio lookup and chapter downloads are queued in core.enrichment.
+        """
+        timings = timings or refresh_stats.FeedTimings()
+        timings.merge(parsed.get("timings"))
+        if parsed.get("title") is not None:
+            final_title = parsed["title"]
+        entries = parsed.get("entries") or []
+        timings.add("entries", len(entries))
+        with timings.measure("db_s"):
+            fields, new_item_time = self._schedule_fields(
+                feed_id,
+                entries=entries,
+                fresh_until=fetched.fresh_until,
+                ttl_s=parsed.get("ttl_s"),
+                skip_hours=parsed.get("skip_hours"),
+            )
+            fields.update({
+                "title": final_title,
+                "etag": fetched.etag,
+                "last_modified": fetched.last_modified,
+                "body_hash": fetched.body_hash,
+                "body_size": fetched.body_size,
+            })
+            inserted = refresh_writer.get_writer().write(feed_id, fields, entries, new_item_time=new_item_time)
+        return final_title, len(inserted)
+
+    def _store_listing_items(self, feed_id, feed_url, final_title, items, default_author, body_hash=None, body_size=None, timings=None) -> int:
+        """Persist scraped Rumble/Odysee listing items. Returns the number of new items."""
+        timings = timings or refresh_stats.FeedTimings()
+        parse_started = time.perf_counter()
+        entries = []
+        for item in items:
             try:
-                # Prefer XML parser if available (lxml), otherwise fall back to built-in HTML parser
-                try:
-                    soup = BS(xml_text, "xml")
-                except Exception as parser_exc:
-                    log.debug(f"XML parser unavailable for chapter map on {feed_url}; falling back to html.parser ({parser_exc})")
-                    soup = BS(xml_text, "html.parser")
-
-                for item in soup.find_all("item"):
-                    chap = item.find(["podcast:chapters", "psc:chapters", "chapters"])
-                    if chap:
-                        chap_url = chap.get("url") or chap.get("href") or chap.get("src") or chap.get("link")
-                        if chap_url:
-                            guid = item.find("guid")
-                            link = item.find("link")
-                            key = None
-                            if guid and guid.text:
-                                key = guid.text.strip()
-                            elif link and link.text:
-                                key = link.text.strip()
-                            if key:
-                                chapter_map[key] = chap_url
+                title = item.title or "No Title"
+                url = item.url or ""
+                entries.append({
+                    "id": item.id,
+                    "title": title,
+                    "url": url,
+                    "author": item.author or final_title or default_author,
+                    "content": "",
+                    "date": utils.normalize_date(item.published or "", title, "", url),
+                    "media_url": None,
+                    "media_type": None,
+                })
             except Exception as e:
-                log.warning(f"Chapter map build failed for {feed_url}: {e}")
+                log.debug(f"{default_author} entry parse failed for {feed_url}: {e}")
+                continue
+        timings.add("parse_s", time.perf_counter() - parse_started)
+        timings.add("entries", len(entries))
+        with timings.measure("db_s"):
+            fields, new_item_time = self._schedule_fields(feed_id, entries=entries)
+            # Listing refreshes do not use ETag/Last-Modified; the item digest plays that role.
+            fields.update({
+                "title": final_title,
+                "etag": None,
+                "last_modified": None,
+                "body_hash": body_hash,
+                "body_size": body_size,
+            })
+            inserted = refresh_writer.get_writer().write(feed_id, fields, entries, new_item_time=new_item_time)
+        return len(inserted)
+
+    def _body_unchanged(self, feed_id, body_hash, body_size) -> bool:
+        conn = None
+        try:
+            conn = get_connection()
+            c = conn.cursor()
+            c.execute("SELECT body_hash, body_size FROM feeds WHERE id = ?", (feed_id,))
+            row = c.fetchone()
+        except Exception as e:
+            log.debug(f"Body hash lookup failed for {feed_id}: {e}")
+            return False
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        return bool(row and row[0] and row[0] == body_hash and row[1] == body_size)
+
+    def _incremental_known_ids(self, feed_id, fetched: "FeedFetchResult") -> Optional[frozenset]:
+        """Stored article ids for a large feed body, enabling early-terminating parsing.
 
+        Returns None for small bodies (a full parse is cheap) or when disabled.
+        """
+        try:
+            min_bytes = int(self.config.get("incremental_ingest_min_bytes", 1048576) or 0)
+        except (TypeError, ValueError):
+            min_bytes = 1048576
+        if min_bytes <= 0 or fetched.data is None or len(fetched.data) < min_bytes:
+            return None
+        conn = None
+        try:
             conn = get_connection()
-            try:
-                c = conn.cursor()
-                
-                final_title = d.feed.get('title', final_title)
-                c.execute("UPDATE feeds SET title = ?, etag = ?, last_modified = ? WHERE id = ?", 
-                          (final_title, new_etag, new_last_modified, feed_id))
-                conn.commit()
-                
-                total_entries = len(d.entries)
-                for i, entry in enumerate(d.entries):
-                    # Shared extension filters for enclosure/media tags
-                    image_exts = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp")
-                    audio_exts = (".mp3", ".m4a", ".m4b", ".aac", ".ogg", ".opus", ".wav", ".flac")
+            c = conn.cursor()
+            c.execute("SELECT id FROM articles WHERE feed_id = ?", (feed_id,))
+            ids = frozenset(row[0] for row in c.fetchall())
+        except Exception as e:
+            log.debug(f"Known id lookup failed for {feed_id}: {e}")
+            return None
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        return ids or None
 
-                    content = ""
-                    if 'content' in entry:
-                        content = entry.content[0].value
-                    elif 'summary_detail' in entry:
-                        content = entry.summary_detail.value
-                    elif 'summary' in entry:
-                        content = entry.summary
-                    elif 'description' in entry:
-                        content = entry.description
-                    
-                    article_id = entry.get('id', entry.get('link', ''))
-                    if not article_id:
-                        continue
-
-                    title = entry.get('title', '')
-                    if not title or title.strip() == "No Title":
-                         # Fallback: create title from content snippet (e.g. Bluesky/Mastodon)
-                         snippet = content or ""
-                         # Strip HTML
-                         if snippet:
-                             try:
-                                 snippet = BS(snippet, "html.parser").get_text(" ", strip=True)
-                             except Exception:
-                                 pass
-                         if len(snippet) > 80:
-                             snippet = snippet[:80] + "..."
-                         title = snippet or "No Title"
-
-                    url = entry.get('link', '')
-                    author = entry.get('author', 'Unknown')
-
-                    raw_date = entry.get('published') or entry.get('updated') or entry.get('pubDate') or entry.get('date')
-                    if not raw_date:
-                            parsed = entry.get('published_parsed') or entry.get('updated_parsed')
-                            if parsed:
-                                raw_date = time.strftime("%Y-%m-%d %H:%M:%S", parsed)
-                    
-                    date = utils.normalize_date(
-                        str(raw_date) if raw_date else "", 
-                        title, 
-                        content or (entry.get('summary') or ''),
-                        url
-                    )
+    def _short_circuit_unchanged(self, feed_id, fetched: "FeedFetchResult", force: bool = False) -> bool:
+        """Turn a 200 response whose body matches the last stored one into not_modified.
 
-                    c.execute("SELECT date FROM articles WHERE id = ?", (article_id,))
-                    row = c.fetchone()
-                    if row:
-                        existing_date = row[0] or ""
-                        if existing_date != date:
-                                c.execute("UPDATE articles SET date = ? WHERE id = ?", (date, article_id))
-                                # Commit updates occasionally too
-                                if i % 5 == 0 or i == total_entries - 1:
-                                    conn.commit()
-                        continue
-
-                    media_url = None
-                    media_type = None
-                    
-                    # 1. Prioritize YouTube video ID if present (ensures we get the video, not thumbnail)
-                    if 'yt_videoid' in entry:
-                        media_url = url
-                        media_type = "video/youtube"
-                    # 2. Check enclosures, but filter out common image types (thumbnails)
-                    elif 'enclosures' in entry and len(entry.enclosures) > 0:
-                        valid_enclosure = None
-                        for enc in entry.enclosures:
-                            enc_href = getattr(enc, "href", None)
-                            enc_type = getattr(enc, "type", "") or ""
-                            if enc_href:
-                                # Skip if it looks like an image and isn't explicitly audio/video type
-                                if any(enc_href.lower().endswith(ext) for ext in image_exts):
-                                    if not (enc_type.startswith("audio/") or enc_type.startswith("video/")):
-                                        continue
-                                valid_enclosure = enc
-                                break
-                        
-                        if valid_enclosure:
-                            enc_type = getattr(valid_enclosure, "type", "") or ""
-                            enc_href = getattr(valid_enclosure, "href", None)
-                            if enc_type.startswith("audio/") or enc_type.startswith("video/"):
-                                media_url = enc_href
-                                media_type = enc_type
-                            elif enc_href and enc_href.lower().endswith(audio_exts):
-                                media_url = enc_href
-                                media_type = enc_type or "audio/mpeg"
-
-                    # 3. Check media:content (common in RSS 2.0 / MRSS)
-                    if not media_url and 'media_content' in entry:
-                        for mc in entry.media_content:
-                            mc_url = mc.get('url')
-                            mc_type = mc.get('type')
-                            if mc_url:
-                                # Skip thumbnails or images
-                                if mc_type and mc_type.startswith('image/'):
-                                    continue
-                                if any(mc_url.lower().endswith(ext) for ext in image_exts):
-                                    continue
-                                
-                                # Accept if audio/video or looks like audio
-                                if (mc_type and (mc_type.startswith('audio/') or mc_type.startswith('video/'))) or \
-                                   mc_url.lower().endswith(audio_exts):
-                                    media_url = mc_url
-                                    media_type = mc_type or "audio/mpeg"
-                                    break
+        Always records the body digest on fetched so it is stored with the parsed result.
+        """
+        if fetched.status != "ok":
+            return False
+        body = fetched.data
+        if body is None:
+            body = (fetched.text or "").encode("utf-8", errors="replace")
+        fetched.body_hash = _body_digest(body)
+        fetched.body_size = len(body)
+        if force or not self._body_unchanged(feed_id, fetched.body_hash, fetched.body_size):
+            return False
+        fetched.status = "not_modified"
+        fetched.data = None
+        fetched.text = None
+        return True
 
-                    # 4. Check NPR-specific extraction if still no media
-                    if not media_url and npr_mod.is_npr_url(url):
-                        media_url, media_type = npr_mod.extract_npr_audio(url, timeout_s=feed_timeout)
+    def _adaptive_refresh_enabled(self) -> bool:
+        return bool(self.config.get("adaptive_refresh", True))
 
-                    c.execute("INSERT INTO articles (id, feed_id, title, url, content, date, author, is_read, media_url, media_type) VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?)",
-                                (article_id, feed_id, title, url, content, date, author, media_url, media_type))
-                    new_items += 1
-                    
-                    chapter_url = None
-                    if 'podcast_chapters' in entry:
-                        chapters_tag = entry.podcast_chapters
-                        chapter_url = getattr(chapters_tag, 'href', None) or getattr(chapters_tag, 'url', None) or getattr(chapters_tag, 'value', None)
-                    if not chapter_url and 'psc_chapters' in entry:
-                        chapters_tag = entry.psc_chapters
-                        chapter_url = getattr(chapters_tag, 'href', None) or getattr(chapters_tag, 'url', None) or getattr(chapters_tag, 'value', None)
-                    
-                    if not chapter_url:
-                        key = entry.get('guid') or entry.get('id') or entry.get('link')
-                        if key and key in chapter_map:
-                            chapter_url = chapter_map[key]
+    def _base_refresh_interval(self) -> float:
+        try:
+            interval = float(self.config.get("refresh_interval", 300) or 0)
+        except (TypeError, ValueError):
+            interval = 300.0
+        # refresh_interval <= 0 means "never"; manual refreshes still schedule sensibly.
+        return interval if interval > 0 else 300.0
+
+    def _max_refresh_interval(self) -> float:
+        try:
+            max_interval = float(self.config.get("refresh_max_interval", 21600) or 21600)
+        except (TypeError, ValueError):
+            max_interval = 21600.0
+        return max(self._base_refresh_interval(), max_interval)
+
+    def _schedule_fields(self, feed_id, entries=None, fresh_until=None, ttl_s=None, skip_hours=None, failed=False):
+        """Compute feeds scheduling columns after a check. Returns (fields, new_item_time).
+
+        entries is None when the body was not (re)parsed: 304s, errors. In that case the
+        stored publish history and RSS hints are reused.
+        """
+        now = time.time()
+        prev_interval = prev_last_new = prev_ttl = None
+        prev_skip = None
+        conn = None
+        try:
+            conn = get_connection()
+            c = conn.cursor()
+            c.execute(
+                "SELECT publish_interval_s, last_new_item_at, ttl_s, skip_hours FROM feeds WHERE id = ?",
+                (feed_id,),
+            )
+            row = c.fetchone()
+            if row:
+                prev_interval, prev_last_new, prev_ttl, prev_skip = row
+        except Exception as e:
+            log.debug(f"Schedule history fetch failed for {feed_id}: {e}")
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
 
-                    utils.fetch_and_store_chapters(article_id, media_url, media_type, chapter_url, allow_id3=False)
+        new_item_time = None
+        publish_interval = prev_interval
+        last_new = prev_last_new
+        if entries is not None:
+            stamps = feed_schedule.entry_timestamps(entries, now)
+            if stamps:
+                new_item_time = min(now, stamps[0])
+                last_new = max(float(prev_last_new or 0), new_item_time)
+            publish_interval = feed_schedule.estimate_publish_interval(stamps) or prev_interval
+            ttl = ttl_s
+            skip = feed_schedule.format_skip_hours(skip_hours)
+        else:
+            ttl = prev_ttl
+            skip = prev_skip
+
+        next_at = feed_schedule.compute_next_check(
+            now,
+            base_interval=self._base_refresh_interval(),
+            max_interval=self._max_refresh_interval(),
+            publish_interval=publish_interval,
+            last_new_item_at=last_new,
+            fresh_until=fresh_until,
+            ttl_s=ttl,
+            skip_hours=feed_schedule.parse_skip_hours(skip),
+            failed=failed,
+        )
+        fields = {
+            "last_checked_at": now,
+            "next_check_at": next_at,
+            "publish_interval_s": publish_interval,
+            "ttl_s": ttl,
+            "skip_hours": skip,
+        }
+        return fields, new_item_time
 
-                    # Commit every 5 items to save progress incrementally
-                    if i % 5 == 0 or i == total_entries - 1:
-                        conn.commit()
-            finally:
-                conn.close()
+    def _record_feed_check(self, feed_id, status, fetched: Optional["FeedFetchResult"] = None):
+        """Reschedule a feed whose check stored no entries (not modified, deferred or failed)."""
+        try:
+            fields, _ = self._schedule_fields(
+                feed_id,
+                fresh_until=fetched.fresh_until if fetched is not None else None,
+                failed=(status in ("error", "deferred")),
+            )
+            if status == "deferred" and fetched is not None and fetched.retry_at:
+                # No point checking before the host's cooldown ends.
+                fields["next_check_at"] = max(fields["next_check_at"], float(fetched.retry_at))
+            refresh_writer.get_writer().write(feed_id, fields)
+        except Exception as e:
+            log.debug(f"Schedule update failed for {feed_id}: {e}")
+
+    def _complete_fetched_feed(self, feed_row, fetched: "FeedFetchResult", feed_timeout, progress_cb, parsed: Optional[Dict[str, Any]] = None, timings=None):
+        """Finish a refresh whose download (and optionally parse) already happened elsewhere.
+
+        Used by the async and staged engines. When parsed is None the document is parsed inline.
+        timings is the FeedTimings started when the engine picked the feed up.
+        """
+        timings = timings or refresh_stats.FeedTimings()
+        feed_id, feed_url, feed_title, feed_category, _etag, _last_modified = feed_row
+        status = fetched.status
+        new_items = 0
+        error_msg = fetched.error
+        final_title = feed_title or "Unknown Feed"
+        try:
+            if status == "ok":
+                if parsed is None:
+                    final_title, new_items = self._ingest_feed_document(
+                        feed_id, feed_url, final_title, fetched, feed_timeout, timings=timings
+                    )
+                else:
+                    final_title, new_items = self._store_parsed_feed(
+                        feed_id, feed_url, final_title, parsed, fetched, feed_timeout, timings=timings
+                    )
         except Exception as e:
             error_msg = str(e)
             status = "error"
             log.error(f"Error processing feed {feed_url}: {e}")
         finally:
-            state = self._collect_feed_state(feed_id, final_title, feed_category, status, new_items, error_msg)
+            if status != "ok":
+                with timings.measure("db_s"):
+                    self._record_feed_check(feed_id, status, fetched)
+            state = self._collect_feed_state(feed_id, final_title, feed_category, status, new_items, error_msg, timings)
             self._emit_progress(progress_cb, state)
 
-    def _collect_feed_state(self, feed_id, title, category, status, new_items, error_msg):
+    def _collect_feed_state(self, feed_id, title, category, status, new_items, error_msg, timings=None):
         unread = 0
         conn = None
         try:
             conn = get_connection()
             c = conn.cursor()
-            c.execute("SELECT title, category FROM feeds WHERE id = ?", (feed_id,))
+            c.execute(
+                "SELECT f.title, f.category, fc.unread FROM feeds f "
+                "LEFT JOIN feed_counters fc ON fc.feed_id = f.id WHERE f.id = ?",
+                (feed_id,),
+            )
             row = c.fetchone()
             if row:
                 title = row[0] or title
                 category = row[1] or category
-            c.execute("SELECT COUNT(*) FROM articles WHERE feed_id = ? AND is_read = 0", (feed_id,))
-            unread = c.fetchone()[0] or 0
+                unread = row[2] or 0
         except Exception as e:
             log.debug(f"Feed state fetch failed for {feed_id}: {e}")
         finally:
@@ -647,6 +903,7 @@ class LocalProvider(RSSProvider):
             "status": status,
             "new_items": new_items,
             "error": error_msg,
+            "timings": timings.as_dict() if timings is not None else {},
         }
 
     def _emit_progress(self, progress_cb, state):
@@ -661,16 +918,17 @@ class LocalProvider(RSSProvider):
         conn = get_connection()
         try:
             c = conn.cursor()
-            c.execute("SELECT id, title, url, category, icon_url FROM feeds")
+            # Unread counts come from the trigger-maintained feed_counters table.
+            c.execute(
+                "SELECT f.id, f.title, f.url, f.category, f.icon_url, fc.unread FROM feeds f "
+                "LEFT JOIN feed_counters fc ON fc.feed_id = f.id"
+            )
             rows = c.fetchall()
 
-            c.execute("SELECT feed_id, COUNT(*) FROM articles WHERE is_read = 0 GROUP BY feed_id")
-            unread_map = {row[0]: row[1] for row in c.fetchall()}
-            
             feeds = []
             for row in rows:
                 f = Feed(id=row[0], title=row[1], url=row[2], category=row[3], icon_url=row[4])
-                f.unread_count = unread_map.get(f.id, 0)
+                f.unread_count = row[5] or 0
                 feeds.append(f)
             return feeds
         finally:
@@ -700,87 +958,128 @@ class LocalProvider(RSSProvider):
 
         return real_feed_id, filter_read, filter_favorite
 
+    @staticmethod
+    def _counter_expression(filter_read: Optional[int], filter_favorite: Optional[int]) -> str:
+        """feed_counters expression counting the articles a read/favorite filter selects."""
+        if filter_favorite:
+            return {None: "favorites", 0: "unread_favorites"}.get(filter_read, "favorites - unread_favorites")
+        return {None: "total", 0: "unread"}.get(filter_read, "total - unread")
+
+    def _count_view_articles(self, c, real_feed_id: str, filter_read: Optional[int], filter_favorite: Optional[int]) -> int:
+        """Article total for a view, read from feed_counters (O(feeds), no articles scan)."""
+        expr = self._counter_expression(filter_read, filter_favorite)
+        if real_feed_id.startswith("category:"):
+            c.execute(
+                f"SELECT COALESCE(SUM({expr}), 0) FROM feed_counters fc "
+                "JOIN feeds f ON fc.feed_id = f.id WHERE f.category = ?",
+                (real_feed_id.split(":", 1)[1],),
+            )
+        elif real_feed_id == "all":
+            c.execute(f"SELECT COALESCE(SUM({expr}), 0) FROM feed_counters")
+        else:
+            c.execute(f"SELECT {expr} FROM feed_counters WHERE feed_id = ?", (real_feed_id,))
+        row = c.fetchone()
+        return int(row[0] or 0) if row else 0
+
     def get_articles(self, feed_id: str) -> List[Article]:
+        """Every article in a view, newest first, without bodies (see get_article_content())."""
         conn = get_connection()
         try:
             c = conn.cursor()
-            
-            # Determine filters
             real_feed_id, filter_read, filter_favorite = self._parse_article_view_filters(feed_id)
-
-            sql_parts = ["SELECT id, feed_id, title, url, content, date, author, is_read, is_favorite, media_url, media_type FROM articles"]
-            where_clauses = []
-            params = []
-            
-            # For category queries we alias articles as 'a' (because of JOIN). 
-            # For simple queries we don't alias or can assume table is articles.
-            # To be consistent, let's handle the join case specifically.
-            
-            is_category = real_feed_id.startswith("category:")
-            if is_category:
-                cat_name = real_feed_id.split(":", 1)[1]
-                sql_parts = ["""
-                    SELECT a.id, a.feed_id, a.title, a.url, a.content, a.date, a.author, a.is_read, a.is_favorite, a.media_url, a.media_type
-                    FROM articles a
-                    JOIN feeds f ON a.feed_id = f.id
-                """]
-                where_clauses.append("f.category = ?")
-                params.append(cat_name)
-            elif real_feed_id != "all":
-                where_clauses.append("feed_id = ?")
-                params.append(real_feed_id)
-            
-            if filter_read is not None:
-                # If we are in category mode, we use 'a.is_read', otherwise just 'is_read'
-                col = "a.is_read" if is_category else "is_read"
-                where_clauses.append(f"{col} = ?")
-                params.append(filter_read)
-
-            if filter_favorite is not None:
-                col = "a.is_favorite" if is_category else "is_favorite"
-                where_clauses.append(f"{col} = ?")
-                params.append(filter_favorite)
-
+            sql, where_clauses, params, alias = self._article_view_query(real_feed_id, filter_read, filter_favorite)
+            sql_parts = [sql]
             if where_clauses:
                 sql_parts.append("WHERE " + " AND ".join(where_clauses))
-            
-            sort_col = "a.date" if is_category else "date"
-            sort_id = "a.id" if is_category else "id"
-            sql_parts.append(f"ORDER BY {sort_col} DESC, {sort_id} DESC")
-            
+            sort_col = self._sort_column()
+            sql_parts.append(f"ORDER BY {alias}{sort_col} DESC, {alias}id DESC")
             c.execute(" ".join(sql_parts), tuple(params))
-                
-            rows = c.fetchall()
-            
-            # Batch fetch chapters for these articles
-            article_ids = [r[0] for r in rows]
-            chapters_map = {}
-            
-            if article_ids:
-                # SQLite limits variables, simple chunking
-                chunk_size = 900
-                for i in range(0, len(article_ids), chunk_size):
-                    chunk = article_ids[i:i+chunk_size]
-                    placeholders = ','.join(['?'] * len(chunk))
-                    c.execute(f"SELECT article_id, start, title, href FROM chapters WHERE article_id IN ({placeholders})", chunk)
-                    for ch_row in c.fetchall():
-                        aid = ch_row[0]
-                        if aid not in chapters_map: chapters_map[aid] = []
-                        chapters_map[aid].append({"start": ch_row[1], "title": ch_row[2], "href": ch_row[3]})
-
-            articles = []
-            for row in rows:
-                chs = chapters_map.get(row[0], [])
-                chs.sort(key=lambda x: x["start"])
-                
-                articles.append(Article(
-                    id=row[0], feed_id=row[1], title=row[2], url=row[3], content=row[4], date=row[5], author=row[6], is_read=bool(row[7]),
-                    is_favorite=bool(row[8]), media_url=row[9], media_type=row[10], chapters=chs
-                ))
-            return articles
+            return self._page_rows_to_articles(c, c.fetchall())
         finally:
             conn.close()
 
+    def _article_view_query(self, real_feed_id: str, filter_read: Optional[int], filter_favorite: Optional[int]):
+        """SELECT ... FROM for a view plus its WHERE clauses. Returns (sql, where, params, alias).
+
+        This is the list projection: content is selected as NULL so pages do not read (or keep
+        cached) article bodies; the body is loaded on selection via get_article_content().
+        """
+        columns = ["id", "feed_id", "title", "url", "NULL", "date", "author", "is_read", "is_favorite", "media_url", "media_type"]
+        where_clauses = []
+        params = []
+        if real_feed_id.startswith("category:"):
+            alias = "a."
+            sql = (
+                "SELECT " + ", ".join(col if col == "NULL" else "a." + col for col in columns)
+                + ", " + self._timestamp_column(alias)
+                + " FROM articles a JOIN feeds f ON a.feed_id = f.id"
+            )
+            where_clauses.append("f.category = ?")
+            params.append(real_feed_id.split(":", 1)[1])
+        else:
+            alias = ""
+            sql = "SELECT " + ", ".join(columns) + ", " + self._timestamp_column(alias) + " FROM articles"
+            if real_feed_id != "all":
+                where_clauses.append("feed_id = ?")
+                params.append(real_feed_id)
+
+        if filter_read is not None:
+            where_clauses.append(f"{alias}is_read = ?")
+            params.append(filter_read)
+
+        if filter_favorite is not None:
+            where_clauses.append(f"{alias}is_favorite = ?")
+            params.append(filter_favorite)
+        return sql, where_clauses, params, alias
+
+    @staticmethod
+    def _sort_column() -> str:
+        # published_ts once the background backfill has filled it in and indexed it
+        return "published_ts" if published_ts_ready() else "date"
+
+    @staticmethod
+    def _timestamp_column(alias: str) -> str:
+        # Rows not backfilled yet get the same value computed by SQLite
+        return f"COALESCE({alias}published_ts, {published_ts_sql(alias + 'date')})"
+
+    def _page_rows_to_articles(self, c, rows) -> List[Article]:
+        # Fetch chapters for just this page
+        article_ids = [r[0] for r in rows]
+        chapters_map = {}
+        if article_ids:
+            chunk_size = 900
+            for i in range(0, len(article_ids), chunk_size):
+                chunk = article_ids[i:i+chunk_size]
+                placeholders = ",".join(["?" for _ in chunk])
+                c.execute(
+                    f"SELECT article_id, start, title, href FROM chapters WHERE article_id IN ({placeholders}) ORDER BY article_id, start",
+                    chunk,
+                )
+                for row in c.fetchall():
+                    aid = row[0]
+                    if aid not in chapters_map:
+                        chapters_map[aid] = []
+                    chapters_map[aid].append({"start": row[1], "title": row[2], "href": row[3]})
+
+        articles: List[Article] = []
+        for r in rows:
+            chapters = chapters_map.get(r[0], [])
+            articles.append(Article(
+                id=r[0],
+                feed_id=r[1],
+                title=r[2],
+                url=r[3],
+                content=r[4],
+                date=r[5],
+                author=r[6],
+                is_read=bool(r[7]),
+                is_favorite=bool(r[8]),
+                media_url=r[9],
+                media_type=r[10],
+                chapters=chapters,
+                timestamp=r[11],
+            ))
+        return articles
 
     def get_articles_page(self, feed_id: str, offset: int = 0, limit: int = 200):
         """Fetch a single page of articles from the local SQLite DB (fast-first loading)."""
@@ -794,144 +1093,167 @@ class LocalProvider(RSSProvider):
             # Determine filters
             real_feed_id, filter_read, filter_favorite = self._parse_article_view_filters(feed_id)
 
-            # 1. Calculate Total
-            count_sql_parts = []
-            count_where = []
-            count_params = []
-            
-            is_category = real_feed_id.startswith("category:")
-            
-            if is_category:
-                cat_name = real_feed_id.split(":", 1)[1]
-                count_sql_parts = ["SELECT COUNT(*) FROM articles a JOIN feeds f ON a.feed_id = f.id"]
-                count_where.append("f.category = ?")
-                count_params.append(cat_name)
-            elif real_feed_id == "all":
-                count_sql_parts = ["SELECT COUNT(*) FROM articles"]
-            else:
-                count_sql_parts = ["SELECT COUNT(*) FROM articles"]
-                count_where.append("feed_id = ?")
-                count_params.append(real_feed_id)
-            
-            if filter_read is not None:
-                # If we are in category mode (or generally aliased), check prefix
-                # But for simple "SELECT COUNT(*) FROM articles", no alias 'a' is defined unless we added it or joined.
-                # 'is_category' uses JOIN so 'a' is defined.
-                # 'all' and 'feed_id' do not use JOIN in count query above.
-                col = "a.is_read" if is_category else "is_read"
-                count_where.append(f"{col} = ?")
-                count_params.append(filter_read)
-
-            if filter_favorite is not None:
-                col = "a.is_favorite" if is_category else "is_favorite"
-                count_where.append(f"{col} = ?")
-                count_params.append(filter_favorite)
-            
-            if count_where:
-                count_sql_parts.append("WHERE " + " AND ".join(count_where))
-                
-            c.execute(" ".join(count_sql_parts), tuple(count_params))
-            total = int(c.fetchone()[0] or 0)
+            # 1. Calculate Total (from the trigger-maintained counters)
+            total = self._count_view_articles(c, real_feed_id, filter_read, filter_favorite)
 
             # 2. Fetch Page
-            sql_parts = ["SELECT id, feed_id, title, url, content, date, author, is_read, is_favorite, media_url, media_type FROM articles"]
-            where_clauses = []
-            params = []
-            
-            if is_category:
-                cat_name = real_feed_id.split(":", 1)[1]
-                sql_parts = ["""
-                    SELECT a.id, a.feed_id, a.title, a.url, a.content, a.date, a.author, a.is_read, a.is_favorite, a.media_url, a.media_type
-                    FROM articles a
-                    JOIN feeds f ON a.feed_id = f.id
-                """]
-                where_clauses.append("f.category = ?")
-                params.append(cat_name)
-            elif real_feed_id != "all":
-                where_clauses.append("feed_id = ?")
-                params.append(real_feed_id)
-                
-            if filter_read is not None:
-                col = "a.is_read" if is_category else "is_read"
-                where_clauses.append(f"{col} = ?")
-                params.append(filter_read)
-
-            if filter_favorite is not None:
-                col = "a.is_favorite" if is_category else "is_favorite"
-                where_clauses.append(f"{col} = ?")
-                params.append(filter_favorite)
-            
+            sql, where_clauses, params, alias = self._article_view_query(real_feed_id, filter_read, filter_favorite)
+            sql_parts = [sql]
             if where_clauses:
                 sql_parts.append("WHERE " + " AND ".join(where_clauses))
-                
-            sort_col = "a.date" if is_category else "date"
-            sort_id = "a.id" if is_category else "id"
-            sql_parts.append(f"ORDER BY {sort_col} DESC, {sort_id} DESC LIMIT ? OFFSET ?")
+            sort_col = self._sort_column()
+            sql_parts.append(f"ORDER BY {alias}{sort_col} DESC, {alias}id DESC LIMIT ? OFFSET ?")
             params.append(limit)
             params.append(offset)
-            
+
             c.execute(" ".join(sql_parts), tuple(params))
             rows = c.fetchall()
+            return self._page_rows_to_articles(c, rows), total
+        finally:
+            conn.close()
 
-            # Fetch chapters for just this page
-            article_ids = [r[0] for r in rows]
-            chapters_map = {}
-            if article_ids:
-                chunk_size = 900
-                for i in range(0, len(article_ids), chunk_size):
-                    chunk = article_ids[i:i+chunk_size]
-                    placeholders = ",".join(["?" for _ in chunk])
-                    c.execute(
-                        f"SELECT article_id, start, title, href FROM chapters WHERE article_id IN ({placeholders}) ORDER BY article_id, start",
-                        chunk,
-                    )
-                    for row in c.fetchall():
-                        aid = row[0]
-                        if aid not in chapters_map:
-                            chapters_map[aid] = []
-                        chapters_map[aid].append({"start": row[1], "title": row[2], "href": row[3]})
-
-            articles: List[Article] = []
-            for r in rows:
-                chapters = chapters_map.get(r[0], [])
-                articles.append(Article(
-                    id=r[0],
-                    feed_id=r[1],
-                    title=r[2],
-                    url=r[3],
-                    content=r[4],
-                    date=r[5],
-                    author=r[6],
-                    is_read=bool(r[7]),
-                    is_favorite=bool(r[8]),
-                    media_url=r[9],
-                    media_type=r[10],
-                    chapters=chapters
-                ))
-            return articles, total
+    def supports_keyset_paging(self) -> bool:
+        return True
+
+    def get_article_content(self, article_id: str) -> Optional[str]:
+        """Body of one article (list pages leave Article.content as None).
+
+        Recently viewed bodies are kept in a small LRU so moving back and forth in the
+        list does not go to the database every time.
+        """
+        with self._content_cache_lock:
+            if article_id in self._content_cache:
+                self._content_cache.move_to_end(article_id)
+                return self._content_cache[article_id]
+        conn = get_connection()
+        try:
+            c = conn.cursor()
+            c.execute("SELECT content FROM articles WHERE id = ?", (article_id,))
+            row = c.fetchone()
         finally:
             conn.close()
+        if row is None:
+            return None
+        content = content_store.decode(row[0]) or ""
+        with self._content_cache_lock:
+            self._content_cache[article_id] = content
+            while len(self._content_cache) > _CONTENT_CACHE_SIZE:
+                self._content_cache.popitem(last=False)
+        return content
+
+    def search_articles(self, query: str, view_id: str = "all", limit: int = 50, cursor: Optional[int] = None):
+        """Full-text search (FTS5, BM25-ranked) within a view. Returns (articles, next_cursor).
+
+        Each article carries a .snippet of the matching text; content is left for
+        get_article_content() like on list pages.
+        """
+        match = search_index.fts_query(query)
+        limit = int(limit)
+        if not match or limit <= 0:
+            return [], None
+        offset = max(0, int(cursor or 0))
+
+        real_feed_id, filter_read, filter_favorite = self._parse_article_view_filters(view_id or "all")
+        sql = (
+            "SELECT a.id, a.feed_id, a.title, a.url, NULL, a.date, a.author, a.is_read, a.is_favorite, "
+            f"a.media_url, a.media_type, {self._timestamp_column('a.')}, snippet(articles_fts, -1, '', '', '...', 16) "
+            "FROM articles_fts JOIN articles a ON a.id = articles_fts.article_id"
+        )
+        where_clauses = ["articles_fts MATCH ?"]
+        params: List[Any] = [match]
+        if real_feed_id.startswith("category:"):
+            sql += " JOIN feeds f ON a.feed_id = f.id"
+            where_clauses.append("f.category = ?")
+            params.append(real_feed_id.split(":", 1)[1])
+        elif real_feed_id != "all":
+            where_clauses.append("a.feed_id = ?")
+            params.append(real_feed_id)
+        if filter_read is not None:
+            where_clauses.append("a.is_read = ?")
+            params.append(filter_read)
+        if filter_favorite is not None:
+            where_clauses.append("a.is_favorite = ?")
+            params.append(filter_favorite)
+        sql += " WHERE " + " AND ".join(where_clauses) + " ORDER BY articles_fts.rank LIMIT ? OFFSET ?"
+        # One extra row tells whether another page exists.
+        params.extend([limit + 1, offset])
 
-    def mark_read(self, article_id: str) -> bool:
         conn = get_connection()
         try:
             c = conn.cursor()
-            c.execute("UPDATE articles SET is_read = 1 WHERE id = ?", (article_id,))
-            conn.commit()
-            return True
+            try:
+                c.execute(sql, params)
+            except sqlite3.OperationalError as e:
+                log.warning(f"Article search failed: {e}")
+                return [], None
+            rows = c.fetchall()
+            more = len(rows) > limit
+            rows = rows[:limit]
+            articles = self._page_rows_to_articles(c, [r[:12] for r in rows])
         finally:
             conn.close()
+        for article, row in zip(articles, rows):
+            article.snippet = row[12] or ""
+        return articles, (offset + limit if more else None)
+
+    def get_articles_after(self, feed_id: str, cursor: Optional[Tuple[float, str]] = None, limit: int = 200):
+        """Fetch the page of articles that follows cursor in (timestamp DESC, id DESC) order.
+
+        cursor is the (timestamp, id) of the last article already loaded, or None for the
+        first page. The (published_ts, id) and (feed_id, published_ts, id) indexes seek
+        straight to the cursor, so deep pages cost the same as the first one (OFFSET has
+        to walk every skipped row). Returns (articles, total); total comes from feed_counters.
+        """
+        limit = int(limit)
 
-    def mark_unread(self, article_id: str) -> bool:
         conn = get_connection()
         try:
             c = conn.cursor()
-            c.execute("UPDATE articles SET is_read = 0 WHERE id = ?", (article_id,))
-            conn.commit()
-            return True
+            real_feed_id, filter_read, filter_favorite = self._parse_article_view_filters(feed_id)
+            total = self._count_view_articles(c, real_feed_id, filter_read, filter_favorite)
+
+            sql, where_clauses, params, alias = self._article_view_query(real_feed_id, filter_read, filter_favorite)
+            sort_col = self._sort_column()
+            if cursor is not None:
+                cursor_ts, cursor_id = cursor
+                if sort_col == "date":
+                    # Still ordering by the date string (backfill running): continue from the
+                    # cursor row's stored date. Rebuilding it from the timestamp is wrong for
+                    # dates SQLite cannot read ('' or raw RFC 822), whose timestamp is 0.
+                    c.execute("SELECT date FROM articles WHERE id = ?", (cursor_id or "",))
+                    row = c.fetchone()
+                    if row and row[0] is not None:
+                        cursor_key = row[0]
+                    else:
+                        cursor_key = utils.format_datetime(_EPOCH + timedelta(seconds=int(cursor_ts or 0)))
+                else:
+                    cursor_key = int(cursor_ts or 0)
+                where_clauses.append(f"({alias}{sort_col}, {alias}id) < (?, ?)")
+                params.extend([cursor_key, cursor_id or ""])
+            sql_parts = [sql]
+            if where_clauses:
+                sql_parts.append("WHERE " + " AND ".join(where_clauses))
+            sql_parts.append(f"ORDER BY {alias}{sort_col} DESC, {alias}id DESC LIMIT ?")
+            params.append(limit)
+
+            c.execute(" ".join(sql_parts), tuple(params))
+            rows = c.fetchall()
+            return self._page_rows_to_articles(c, rows), total
         finally:
             conn.close()
 
+    def mark_read(self, article_id: str) -> bool:
+        with write_connection() as conn:
+            conn.execute("UPDATE articles SET is_read = 1 WHERE id = ?", (article_id,))
+            conn.commit()
+            return True
+
+    def mark_unread(self, article_id: str) -> bool:
+        with write_connection() as conn:
+            conn.execute("UPDATE articles SET is_read = 0 WHERE id = ?", (article_id,))
+            conn.commit()
+            return True
+
     def supports_favorites(self) -> bool:
         return True
 
@@ -939,8 +1261,7 @@ class LocalProvider(RSSProvider):
         return True
 
     def toggle_favorite(self, article_id: str):
-        conn = get_connection()
-        try:
+        with write_connection() as conn:
             c = conn.cursor()
             c.execute("SELECT is_favorite FROM articles WHERE id = ?", (article_id,))
             row = c.fetchone()
@@ -950,12 +1271,9 @@ class LocalProvider(RSSProvider):
             c.execute("UPDATE articles SET is_favorite = ? WHERE id = ?", (new_val, article_id))
             conn.commit()
             return bool(new_val)
-        finally:
-            conn.close()
 
     def set_favorite(self, article_id: str, is_favorite: bool) -> bool:
-        conn = get_connection()
-        try:
+        with write_connection() as conn:
             c = conn.cursor()
             c.execute("SELECT 1 FROM articles WHERE id = ?", (article_id,))
             if not c.fetchone():
@@ -963,40 +1281,32 @@ class LocalProvider(RSSProvider):
             c.execute("UPDATE articles SET is_favorite = ? WHERE id = ?", (1 if is_favorite else 0, article_id))
             conn.commit()
             return True
-        finally:
-            conn.close()
 
     def delete_article(self, article_id: str) -> bool:
         if not article_id:
             return False
-        conn = get_connection()
-        try:
+        with self._content_cache_lock:
+            self._content_cache.pop(article_id, None)
+        with write_connection() as conn:
             c = conn.cursor()
             c.execute("DELETE FROM chapters WHERE article_id = ?", (article_id,))
             c.execute("DELETE FROM articles WHERE id = ?", (article_id,))
             deleted = int(c.rowcount or 0)
             conn.commit()
             return deleted > 0
-        finally:
-            conn.close()
 
     def update_article_media(self, article_id: str, media_url: str, media_type: str) -> bool:
-        conn = get_connection()
         try:
-            c = conn.cursor()
-            c.execute("UPDATE articles SET media_url = ?, media_type = ? WHERE id = ?", (media_url, media_type, article_id))
-            conn.commit()
+            with write_connection() as conn:
+                conn.execute("UPDATE articles SET media_url = ?, media_type = ? WHERE id = ?", (media_url, media_type, article_id))
+                conn.commit()
             return True
         except Exception as e:
             log.error(f"Error updating article media: {e}")
             return False
-        finally:
-            conn.close()
 
     def add_feed(self, url: str, category: str = "Uncategorized") -> bool:
         from core.discovery import get_ytdlp_feed_url
-        from core import rumble as rumble_mod
-        from core import odysee as odysee_mod
         
         # Try to get native feed URL for media sites (e.g. YouTube)
         real_url = get_ytdlp_feed_url(url) or discover_feed(url) or url
@@ -1018,27 +1328,22 @@ class LocalProvider(RSSProvider):
         except Exception:
             title = title or real_url
             
-        conn = get_connection()
-        try:
+        with write_connection() as conn:
             c = conn.cursor()
             feed_id = str(uuid.uuid4())
             c.execute("INSERT INTO feeds (id, url, title, category, icon_url) VALUES (?, ?, ?, ?, ?)",
                       (feed_id, real_url, title, category, ""))
             conn.commit()
             return True
-        finally:
-            conn.close()
 
     def remove_feed(self, feed_id: str) -> bool:
-        conn = get_connection()
-        try:
+        with write_connection() as conn:
             c = conn.cursor()
             c.execute("DELETE FROM articles WHERE feed_id = ?", (feed_id,))
+            c.execute("DELETE FROM feed_counters WHERE feed_id = ?", (feed_id,))
             c.execute("DELETE FROM feeds WHERE id = ?", (feed_id,))
             conn.commit()
             return True
-        finally:
-            conn.close()
 
     def supports_feed_edit(self) -> bool:
         return True
@@ -1047,35 +1352,33 @@ class LocalProvider(RSSProvider):
         return True
 
     def update_feed(self, feed_id: str, title: str = None, url: str = None, category: str = None) -> bool:
-        conn = get_connection()
         try:
-            c = conn.cursor()
-            c.execute("SELECT url, title, category FROM feeds WHERE id = ?", (feed_id,))
-            row = c.fetchone()
-            if not row:
-                return False
-            cur_url, cur_title, cur_category = row[0], row[1], row[2]
-            new_url = url if url is not None else cur_url
-            new_title = title if title is not None else cur_title
-            new_category = category if category is not None else cur_category
+            with write_connection() as conn:
+                c = conn.cursor()
+                c.execute("SELECT url, title, category FROM feeds WHERE id = ?", (feed_id,))
+                row = c.fetchone()
+                if not row:
+                    return False
+                cur_url, cur_title, cur_category = row[0], row[1], row[2]
+                new_url = url if url is not None else cur_url
+                new_title = title if title is not None else cur_title
+                new_category = category if category is not None else cur_category
 
-            if str(new_url or "") != str(cur_url or ""):
-                c.execute(
-                    "UPDATE feeds SET url = ?, title = ?, category = ?, etag = NULL, last_modified = NULL WHERE id = ?",
-                    (new_url, new_title, new_category, feed_id),
-                )
-            else:
-                c.execute(
-                    "UPDATE feeds SET url = ?, title = ?, category = ? WHERE id = ?",
-                    (new_url, new_title, new_category, feed_id),
-                )
-            conn.commit()
-            return True
+                if str(new_url or "") != str(cur_url or ""):
+                    c.execute(
+                        "UPDATE feeds SET url = ?, title = ?, category = ?, etag = NULL, last_modified = NULL WHERE id = ?",
+                        (new_url, new_title, new_category, feed_id),
+                    )
+                else:
+                    c.execute(
+                        "UPDATE feeds SET url = ?, title = ?, category = ? WHERE id = ?",
+                        (new_url, new_title, new_category, feed_id),
+                    )
+                conn.commit()
+                return True
         except Exception as e:
             log.error(f"Update feed error: {e}")
             return False
-        finally:
-            conn.close()
 
     # ... import/export/category methods ...
 
@@ -1134,8 +1437,7 @@ class LocalProvider(RSSProvider):
                     
                     write_log(f"Body found. Children: {len(body.find_all('outline', recursive=False))}")
 
-                    conn = get_connection()
-                    try:
+                    with write_connection() as conn:
                         c = conn.cursor()
 
                         def ensure_category(title: str):
@@ -1205,8 +1507,6 @@ class LocalProvider(RSSProvider):
                             process_outline(outline)
                             
                         conn.commit()
-                    finally:
-                        conn.close()
                     write_log("Import completed successfully.")
                     return True
                 except Exception as e:
@@ -1263,45 +1563,37 @@ class LocalProvider(RSSProvider):
             conn.close()
 
     def add_category(self, title: str) -> bool:
-        conn = get_connection()
-        c = conn.cursor()
-        try:
-            c.execute("INSERT INTO categories (id, title) VALUES (?, ?)", (str(uuid.uuid4()), title))
-            conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            return False # Already exists
-        finally:
-            conn.close()
+        with write_connection() as conn:
+            try:
+                conn.execute("INSERT INTO categories (id, title) VALUES (?, ?)", (str(uuid.uuid4()), title))
+                conn.commit()
+                return True
+            except sqlite3.IntegrityError:
+                return False # Already exists
 
     def rename_category(self, old_title: str, new_title: str) -> bool:
-        conn = get_connection()
-        c = conn.cursor()
         try:
-            # Update categories table
-            c.execute("UPDATE categories SET title = ? WHERE title = ?", (new_title, old_title))
-            # Update feeds
-            c.execute("UPDATE feeds SET category = ? WHERE category = ?", (new_title, old_title))
-            conn.commit()
-            return True
+            with write_connection() as conn:
+                c = conn.cursor()
+                # Update categories table
+                c.execute("UPDATE categories SET title = ? WHERE title = ?", (new_title, old_title))
+                # Update feeds
+                c.execute("UPDATE feeds SET category = ? WHERE category = ?", (new_title, old_title))
+                conn.commit()
+                return True
         except Exception as e:
             log.error(f"Rename error: {e}")
             return False
-        finally:
-            conn.close()
 
     def delete_category(self, title: str) -> bool:
         if title.lower() == "uncategorized": return False
-        conn = get_connection()
-        try:
+        with write_connection() as conn:
             c = conn.cursor()
             # Move feeds to Uncategorized? Or delete them? usually move.
             c.execute("UPDATE feeds SET category = 'Uncategorized' WHERE category = ?", (title,))
             c.execute("DELETE FROM categories WHERE title = ?", (title,))
             conn.commit()
             return True
-        finally:
-            conn.close()
 
     # Optional API used by GUI when present
     def get_article_chapters(self, article_id: str):
@@ -0,0 +1,219 @@
+"""
+asyncio refresh engine for LocalProvider.
+
+Selected with config "refresh_engine": "async". Feed downloads all run on one event
+loop (aiohttp) gated by a per-host asyncio.Semaphore, so a large subscription list
+can have many requests in flight without one OS thread per feed. Parsing and SQLite
+writes still go through a small bounded thread pool, which keeps the GIL-heavy part
+of a refresh from competing with the wx thread.
+
+Rumble/Odysee listings are scraped with their own blocking helpers; those feeds run
+whole inside the worker pool using the regular threaded code path.
+
+The progress_cb contract is unchanged: one feed-state dict per finished feed, emitted
+from a worker thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+from core import feed_schedule, host_health, refresh_stats, utils
+
+try:
+    import aiohttp
+except Exception:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+LOG = logging.getLogger(__name__)
+
+
+def is_available() -> bool:
+    return aiohttp is not None
+
+
+def _decode_body(data: bytes, charset: str | None) -> str:
+    for enc in (charset, "utf-8"):
+        if not enc:
+            continue
+        try:
+            return data.decode(enc)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return data.decode("utf-8", errors="replace")
+
+
+async def _fetch_feed(session, feed_url: str, headers: dict, host_sem, feed_timeout: float, retries: int, timings=None):
+    from providers.local import FeedFetchResult
+
+    timings = timings or refresh_stats.FeedTimings()
+    host = urlparse(feed_url).hostname or ""
+    health = host_health.get_registry()
+    timeout = aiohttp.ClientTimeout(total=float(feed_timeout))
+    attempts = retries + 1
+    for attempt in range(1, attempts + 1):
+        health.check(host)
+        try:
+            # The host slot is held per request, not across the backoff sleep.
+            wait_started = time.perf_counter()
+            async with host_sem:
+                request_started = time.perf_counter()
+                timings.add("host_wait_s", request_started - wait_started)
+                async with session.get(feed_url, headers=headers, timeout=timeout, allow_redirects=True) as resp:
+                    timings.add("connect_s", time.perf_counter() - request_started)
+                    if resp.status in host_health.HOST_FAILURE_STATUSES:
+                        retry_after = None
+                        if resp.status in (429, 503):
+                            retry_after = host_health.parse_retry_after(resp.headers.get("Retry-After"))
+                        if retry_after is not None or attempt > retries:
+                            health.record_failure(host, f"HTTP {resp.status}", retry_after=retry_after)
+                            # The server asked us to back off: defer instead of retrying now.
+                            health.check(host)
+                        else:
+                            health.release_probe(host)
+                    else:
+                        health.record_success(host)
+                    if resp.status == 304:
+                        return FeedFetchResult(
+                            status="not_modified",
+                            fresh_until=feed_schedule.http_fresh_until(resp.headers),
+                        )
+                    resp.raise_for_status()
+                    body_started = time.perf_counter()
+                    data = await resp.read()
+                    timings.add("download_s", time.perf_counter() - body_started)
+                    timings.add("bytes", len(data))
+                    return FeedFetchResult(
+                        status="ok",
+                        data=data,
+                        text=_decode_body(data, resp.charset),
+                        etag=resp.headers.get("ETag"),
+                        last_modified=resp.headers.get("Last-Modified"),
+                        fresh_until=feed_schedule.http_fresh_until(resp.headers),
+                    )
+        except host_health.HostDeferred:
+            raise
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            health.record_failure(host, str(e) or type(e).__name__)
+            if attempt > retries:
+                raise
+        except Exception:
+            health.release_probe(host)
+            if attempt > retries:
+                raise
+        await asyncio.sleep(min(4, attempt))  # simple backoff
+
+
+async def _refresh_all(provider, feeds, *, per_host_limit, max_in_flight, cpu_workers, feed_timeout, retries, progress_cb, force):
+    from providers.local import FeedFetchResult
+
+    loop = asyncio.get_running_loop()
+    # Load breaker state from SQLite before the loop starts using it; later updates are in memory.
+    await loop.run_in_executor(None, host_health.get_registry().snapshot)
+    in_flight = asyncio.Semaphore(max(1, int(max_in_flight)))
+    host_sems = defaultdict(lambda: asyncio.Semaphore(per_host_limit))
+    # Listing feeds go through the blocking code path and need thread semaphores.
+    thread_host_limits = defaultdict(lambda: threading.Semaphore(per_host_limit))
+
+    connector = aiohttp.TCPConnector(
+        limit=max(1, int(max_in_flight)),
+        limit_per_host=max(1, int(per_host_limit)),
+        ttl_dns_cache=300,
+    )
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, int(cpu_workers)),
+        thread_name_prefix="refresh-cpu",
+    )
+
+    async def refresh_one(feed_row):
+        feed_id, feed_url, _title, _category, etag, last_modified = feed_row
+        queued_at = time.perf_counter()
+        async with in_flight:
+            if provider._is_html_listing_url(feed_url):
+                await loop.run_in_executor(
+                    executor,
+                    functools.partial(
+                        provider._refresh_single_feed,
+                        feed_row, thread_host_limits, feed_timeout, retries, progress_cb, force,
+                        queued_at=queued_at,
+                    ),
+                )
+                return
+
+            timings = refresh_stats.FeedTimings(queued_at)
+            headers = utils.HEADERS.copy()
+            if not force:
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
+
+            host = urlparse(feed_url).hostname or feed_url
+            try:
+                fetched = await _fetch_feed(
+                    session, feed_url, headers, host_sems[host], feed_timeout, retries, timings=timings
+                )
+            except host_health.HostDeferred as e:
+                LOG.info(f"Skipping feed {feed_url}: {e}")
+                fetched = FeedFetchResult(status="deferred", error=str(e), retry_at=e.retry_at)
+            except Exception as e:
+                LOG.error(f"Error processing feed {feed_url}: {e}")
+                fetched = FeedFetchResult(status="error", error=str(e))
+
+            if fetched.status == "ok":
+                await loop.run_in_executor(executor, provider._short_circuit_unchanged, feed_id, fetched, force)
+
+            await loop.run_in_executor(
+                executor,
+                functools.partial(
+                    provider._complete_fetched_feed,
+                    feed_row, fetched, feed_timeout, progress_cb, timings=timings,
+                ),
+            )
+
+    try:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await asyncio.gather(*(refresh_one(f) for f in feeds), return_exceptions=True)
+        for res in results:
+            if isinstance(res, Exception):
+                LOG.error(f"Refresh worker error: {res}")
+    finally:
+        executor.shutdown(wait=True)
+    return True
+
+
+def run_refresh(
+    provider,
+    feeds,
+    *,
+    per_host_limit: int,
+    max_in_flight: int,
+    cpu_workers: int,
+    feed_timeout: float,
+    retries: int,
+    progress_cb=None,
+    force: bool = False,
+) -> bool:
+    """Refresh feeds on a private event loop; blocks until every feed has reported."""
+    if aiohttp is None:
+        raise RuntimeError("aiohttp is not installed")
+    return asyncio.run(
+        _refresh_all(
+            provider,
+            feeds,
+            per_host_limit=per_host_limit,
+            max_in_flight=max_in_flight,
+            cpu_workers=cpu_workers,
+            feed_timeout=feed_timeout,
+            retries=retries,
+            progress_cb=progress_cb,
+            force=force,
+        )
+    )
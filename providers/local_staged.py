@@ -0,0 +1,215 @@
+"""
+Staged refresh pipeline for LocalProvider.
+
+The default refresh engine (config "refresh_engine": "staged"):
+
+    fetch threads --(bounded queue)--> parse processes --(bounded queue)--> persist thread
+
+- Fetch: a thread pool downloads feeds under the usual per-host limits and pushes
+  payloads onto a bounded queue, so downloads pause when parsing falls behind.
+- Parse: feed_parse.parse_feed_document() runs in a ProcessPoolExecutor. feedparser and
+  the chapter-map BeautifulSoup pass no longer hold this process's GIL, so parsing
+  scales with cores and the wx thread stays responsive.
+- Persist: a single thread writes results in completion order and emits progress.
+
+The process pool is created once and reused across refreshes. If it cannot be started
+(or breaks), documents are parsed inline on the persist thread instead.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+from urllib.parse import urlparse
+
+from core import feed_parse, host_health, refresh_stats
+
+LOG = logging.getLogger(__name__)
+
+_PARSE_WORKERS_MAX = 4
+_SENTINEL = object()
+
+_parse_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_parse_pool_workers = 0
+_parse_pool_lock = threading.Lock()
+
+
+def _auto_parse_workers() -> int:
+    cpu_count = os.cpu_count() or 2
+    return max(1, min(_PARSE_WORKERS_MAX, int(cpu_count) - 1))
+
+
+def _get_parse_pool(workers: int) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        if _parse_pool is not None and _parse_pool_workers == workers:
+            return _parse_pool
+        old = _parse_pool
+        _parse_pool = None
+        if old is not None:
+            try:
+                old.shutdown(wait=False, cancel_futures=True)
+            except Exception:
+                pass
+        try:
+            _parse_pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            _parse_pool_workers = workers
+        except Exception as e:
+            LOG.warning(f"Parse process pool unavailable; parsing inline ({e})")
+            _parse_pool = None
+            _parse_pool_workers = 0
+        return _parse_pool
+
+
+def _discard_parse_pool(pool) -> None:
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+            _parse_pool_workers = 0
+    try:
+        pool.shutdown(wait=False, cancel_futures=True)
+    except Exception:
+        pass
+
+
+def shutdown_parse_pool() -> None:
+    """Stop worker processes (called on application exit)."""
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        pool = _parse_pool
+        _parse_pool = None
+        _parse_pool_workers = 0
+    if pool is not None:
+        try:
+            pool.shutdown(wait=True, cancel_futures=True)
+        except Exception:
+            pass
+
+
+def run_refresh(
+    provider,
+    feeds,
+    *,
+    fetch_workers: int,
+    parse_workers: int,
+    per_host_limit: int,
+    queue_size: int,
+    feed_timeout: float,
+    retries: int,
+    progress_cb=None,
+    force: bool = False,
+) -> bool:
+    """Run a refresh through the staged pipeline; blocks until every feed has reported."""
+    from providers.local import FeedFetchResult
+
+    workers = int(parse_workers) if int(parse_workers or 0) > 0 else _auto_parse_workers()
+    pool = _get_parse_pool(workers)
+
+    host_limits = defaultdict(lambda: threading.Semaphore(per_host_limit))
+    fetched_q: "queue.Queue" = queue.Queue(maxsize=max(1, int(queue_size)))
+    parsed_q: "queue.Queue" = queue.Queue(maxsize=max(1, int(queue_size)))
+
+    def fetch_one(feed_row, queued_at):
+        feed_id, feed_url, _title, _category, etag, last_modified = feed_row
+        if provider._is_html_listing_url(feed_url):
+            # Scraped listings do their own fetch/parse/store.
+            provider._refresh_single_feed(
+                feed_row, host_limits, feed_timeout, retries, progress_cb, force, queued_at=queued_at
+            )
+            return
+
+        timings = refresh_stats.FeedTimings(queued_at)
+        headers = {}
+        if not force:
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        host = urlparse(feed_url).hostname or feed_url
+        try:
+            fetched = provider._fetch_feed_document(
+                feed_url, headers, host_limits[host], feed_timeout, retries, timings=timings
+            )
+            # Identical bodies never reach the parse processes.
+            with timings.measure("db_s"):
+                provider._short_circuit_unchanged(feed_id, fetched, force)
+        except host_health.HostDeferred as e:
+            LOG.info(f"Skipping feed {feed_url}: {e}")
+            fetched = FeedFetchResult(status="deferred", error=str(e), retry_at=e.retry_at)
+        except Exception as e:
+            LOG.error(f"Error processing feed {feed_url}: {e}")
+            fetched = FeedFetchResult(status="error", error=str(e))
+        with timings.measure("db_s"):
+            known_ids = provider._incremental_known_ids(feed_id, fetched) if fetched.status == "ok" else None
+        # Blocks while the parse stage is saturated (backpressure).
+        fetched_q.put((feed_row, fetched, known_ids, timings))
+
+    def dispatch_parses():
+        nonlocal pool
+        while True:
+            item = fetched_q.get()
+            if item is _SENTINEL:
+                parsed_q.put(_SENTINEL)
+                return
+            feed_row, fetched, known_ids, timings = item
+            future = None
+            if fetched.status == "ok" and pool is not None:
+                try:
+                    future = pool.submit(
+                        feed_parse.parse_feed_document, fetched.data, fetched.text, feed_row[1], known_ids
+                    )
+                except Exception as e:
+                    LOG.warning(f"Parse process pool failed; parsing inline ({e})")
+                    _discard_parse_pool(pool)
+                    pool = None
+            parsed_q.put((feed_row, fetched, future, timings))
+
+    def persist():
+        while True:
+            item = parsed_q.get()
+            if item is _SENTINEL:
+                return
+            feed_row, fetched, future, timings = item
+            parsed = None
+            if future is not None:
+                try:
+                    parsed = future.result()
+                except BrokenProcessPool as e:
+                    LOG.warning(f"Parse worker died; parsing {feed_row[1]} inline ({e})")
+                except Exception as e:
+                    LOG.debug(f"Parse worker failed for {feed_row[1]}; retrying inline ({e})")
+            try:
+                provider._complete_fetched_feed(
+                    feed_row, fetched, feed_timeout, progress_cb, parsed=parsed, timings=timings
+                )
+            except Exception as e:
+                LOG.error(f"Refresh persist error: {e}")
+
+    dispatcher = threading.Thread(target=dispatch_parses, name="refresh-parse-dispatch", daemon=True)
+    writer = threading.Thread(target=persist, name="refresh-persist", daemon=True)
+    dispatcher.start()
+    writer.start()
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, int(fetch_workers))) as executor:
+            queued_at = time.perf_counter()
+            futures = [executor.submit(fetch_one, f, queued_at) for f in feeds]
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    LOG.error(f"Refresh worker error: {e}")
+    finally:
+        fetched_q.put(_SENTINEL)
+        dispatcher.join()
+        writer.join()
+    return True
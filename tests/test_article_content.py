@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+import providers.local as local_mod
+from providers.local import LocalProvider
+
+
+class ArticleContentTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(self._tmp.name, "rss.db")
+        self.provider = LocalProvider({})
+        conn = core.db.get_connection()
+        c = conn.cursor()
+        c.execute("INSERT INTO feeds (id, url, title, category, icon_url) VALUES ('f', 'http://example.com/f', 'F', 'News', '')")
+        c.executemany(
+            "INSERT INTO articles (id, feed_id, title, url, content, date, author, is_read) VALUES (?, 'f', ?, ?, ?, ?, '', 0)",
+            [(f"a{i}", f"t{i}", f"http://example.com/{i}", f"<p>body {i}</p>", f"2025-01-{i + 1:02d} 00:00:00") for i in range(5)],
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        core.db.DB_FILE = self._orig_db_file
+        self._tmp.cleanup()
+
+    def test_list_pages_do_not_carry_bodies(self):
+        for view in ("all", "f", "category:News"):
+            page, total = self.provider.get_articles_page(view, offset=0, limit=10)
+            self.assertEqual(total, 5)
+            self.assertTrue(all(a.content is None for a in page), view)
+            self.assertEqual(page[0].url, "http://example.com/4")
+        after, _ = self.provider.get_articles_after("f", limit=2)
+        self.assertEqual([a.content for a in after], [None, None])
+
+    def test_content_loaded_on_demand_and_cached(self):
+        self.assertEqual(self.provider.get_article_content("a3"), "<p>body 3</p>")
+        self.assertIsNone(self.provider.get_article_content("missing"))
+
+        # Served from the LRU without touching the database.
+        conn = core.db.get_connection()
+        conn.execute("UPDATE articles SET content = 'changed' WHERE id = 'a3'")
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.provider.get_article_content("a3"), "<p>body 3</p>")
+
+        self.provider.delete_article("a3")
+        self.assertIsNone(self.provider.get_article_content("a3"))
+
+    def test_cache_is_bounded(self):
+        orig = local_mod._CONTENT_CACHE_SIZE
+        local_mod._CONTENT_CACHE_SIZE = 2
+        try:
+            for i in range(5):
+                self.provider.get_article_content(f"a{i}")
+            self.provider.get_article_content("a3")
+        finally:
+            local_mod._CONTENT_CACHE_SIZE = orig
+        self.assertEqual(list(self.provider._content_cache), ["a4", "a3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
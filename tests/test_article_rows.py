@@ -0,0 +1,68 @@
+import os
+import sys
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from core.models import Article
+from gui.article_rows import ArticleRows
+
+
+def _rows(n):
+    articles = [
+        Article(title=f"t{i}", url=f"u{i}", content="", date="", author=f"a{i}",
+                feed_id="f" if i % 2 else None, is_read=bool(i % 3 == 0), timestamp=0)
+        for i in range(n)
+    ]
+    rows = ArticleRows(lambda a: a.title, lambda fid: "Feed " + fid)
+    rows.set_articles(articles)
+    return rows, articles
+
+
+def test_rows_are_formatted_per_window_on_demand():
+    rows, _ = _rows(10000)
+    assert rows.count() == 10000
+    assert rows.formatted == 0
+    assert rows.text(5000, 0) == "t5000"
+    assert rows.text(5001, 1) == "Feed f"
+    assert rows.text(5000, 1) == ""
+    assert rows.text(5001, 3) == "a5001"
+    assert rows.text(5002, 4) == "Unread"
+    assert rows.formatted == ArticleRows.WINDOW
+    for row in range(ArticleRows.WINDOW * 100):
+        rows.text(row, 0)
+    assert len(rows._windows) == ArticleRows.MAX_WINDOWS
+
+
+def test_trailer_and_message_rows():
+    rows, _ = _rows(3)
+    assert rows.trailer_index() == -1
+    rows.set_trailer("Load more items (Enter)")
+    assert rows.count() == 4
+    assert rows.trailer_index() == 3
+    assert rows.text(3, 0) == "Load more items (Enter)"
+    assert rows.text(3, 2) == ""
+    assert rows.article_at(3) is None
+
+    rows.set_message("No articles found.")
+    assert rows.count() == 1
+    assert rows.trailer_index() == -1
+    assert rows.text(0, 0) == "No articles found."
+    rows.set_message(None)
+    assert rows.count() == 0
+
+
+def test_invalidate_reformats_changed_row():
+    rows, articles = _rows(200)
+    assert rows.text(130, 4) == "Unread"
+    articles[130].is_read = True
+    assert rows.text(130, 4) == "Unread"
+    rows.invalidate(130)
+    assert rows.text(130, 4) == "Read"
+
+    articles.pop(0)
+    rows.invalidate()
+    assert rows.count() == 199
+    assert rows.text(0, 0) == "t1"
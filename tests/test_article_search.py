@@ -0,0 +1,126 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+from core import background_migrations, refresh_writer, search_index
+from providers.local import LocalProvider
+
+
+def _entry(aid, title, content="", author=""):
+    return {
+        "id": aid,
+        "title": title,
+        "url": f"https://example.com/{aid}",
+        "author": author,
+        "content": content,
+        "date": f"2025-01-{int(aid[1:]) + 1:02d} 00:00:00",
+        "media_url": None,
+        "media_type": None,
+    }
+
+
+class ArticleSearchTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(self._tmp.name, "rss.db")
+        self.provider = LocalProvider({})
+        background_migrations.shutdown()
+        conn = core.db.get_connection()
+        for fid, cat in (("f1", "News"), ("f2", "Tech")):
+            conn.execute(
+                "INSERT INTO feeds (id, url, title, category, icon_url) VALUES (?, ?, ?, ?, '')",
+                (fid, f"https://example.com/{fid}.xml", fid, cat),
+            )
+        conn.commit()
+        conn.close()
+        self.writer = refresh_writer.RefreshWriter(linger_s=0)
+        self.writer.write("f1", {}, [
+            _entry("a0", "Budget vote delayed", "<p>The <b>parliament</b> postponed the budget.</p>"),
+            _entry("a1", "Weather", "<div class='x'>Storms expected; budget for repairs&nbsp;approved</div>"),
+            _entry("a2", "Interview", "<script>var budget = 1;</script><p>A talk with the mayor.</p>", author="Budget Desk"),
+        ])
+        self.writer.write("f2", {}, [
+            _entry("a3", "Python 3.13 released", "<p>Faster interpreter, new REPL.</p>"),
+            _entry("a4", "Rust budget", "<p>Compile times.</p>"),
+        ])
+
+    def tearDown(self):
+        self.writer.shutdown()
+        background_migrations.shutdown()
+        core.db.DB_FILE = self._orig_db_file
+        self._tmp.cleanup()
+
+    def _ids(self, query, view_id="all", **kw):
+        articles, _cursor = self.provider.search_articles(query, view_id=view_id, **kw)
+        return [a.id for a in articles]
+
+    def test_ranked_search_with_snippets(self):
+        articles, cursor = self.provider.search_articles("budget")
+        self.assertIsNone(cursor)
+        ids = [a.id for a in articles]
+        # Title hits rank above author and body hits; script text is not indexed.
+        self.assertEqual(set(ids[:2]), {"a0", "a4"})
+        self.assertEqual(set(ids), {"a0", "a1", "a2", "a4"})
+        self.assertLess(ids.index("a2"), ids.index("a1"))
+        body_hit = next(a for a in articles if a.id == "a1")
+        self.assertIn("budget for repairs", body_hit.snippet)
+        self.assertNotIn("<", body_hit.snippet)
+        self.assertIsNone(body_hit.content)
+
+        self.assertEqual(self._ids("parliament budget"), ["a0"])
+        self.assertEqual(self._ids('"budget for repairs"'), ["a1"])
+        self.assertEqual(self._ids("interp*"), ["a3"])
+        self.assertEqual(self._ids("div"), [])
+        # Operators and stray quotes are searched literally rather than failing.
+        self.assertEqual(self._ids('budget AND ( "repairs'), [])
+        self.assertEqual(self._ids("  * - "), [])
+
+    def test_view_filters_and_paging(self):
+        self.assertEqual(set(self._ids("budget", "category:Tech")), {"a4"})
+        self.assertEqual(set(self._ids("budget", "f1")), {"a0", "a1", "a2"})
+        self.provider.mark_read("a0")
+        self.assertEqual(set(self._ids("budget", "unread:category:News")), {"a1", "a2"})
+        self.provider.set_favorite("a1", True)
+        self.assertEqual(self._ids("budget", "favorites:all"), ["a1"])
+
+        first, cursor = self.provider.search_articles("budget", limit=3)
+        rest, end = self.provider.search_articles("budget", limit=3, cursor=cursor)
+        self.assertIsNone(end)
+        self.assertEqual([a.id for a in first + rest], self._ids("budget"))
+
+    def test_deleted_articles_leave_the_index(self):
+        self.provider.delete_article("a4")
+        self.assertEqual(set(self._ids("budget")), {"a0", "a1", "a2"})
+        self.provider.remove_feed("f1")
+        self.assertEqual(self._ids("budget"), [])
+        self.assertEqual(search_index.pending_count(), 0)
+
+    def test_backfill_indexes_existing_articles(self):
+        conn = core.db.get_connection()
+        conn.execute("DELETE FROM articles_fts")
+        conn.executemany(
+            "INSERT INTO articles (id, feed_id, title, url, content, date, author) VALUES (?, 'f2', ?, '', ?, '', '')",
+            [(f"old{i}", f"Archive {i}", "<p>legacy budget</p>") for i in range(7)],
+        )
+        conn.commit()
+        conn.close()
+        self.assertEqual(search_index.pending_count(), 12)
+        self.assertEqual(self._ids("legacy"), [])
+
+        self.assertEqual(search_index.backfill(batch_size=5), 12)
+        self.assertEqual(search_index.pending_count(), 0)
+        self.assertEqual(len(self._ids("legacy")), 7)
+        self.assertEqual(len(self._ids("budget")), 11)
+        self.assertEqual(search_index.backfill(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
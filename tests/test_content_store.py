@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+from core import background_migrations, content_store, refresh_writer, search_index
+from providers.local import LocalProvider
+
+_BODY = "<p>" + "Quarterly report on regional rainfall and river levels. " * 40 + "</p>"
+
+
+def _with_provider(fn):
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(tmp, "rss.db")
+        try:
+            provider = LocalProvider({})
+            background_migrations.shutdown()
+            conn = core.db.get_connection()
+            conn.execute("INSERT INTO feeds (id, url, title, category, icon_url) VALUES ('f', 'u', 'F', 'News', '')")
+            conn.commit()
+            conn.close()
+            fn(provider)
+        finally:
+            core.db.DB_FILE = orig_db_file
+
+
+def _stored(article_id):
+    conn = core.db.get_connection()
+    try:
+        return conn.execute("SELECT content FROM articles WHERE id = ?", (article_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_encode_decode_round_trip():
+    for text in (None, "", "short <b>body</b>", _BODY, "é€😀 " * 200):
+        assert content_store.decode(content_store.encode(text)) == text
+    assert content_store.encode("tiny") == "tiny"
+    packed = content_store.encode(_BODY)
+    assert isinstance(packed, bytes) and packed[0] == content_store.TAG_ZLIB
+    assert len(packed) < len(_BODY) // 5
+
+
+def test_writer_compresses_and_readers_decode():
+    def run(provider):
+        writer = refresh_writer.RefreshWriter(linger_s=0)
+        try:
+            writer.write("f", {}, [
+                {"id": "big", "title": "Rain", "url": "", "content": _BODY, "date": "2025-01-02 00:00:00"},
+                {"id": "small", "title": "Note", "url": "", "content": "<p>hi</p>", "date": "2025-01-01 00:00:00"},
+            ])
+        finally:
+            writer.shutdown()
+        assert isinstance(_stored("big"), bytes)
+        assert _stored("small") == "<p>hi</p>"
+        assert provider.get_article_content("big") == _BODY
+        assert provider.get_article_content("small") == "<p>hi</p>"
+        # Lists never carry bodies; they are loaded on selection.
+        assert {a.id: a.content for a in provider.get_articles("f")} == {"big": None, "small": None}
+        hits, _ = provider.search_articles("rainfall")
+        assert [a.id for a in hits] == ["big"]
+
+    _with_provider(run)
+
+
+def test_background_migration_compresses_existing_rows():
+    def run(provider):
+        conn = core.db.get_connection()
+        conn.executemany(
+            "INSERT INTO articles (id, feed_id, title, url, content, date, author) VALUES (?, 'f', ?, '', ?, '', '')",
+            [(f"a{i}", f"t{i}", _BODY if i % 3 else "<p>short</p>") for i in range(9)],
+        )
+        conn.commit()
+        conn.close()
+
+        before = content_store.stats()
+        assert before["pending_rows"] == 6 and before["compressed_rows"] == 0 and before["saved_bytes"] == 0
+
+        assert content_store.migrate(batch_size=4) == 6
+        after = content_store.stats()
+        assert after["pending_rows"] == 0
+        assert after["compressed_rows"] == 6 and after["plain_rows"] == 3
+        assert after["original_bytes"] == before["stored_bytes"]
+        assert after["saved_bytes"] == after["original_bytes"] - after["stored_bytes"] > 0
+        assert provider.get_content_stats() == after
+        assert provider.get_article_content("a1") == _BODY
+        assert content_store.migrate() == 0
+
+        # The index built from compressed rows is searchable too.
+        assert search_index.backfill() == 9
+        assert len(provider.search_articles("rainfall")[0]) == 6
+
+    _with_provider(run)
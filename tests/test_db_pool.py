@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+import pytest
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+
+
+@pytest.fixture
+def temp_db():
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(tmp, "rss.db")
+        try:
+            core.db.init_db()
+            yield core.db.DB_FILE
+        finally:
+            core.db.close_all_connections()
+            core.db.DB_FILE = orig_db_file
+
+
+def test_connections_are_reused_per_thread(temp_db):
+    before = core.db.connection_stats()
+    conn = core.db.get_connection()
+    raw = conn._raw
+    conn.close()
+    conn.close()  # double close is harmless
+    for _ in range(5):
+        again = core.db.get_connection()
+        assert again._raw is raw
+        again.execute("SELECT 1").fetchone()
+        again.close()
+
+    # Nested users get their own connection.
+    outer = core.db.get_connection()
+    inner = core.db.get_connection()
+    assert inner._raw is not outer._raw
+    inner.close()
+    outer.close()
+
+    # Another thread does not share this thread's connections.
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(core.db.get_connection()._raw))
+    t.start()
+    t.join()
+    assert seen[0] is not raw
+
+    stats = core.db.connection_stats()
+    assert stats["reused"] - before["reused"] >= 5
+    assert 0 < stats["reuse_rate"] <= 1
+
+
+def test_release_rolls_back_uncommitted_work(temp_db):
+    conn = core.db.get_connection()
+    conn.execute("INSERT INTO categories (id, title) VALUES ('x', 'Pending')")
+    conn.close()
+    conn = core.db.get_connection()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM categories WHERE id = 'x'").fetchone()[0] == 0
+        assert not conn.in_transaction
+    finally:
+        conn.close()
+
+
+def test_busy_timeout_is_restored_for_the_next_user(temp_db):
+    conn = core.db.get_connection(busy_timeout_ms=500)
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 500
+    conn.close()
+    conn = core.db.get_connection()
+    try:
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == core.db.DEFAULT_BUSY_TIMEOUT_MS
+    finally:
+        conn.close()
+
+
+def test_writer_is_serialized_and_times_out(temp_db):
+    with core.db.write_connection() as w:
+        w.execute("INSERT INTO categories (id, title) VALUES ('a', 'A')")
+        # Re-entrant on the same thread; the inner block must not roll back the outer one.
+        with core.db.write_connection() as w2:
+            assert w2 is w
+        assert w.in_transaction
+
+        errors = []
+
+        def other():
+            try:
+                with core.db.write_connection(timeout=0.05):
+                    pass
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+
+        t = threading.Thread(target=other)
+        t.start()
+        t.join()
+        assert errors and "locked" in errors[0]
+        w.commit()
+
+    with core.db.write_connection() as w:
+        w.execute("INSERT INTO categories (id, title) VALUES ('b', 'B')")
+    conn = core.db.get_connection()
+    try:
+        ids = {r[0] for r in conn.execute("SELECT id FROM categories WHERE id IN ('a', 'b')")}
+    finally:
+        conn.close()
+    assert ids == {"a"}
+
+
+def test_db_file_switch_and_close_all(temp_db):
+    conn = core.db.get_connection()
+    raw = conn._raw
+    conn.close()
+    core.db.close_all_connections()
+    with pytest.raises(sqlite3.ProgrammingError):
+        raw.execute("SELECT 1")
+    conn = core.db.get_connection()
+    try:
+        assert conn._raw is not raw
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    finally:
+        conn.close()
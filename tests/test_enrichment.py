@@ -0,0 +1,174 @@
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+import requests
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+from core import enrichment, refresh_writer
+
+
+def _entry(aid, url, chapter_url=None):
+    return {
+        "id": aid,
+        "title": aid,
+        "url": url,
+        "author": "a",
+        "content": "",
+        "date": "2025-01-01 00:00:00",
+        "media_url": None,
+        "media_type": None,
+        "chapter_url": chapter_url,
+    }
+
+
+def _jobs():
+    conn = core.db.get_connection()
+    try:
+        c = conn.cursor()
+        c.execute("SELECT article_id, kind, attempts, next_attempt_at FROM enrichment_jobs ORDER BY id")
+        return c.fetchall()
+    finally:
+        conn.close()
+
+
+def test_insert_queues_jobs_and_worker_fills_media():
+    # Keep the shared background worker out of this test's database.
+    enrichment.shutdown()
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(tmp, "rss.db")
+        writer = refresh_writer.RefreshWriter()
+        try:
+            core.db.init_db()
+            conn = core.db.get_connection()
+            conn.execute("INSERT INTO feeds (id, url, title, category, icon_url) VALUES ('f', 'u', 't', 'c', '')")
+            conn.commit()
+            conn.close()
+
+            writer.write("f", {}, [
+                _entry("npr-1", "https://www.npr.org/2025/01/01/story"),
+                _entry("pod-1", "https://example.com/ep", chapter_url="https://example.com/ep.json"),
+                _entry("plain", "https://example.com/plain"),
+            ])
+            assert [(r[0], r[1]) for r in _jobs()] == [
+                ("npr-1", enrichment.KIND_NPR_AUDIO),
+                ("pod-1", enrichment.KIND_CHAPTERS),
+            ]
+
+            events = []
+            queue = enrichment.EnrichmentQueue(timeout_s=2)
+            queue.add_listener(events.append)
+            with mock.patch("core.npr.extract_npr_audio", return_value=("https://npr.example/a.mp3", "audio/mpeg")) as npr, \
+                    mock.patch("core.utils.fetch_and_store_chapters", return_value=[{"start": 0.0}]) as chapters:
+                assert queue.run_pending() == 2
+
+            npr.assert_called_once()
+            chapters.assert_called_once_with(
+                "pod-1", None, None, "https://example.com/ep.json", allow_id3=False, raise_transient=True
+            )
+            # Higher priority (audio) first.
+            assert [e["kind"] for e in events] == [enrichment.KIND_NPR_AUDIO, enrichment.KIND_CHAPTERS]
+            assert events[1]["chapters"] == 1
+            assert _jobs() == []
+
+            conn = core.db.get_connection()
+            c = conn.cursor()
+            c.execute("SELECT media_url, media_type FROM articles WHERE id = 'npr-1'")
+            assert c.fetchone() == ("https://npr.example/a.mp3", "audio/mpeg")
+            conn.close()
+        finally:
+            writer.shutdown()
+            core.db.DB_FILE = orig_db_file
+
+
+def _response(status, body=b""):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body
+    resp.url = "https://npr.org/x"
+    return resp
+
+
+def test_failed_job_is_retried_later_and_queue_is_bounded():
+    enrichment.shutdown()
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(tmp, "rss.db")
+        try:
+            core.db.init_db()
+            conn = core.db.get_connection()
+            c = conn.cursor()
+            c.execute(
+                "INSERT INTO articles (id, feed_id, title, url, content, date, author, is_read) "
+                "VALUES ('npr-1', 'f', 't', 'https://npr.org/x', '', '', '', 0)"
+            )
+            enrichment.insert_jobs(c, [("npr-1", enrichment.KIND_NPR_AUDIO, "https://npr.org/x", 20)])
+            conn.commit()
+            conn.close()
+
+            queue = enrichment.EnrichmentQueue(timeout_s=2)
+            # The real extractor runs; only the HTTP layer is stubbed.
+            with mock.patch("core.utils.pooled_requests_get", side_effect=requests.Timeout("read timed out")):
+                assert queue.run_pending() == 1
+            (aid, kind, attempts, next_at), = _jobs()
+            assert attempts == 1
+            assert next_at > time.time() + 30
+            # Not due yet.
+            assert queue.run_pending() == 0
+
+            def _make_due():
+                conn = core.db.get_connection()
+                conn.execute("UPDATE enrichment_jobs SET next_attempt_at = 0")
+                conn.commit()
+                conn.close()
+
+            _make_due()
+            with mock.patch("core.utils.pooled_requests_get", return_value=_response(503)):
+                assert queue.run_pending() == 1
+            (aid, kind, attempts, next_at), = _jobs()
+            assert attempts == 2
+
+            # A page that loads but has no audio finishes the job for good.
+            _make_due()
+            with mock.patch("core.utils.pooled_requests_get", return_value=_response(200, b"<html></html>")):
+                assert queue.run_pending() == 1
+            assert _jobs() == []
+
+            conn = core.db.get_connection()
+            c = conn.cursor()
+            enrichment.insert_jobs(c, [("npr-1", enrichment.KIND_CHAPTERS, "https://example.com/ch.json", 10)])
+            conn.commit()
+            conn.close()
+            with mock.patch("core.utils.pooled_requests_get", return_value=_response(502)):
+                assert queue.run_pending() == 1
+            assert [r[2] for r in _jobs()] == [1]
+            _make_due()
+            with mock.patch("core.utils.pooled_requests_get", return_value=_response(404)):
+                assert queue.run_pending() == 1
+            assert _jobs() == []
+
+            conn = core.db.get_connection()
+            c = conn.cursor()
+            enrichment.insert_jobs(c, [("npr-1", enrichment.KIND_NPR_AUDIO, "https://npr.org/x", 20)])
+            dropped = enrichment.insert_jobs(
+                c,
+                [(f"ch-{i}", enrichment.KIND_CHAPTERS, "u", 10) for i in range(5)],
+                max_pending=4,
+            )
+            conn.commit()
+            conn.close()
+            assert dropped == 2
+            kept = [(r[0], r[1]) for r in _jobs()]
+            # The audio job outranks chapters; the oldest chapter jobs go first.
+            assert ("npr-1", enrichment.KIND_NPR_AUDIO) in kept
+            assert [r[0] for r in kept if r[1] == enrichment.KIND_CHAPTERS] == ["ch-2", "ch-3", "ch-4"]
+        finally:
+            core.db.DB_FILE = orig_db_file
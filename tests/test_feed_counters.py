@@ -0,0 +1,160 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+from core import background_migrations
+from providers.local import LocalProvider
+
+
+def _counters():
+    conn = core.db.get_connection()
+    try:
+        c = conn.cursor()
+        c.execute("SELECT feed_id, total, unread, favorites, unread_favorites FROM feed_counters ORDER BY feed_id")
+        return {row[0]: row[1:] for row in c.fetchall()}
+    finally:
+        conn.close()
+
+
+class FeedCountersTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(self._tmp.name, "rss.db")
+        self.provider = LocalProvider({})
+        conn = core.db.get_connection()
+        c = conn.cursor()
+        for fid, cat in (("a", "News"), ("b", "News"), ("c", "Tech")):
+            c.execute(
+                "INSERT INTO feeds (id, url, title, category, icon_url) VALUES (?, ?, ?, ?, '')",
+                (fid, f"http://example.com/{fid}", fid.upper(), cat),
+            )
+        rows = []
+        for fid, n in (("a", 5), ("b", 3), ("c", 4)):
+            for i in range(n):
+                rows.append((f"{fid}{i}", fid, f"t{i}", "", "", f"2025-01-0{i + 1} 00:00:00", "", 1 if i == 0 else 0))
+        c.executemany(
+            "INSERT INTO articles (id, feed_id, title, url, content, date, author, is_read) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        core.db.DB_FILE = self._orig_db_file
+        self._tmp.cleanup()
+
+    def _scan_total(self, view_id):
+        # Reference: the COUNT(*) the counters replace.
+        real, filter_read, filter_fav = self.provider._parse_article_view_filters(view_id)
+        where, params = [], []
+        if real.startswith("category:"):
+            where.append("a.feed_id IN (SELECT id FROM feeds WHERE category = ?)")
+            params.append(real.split(":", 1)[1])
+        elif real != "all":
+            where.append("a.feed_id = ?")
+            params.append(real)
+        if filter_read is not None:
+            where.append("a.is_read = ?")
+            params.append(filter_read)
+        if filter_fav is not None:
+            where.append("a.is_favorite = ?")
+            params.append(filter_fav)
+        sql = "SELECT COUNT(*) FROM articles a" + (" WHERE " + " AND ".join(where) if where else "")
+        conn = core.db.get_connection()
+        try:
+            return conn.execute(sql, params).fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_triggers_track_inserts_updates_and_deletes(self):
+        self.assertEqual(_counters(), {"a": (5, 4, 0, 0), "b": (3, 2, 0, 0), "c": (4, 3, 0, 0)})
+
+        self.provider.mark_read("a1")
+        self.provider.mark_unread("a0")
+        self.provider.set_favorite("a2", True)
+        self.provider.set_favorite("b0", True)  # read favorite
+        self.provider.toggle_favorite("c1")
+        self.provider.mark_read("c1")
+        self.provider.delete_article("b1")
+        self.provider.mark_read("a1")  # no-op update
+        conn = core.db.get_connection()
+        conn.execute("UPDATE articles SET feed_id = 'c' WHERE id = 'a3'")
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(_counters(), {"a": (4, 3, 1, 1), "b": (2, 1, 1, 0), "c": (5, 3, 1, 0)})
+        self.assertEqual(core.db.check_feed_counters(repair=False), 0)
+
+        self.provider.remove_feed("b")
+        self.assertNotIn("b", _counters())
+
+    def test_views_and_feeds_use_counters(self):
+        self.provider.set_favorite("a2", True)
+        self.provider.set_favorite("c0", True)
+        views = [
+            "all", "unread:all", "read:all", "favorites:all", "favorites:unread:all", "fav:read:all",
+            "category:News", "unread:category:News", "favorites:category:Tech",
+            "a", "unread:a", "read:c", "favorites:unread:a", "missing",
+        ]
+        for view in views:
+            _articles, total = self.provider.get_articles_page(view, offset=0, limit=2)
+            self.assertEqual(total, self._scan_total(view), view)
+
+        unread = {f.id: f.unread_count for f in self.provider.get_feeds()}
+        self.assertEqual(unread, {"a": 4, "b": 2, "c": 3})
+        state = self.provider._collect_feed_state("a", "A", "News", "ok", 0, None)
+        self.assertEqual(state["unread_count"], 4)
+
+    def test_check_repairs_drift(self):
+        conn = core.db.get_connection()
+        conn.execute("UPDATE feed_counters SET unread = 99 WHERE feed_id = 'a'")
+        conn.execute("DELETE FROM feed_counters WHERE feed_id = 'c'")
+        conn.commit()
+        conn.close()
+        self.assertEqual(core.db.check_feed_counters(), 2)
+        self.assertEqual(_counters(), {"a": (5, 4, 0, 0), "b": (3, 2, 0, 0), "c": (4, 3, 0, 0)})
+        self.assertEqual(core.db.check_feed_counters(), 0)
+
+    def test_existing_database_is_filled_by_the_migration(self):
+        # A database from before the counters migration (schema version 1).
+        conn = core.db.get_connection()
+        conn.execute("DROP TABLE feed_counters")
+        conn.execute("PRAGMA user_version = 1")
+        conn.commit()
+        conn.close()
+        core.db.init_db()
+        self.assertEqual(core.db.get_schema_version(), core.db.SCHEMA_VERSION)
+        # Counted in the migration step, so unread counts are right before any job runs.
+        self.assertEqual(_counters(), {"a": (5, 4, 0, 0), "b": (3, 2, 0, 0), "c": (4, 3, 0, 0)})
+        self.assertNotIn("feed_counters", [name for name, _pos in background_migrations.pending()])
+        unread = {f.id: f.unread_count for f in self.provider.get_feeds()}
+        self.assertEqual(unread, {"a": 4, "b": 2, "c": 3})
+
+    def test_job_queued_by_older_version_still_runs(self):
+        conn = core.db.get_connection()
+        conn.execute("DELETE FROM feed_counters")
+        conn.execute("INSERT OR REPLACE INTO background_migrations (name, position, done) VALUES ('feed_counters', NULL, 0)")
+        conn.commit()
+        conn.close()
+
+        orig_jobs = dict(background_migrations.JOBS)
+        background_migrations.JOBS["feed_counters"] = (core.db.rebuild_feed_counters_batch, 2)
+        try:
+            processed = background_migrations.run_pending()
+        finally:
+            background_migrations.JOBS.update(orig_jobs)
+        self.assertEqual(processed["feed_counters"], 3)
+        self.assertEqual(_counters(), {"a": (5, 4, 0, 0), "b": (3, 2, 0, 0), "c": (4, 3, 0, 0)})
+        self.assertEqual(background_migrations.pending(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
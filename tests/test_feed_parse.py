@@ -0,0 +1,102 @@
+import os
+import pickle
+import sys
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from core import feed_parse
+
+
+PODCAST_FEED = """<?xml version='1.0' encoding='UTF-8'?>
+<rss version='2.0' xmlns:podcast="https://podcastindex.org/namespace/1.0">
+  <channel>
+    <title>Parse Feed</title>
+    <item>
+      <guid>ep-2</guid>
+      <title>Episode 2</title>
+      <link>http://example.com/ep-2</link>
+      <description>second</description>
+      <pubDate>Fri, 05 Dec 2025 10:00:00 GMT</pubDate>
+      <enclosure url="http://example.com/cover.jpg" type="image/jpeg" />
+      <enclosure url="http://example.com/ep-2.mp3" type="audio/mpeg" length="1" />
+      <podcast:chapters url="http://example.com/ep-2.json" type="application/json+chapters" />
+    </item>
+    <item>
+      <guid>ep-1</guid>
+      <title></title>
+      <link>http://example.com/ep-1</link>
+      <description>&lt;p&gt;First &lt;b&gt;episode&lt;/b&gt; body&lt;/p&gt;</description>
+      <pubDate>Thu, 04 Dec 2025 10:00:00 GMT</pubDate>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+def test_parse_feed_document_returns_plain_entries():
+    parsed = feed_parse.parse_feed_document(PODCAST_FEED.encode("utf-8"), PODCAST_FEED, "http://example.com/feed")
+
+    # Results cross a process boundary in the staged engine.
+    assert pickle.loads(pickle.dumps(parsed)) == parsed
+
+    assert parsed["title"] == "Parse Feed"
+    assert parsed["bozo"] is False
+    entries = parsed["entries"]
+    assert [e["id"] for e in entries] == ["ep-2", "ep-1"]
+
+    ep2 = entries[0]
+    assert ep2["date"] == "2025-12-05 10:00:00"
+    assert ep2["media_url"] == "http://example.com/ep-2.mp3"
+    assert ep2["media_type"] == "audio/mpeg"
+    assert ep2["chapter_url"] == "http://example.com/ep-2.json"
+
+    ep1 = entries[1]
+    assert ep1["title"] == "First episode body"
+    assert ep1["media_url"] is None
+    assert ep1["chapter_url"] is None
+
+
+def test_parse_feed_document_without_title():
+    doc = "<?xml version='1.0'?><rss version='2.0'><channel><item><guid>x</guid></item></channel></rss>"
+    parsed = feed_parse.parse_feed_document(doc.encode("utf-8"), doc)
+    assert parsed["title"] is None
+    assert [e["id"] for e in parsed["entries"]] == ["x"]
+
+
+def _big_feed(count):
+    items = "".join(
+        f"<item><guid>g-{i}</guid><title>Item {i}</title><link>http://example.com/{i}</link>"
+        f"<pubDate>Fri, 05 Dec 2025 10:{i % 60:02d}:00 GMT</pubDate></item>"
+        for i in range(count)
+    )
+    return (
+        "<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel>"
+        f"<title>Big</title><ttl>30</ttl>{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+def test_incremental_parse_stops_after_known_run():
+    data = _big_feed(500)
+    known = {f"g-{i}" for i in range(2, 500)}
+    parsed = feed_parse.parse_feed_document(data, data.decode("utf-8"), "http://example.com/big", known_ids=known, known_run=3)
+
+    assert parsed["incremental"] is True
+    assert parsed["title"] == "Big"
+    assert parsed["ttl_s"] == 30 * 60
+    # Two new items plus the run of three known ones; nothing past it.
+    assert [e["id"] for e in parsed["entries"]] == ["g-0", "g-1", "g-2", "g-3", "g-4"]
+
+
+def test_incremental_parse_falls_back_without_known_run_or_on_bad_xml():
+    data = _big_feed(20)
+    parsed = feed_parse.parse_feed_document(data, data.decode("utf-8"), known_ids={"g-5", "g-9"}, known_run=3)
+    assert parsed["incremental"] is False
+    assert len(parsed["entries"]) == 20
+
+    broken = data.replace(b"</channel></rss>", b"<item><guid>x</item>")
+    assert feed_parse.truncate_at_known_items(broken, {"nope"}) is None
+    parsed = feed_parse.parse_feed_document(broken, broken.decode("utf-8"), known_ids={"nope"})
+    assert parsed["incremental"] is False
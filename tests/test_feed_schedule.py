@@ -0,0 +1,151 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+from core import feed_schedule
+from providers.local import LocalProvider
+
+
+HOUR = 3600.0
+
+
+def _ts(s):
+    return datetime.strptime(s, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+
+
+def test_http_fresh_until_prefers_max_age_and_ignores_no_cache():
+    now = 1_700_000_000.0
+    assert feed_schedule.http_fresh_until({"Cache-Control": "public, max-age=600"}, now) == now + 600
+    assert feed_schedule.http_fresh_until({"Cache-Control": "no-cache, max-age=600"}, now) is None
+    expires = feed_schedule.http_fresh_until({"Expires": "Tue, 14 Nov 2023 23:13:20 GMT"}, now)
+    assert expires == 1_700_003_600.0
+    assert feed_schedule.http_fresh_until({}, now) is None
+
+
+def test_parse_feed_hints_reads_channel_ttl_and_skip_hours():
+    xml = (
+        "<rss><channel><title>x</title><ttl>90</ttl>"
+        "<skipHours><hour>1</hour><hour>2</hour></skipHours>"
+        "<item><ttl>5</ttl></item></channel></rss>"
+    )
+    hints = feed_schedule.parse_feed_hints(xml)
+    assert hints["ttl_s"] == 90 * 60
+    assert hints["skip_hours"] == [1, 2]
+    assert feed_schedule.parse_skip_hours(feed_schedule.format_skip_hours(hints["skip_hours"])) == {1, 2}
+
+
+def test_publish_interval_is_median_gap_of_recent_entries():
+    entries = [
+        {"date": "2025-01-01 12:00:00"},
+        {"date": "2025-01-01 10:00:00"},
+        {"date": "2025-01-01 08:00:00"},
+        {"date": "2024-12-01 08:00:00"},  # outlier gap
+        {"date": "0001-01-01 00:00:00"},  # sentinel ignored
+    ]
+    stamps = feed_schedule.entry_timestamps(entries, now=_ts("2025-01-02 00:00:00"))
+    assert len(stamps) == 4
+    assert feed_schedule.estimate_publish_interval(stamps) == 2 * HOUR
+    assert feed_schedule.estimate_publish_interval(stamps[:1]) is None
+
+
+def test_compute_next_check_bounds_and_hints():
+    now = _ts("2025-01-01 00:30:00")
+    kwargs = {"base_interval": 300, "max_interval": 6 * HOUR}
+
+    # Busy feed: never sooner than the base interval.
+    assert feed_schedule.compute_next_check(now, publish_interval=60, **kwargs) == now + 300
+    # Quiet feed: capped by max_interval.
+    assert feed_schedule.compute_next_check(now, last_new_item_at=now - 365 * 86400, **kwargs) == now + 6 * HOUR
+    # Server freshness extends the delay; RSS ttl too.
+    assert feed_schedule.compute_next_check(now, fresh_until=now + HOUR, **kwargs) == now + HOUR
+    assert feed_schedule.compute_next_check(now, ttl_s=2 * HOUR, **kwargs) == now + 2 * HOUR
+    # Failures retry on the base interval regardless of hints.
+    assert feed_schedule.compute_next_check(now, ttl_s=2 * HOUR, failed=True, **kwargs) == now + 300
+    # skipHours pushes the check to the next allowed hour (UTC).
+    assert feed_schedule.compute_next_check(now, skip_hours={0, 1}, **kwargs) == _ts("2025-01-01 02:00:00")
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    hits = 0
+    body = b""
+
+    def do_GET(self):
+        type(self).hits += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Cache-Control", "max-age=3600")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args, **kwargs):
+        return
+
+
+def test_refresh_skips_feeds_that_are_not_due():
+    _CountingHandler.hits = 0
+    _CountingHandler.body = (
+        "<?xml version='1.0'?><rss version='2.0'><channel><title>Sched</title>"
+        "<item><guid>s-1</guid><title>One</title><link>http://example.com/1</link>"
+        "<pubDate>Fri, 05 Dec 2025 10:00:00 GMT</pubDate></item>"
+        "</channel></rss>"
+    ).encode("utf-8")
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(tmp, "rss.db")
+        try:
+            provider = LocalProvider({
+                "refresh_interval": 300,
+                "feed_timeout_seconds": 2,
+                "feed_retry_attempts": 0,
+            })
+            conn = core.db.get_connection()
+            try:
+                conn.execute(
+                    "INSERT INTO feeds (id, url, title, category, icon_url) VALUES (?, ?, ?, ?, ?)",
+                    ("sched", f"http://127.0.0.1:{httpd.server_address[1]}/feed", "Sched", "Tests", ""),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+            before = time.time()
+            assert provider.refresh()
+            assert _CountingHandler.hits == 1
+
+            conn = core.db.get_connection()
+            try:
+                c = conn.cursor()
+                c.execute("SELECT last_checked_at, next_check_at, last_new_item_at FROM feeds WHERE id = 'sched'")
+                last_checked, next_check, last_new = c.fetchone()
+            finally:
+                conn.close()
+            assert last_checked >= before
+            # Cache-Control: max-age=3600 pushes the next check an hour out.
+            assert next_check >= before + 3600
+            assert last_new == _ts("2025-12-05 10:00:00")
+
+            # Not due: the scheduled refresh makes no request, a forced one does.
+            assert provider.refresh()
+            assert _CountingHandler.hits == 1
+            assert provider.refresh(force=True)
+            assert _CountingHandler.hits == 2
+        finally:
+            core.db.DB_FILE = orig_db_file
+            httpd.shutdown()
+            httpd.server_close()
+            thread.join(timeout=1)
@@ -0,0 +1,166 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+from core import host_health
+from providers.local import LocalProvider
+
+
+@pytest.fixture
+def temp_db():
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(tmp, "rss.db")
+        try:
+            core.db.init_db()
+            yield
+        finally:
+            core.db.DB_FILE = orig_db_file
+
+
+def test_parse_retry_after():
+    assert host_health.parse_retry_after("120") == 120.0
+    assert host_health.parse_retry_after("Tue, 14 Nov 2023 23:13:20 GMT", now=1_700_003_500.0) == 100.0
+    assert host_health.parse_retry_after("soon") is None
+    assert host_health.parse_retry_after(None) is None
+
+
+def test_circuit_opens_half_opens_and_persists(temp_db):
+    reg = host_health.HostHealthRegistry(failure_threshold=3, cooldown_s=60, max_cooldown_s=600)
+    now = 1000.0
+    for _ in range(2):
+        reg.record_failure("down.example", "timeout", now=now)
+    reg.check("down.example", now=now)  # still closed
+    reg.record_failure("down.example", "timeout", now=now)
+    with pytest.raises(host_health.HostDeferred) as exc:
+        reg.check("down.example", now=now + 1)
+    assert exc.value.retry_at == now + 60
+    reg.flush()
+
+    # State survives a restart (fresh registry, same database).
+    reg2 = host_health.HostHealthRegistry(failure_threshold=3, cooldown_s=60, max_cooldown_s=600)
+    with pytest.raises(host_health.HostDeferred):
+        reg2.check("down.example", now=now + 30)
+
+    # After the cooldown exactly one probe goes through.
+    reg2.check("down.example", now=now + 61)
+    with pytest.raises(host_health.HostDeferred):
+        reg2.check("down.example", now=now + 61)
+    # Failed probe re-opens with a doubled cooldown.
+    reg2.record_failure("down.example", "timeout", now=now + 62)
+    assert reg2.snapshot()["down.example"]["retry_at"] == now + 62 + 120
+
+    reg2.check("down.example", now=now + 200)
+    reg2.record_success("down.example")
+    reg2.check("down.example", now=now + 201)
+    assert "down.example" not in reg2.snapshot()
+    reg2.flush()
+    assert host_health.HostHealthRegistry().snapshot() == {}
+
+
+def test_state_changes_do_not_wait_for_the_writer(temp_db):
+    reg = host_health.HostHealthRegistry(failure_threshold=3, cooldown_s=60, max_cooldown_s=600)
+    with core.db.write_connection():
+        # Another writer holds the database; the breaker must still answer at once.
+        started = time.perf_counter()
+        for _ in range(5):
+            reg.record_failure("slow.example", "timeout", now=0.0)
+        assert time.perf_counter() - started < 0.5
+        with pytest.raises(host_health.HostDeferred):
+            reg.check("slow.example", now=1.0)
+    reg.flush()
+    conn = core.db.get_connection()
+    try:
+        row = conn.execute("SELECT state, consecutive_failures FROM host_health WHERE host = 'slow.example'").fetchone()
+    finally:
+        conn.close()
+    assert row == (host_health.OPEN, 5)
+
+
+def test_retry_after_opens_immediately(temp_db):
+    reg = host_health.HostHealthRegistry(failure_threshold=5, cooldown_s=60, max_cooldown_s=3600)
+    reg.record_failure("busy.example", "HTTP 429", retry_after=300, now=0.0)
+    with pytest.raises(host_health.HostDeferred) as exc:
+        reg.check("busy.example", now=10.0)
+    assert exc.value.retry_at == 300.0
+
+
+class _RateLimitedHandler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        self.send_response(503)
+        self.send_header("Retry-After", "120")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args, **kwargs):
+        return
+
+
+def test_feeds_on_open_host_are_deferred_without_requests(temp_db):
+    _RateLimitedHandler.hits = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _RateLimitedHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        provider = LocalProvider({
+            "max_concurrent_refreshes": 1,
+            "feed_timeout_seconds": 2,
+            "feed_retry_attempts": 3,
+        })
+        conn = core.db.get_connection()
+        for i in range(4):
+            conn.execute(
+                "INSERT INTO feeds (id, url, title, category, icon_url) VALUES (?, ?, ?, ?, ?)",
+                (f"f{i}", f"http://127.0.0.1:{httpd.server_address[1]}/feed{i}", f"F{i}", "Tests", ""),
+            )
+        conn.commit()
+        conn.close()
+
+        states = []
+        started = time.time()
+        provider.refresh(states.append)
+        elapsed = time.time() - started
+
+        # One request opens the circuit; no retries or further requests to the host.
+        assert _RateLimitedHandler.hits == 1
+        assert elapsed < 3
+        assert [st["status"] for st in states] == ["deferred"] * 4
+
+        conn = core.db.get_connection()
+        c = conn.cursor()
+        c.execute("SELECT retry_at FROM host_health WHERE host = '127.0.0.1'")
+        retry_at = c.fetchone()[0]
+        c.execute("SELECT MIN(next_check_at) FROM feeds")
+        assert c.fetchone()[0] >= retry_at - 1
+        conn.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join(timeout=1)
+
+
+def test_only_network_errors_count_as_host_failures():
+    resp = requests.Response()
+    resp.status_code = 503
+    assert host_health.is_host_failure(requests.HTTPError(response=resp))
+    assert host_health.is_host_failure(requests.Timeout("read timed out"))
+    assert host_health.is_host_failure(RuntimeError("curl: (28) Operation timed out after 20001 milliseconds"))
+    assert host_health.is_host_failure(RuntimeError("curl: (6) Could not resolve host: rumble.com"))
+    assert host_health.is_host_failure(RuntimeError("ERROR: Unable to download webpage: HTTP Error 429: Too Many Requests"))
+    assert not host_health.is_host_failure(ValueError("Expecting value: line 1 column 1 (char 0)"))
+    assert not host_health.is_host_failure(RuntimeError("HTTP Error 404: Not Found"))
@@ -0,0 +1,73 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from core import http_pool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args, **kwargs):
+        return
+
+
+def test_registry_reuses_connections_per_host():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    port = httpd.server_address[1]
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    reg = http_pool.HostSessionRegistry(pool_size=2)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        for i in range(5):
+            resp = reg.get(f"{base}/feed/{i}", timeout=5)
+            assert resp.status_code == 200
+            assert resp.content == b"ok"
+
+        # Same origin -> same session.
+        assert reg.session_for(f"{base}/a") is reg.session_for(f"{base}/b")
+
+        stats = reg.stats()
+        assert base in stats
+        assert stats[base]["requests"] == 5
+        assert stats[base]["connections_opened"] == 1
+        assert stats[base]["connections_reused"] == 4
+
+        totals = reg.totals()
+        assert totals["hosts"] == 1
+        assert totals["requests"] == 5
+    finally:
+        reg.close()
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join(timeout=1)
+
+
+def test_configure_rebuilds_sessions_with_new_pool_size():
+    reg = http_pool.HostSessionRegistry(pool_size=2)
+    try:
+        s1 = reg.session_for("https://example.com/feed")
+        reg.configure(6)
+        assert reg.pool_size == 6
+        s2 = reg.session_for("https://example.com/other")
+        assert s1 is not s2
+        # Same size is a no-op.
+        reg.configure(6)
+        assert reg.session_for("https://example.com/x") is s2
+    finally:
+        reg.close()
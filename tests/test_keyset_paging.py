@@ -0,0 +1,174 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+from providers.base import RSSProvider
+from providers.local import LocalProvider
+
+
+class KeysetPagingTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(self._tmp.name, "rss.db")
+        self.provider = LocalProvider({})
+        conn = core.db.get_connection()
+        c = conn.cursor()
+        for fid, cat in (("a", "News"), ("b", "News"), ("c", "Tech")):
+            c.execute(
+                "INSERT INTO feeds (id, url, title, category, icon_url) VALUES (?, ?, ?, ?, '')",
+                (fid, f"http://example.com/{fid}", fid.upper(), cat),
+            )
+        rows = []
+        for i in range(60):
+            fid = "abc"[i % 3]
+            # Several articles share a date so the id tie-break matters.
+            date = f"2025-01-{(i // 4) + 1:02d} 12:00:00"
+            rows.append((f"{fid}-{i:03d}", fid, f"t{i}", "", "", date, "", i % 2, 1 if i % 7 == 0 else 0))
+        c.executemany(
+            "INSERT INTO articles (id, feed_id, title, url, content, date, published_ts, author, is_read, is_favorite) "
+            f"VALUES (?, ?, ?, ?, ?, ?6, {core.db.published_ts_sql('?6')}, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        core.db.DB_FILE = self._orig_db_file
+        self._tmp.cleanup()
+
+    def _walk(self, view_id, page_size):
+        ids = []
+        cursor = None
+        for _ in range(1000):
+            page, total = self.provider.get_articles_after(view_id, cursor=cursor, limit=page_size)
+            if not page:
+                return ids, total
+            ids.extend(a.id for a in page)
+            cursor = (page[-1].timestamp, page[-1].id)
+        self.fail(f"paging {view_id} did not end: {ids[-page_size:]}")
+
+    def _add_unreadable_dates(self):
+        # An empty date and a raw RFC 822 one (older rows) have no strftime() value.
+        conn = core.db.get_connection()
+        conn.executemany(
+            "INSERT INTO articles (id, feed_id, title, url, content, date, published_ts, author) "
+            f"VALUES (?, 'a', ?, '', '', ?3, {core.db.published_ts_sql('?3')}, '')",
+            [("a-empty", "no date", ""), ("a-empty2", "no date", ""), ("a-rfc", "raw date", "Tue, 07 Jan 2025 09:00:00 GMT")],
+        )
+        conn.commit()
+        conn.close()
+
+    def test_keyset_walk_matches_offset_paging(self):
+        self.assertTrue(self.provider.supports_keyset_paging())
+        for view in ("all", "unread:all", "category:News", "favorites:category:News", "b", "read:c"):
+            expected, expected_total = self.provider.get_articles_page(view, offset=0, limit=1000)
+            ids, total = self._walk(view, page_size=7)
+            self.assertEqual(ids, [a.id for a in expected], view)
+            self.assertEqual(total, expected_total, view)
+            self.assertEqual(total, len(ids), view)
+
+    def test_keyset_walk_while_published_ts_backfill_is_pending(self):
+        # Until the backfill builds its index, views order by the date string instead.
+        expected, _ = self.provider.get_articles_page("category:News", offset=0, limit=1000)
+        conn = core.db.get_connection()
+        conn.execute("DROP INDEX idx_articles_published_ts_id")
+        conn.execute("UPDATE articles SET published_ts = NULL WHERE rowid % 2 = 0")
+        conn.commit()
+        conn.close()
+        core.db._PUBLISHED_TS_READY.discard(core.db.DB_FILE)
+        self.assertFalse(core.db.published_ts_ready())
+        ids, _total = self._walk("category:News", page_size=7)
+        self.assertEqual(ids, [a.id for a in expected])
+        page, _ = self.provider.get_articles_page("category:News", offset=0, limit=5)
+        self.assertEqual([a.timestamp for a in page], [a.timestamp for a in expected[:5]])
+
+    def test_unreadable_dates_are_paged(self):
+        self._add_unreadable_dates()
+        for view in ("all", "a"):
+            expected, _ = self.provider.get_articles_page(view, offset=0, limit=1000)
+            ids, total = self._walk(view, page_size=7)
+            self.assertEqual(ids, [a.id for a in expected], view)
+            self.assertEqual(total, len(ids), view)
+            self.assertEqual(ids[-3:], ["a-rfc", "a-empty2", "a-empty"], view)
+
+        # The backfill re-normalizes such dates instead of leaving published_ts empty.
+        conn = core.db.get_connection()
+        conn.execute("UPDATE articles SET published_ts = NULL")
+        conn.commit()
+        conn.close()
+        self.assertEqual(core.db.backfill_published_ts_batch(0, 1000)[0], 63)
+        conn = core.db.get_connection()
+        rows = dict(conn.execute(
+            "SELECT id, date || ' ' || published_ts FROM articles WHERE id IN ('a-empty', 'a-rfc')"
+        ).fetchall())
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM articles WHERE published_ts IS NULL").fetchone()[0], 0)
+        conn.close()
+        self.assertEqual(rows["a-rfc"], "2025-01-07 09:00:00 1736240400")
+        self.assertTrue(rows["a-empty"].startswith("0001-01-01 00:00:00 -"))
+        expected, _ = self.provider.get_articles_page("a", offset=0, limit=1000)
+        ids, _total = self._walk("a", page_size=7)
+        self.assertEqual(ids, [a.id for a in expected])
+        self.assertEqual(ids[-1], "a-empty")
+
+    def test_unreadable_dates_are_paged_while_backfill_is_pending(self):
+        # An upgraded database: nothing backfilled yet, so views order by the date string.
+        self._add_unreadable_dates()
+        conn = core.db.get_connection()
+        conn.execute("DROP INDEX idx_articles_published_ts_id")
+        conn.execute("UPDATE articles SET published_ts = NULL")
+        conn.commit()
+        conn.close()
+        core.db._PUBLISHED_TS_READY.discard(core.db.DB_FILE)
+        self.assertFalse(core.db.published_ts_ready())
+        for view in ("all", "a", "unread:all"):
+            expected, _ = self.provider.get_articles_page(view, offset=0, limit=1000)
+            for page_size in (1, 7):
+                ids, _total = self._walk(view, page_size=page_size)
+                self.assertEqual(ids, [a.id for a in expected], view)
+                self.assertEqual(len(ids), len(set(ids)), view)
+                # As strings, the raw date sorts first and the empty ones last.
+                self.assertEqual(ids[0], "a-rfc", view)
+                self.assertEqual(ids[-2:], ["a-empty2", "a-empty"], view)
+
+    def test_cursor_page_continues_after_offset_page(self):
+        first, _ = self.provider.get_articles_page("all", offset=0, limit=10)
+        after, _ = self.provider.get_articles_after("all", cursor=(first[-1].timestamp, first[-1].id), limit=10)
+        second, _ = self.provider.get_articles_page("all", offset=10, limit=10)
+        self.assertEqual([a.id for a in after], [a.id for a in second])
+
+    def test_base_provider_default(self):
+        local = self.provider
+
+        class _Remote(RSSProvider):
+            def get_name(self): return "remote"
+            def refresh(self, progress_cb=None, force=False): return True
+            def get_feeds(self): return []
+            def get_articles(self, feed_id): return local.get_articles(feed_id)
+            def mark_read(self, article_id): return True
+            def mark_unread(self, article_id): return True
+            def add_feed(self, url, category=None): return True
+            def remove_feed(self, feed_id): return True
+            def get_categories(self): return []
+            def add_category(self, title): return True
+            def rename_category(self, old_title, new_title): return True
+            def delete_category(self, title): return True
+
+        remote = _Remote({})
+        self.assertFalse(remote.supports_keyset_paging())
+        first, total = remote.get_articles_after("a", limit=5)
+        rest, _ = remote.get_articles_after("a", cursor=(first[-1].timestamp, first[-1].id), limit=100)
+        expected, _ = self.provider.get_articles_page("a", offset=0, limit=100)
+        self.assertEqual([x.id for x in first + rest], [x.id for x in expected])
+        self.assertEqual(total, 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pytest
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+from core import maintenance
+
+
+@pytest.fixture
+def temp_db():
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(tmp, "rss.db")
+        try:
+            core.db.init_db()
+            yield core.db.DB_FILE
+        finally:
+            core.db.close_all_connections()
+            core.db.DB_FILE = orig_db_file
+
+
+def _seed(old=30, new=5, favorites=3):
+    conn = core.db.get_connection()
+    c = conn.cursor()
+    c.execute("INSERT INTO feeds (id, url, title, category, icon_url) VALUES ('f', 'http://example.com/f', 'F', 'News', '')")
+    rows = []
+    for i in range(old):
+        rows.append((f"old-{i:03d}", "2000-01-01 00:00:00", 1 if i < favorites else 0, f"http://example.com/{i}.mp3"))
+    now = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+    for i in range(new):
+        rows.append((f"new-{i:03d}", now, 0, None))
+    c.executemany(
+        "INSERT INTO articles (id, feed_id, title, url, content, date, published_ts, author, is_read, is_favorite, media_url) "
+        f"VALUES (?, 'f', ?, '', ?, ?4, {core.db.published_ts_sql('?4')}, '', 0, ?, ?)",
+        [(aid, aid, "body " * 200, date, fav, media) for aid, date, fav, media in rows],
+    )
+    c.executemany(
+        "INSERT INTO articles_fts (rowid, article_id, title, author, body) "
+        "SELECT rowid, id, title, '', 'body' FROM articles WHERE id = ?",
+        [(r[0],) for r in rows],
+    )
+    c.execute("INSERT INTO chapters (id, article_id, start, title, href) VALUES ('ch', 'old-010', 0, 'c', '')")
+    c.execute("INSERT INTO chapters (id, article_id, start, title, href) VALUES ('ch2', 'new-000', 0, 'c', '')")
+    # One stale resume position, one touched recently
+    c.execute("INSERT INTO playback_state (id, position_ms, updated_at) VALUES ('http://example.com/10.mp3', 5, 0)")
+    c.execute("INSERT INTO playback_state (id, position_ms, updated_at) VALUES ('http://example.com/11.mp3', 5, ?)",
+              (int(time.time()),))
+    conn.commit()
+    conn.close()
+
+
+def _count(sql):
+    conn = core.db.get_connection()
+    try:
+        return conn.execute(sql).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _auto_vacuum():
+    conn = sqlite3.connect(core.db.DB_FILE)
+    try:
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_retention_deletes_in_batches_with_related_rows(temp_db):
+    _seed()
+    report = core.db.cleanup_old_articles(30, batch_size=4)
+    assert report["articles"] == 27
+    assert report["batches"] == 7
+    assert report["chapters"] == 1
+    assert report["playback_state"] == 1
+    assert _count("SELECT COUNT(*) FROM articles") == 8
+    assert _count("SELECT COUNT(*) FROM articles WHERE id LIKE 'old-%'") == 3  # favorites kept
+    assert _count("SELECT COUNT(*) FROM articles_fts") == 8
+    assert _count("SELECT id FROM chapters") == "ch2"
+    assert _count("SELECT id FROM playback_state") == "http://example.com/11.mp3"
+    assert _count("SELECT total FROM feed_counters WHERE feed_id = 'f'") == 8
+    assert core.db.check_feed_counters(repair=False) == 0
+
+
+def test_retention_without_keep_favorites_and_noop(temp_db):
+    _seed()
+    assert core.db.cleanup_old_articles(None)["articles"] == 0
+    assert core.db.cleanup_old_articles(30, keep_favorites=False)["articles"] == 30
+    assert core.db.cleanup_old_articles(30)["articles"] == 0
+
+
+def test_new_database_uses_incremental_vacuum_and_releases_pages(temp_db):
+    _seed(old=400, new=0, favorites=0)
+    assert _auto_vacuum() == maintenance.AUTO_VACUUM_INCREMENTAL
+    size_before = _count("PRAGMA page_count")
+    report = maintenance.run_once(1)
+    assert report["retention"]["articles"] == 400
+    vacuum = report["vacuum"]
+    assert vacuum["pages_freed"] > 0
+    assert vacuum["freelist_after"] == 0
+    assert vacuum["bytes_freed"] == vacuum["pages_freed"] * _count("PRAGMA page_size")
+    assert _count("PRAGMA page_count") == size_before - vacuum["pages_freed"]
+
+
+def test_vacuum_ticks_are_bounded(temp_db):
+    _seed(old=400, new=0, favorites=0)
+    core.db.cleanup_old_articles(1)
+    free = _count("PRAGMA freelist_count")
+    report = maintenance.incremental_vacuum(pages_per_tick=8, max_ticks=2)
+    assert report["ticks"] == 2
+    assert report["pages_freed"] == 16
+    assert _count("PRAGMA freelist_count") == free - 16
+
+
+def test_existing_database_is_converted_when_small(temp_db):
+    conn = core.db.get_connection()
+    conn.execute("PRAGMA auto_vacuum = NONE")
+    conn.execute("VACUUM")
+    conn.close()
+    assert _auto_vacuum() == maintenance.AUTO_VACUUM_NONE
+    assert maintenance.enable_incremental_vacuum(max_bytes=1) is False
+    assert maintenance.incremental_vacuum()["pages_freed"] == 0
+    assert maintenance.enable_incremental_vacuum() is True
+    assert _auto_vacuum() == maintenance.AUTO_VACUUM_INCREMENTAL
+
+
+def test_retention_days_setting():
+    assert maintenance.retention_days("1 week") == 7
+    assert maintenance.retention_days("5 years") == 1825
+    assert maintenance.retention_days("Unlimited") is None
+    assert maintenance.retention_days(None) is None
@@ -0,0 +1,82 @@
+import os
+import sys
+from datetime import timezone
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from dateutil import parser as dateparser
+
+from core import utils
+
+
+SAMPLES = [
+    "Fri, 05 Dec 2025 10:00:00 GMT",
+    "Fri, 05 Dec 2025 10:00:00 +0000",
+    "Fri, 5 Dec 2025 10:00:00 -0500",
+    "5 Dec 2025 10:00 EST",
+    "Thu, 04 Dec 2025 23:59:59 PDT",
+    "Thu, 04 Dec 2025 23:59:59 UT",
+    "Thu, 04 Dec 2025 23:59:59",
+    "2025-12-05T10:00:00Z",
+    "2025-12-05T10:00:00+02:00",
+    "2025-12-05T10:00:00.123456-0700",
+    "2025-12-05 10:00:00",
+    "2025-12-05",
+]
+
+
+def _reference(raw):
+    dt = dateparser.parse(raw, tzinfos=utils.TZINFOS)
+    return utils.format_datetime(dt)
+
+
+def test_fast_path_matches_dateutil():
+    for raw in SAMPLES:
+        fast = utils._parse_raw_date_fast(raw)
+        assert fast is not None, raw
+        assert utils.format_datetime(fast) == _reference(raw), raw
+        assert utils.normalize_date(raw) == _reference(raw), raw
+
+
+def test_non_strict_dates_fall_back_to_dateutil():
+    for raw in ("December 5, 2025 10:00am", "Fri, 05 Dec 2025 10:00:00 CET", "05/12/2025"):
+        assert utils._parse_raw_date_fast(raw) is None
+        assert utils.normalize_date(raw) == _reference(raw)
+
+
+def test_raw_dates_are_memoised_and_future_check_still_applies():
+    utils._parse_raw_date.cache_clear()
+    raw = "Fri, 05 Dec 2025 10:00:00 GMT"
+    assert utils.normalize_date(raw) == "2025-12-05 10:00:00"
+    assert utils.normalize_date(raw) == "2025-12-05 10:00:00"
+    info = utils._parse_raw_date.cache_info()
+    assert info.hits == 1 and info.misses == 1
+    assert utils._parse_raw_date(raw)[0].tzinfo == timezone.utc
+
+    # A far-future feed date is rejected on every call; the title date wins.
+    assert utils.normalize_date("Mon, 01 Jan 2099 00:00:00 GMT", title="Episode 2024-03-01") == "2024-03-01 00:00:00"
+    assert utils.normalize_date("Mon, 01 Jan 2099 00:00:00 GMT", title="Episode 2024-03-01") == "2024-03-01 00:00:00"
+
+
+def test_timestamps_and_sentinel():
+    assert utils.normalize_date("1700000000") == "2023-11-14 22:13:20"
+    assert utils.normalize_date("") == "0001-01-01 00:00:00"
+    assert utils.normalize_date("not a date") == "0001-01-01 00:00:00"
+
+
+def test_humanize_timestamp_matches_date_string():
+    from datetime import datetime
+    from core.models import Article
+
+    now = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+    for date in ("2025-06-01 11:59:30", "2025-06-01 11:15:00", "2025-06-01 02:00:00", "2025-05-20 08:30:00"):
+        article = Article(title="", url="u", content=None, date=date, author="", feed_id="f")
+        assert utils.humanize_timestamp(article.timestamp, now_utc=now) == utils.humanize_article_date(date, now_utc=now)
+    assert utils.humanize_timestamp(utils.parse_datetime_utc("2025-06-01 09:00:00").timestamp(), now_utc=now) == "3 hours ago"
+    # The sentinel date and unknown timestamps render blank.
+    assert utils.humanize_article_date("0001-01-01 00:00:00") == ""
+    assert utils.humanize_timestamp(0) == ""
+    assert Article(title="", url="u", content=None, date="", author="", feed_id="f", timestamp=5.0).timestamp == 5.0
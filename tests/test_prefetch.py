@@ -0,0 +1,97 @@
+import os
+import sys
+import threading
+import time
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from core.models import Feed
+from gui.prefetch import ViewPrefetcher, top_unread_categories
+
+
+class _Recorder:
+    def __init__(self, skip=()):
+        self.fetched = []
+        self.stored = {}
+        self.skip = set(skip)
+        self.done = threading.Event()
+        self.gate = None
+
+    def fetch(self, view_id):
+        if self.gate is not None:
+            self.gate.wait(2)
+        self.fetched.append(view_id)
+        return f"page:{view_id}"
+
+    def store(self, view_id, result):
+        self.stored[view_id] = result
+        self.done.set()
+
+    def wanted(self, view_id):
+        return view_id not in self.skip
+
+
+def _wait(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_prefetch_runs_in_order_after_idle_and_skips_unwanted():
+    rec = _Recorder(skip={"b"})
+    p = ViewPrefetcher(rec.fetch, rec.store, rec.wanted, idle_s=0.15, throttle_s=0)
+    try:
+        started = time.monotonic()
+        p.schedule(["a", "b", None, "a", "c"])
+        assert _wait(lambda: len(rec.stored) == 2)
+        assert rec.fetched == ["a", "c"]
+        assert rec.stored == {"a": "page:a", "c": "page:c"}
+        assert time.monotonic() - started >= 0.15
+    finally:
+        p.stop()
+
+
+def test_prefetch_waits_for_foreground_loads():
+    rec = _Recorder()
+    p = ViewPrefetcher(rec.fetch, rec.store, rec.wanted, idle_s=0.05, throttle_s=0)
+    try:
+        with p.foreground():
+            p.schedule(["a"])
+            time.sleep(0.2)
+            assert rec.fetched == []
+        assert _wait(lambda: rec.stored)
+    finally:
+        p.stop()
+
+
+def test_new_selection_cancels_pending_and_in_flight():
+    rec = _Recorder()
+    rec.gate = threading.Event()
+    p = ViewPrefetcher(rec.fetch, rec.store, rec.wanted, idle_s=0.05, throttle_s=0)
+    try:
+        p.schedule(["a", "b"])
+        time.sleep(0.15)  # "a" is now being fetched and blocks on the gate
+        p.schedule(["c"])
+        assert p.pending() == ["c"]
+        rec.gate.set()
+        assert _wait(lambda: "c" in rec.stored)
+        assert "a" not in rec.stored  # finished after the new selection: dropped
+        assert "b" not in rec.fetched
+    finally:
+        p.stop()
+
+
+def test_top_unread_categories():
+    feeds = []
+    for i, (cat, unread) in enumerate([("News", 5), ("Tech", 20), ("News", 10), ("Empty", 0), (None, 1), ("Pods", 3)]):
+        f = Feed(id=str(i), title="t", url="u", category=cat)
+        f.unread_count = unread
+        feeds.append(f)
+    assert top_unread_categories(feeds) == ["Tech", "News", "Pods"]
+    assert top_unread_categories(feeds, 5) == ["Tech", "News", "Pods", "Uncategorized"]
@@ -0,0 +1,38 @@
+import os
+import sys
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from tools import refresh_benchmark
+
+
+def test_render_feed_is_deterministic_and_versioned():
+    args = refresh_benchmark.build_parser().parse_args(["--feeds", "10", "--chapter-rate", "1"])
+    spec = refresh_benchmark.build_farm_spec(args)
+    assert spec == refresh_benchmark.build_farm_spec(args)
+    feed = spec["feeds"][0]
+    v0 = refresh_benchmark.render_feed(feed, 0, "http://127.0.0.1:1")
+    v1 = refresh_benchmark.render_feed(feed, 1, "http://127.0.0.1:1")
+    assert v0 != v1
+    assert b"podcast:chapters" in v0
+    assert v1.count(b"<item>") == feed["items"]
+
+
+def test_small_benchmark_run_reports_metrics():
+    args = refresh_benchmark.build_parser().parse_args([
+        "--feeds", "12", "--hosts", "3", "--rounds", "2",
+        "--latency-ms", "0", "--jitter-ms", "0", "--error-rate", "0",
+        "--avg-items", "5", "--chapter-rate", "0",
+    ])
+    result = refresh_benchmark.run_benchmark(args)
+    assert len(result["rounds"]) == 2
+    first, second = result["rounds"]
+    assert first["feeds_reported"] == 12
+    assert first["statuses"] == {"ok": 12}
+    assert second["feeds_reported"] == 12
+    for key in ("feeds_per_s", "feed_latency_ms", "db_lock_wait_ms", "ui_stall_ms", "peak_rss_mb"):
+        assert key in first
+    assert first["feed_latency_ms"]["p95"] >= first["feed_latency_ms"]["p50"]
@@ -0,0 +1,150 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+from core import refresh_stats
+from providers.local import LocalProvider
+
+
+FEED = """<?xml version='1.0' encoding='UTF-8'?>
+<rss version='2.0' xmlns:podcast='https://podcastindex.org/namespace/1.0'>
+  <channel>
+    <title>Timed Feed</title>
+    <item>
+      <guid>{name}-1</guid>
+      <title>Item</title>
+      <link>http://example.com/{name}-1</link>
+      <description>body</description>
+      <pubDate>Fri, 05 Dec 2025 10:00:00 GMT</pubDate>
+    </item>
+    <item>
+      <guid>{name}-2</guid>
+      <title>Item 2</title>
+      <link>http://example.com/{name}-2</link>
+      <description>body</description>
+      <pubDate>Thu, 04 Dec 2025 10:00:00 GMT</pubDate>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        name = self.path.strip("/")
+        if name == "slow":
+            time.sleep(0.3)
+        if name == "fail":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = FEED.format(name=name).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args, **kwargs):
+        return
+
+
+@pytest.fixture
+def feed_server():
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(tmp, "rss.db")
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{httpd.server_address[1]}"
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            thread.join(timeout=1)
+            core.db.DB_FILE = orig_db_file
+
+
+def _add_feeds(base, names):
+    conn = core.db.get_connection()
+    for name in names:
+        conn.execute(
+            "INSERT INTO feeds (id, url, title, category, icon_url) VALUES (?, ?, ?, ?, ?)",
+            (name, f"{base}/{name}", name, "Tests", ""),
+        )
+    conn.commit()
+    conn.close()
+
+
+def test_feed_timings_accumulate():
+    t = refresh_stats.FeedTimings(queued_at=time.perf_counter() - 0.5)
+    with t.measure("db_s"):
+        time.sleep(0.01)
+    t.add("bytes", 100)
+    t.add("bytes", 50)
+    t.merge({"parse_s": 0.2, "chapter_s": 0.1})
+    d = t.as_dict()
+    assert d["queue_wait_s"] >= 0.5
+    assert d["db_s"] >= 0.01
+    assert d["bytes"] == 150
+    assert d["parse_s"] == 0.2
+    assert d["entries"] == 0
+    assert set(refresh_stats.PHASES) <= set(d)
+
+
+@pytest.mark.parametrize("engine", ["threads", "staged"])
+def test_refresh_records_timings_and_stats(feed_server, engine):
+    provider = LocalProvider({
+        "max_concurrent_refreshes": 1,
+        "feed_timeout_seconds": 5,
+        "feed_retry_attempts": 0,
+        "refresh_engine": engine,
+        "refresh_parse_workers": 1,
+        "refresh_stats_runs": 2,
+    })
+    _add_feeds(feed_server, ["fast", "slow", "fail"])
+
+    states = []
+    provider.refresh(states.append, force=True)
+    by_id = {st["id"]: st for st in states}
+    fast = by_id["fast"]["timings"]
+    assert fast["bytes"] > 0
+    assert fast["entries"] == 2
+    assert fast["parse_s"] > 0
+    assert fast["total_s"] >= fast["parse_s"]
+    assert by_id["slow"]["timings"]["connect_s"] >= 0.25
+    # With one worker the other feeds waited for the slow one or vice versa.
+    assert max(st["timings"]["queue_wait_s"] for st in states) > 0
+
+    stats = provider.get_refresh_stats()
+    assert len(stats["runs"]) == 1
+    run = stats["runs"][0]
+    assert run["feeds"] == 3
+    assert run["errors"] == 1
+    assert run["engine"] == engine
+    assert stats["slowest_feeds"][0]["feed_id"] == "slow"
+    assert stats["slowest_hosts"][0]["host"] == "127.0.0.1"
+
+    # Only the newest refresh_stats_runs runs are kept.
+    provider.refresh(force=True)
+    provider.refresh(force=True)
+    stats = provider.get_refresh_stats()
+    assert len(stats["runs"]) == 2
+    conn = core.db.get_connection()
+    c = conn.cursor()
+    c.execute("SELECT COUNT(DISTINCT run_id) FROM refresh_stats")
+    assert c.fetchone()[0] == 2
+    conn.close()
@@ -0,0 +1,124 @@
+import os
+import sys
+import tempfile
+import threading
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+from core import refresh_writer
+
+
+def _entry(aid, date="2025-01-01 00:00:00"):
+    return {
+        "id": aid,
+        "title": f"Title {aid}",
+        "url": f"https://example.com/{aid}",
+        "author": "a",
+        "content": "body",
+        "date": date,
+        "media_url": None,
+        "media_type": None,
+    }
+
+
+def _with_temp_db(fn):
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(tmp, "rss.db")
+        writer = refresh_writer.RefreshWriter(max_batch_feeds=8, linger_s=0.05)
+        try:
+            core.db.init_db()
+            conn = core.db.get_connection()
+            try:
+                for i in range(4):
+                    conn.execute(
+                        "INSERT INTO feeds (id, url, title, category, icon_url) VALUES (?, ?, ?, ?, ?)",
+                        (f"feed-{i}", f"https://example.com/{i}.xml", "Old", "Tests", ""),
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+            fn(writer)
+        finally:
+            writer.shutdown()
+            core.db.DB_FILE = orig_db_file
+
+
+def test_writer_inserts_new_updates_dates_and_dedupes():
+    def run(writer):
+        inserted = writer.write("feed-0", {"title": "Feed 0", "etag": "etag-1"}, [_entry("a"), _entry("b"), _entry("a")])
+        assert [e["id"] for e in inserted] == ["a", "b"]
+
+        # Known ids are not re-inserted; a changed date is updated in place.
+        inserted = writer.write(
+            "feed-0",
+            {"title": "Feed 0", "etag": "etag-2"},
+            [_entry("a", "2025-02-02 00:00:00"), _entry("b"), _entry("c")],
+        )
+        assert [e["id"] for e in inserted] == ["c"]
+
+        conn = core.db.get_connection()
+        try:
+            c = conn.cursor()
+            c.execute("SELECT date FROM articles WHERE id = 'a'")
+            assert c.fetchone()[0] == "2025-02-02 00:00:00"
+            c.execute("SELECT COUNT(*) FROM articles WHERE feed_id = 'feed-0'")
+            assert c.fetchone()[0] == 3
+            c.execute("SELECT title, etag FROM feeds WHERE id = 'feed-0'")
+            assert c.fetchone() == ("Feed 0", "etag-2")
+        finally:
+            conn.close()
+
+        stats = writer.stats()
+        assert stats["inserted"] == 3
+        assert stats["updated"] == 1
+
+    _with_temp_db(run)
+
+
+def test_writer_group_commits_concurrent_feeds():
+    def run(writer):
+        barrier = threading.Barrier(4)
+        results = {}
+
+        def worker(i):
+            barrier.wait()
+            entries = [_entry(f"f{i}-{n}") for n in range(20)]
+            results[i] = writer.write(f"feed-{i}", {"title": f"Feed {i}"}, entries)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+
+        assert all(len(results[i]) == 20 for i in range(4))
+        stats = writer.stats()
+        assert stats["feeds"] == 4
+        assert stats["inserted"] == 80
+        # Feeds submitted together share transactions.
+        assert stats["transactions"] < 4
+
+    _with_temp_db(run)
+
+
+def test_writer_isolates_failing_feed_in_batch():
+    def run(writer):
+        bad = _entry("bad")
+        bad["title"] = object()  # not bindable -> this feed's insert fails
+        f_bad = writer.submit("feed-0", {"title": "Feed 0"}, [bad])
+        f_ok = writer.submit("feed-1", {"title": "Feed 1"}, [_entry("ok")])
+
+        assert [e["id"] for e in f_ok.result(timeout=10)["new_entries"]] == ["ok"]
+        try:
+            f_bad.result(timeout=10)
+            assert False, "expected failure"
+        except Exception:
+            pass
+        assert writer.stats()["failed_feeds"] == 1
+
+    _with_temp_db(run)
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import core.db
+from core import background_migrations, content_store, search_index
+
+_BODY = "<p>" + "archived article about harbour dredging " * 20 + "</p>"
+
+
+class SchemaMigrationTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._orig_db_file = core.db.DB_FILE
+        core.db.DB_FILE = os.path.join(self._tmp.name, "rss.db")
+
+    def tearDown(self):
+        background_migrations.shutdown()
+        core.db.close_all_connections()
+        core.db.DB_FILE = self._orig_db_file
+        self._tmp.cleanup()
+
+    def _legacy_database(self, articles=12):
+        """The pre-versioning layout: no user_version, counters, search index or new feed columns."""
+        raw = sqlite3.connect(core.db.DB_FILE)
+        raw.execute("CREATE TABLE feeds (id TEXT PRIMARY KEY, url TEXT, title TEXT, category TEXT, icon_url TEXT)")
+        raw.execute(
+            "CREATE TABLE articles (id TEXT PRIMARY KEY, feed_id TEXT, title TEXT, url TEXT, content TEXT, "
+            "date TEXT, author TEXT, is_read INTEGER DEFAULT 0)"
+        )
+        raw.execute("INSERT INTO feeds VALUES ('f', 'http://example.com/f', 'F', 'News', '')")
+        raw.executemany(
+            "INSERT INTO articles (id, feed_id, title, url, content, date, author, is_read) VALUES (?, 'f', ?, '', ?, ?, '', ?)",
+            [(f"a{i}", f"Item {i}", _BODY, f"2024-01-{i + 1:02d} 08:00:00", i % 2) for i in range(articles)],
+        )
+        raw.commit()
+        raw.close()
+
+    def test_fresh_database_runs_each_step_once(self):
+        core.db.init_db()
+        self.assertEqual(core.db.get_schema_version(), core.db.SCHEMA_VERSION)
+        # Nothing to process in an empty database.
+        self.assertEqual(background_migrations.pending(), [])
+
+        calls = []
+        orig = core.db.MIGRATIONS
+        core.db.MIGRATIONS = orig + ((core.db.SCHEMA_VERSION + 1, lambda c: calls.append(1)),)
+        try:
+            core.db.SCHEMA_VERSION += 1
+            core.db.init_db()
+            core.db.init_db()
+        finally:
+            core.db.MIGRATIONS = orig
+            core.db.SCHEMA_VERSION -= 1
+        self.assertEqual(calls, [1])
+
+    def test_failed_step_is_rolled_back_and_retried(self):
+        core.db.init_db()
+        version = core.db.SCHEMA_VERSION
+
+        def broken(c):
+            c.execute("CREATE TABLE half_done (x)")
+            raise RuntimeError("boom")
+
+        orig = core.db.MIGRATIONS
+        core.db.MIGRATIONS = orig + ((version + 1, broken),)
+        core.db.SCHEMA_VERSION = version + 1
+        try:
+            with self.assertRaises(RuntimeError):
+                core.db.init_db()
+        finally:
+            core.db.MIGRATIONS = orig
+            core.db.SCHEMA_VERSION = version
+        self.assertEqual(core.db.get_schema_version(), version)
+        conn = core.db.get_connection()
+        try:
+            self.assertIsNone(conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'").fetchone())
+        finally:
+            conn.close()
+
+    def test_legacy_database_is_upgraded_with_background_jobs(self):
+        self._legacy_database()
+        core.db.init_db()
+        self.assertEqual(core.db.get_schema_version(), core.db.SCHEMA_VERSION)
+        conn = core.db.get_connection()
+        try:
+            cols = {row[1] for row in conn.execute("PRAGMA table_info(feeds)")}
+            self.assertTrue({"etag", "next_check_at", "body_hash"} <= cols)
+            self.assertEqual(conn.execute("SELECT title FROM categories WHERE title = 'News'").fetchone(), ("News",))
+        finally:
+            conn.close()
+        self.assertEqual(
+            [name for name, _pos in background_migrations.pending()],
+            ["search_index", "content_compress", "published_ts"],
+        )
+        self.assertEqual(core.db.check_feed_counters(repair=False), 0)
+        self.assertFalse(core.db.published_ts_ready())
+
+        # Interrupted after one batch: the saved position is where the next run resumes.
+        orig_jobs = dict(background_migrations.JOBS)
+        background_migrations.JOBS["search_index"] = (search_index.backfill_batch, 5)
+        try:
+            class _StopAfterFirstBatch:
+                calls = 0
+
+                def is_set(self):
+                    self.calls += 1
+                    return self.calls > 1
+
+                def wait(self, _timeout):
+                    return False
+
+            background_migrations.run_pending(stop_event=_StopAfterFirstBatch())
+            left = dict(background_migrations.pending())
+            self.assertIsNotNone(left["search_index"])
+            self.assertEqual(search_index.pending_count(), 7)
+
+            processed = background_migrations.run_pending()
+        finally:
+            background_migrations.JOBS.update(orig_jobs)
+        self.assertEqual(processed["search_index"], 7)
+        self.assertEqual(processed["content_compress"], 12)
+        self.assertEqual(processed["published_ts"], 12)
+        self.assertTrue(core.db.published_ts_ready())
+        self.assertEqual(background_migrations.pending(), [])
+        self.assertEqual(content_store.stats()["pending_rows"], 0)
+        self.assertEqual(core.db.check_feed_counters(repair=False), 0)
+        conn = core.db.get_connection()
+        try:
+            self.assertEqual(
+                conn.execute("SELECT published_ts FROM articles WHERE id = 'a0'").fetchone()[0], 1704096000
+            )
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import os
+import sys
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from core.models import Feed
+from gui import tree_model
+
+
+class _Item:
+    def __init__(self, label, data=None, parent=None):
+        self.label = label
+        self.data = data
+        self.parent = parent
+        self.children = []
+        self.expanded = False
+
+
+class FakeBackend:
+    """Mimics the wx.TreeCtrl calls WxTreeBackend makes and counts them."""
+
+    def __init__(self):
+        self.root = _Item("Root")
+        self.root.children.append(_Item("All Feeds", parent=self.root))
+        self.calls = {}
+        self.frozen = 0
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def clear(self):
+        self._count("clear")
+        self.root.children = []
+
+    def insert(self, parent, prev, label, data):
+        self._count("insert")
+        item = _Item(label, data, parent)
+        pos = 0 if prev is None else parent.children.index(prev) + 1
+        parent.children.insert(pos, item)
+        return item
+
+    def delete(self, item):
+        self._count("delete")
+        item.parent.children.remove(item)
+
+    def set_label(self, item, label):
+        self._count("set_label")
+        item.label = label
+
+    def expand(self, item):
+        item.expanded = True
+
+    def freeze(self):
+        self._count("freeze")
+        self.frozen += 1
+
+    def thaw(self):
+        self.frozen -= 1
+
+    def dump(self, item=None):
+        item = item or self.root
+        return [(c.label, c.data, self.dump(c)) for c in item.children]
+
+
+def _expected(spec):
+    return [(n.label, n.data, [(c.label, c.data, []) for c in n.children]) for n in spec]
+
+
+def _feeds(n, cats=("News", "Tech", "Pods")):
+    feeds = []
+    for i in range(n):
+        f = Feed(id=f"f{i}", title=f"Feed {i:04d}", url=f"http://example.com/{i}", category=cats[i % len(cats)])
+        f.unread_count = i % 5
+        feeds.append(f)
+    return feeds
+
+
+def _sync(sync, feeds, cats=("News", "Tech", "Pods", "Empty"), favorites=False):
+    spec = tree_model.build_spec(feeds, cats, favorites=favorites)
+    backend = sync.backend
+    backend.calls = {}
+    stats = sync.sync(spec)
+    assert backend.dump() == _expected(spec)
+    assert backend.frozen == 0
+    return stats
+
+
+def test_first_sync_builds_the_tree():
+    backend = FakeBackend()
+    sync = tree_model.TreeSync(backend)
+    feeds = _feeds(30)
+    stats = _sync(sync, feeds, favorites=True)
+    assert backend.calls["clear"] == 1
+    assert backend.calls["freeze"] == 1
+    assert stats["inserted"] == 4 + 4 + 30
+    assert [c.label for c in backend.root.children][:4] == ["All Articles", "Unread Articles", "Read Articles", "Favorites"]
+    assert backend.root.children[4].label == "Empty" and backend.root.children[4].children == []
+    assert all(c.expanded for c in backend.root.children[5:])
+    assert sync.handles("feed")["f1"].label == "Feed 0001 (1)"
+
+
+def test_unchanged_tree_makes_no_calls_and_label_changes_keep_items():
+    backend = FakeBackend()
+    sync = tree_model.TreeSync(backend)
+    feeds = _feeds(1200)
+    _sync(sync, feeds)
+    handles = sync.handles("feed")
+
+    assert _sync(sync, feeds) == {"inserted": 0, "removed": 0, "relabeled": 0}
+    assert backend.calls == {}
+
+    feeds[7].unread_count = 99
+    feeds[8].unread_count = 0
+    stats = _sync(sync, feeds)
+    assert stats == {"inserted": 0, "removed": 0, "relabeled": 2}
+    assert backend.calls == {"freeze": 1, "set_label": 2}
+    assert sync.handles("feed") == handles
+
+    assert sync.relabel(("feed", "f7"), "Live (3)")
+    assert handles["f7"].label == "Live (3)"
+    assert not sync.relabel(("feed", "missing"), "x")
+    stats = _sync(sync, feeds)
+    assert stats["relabeled"] == 1
+
+
+def test_renames_moves_inserts_and_removes():
+    backend = FakeBackend()
+    sync = tree_model.TreeSync(backend)
+    feeds = _feeds(60)
+    _sync(sync, feeds)
+    kept = sync.handles("feed")["f4"]
+
+    # A rename that re-sorts costs one delete and one insert.
+    feeds[0].title = "ZZZ last"
+    stats = _sync(sync, feeds)
+    assert stats == {"inserted": 1, "removed": 1, "relabeled": 0}
+
+    # Move to another category, add one feed, drop one.
+    feeds[1].category = "News"
+    extra = Feed(id="new", title="Brand new", url="u", category="Tech")
+    feeds = [f for f in feeds if f.id != "f2"] + [extra]
+    stats = _sync(sync, feeds)
+    assert stats == {"inserted": 2, "removed": 2, "relabeled": 0}
+    assert sync.handles("feed")["f4"] is kept
+
+    # Category rename: the old node and its feeds go, the new one comes in expanded.
+    pods = [f for f in feeds if f.category == "Pods"]
+    for f in pods:
+        f.category = "Podcasts"
+    stats = _sync(sync, feeds, cats=("News", "Tech", "Podcasts"))
+    # Pods and its feeds, plus the now-unknown "Empty" category
+    assert stats["removed"] == 1 + len(pods) + 1
+    assert stats["inserted"] == 1 + len(pods)
+    assert sync.handle(("category", "Podcasts")).expanded
+    assert sync.handle(("category", "Pods")) is None
@@ -0,0 +1,79 @@
+import os
+import sys
+
+# Ensure repo root on path
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from core.models import Article
+from gui import view_cache
+
+
+def _view(n, body=1000, last_access=0.0):
+    articles = [
+        Article(title=f"t{i}", url=f"u{i}", content="x" * body, date="", author="", feed_id="f",
+                id=f"a{i}", timestamp=1000 - i)
+        for i in range(n)
+    ]
+    return {"articles": articles, "id_set": {a.id for a in articles}, "total": n,
+            "page_size": 400, "paged_offset": n, "fully_loaded": True, "last_access": last_access}
+
+
+def test_estimate_tracks_content_and_is_cached():
+    small = _view(100, body=10)
+    big = _view(100, body=10000)
+    assert view_cache.estimate_view_bytes(big) > view_cache.estimate_view_bytes(small) + 100 * 9000
+    assert big["bytes"] == view_cache.estimate_view_bytes(big)
+
+    sampled = _view(5000, body=1000)
+    exact = sum(view_cache.estimate_article_bytes(a) for a in sampled["articles"])
+    assert abs(view_cache.estimate_view_bytes(sampled) - exact) < exact * 0.05
+
+
+def test_prune_enforces_byte_budget_and_keeps_current():
+    cache = {f"v{i}": _view(50, body=20000, last_access=float(i)) for i in range(5)}
+    per_view = view_cache.estimate_view_bytes(cache["v0"])
+    stats = view_cache.ViewCacheStats()
+
+    evicted = view_cache.prune(cache, keep="v0", max_views=15, max_bytes=int(per_view * 2.5), stats=stats)
+    assert evicted == ["v1", "v2", "v3"]
+    assert not view_cache.is_stub(cache["v0"])  # current view, oldest but kept
+    assert view_cache.is_stub(cache["v1"])
+    assert cache["v1"]["stub"] == 50
+    assert cache["v1"]["articles"] == []
+    assert stats.evictions == 3 and stats.stubbed == 3
+
+    view_cache.prune(cache, keep="v0", max_views=15, max_bytes=1, keep_stubs=False)
+    assert set(cache) == {"v0", "v1", "v2", "v3"}  # stubs stay, the last full view is dropped
+
+
+def test_prune_view_count_and_stub_limit():
+    cache = {f"v{i}": _view(1, last_access=float(i)) for i in range(view_cache.MAX_STUBS + 10)}
+    view_cache.prune(cache, keep=None, max_views=5)
+    stubs = [k for k, st in cache.items() if view_cache.is_stub(st)]
+    full = [k for k, st in cache.items() if not view_cache.is_stub(st)]
+    assert len(full) == 5
+    assert len(stubs) == view_cache.MAX_STUBS
+    assert "v0" not in cache
+
+
+def test_stats_and_report():
+    stats = view_cache.ViewCacheStats()
+    stats.record("hit")
+    stats.record("hit")
+    stats.record("hit")
+    stats.record("stub")
+    assert stats.hit_ratio() == 0.75
+    assert stats.rehydrations == 1
+
+    cache = {"all": _view(10)}
+    view_cache.make_stub(cache.setdefault("old", _view(3)))
+    info = view_cache.summary(cache, stats)
+    assert info["full_views"] == 1 and info["stubs"] == 1
+    text = view_cache.format_report(info, max_bytes=view_cache.max_bytes_from_setting(256), max_views=15)
+    assert "Hit ratio: 75%" in text
+    assert "of 256 MB" in text
+    assert "old: 3 articles" in text
+    assert view_cache.max_bytes_from_setting("bad") == view_cache.DEFAULT_MAX_MB * 1024 * 1024
+    assert view_cache.max_bytes_from_setting(0) == 0
@@ -0,0 +1,98 @@
+"""
+Micro-benchmark for core.utils.normalize_date.
+
+Compares the plain dateutil parse (what normalize_date used to do for every entry)
+with the current tiered parser, cold (memo cache cleared before every call) and warm
+(a pool of dates that fits the cache, seen again as on a refresh). Prints calls per
+second as JSON.
+
+    python tools/date_benchmark.py --count 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from email.utils import formatdate
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def build_samples(count: int, seed: int):
+    """A mix of the date shapes seen in real feeds (mostly RFC 822, some ISO 8601)."""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        ts = rng.randint(1_500_000_000, 1_760_000_000)
+        roll = rng.random()
+        if roll < 0.55:
+            samples.append(formatdate(ts, usegmt=True))
+        elif roll < 0.70:
+            samples.append(formatdate(ts, localtime=False).replace("-0000", "+0000"))
+        elif roll < 0.90:
+            samples.append(time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts)))
+        elif roll < 0.97:
+            samples.append(time.strftime("%Y-%m-%dT%H:%M:%S+02:00", time.gmtime(ts)))
+        else:
+            samples.append(time.strftime("%B %d, %Y %I:%M %p", time.gmtime(ts)))
+    return samples
+
+
+def _rate(fn, samples, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for raw in samples:
+            fn(raw)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return round(len(samples) / best, 1) if best else 0.0
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="normalize_date micro-benchmark")
+    p.add_argument("--count", type=int, default=20000, help="dates per pass")
+    p.add_argument("--repeat", type=int, default=3, help="passes; the best one is reported")
+    p.add_argument("--seed", type=int, default=1234)
+    args = p.parse_args(argv)
+
+    from dateutil import parser as dateparser
+    from core import utils
+
+    samples = build_samples(max(1, args.count), args.seed)
+
+    def legacy(raw):
+        return utils.format_datetime(dateparser.parse(raw, tzinfos=utils.TZINFOS))
+
+    def cold(raw):
+        utils._parse_raw_date.cache_clear()
+        return utils.normalize_date(raw)
+
+    # A refresh sees the same dates again; keep the warm set within the memo cache.
+    pool = samples[:1000]
+    warm_samples = (pool * (len(samples) // len(pool) + 1))[:len(samples)]
+    utils._parse_raw_date.cache_clear()
+    result = {
+        "benchmark": "normalize_date",
+        "samples": len(samples),
+        "calls_per_s": {
+            "dateutil": _rate(legacy, samples, args.repeat),
+            "tiered_cold": _rate(cold, samples, args.repeat),
+            "tiered_warm": _rate(utils.normalize_date, warm_samples, args.repeat),
+        },
+    }
+    rates = result["calls_per_s"]
+    if rates["dateutil"]:
+        result["speedup_cold"] = round(rates["tiered_cold"] / rates["dateutil"], 1)
+        result["speedup_warm"] = round(rates["tiered_warm"] / rates["dateutil"], 1)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
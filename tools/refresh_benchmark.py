@@ -0,0 +1,449 @@
+"""
+Offline refresh benchmark: a synthetic feed farm plus LocalProvider.refresh().
+
+The farm runs in a separate process (so serving feeds does not compete with the
+refresh for this process's GIL) and listens on one loopback address per simulated
+host (127.0.0.2, 127.0.0.3, ...; falls back to distinct ports on 127.0.0.1 where
+only that address is routable). Each synthetic feed has:
+
+- a realistic size (log-normal item count, variable item bodies, podcast enclosures),
+- per-host latency with jitter,
+- ETag validators (or none, for a configurable share of feeds),
+- a not-modified rate: how often a re-fetch finds the feed unchanged,
+- an error rate (HTTP 500),
+- optional podcast:chapters tags (served by the farm as well).
+
+Each round runs LocalProvider.refresh() against a temporary database and reports
+throughput, per-feed completion latency (p50/p95), peak RSS, how long a writer had to
+wait for the SQLite write lock, and how long a thread that wants to run every 5 ms
+(a stand-in for the wx main loop) was stalled. Results are printed as JSON.
+
+    python tools/refresh_benchmark.py --feeds 500 --hosts 20 --rounds 3 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+_BASE_TS = 1_735_689_600  # 2025-01-01 00:00:00 UTC
+
+
+# --- feed farm -------------------------------------------------------------
+
+
+def build_farm_spec(args) -> Dict[str, Any]:
+    """Deterministic description of every feed (shared by the farm and the client)."""
+    rng = random.Random(args.seed)
+    hosts = []
+    for h in range(args.hosts):
+        hosts.append({"latency_ms": args.latency_ms * rng.uniform(0.5, 1.5)})
+    feeds = []
+    for i in range(args.feeds):
+        items = int(min(2000, max(1, rng.lognormvariate(math.log(max(1, args.avg_items)), 0.8))))
+        feeds.append({
+            "id": f"bench-{i}",
+            "host": i % args.hosts,
+            "items": items,
+            "body_bytes": int(rng.uniform(0.25, 1.75) * args.item_bytes),
+            "validators": rng.random() >= args.no_validator_rate,
+            "podcast": rng.random() < args.podcast_rate,
+            "chapters": rng.random() < args.chapter_rate,
+        })
+    return {
+        "seed": args.seed,
+        "hosts": hosts,
+        "feeds": feeds,
+        "jitter_ms": args.jitter_ms,
+        "not_modified_rate": args.not_modified_rate,
+        "error_rate": args.error_rate,
+    }
+
+
+def render_feed(feed: Dict[str, Any], version: int, chapter_base: str) -> bytes:
+    fid = feed["id"]
+    parts = [
+        "<?xml version='1.0' encoding='UTF-8'?>",
+        "<rss version='2.0' xmlns:podcast='https://podcastindex.org/namespace/1.0'><channel>",
+        f"<title>Benchmark {fid}</title><link>http://example.com/{fid}</link>",
+    ]
+    filler = ("lorem ipsum dolor sit amet " * (feed["body_bytes"] // 27 + 1))[:feed["body_bytes"]]
+    newest = feed["items"] + version
+    for n in range(newest, newest - feed["items"], -1):
+        pub = formatdate(_BASE_TS + n * 3600, usegmt=True)
+        parts.append(
+            f"<item><guid>{fid}-{n}</guid><title>{fid} item {n}</title>"
+            f"<link>http://example.com/{fid}/{n}</link>"
+            f"<description>&lt;p&gt;{filler}&lt;/p&gt;</description><pubDate>{pub}</pubDate>"
+        )
+        if feed["podcast"]:
+            parts.append(f"<enclosure url='http://example.com/{fid}/{n}.mp3' type='audio/mpeg' length='1000'/>")
+        if feed["chapters"]:
+            parts.append(f"<podcast:chapters url='{chapter_base}/chapters/{fid}-{n}.json' type='application/json+chapters'/>")
+        parts.append("</item>")
+    parts.append("</channel></rss>")
+    return "".join(parts).encode("utf-8")
+
+
+def _make_handler(spec, host_index, state, lock, chapter_base_for):
+    feeds_by_id = {f["id"]: f for f in spec["feeds"]}
+    latency_s = spec["hosts"][host_index]["latency_ms"] / 1000.0
+    jitter_s = spec["jitter_ms"] / 1000.0
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args, **kwargs):
+            return
+
+        def _send(self, code, body=b"", headers=None):
+            self.send_response(code)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            with lock:
+                rng = state["rng"]
+                delay = max(0.0, latency_s + rng.uniform(-jitter_s, jitter_s))
+                roll_error = rng.random()
+                roll_change = rng.random()
+            if delay:
+                time.sleep(delay)
+
+            if self.path.startswith("/chapters/"):
+                body = json.dumps({"version": "1.2.0", "chapters": [
+                    {"startTime": 0, "title": "Intro"}, {"startTime": 120, "title": "Main"},
+                ]}).encode("utf-8")
+                self._send(200, body, {"Content-Type": "application/json"})
+                return
+
+            fid = self.path.rsplit("/", 1)[-1]
+            feed = feeds_by_id.get(fid)
+            if feed is None:
+                self._send(404)
+                return
+            if roll_error < spec["error_rate"]:
+                self._send(500)
+                return
+
+            with lock:
+                seen = state["seen"].get(fid, False)
+                version = state["versions"].get(fid, 0)
+                if seen and roll_change >= spec["not_modified_rate"]:
+                    version += 1
+                    state["versions"][fid] = version
+                state["seen"][fid] = True
+
+            etag = f'"{fid}-v{version}"'
+            if feed["validators"] and self.headers.get("If-None-Match") == etag:
+                self._send(304, headers={"ETag": etag})
+                return
+            body = render_feed(feed, version, chapter_base_for(feed))
+            headers = {"Content-Type": "application/rss+xml; charset=utf-8"}
+            if feed["validators"]:
+                headers["ETag"] = etag
+            self._send(200, body, headers)
+
+    return Handler
+
+
+def _farm_main(spec, ready_q, stop_evt):
+    state = {"rng": random.Random(spec["seed"] + 1), "versions": {}, "seen": {}}
+    lock = threading.Lock()
+    servers = []
+    addresses: List[Optional[tuple]] = [None] * len(spec["hosts"])
+
+    def chapter_base_for(feed):
+        addr = addresses[feed["host"]]
+        return f"http://{addr[0]}:{addr[1]}"
+
+    for h in range(len(spec["hosts"])):
+        handler = _make_handler(spec, h, state, lock, chapter_base_for)
+        httpd = None
+        for addr in (f"127.0.0.{2 + h}" if h < 250 else None, "127.0.0.1"):
+            if not addr:
+                continue
+            try:
+                httpd = ThreadingHTTPServer((addr, 0), handler)
+                break
+            except OSError:
+                continue
+        if httpd is None:
+            raise RuntimeError("could not bind a loopback address for the feed farm")
+        httpd.daemon_threads = True
+        addresses[h] = httpd.server_address[:2]
+        servers.append(httpd)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    ready_q.put(addresses)
+    stop_evt.wait()
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+# --- probes ----------------------------------------------------------------
+
+
+class _StallProbe(threading.Thread):
+    """Wants to run every interval; records how late it was woken (GIL/CPU starvation)."""
+
+    def __init__(self, interval_s: float = 0.005):
+        super().__init__(name="bench-stall-probe", daemon=True)
+        self.interval_s = interval_s
+        self.samples: List[float] = []
+        self._stop_evt = threading.Event()
+
+    def run(self):
+        while not self._stop_evt.is_set():
+            t0 = time.perf_counter()
+            time.sleep(self.interval_s)
+            self.samples.append(max(0.0, time.perf_counter() - t0 - self.interval_s))
+
+    def stop(self):
+        self._stop_evt.set()
+        self.join(timeout=2)
+
+
+class _DbLockProbe(threading.Thread):
+    """Periodically takes the SQLite write lock, like a UI mark-as-read would."""
+
+    def __init__(self, db_path: str, interval_s: float = 0.05):
+        super().__init__(name="bench-db-probe", daemon=True)
+        self.db_path = db_path
+        self.interval_s = interval_s
+        self.waits: List[float] = []
+        self._stop_evt = threading.Event()
+
+    def run(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            while not self._stop_evt.wait(self.interval_s):
+                t0 = time.perf_counter()
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    self.waits.append(time.perf_counter() - t0)
+                    conn.execute("ROLLBACK")
+                except sqlite3.OperationalError:
+                    self.waits.append(time.perf_counter() - t0)
+        finally:
+            conn.close()
+
+    def stop(self):
+        self._stop_evt.set()
+        self.join(timeout=2)
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(math.ceil(pct / 100.0 * len(ordered))) - 1))
+    return ordered[k]
+
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value * 1000.0, 2)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux, bytes on macOS.
+        return round(peak / (1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0), 1)
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().peak_wset / (1024.0 * 1024.0), 1)
+    except Exception:
+        return None
+
+
+# --- client ----------------------------------------------------------------
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    import core.db
+    from core import enrichment
+    from providers.local import LocalProvider
+
+    spec = build_farm_spec(args)
+    ctx = multiprocessing.get_context("spawn")
+    ready_q = ctx.Queue()
+    stop_evt = ctx.Event()
+    farm = ctx.Process(target=_farm_main, args=(spec, ready_q, stop_evt), daemon=True)
+    farm.start()
+    addresses = ready_q.get(timeout=60)
+
+    tmp = tempfile.TemporaryDirectory(prefix="blindrss-bench-")
+    orig_db_file = core.db.DB_FILE
+    core.db.DB_FILE = os.path.join(tmp.name, "rss.db")
+    rounds = []
+    try:
+        config = {
+            "max_concurrent_refreshes": args.workers,
+            "per_host_max_connections": args.per_host,
+            "feed_timeout_seconds": args.timeout,
+            "feed_retry_attempts": args.retries,
+            "refresh_engine": args.engine,
+            "adaptive_refresh": bool(args.adaptive),
+        }
+        provider = LocalProvider(config)
+        conn = core.db.get_connection()
+        try:
+            conn.executemany(
+                "INSERT INTO feeds (id, url, title, category, icon_url) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (f["id"], "http://%s:%d/feed/%s" % (addresses[f["host"]][0], addresses[f["host"]][1], f["id"]),
+                     f["id"], "Benchmark", "")
+                    for f in spec["feeds"]
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        for round_no in range(1, args.rounds + 1):
+            done_at: Dict[str, float] = {}
+            statuses: Dict[str, int] = {}
+            new_items = 0
+            lock = threading.Lock()
+
+            stall = _StallProbe()
+            db_probe = _DbLockProbe(core.db.DB_FILE)
+            started = time.perf_counter()
+
+            def progress_cb(state):
+                nonlocal new_items
+                with lock:
+                    done_at[state.get("id")] = time.perf_counter() - started
+                    st = state.get("status") or "unknown"
+                    statuses[st] = statuses.get(st, 0) + 1
+                    new_items += int(state.get("new_items") or 0)
+
+            stall.start()
+            db_probe.start()
+            try:
+                provider.refresh(progress_cb, force=False)
+            finally:
+                elapsed = time.perf_counter() - started
+                stall.stop()
+                db_probe.stop()
+
+            latencies = list(done_at.values())
+            rounds.append({
+                "round": round_no,
+                "wall_s": round(elapsed, 3),
+                "feeds_reported": len(done_at),
+                "feeds_per_s": round(len(done_at) / elapsed, 2) if elapsed > 0 else None,
+                "new_items": new_items,
+                "statuses": statuses,
+                "feed_latency_ms": {"p50": _ms(_percentile(latencies, 50)), "p95": _ms(_percentile(latencies, 95))},
+                "db_lock_wait_ms": {
+                    "samples": len(db_probe.waits),
+                    "p95": _ms(_percentile(db_probe.waits, 95)),
+                    "max": _ms(max(db_probe.waits) if db_probe.waits else None),
+                },
+                "ui_stall_ms": {
+                    "p95": _ms(_percentile(stall.samples, 95)),
+                    "max": _ms(max(stall.samples) if stall.samples else None),
+                    "total_over_50ms": _ms(sum(s for s in stall.samples if s > 0.05)),
+                },
+                "peak_rss_mb": _peak_rss_mb(),
+            })
+    finally:
+        try:
+            enrichment.shutdown()
+        except Exception:
+            pass
+        core.db.DB_FILE = orig_db_file
+        stop_evt.set()
+        farm.join(timeout=10)
+        if farm.is_alive():
+            farm.terminate()
+        try:
+            tmp.cleanup()
+        except Exception:
+            pass
+
+    try:
+        from core.version import APP_VERSION
+    except Exception:
+        APP_VERSION = None
+    return {
+        "benchmark": "refresh",
+        "app_version": APP_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": {k: v for k, v in vars(args).items() if k != "output"},
+        "distinct_hosts": len({a[0] for a in addresses}),
+        "rounds": rounds,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="BlindRSS offline refresh benchmark")
+    p.add_argument("--feeds", type=int, default=200, help="number of synthetic feeds (10-10000)")
+    p.add_argument("--hosts", type=int, default=10, help="number of simulated hosts")
+    p.add_argument("--rounds", type=int, default=3, help="refresh rounds (first one is cold)")
+    p.add_argument("--engine", default="threads", choices=["threads", "async", "staged"])
+    p.add_argument("--workers", type=int, default=10, help="max_concurrent_refreshes")
+    p.add_argument("--per-host", type=int, default=4, help="per_host_max_connections")
+    p.add_argument("--timeout", type=int, default=15, help="feed_timeout_seconds")
+    p.add_argument("--retries", type=int, default=0, help="feed_retry_attempts")
+    p.add_argument("--adaptive", action="store_true", help="keep adaptive scheduling on (later rounds fetch only due feeds)")
+    p.add_argument("--latency-ms", type=float, default=40.0, help="mean per-host response latency")
+    p.add_argument("--jitter-ms", type=float, default=15.0)
+    p.add_argument("--avg-items", type=int, default=40, help="median items per feed (log-normal)")
+    p.add_argument("--item-bytes", type=int, default=800, help="mean item description size")
+    p.add_argument("--not-modified-rate", type=float, default=0.8, help="share of re-fetches that find the feed unchanged")
+    p.add_argument("--no-validator-rate", type=float, default=0.3, help="share of feeds sending no ETag")
+    p.add_argument("--error-rate", type=float, default=0.02, help="share of requests answered with HTTP 500")
+    p.add_argument("--podcast-rate", type=float, default=0.4)
+    p.add_argument("--chapter-rate", type=float, default=0.1)
+    p.add_argument("--seed", type=int, default=1234)
+    p.add_argument("--output", help="write JSON here instead of stdout")
+    return p
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not 10 <= args.feeds <= 10000:
+        raise SystemExit("--feeds must be between 10 and 10000")
+    args.hosts = max(1, min(args.hosts, args.feeds))
+    result = run_benchmark(args)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()